@@ -8,5 +8,8 @@ from .git_hub import github
 from .namespace import namespace
 from .macro.apply import apply
 from .macro.destroy import destroy
+from .macro.batch import batch
+from .daemon import daemon
+from .plugin import plugin
 
-list_groups = [abba, api, azure, powerbi, webapp, vault, github, namespace, apply, destroy]
+list_groups = [abba, api, azure, powerbi, webapp, vault, github, namespace, apply, destroy, batch, daemon, plugin]
@@ -9,6 +9,7 @@ from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 
 logger = getLogger("Babylon")
 env = Environment()
@@ -19,6 +20,7 @@ env = Environment()
 @output_to_file
 @pass_azure_token("csm_api")
 @option("--connector-id", "connector_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, connector_id: str) -> CommandResponse:
     """Get a registered connector details"""
@@ -1,13 +1,14 @@
 from logging import getLogger
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-import jmespath
 from click import command, option
 from Babylon.commands.api.connectors.services.connectors_svc import ConnectorService
-from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import output_to_stream
 from Babylon.utils.decorators import injectcontext
 from Babylon.utils.decorators import retrieve_state
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.listing import ItemFilter, list_response
 from Babylon.utils.environment import Environment
 from Babylon.utils.credentials import pass_azure_token
 
@@ -17,21 +18,19 @@ env = Environment()
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_azure_token("csm_api")
 @option("--filter", "filter", type=str, help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
-def get_all(state: Any, azure_token: str, filter: Optional[str] = None) -> CommandResponse:
+def get_all(state: Any,
+            azure_token: str,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all connectors details.
     Can be filtered with jmespath queries: https://jmespath.org/specification.html#grammar
     """
     service_state = state["services"]
     service = ConnectorService(azure_token=azure_token, state=service_state)
-    response = service.get_all()
-    if response is None:
-        return CommandResponse.fail()
-    connectors = response.json()
-    if len(connectors) and filter:
-        connectors = jmespath.search(filter, connectors)
-    return CommandResponse.success(connectors, verbose=True)
+    return list_response(service.iter_all(), sink, ItemFilter(filter))
@@ -4,7 +4,8 @@ import sys
 from git import Optional
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.listing import DEFAULT_PAGE_SIZE, iter_pages
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -17,6 +18,7 @@ class ConnectorService:
         self.spec = spec
         self.azure_token = azure_token
         self.url = state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
 
         if not self.url:
             logger.error("API url not found")
@@ -24,12 +26,7 @@ class ConnectorService:
 
     def create(self):
         details = self.spec["payload"]
-        response = oauth_request(
-            f'{self.url}/connectors',
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", '/connectors', data=details)
         return response
 
     def delete(self, force_validation: bool):
@@ -39,22 +36,23 @@ class ConnectorService:
             sys.exit(1)
         if not force_validation and not confirm_deletion("connector", connector_id):
             return None
-        response = oauth_request(
-            f'{self.url}/connectors/{connector_id}',
-            self.azure_token,
-            type="DELETE",
-        )
+        response = self.api.sync.request("DELETE", f'/connectors/{connector_id}')
         return response
 
     def get_all(self):
-        response = oauth_request(f'{self.url}/connectors', self.azure_token)
+        response = self.api.sync.request("GET", '/connectors')
         return response
 
+    def iter_all(self, size: int = DEFAULT_PAGE_SIZE):
+        """Iterate over all items, page by page"""
+        return iter_pages(
+            lambda page, size: self.api.sync.request("GET", "/connectors", params=dict(page=page, size=size)), size)
+
     def get(self):
         connector_id = self.state["api"]["connector_id"]
         if not connector_id:
             logger.error('Connector_id is missing')
             sys.exit(1)
-        response = oauth_request(f'{self.url}/connectors/{connector_id}', self.azure_token)
+        response = self.api.sync.request("GET", f'/connectors/{connector_id}')
 
         return response
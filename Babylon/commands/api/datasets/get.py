@@ -5,6 +5,7 @@ from Babylon.commands.api.datasets.services.datasets_api_svc import DatasetServi
 from Babylon.utils.decorators import retrieve_state
 from Babylon.utils.decorators import output_to_file
 from Babylon.utils.decorators import injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
@@ -19,6 +20,7 @@ env = Environment()
 @pass_azure_token("csm_api")
 @option("--organization-id", "organization_id", type=str)
 @option("--dataset-id", "dataset_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, organization_id: str, dataset_id: str) -> CommandResponse:
     """Get a dataset"""
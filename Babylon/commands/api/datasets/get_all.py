@@ -1,16 +1,17 @@
 from logging import getLogger
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-import jmespath
 from click import command
 from click import option
 
 from Babylon.commands.api.datasets.services.datasets_api_svc import DatasetService
 from Babylon.utils.credentials import pass_azure_token
-from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import output_to_stream
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.listing import ItemFilter, list_response
 
 logger = getLogger("Babylon")
 env = Environment()
@@ -18,12 +19,17 @@ env = Environment()
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_azure_token("csm_api")
 @option("--organization-id", "organization_id", type=str)
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
-def get_all(state: Any, azure_token: str, organization_id: str, filter: Optional[str] = None) -> CommandResponse:
+def get_all(state: Any,
+            azure_token: str,
+            organization_id: str,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all datasets from the organization
     """
@@ -31,10 +37,4 @@ def get_all(state: Any, azure_token: str, organization_id: str, filter: Optional
     service_state["api"]["organization_id"] = (organization_id or service_state["api"]["organization_id"])
     logger.info(f"Getting all datasets from organization {service_state['api']['organization_id']}")
     service = DatasetService(azure_token=azure_token, state=service_state)
-    response = service.get_all()
-    if response is None:
-        return CommandResponse.fail()
-    datasets = response.json()
-    if len(datasets) and filter:
-        datasets = jmespath.search(filter, datasets)
-    return CommandResponse.success(datasets, verbose=True)
+    return list_response(service.iter_all(), sink, ItemFilter(filter))
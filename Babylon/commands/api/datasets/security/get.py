@@ -7,6 +7,7 @@ from Babylon.commands.api.datasets.services.datasets_security_svc import Dataset
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import output_to_file
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -19,6 +20,7 @@ env = Environment()
 @output_to_file
 @pass_azure_token("csm_api")
 @argument("identity_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, identity_id: str, organization_id: str, dataset_id: str) -> CommandResponse:
     """
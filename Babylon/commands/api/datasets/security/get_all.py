@@ -8,6 +8,7 @@ from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import output_to_file
 from Babylon.utils.decorators import retrieve_state
 from Babylon.utils.decorators import injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -19,6 +20,7 @@ env = Environment()
 @injectcontext()
 @output_to_file
 @pass_azure_token("csm_api")
+@read_only
 @retrieve_state
 def get_all(state: Any, azure_token: str, organization_id: str, dataset_id: str) -> CommandResponse:
     """
@@ -9,7 +9,8 @@ from pathlib import Path
 from Babylon.commands.api.datasets.services.datasets_security_svc import DatasetSecurityService
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.listing import DEFAULT_PAGE_SIZE, iter_pages
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -22,6 +23,7 @@ class DatasetService:
         self.spec = spec
         self.azure_token = azure_token
         self.url = self.state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         self.organization_id = self.state["api"]["organization_id"]
 
         if not self.url:
@@ -33,51 +35,37 @@ class DatasetService:
 
     def create(self):
         details = self.spec["payload"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/datasets", data=details)
         return response
 
     def delete(self, dataset_id: str, force_validation: bool):
         if not force_validation and not confirm_deletion("dataset", dataset_id):
             return None
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}",
-            self.azure_token,
-            type="DELETE",
-        )
+        response = self.api.sync.request("DELETE", f"/organizations/{self.organization_id}/datasets/{dataset_id}")
         return response
 
     def get_all(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/datasets")
         return response
 
+    def iter_all(self, size: int = DEFAULT_PAGE_SIZE):
+        """Iterate over all items, page by page"""
+        return iter_pages(
+            lambda page, size: self.api.sync.request(
+                "GET", f"/organizations/{self.organization_id}/datasets", params=dict(page=page, size=size)), size)
+
     def get(self, dataset_id: str):
         if not dataset_id:
             logger.error("dataset_id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/datasets/{dataset_id}")
         if response is None:
             return None
         return response
 
     def search(self, tag: str):
         details = {"datasetTags": [tag]}
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/search",
-            self.azure_token,
-            type="POST",
-            json=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/datasets/search", json=details)
         return response
 
     def update(self):
@@ -86,12 +74,9 @@ class DatasetService:
         if not dataset_id:
             logger.error("dataset_id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}",
-            self.azure_token,
-            type="PATCH",
-            data=details,
-        )
+        response = self.api.sync.request("PATCH",
+                                         f"/organizations/{self.organization_id}/datasets/{dataset_id}",
+                                         data=details)
         return response
 
     def update_security(self, old_security: dict):
@@ -130,21 +115,14 @@ class DatasetService:
         if not dataset_id:
             logger.error("dataset_id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}/refresh",
-            self.azure_token,
-            type="POST",
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/datasets/{dataset_id}/refresh")
         return response
 
     def get_status(self, dataset_id: str):
         if not dataset_id:
             logger.error("dataset_id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}/status",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/datasets/{dataset_id}/status")
         return response
 
     def upload(self, dataset_id: str, zip_file: Path):
@@ -152,13 +130,10 @@ class DatasetService:
             logger.error("dataset_id not found")
             sys.exit(1)
         with open(zip_file, "rb") as file:
-            response = oauth_request(
-                f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}",
-                self.azure_token,
-                type="POST",
-                data=file,
-                content_type="application/octet-stream",
-            )
+            response = self.api.sync.request("POST",
+                                             f"/organizations/{self.organization_id}/datasets/{dataset_id}",
+                                             data=file,
+                                             content_type="application/octet-stream")
         return response
 
     def link_to_workspace(self, dataset_id: str):
@@ -166,9 +141,6 @@ class DatasetService:
             logger.error("dataset_id not found")
             sys.exit(1)
         workspace_id = self.state["api"]["workspace_id"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{dataset_id}/link?workspaceId={workspace_id}",
-            self.azure_token,
-            type="POST",
-        )
+        response = self.api.sync.request(
+            "POST", f"/organizations/{self.organization_id}/datasets/{dataset_id}/link?workspaceId={workspace_id}")
         return response
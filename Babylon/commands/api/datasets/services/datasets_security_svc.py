@@ -2,7 +2,7 @@ import sys
 
 from logging import getLogger
 from Babylon.utils.environment import Environment
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
 
 logger = getLogger("Babylon")
 env = Environment()
@@ -14,6 +14,7 @@ class DatasetSecurityService:
         self.state = state
         self.azure_token = azure_token
         self.url = self.state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         if not self.url:
             logger.error("API url not found")
             sys.exit(1)
@@ -27,49 +28,33 @@ class DatasetSecurityService:
             sys.exit(1)
 
     def add(self, details: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request(
+            "POST", f"/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access", data=details)
         return response
 
     def get(self, id: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access/{id}",
-            self.azure_token,
-            type="GET",
-        )
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access/{id}")
         return response
 
     def get_all(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{self.dataset_id}/security",
-            self.azure_token,
-            type="GET",
-        )
+        response = self.api.sync.request("GET",
+                                         f"/organizations/{self.organization_id}/datasets/{self.dataset_id}/security")
         return response
 
     def update(self, id: str, details: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access/{id}",
-            self.azure_token,
-            type="PATCH",
+        response = self.api.sync.request(
+            "PATCH",
+            f"/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access/{id}",
             data=details)
         return response
 
     def set_default(self, details: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/default",
-            self.azure_token,
-            type="POST",
-            data=details)
+        response = self.api.sync.request(
+            "POST", f"/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/default", data=details)
         return response
 
     def delete(self, id: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access/{id}",
-            self.azure_token,
-            type="DELETE")
+        response = self.api.sync.request(
+            "DELETE", f"/organizations/{self.organization_id}/datasets/{self.dataset_id}/security/access/{id}")
         return response
@@ -1,7 +1,9 @@
+import os
 import logging
 
 from pathlib import Path
 from Babylon.utils.environment import Environment
+from Babylon.utils.tracing import span
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -27,6 +29,6 @@ class DatasetStorageService:
         )
         if override and client.exists():
             client.delete_blob()
-        with open(path, "rb") as data:
+        with open(path, "rb") as data, span("blob.upload", artifact="dataset", bytes=os.path.getsize(path)):
             client.upload_blob(data)
         logger.info(f"[azure] successfully sent dataset file : {dataset_name} to workspace {workspace_id}")
@@ -4,6 +4,7 @@ from click import option
 from click import command
 from Babylon.utils.decorators import injectcontext, retrieve_state
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.environment import Environment
 from Babylon.utils.credentials import pass_azure_token
@@ -18,6 +19,7 @@ env = Environment()
 @output_to_file
 @pass_azure_token("csm_api")
 @option("--organization-id", "organization_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, organization_id: str, azure_token: str) -> CommandResponse:
     """Get an organization details"""
@@ -1,39 +1,30 @@
-import jmespath
-
 from logging import getLogger
-from typing import Any
+from typing import Any, Callable, Optional
 from click import command
 from click import option
 from Babylon.utils.decorators import retrieve_state
 from Babylon.utils.decorators import injectcontext
 from Babylon.utils.response import CommandResponse
-from Babylon.utils.decorators import output_to_file
+from Babylon.utils.listing import ItemFilter, list_response
+from Babylon.utils.decorators import output_to_stream
+from Babylon.utils.decorators import read_only
 from Babylon.utils.credentials import pass_azure_token
-from Babylon.utils.environment import Environment
 from Babylon.commands.api.organizations.services.organization_api_svc import OrganizationService
 
 logger = getLogger("Babylon")
-env = Environment()
 
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_azure_token("csm_api")
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
-def get_all(state: Any, azure_token: str, filter: str) -> CommandResponse:
+def get_all(state: Any, azure_token: str, filter: str, sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all organization details
     """
     service_state = state["services"]
     organization_service = OrganizationService(state=service_state, azure_token=azure_token)
-    response = organization_service.get_all()
-    if response is None:
-        return CommandResponse.fail()
-    organizations = response.json()
-    if len(organizations) and filter:
-        organizations = jmespath.search(filter, organizations)
-    env.store_state_in_local(state)
-    env.store_state_in_cloud(state)
-    return CommandResponse.success(organizations, verbose=True)
+    return list_response(organization_service.iter_all(), sink, ItemFilter(filter))
@@ -5,6 +5,7 @@ from Babylon.commands.api.organizations.services.organization_security_svc impor
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import retrieve_state, injectcontext
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -16,6 +17,7 @@ env = Environment()
 @injectcontext()
 @output_to_file
 @pass_azure_token("csm_api")
+@read_only
 @retrieve_state
 def get_all(state: Any, azure_token: str) -> CommandResponse:
     """
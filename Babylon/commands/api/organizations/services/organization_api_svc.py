@@ -5,7 +5,8 @@ from logging import getLogger
 from Babylon.commands.api.organizations.services.organization_security_svc import (
     OrganizationSecurityService, )
 from Babylon.utils.interactive import confirm_deletion
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.listing import DEFAULT_PAGE_SIZE, iter_pages
 from Babylon.utils.environment import Environment
 
 logger = getLogger("Babylon")
@@ -19,13 +20,14 @@ class OrganizationService:
         self.spec = spec
         self.azure_token = azure_token
         self.url = state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         if not self.url:
             logger.error("API url not found")
             sys.exit(1)
 
     def create(self):
         details = self.spec["payload"]
-        response = oauth_request(f"{self.url}/organizations", self.azure_token, type="POST", data=details)
+        response = self.api.sync.request("POST", "/organizations", data=details)
         return response
 
     def delete(self, force_validation: bool):
@@ -35,11 +37,7 @@ class OrganizationService:
             sys.exit(1)
         if not force_validation and not confirm_deletion("organization", organization_id):
             return None
-        response = oauth_request(
-            f"{self.url}/organizations/{organization_id}",
-            self.azure_token,
-            type="DELETE",
-        )
+        response = self.api.sync.request("DELETE", f"/organizations/{organization_id}")
         return response
 
     def get(self):
@@ -47,21 +45,21 @@ class OrganizationService:
         if not organization_id:
             logger.error("Organization id is missing")
             return None
-        response = oauth_request(f"{self.url}/organizations/{organization_id}", self.azure_token)
+        response = self.api.sync.request("GET", f"/organizations/{organization_id}")
         return response
 
     def get_all(self):
-        return oauth_request(f"{self.url}/organizations", self.azure_token)
+        return self.api.sync.request("GET", "/organizations")
+
+    def iter_all(self, size: int = DEFAULT_PAGE_SIZE):
+        """Iterate over all items, page by page"""
+        return iter_pages(
+            lambda page, size: self.api.sync.request("GET", "/organizations", params=dict(page=page, size=size)), size)
 
     def update(self):
         details = self.spec["payload"]
         organization_id = self.state["api"]["organization_id"]
-        response = oauth_request(
-            f"{self.url}/organizations/{organization_id}",
-            self.azure_token,
-            type="PATCH",
-            data=details,
-        )
+        response = self.api.sync.request("PATCH", f"/organizations/{organization_id}", data=details)
         return response
 
     def update_security(self, old_security: dict):
@@ -2,7 +2,7 @@ from logging import getLogger
 from typing import Any
 
 from click import command, option
-from Babylon.commands.api.scenarioruns.services.scenariorun_api_svc import ScenarioRunService
+from Babylon.commands.api.scenarioruns.services.scenariorun_api_svc import ScenarioRunService, follow_logs
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import injectcontext, retrieve_state, output_to_file
 from Babylon.utils.response import CommandResponse
@@ -15,15 +15,28 @@ logger = getLogger("Babylon")
 @output_to_file
 @pass_azure_token("csm_api")
 @option("--organization-id", "organization_id", type=str)
-@option("--scenariorun-id", "scenariorun_id", type=str)
+@option("--scenariorun-id", "scenariorun_ids", type=str, multiple=True, help="Can be repeated with --follow")
+@option("--follow", "follow", is_flag=True, help="Stream new log lines until the scenario runs end")
+@option("--interval", "interval", type=float, default=5, show_default=True, help="Seconds between two polls")
+@option("--timeout", "timeout", type=float, default=0, help="Maximum seconds to follow, 0 to wait for the end")
 @retrieve_state
-def logs(state: Any, azure_token: str, organization_id: str, scenariorun_id: str) -> CommandResponse:
+def logs(state: Any,
+         azure_token: str,
+         organization_id: str,
+         scenariorun_ids: tuple[str],
+         follow: bool = False,
+         interval: float = 5,
+         timeout: float = 0) -> CommandResponse:
     """
     Get the logs for the scenarioRun
     """
     service_state = state['services']
     service_state['api']['organization_id'] = organization_id or service_state['api']['organization_id']
-    service_state['api']['scenariorun_id'] = scenariorun_id or service_state['api'].get('scenariorun_id')
+    service_state['api']['scenariorun_id'] = (scenariorun_ids[0]
+                                              if scenariorun_ids else service_state['api'].get('scenariorun_id'))
+    if follow:
+        run_ids = list(scenariorun_ids) or [service_state['api']['scenariorun_id']]
+        return follow_logs(service_state, azure_token, run_ids, cumulated=False, interval=interval, timeout=timeout)
     logger.info(f"Getting logs for scenariorun: {service_state['api']['scenariorun_id']}")
     service = ScenarioRunService(state=service_state, azure_token=azure_token)
     response = service.logs()
@@ -1,10 +1,19 @@
 import sys
+import time
+import asyncio
 from logging import getLogger
+from typing import Callable, Optional
 
-from Babylon.utils.request import oauth_request
+from click import echo
+from httpx import Response
+from Babylon.utils.api_client import ApiLoop, CosmoTechApiClient
+from Babylon.utils.response import CommandResponse
 
 logger = getLogger("Babylon")
 
+TERMINAL_STATES = ["Successful", "Failed", "DataIngestionFailure"]
+FAILED_STATES = ["Failed", "DataIngestionFailure"]
+
 
 class ScenarioRunService:
 
@@ -12,6 +21,7 @@ class ScenarioRunService:
         self.state = state
         self.azure_token = azure_token
         self.url = self.state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         self.organization_id = self.state["api"]["organization_id"]
         self.scenariorun_id = self.state["api"]["scenariorun_id"]
         if not self.organization_id:
@@ -22,25 +32,135 @@ class ScenarioRunService:
             sys.exit(1)
 
     def logs(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/logs",
-            self.azure_token)
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/logs")
         return response
 
     def cumulated_logs(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/cumulatedlogs",
-            self.azure_token)
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/cumulatedlogs")
         return response
 
     def status(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/status",
-            self.azure_token)
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/status")
         return response
 
     def stop(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/stop",
-            self.azure_token, "POST")
+        response = self.api.sync.request(
+            "POST", f"/organizations/{self.organization_id}/scenarioruns/{self.scenariorun_id}/stop")
         return response
+
+
+class LogFollower:
+    """
+    Incremental reader of the logs of a scenario run
+
+    The api only returns complete log documents, the offset of the text already read is kept
+    for each container so every poll only returns new lines. Logs are not fetched anymore once
+    they have been read after the run reached a terminal state
+    """
+
+    def __init__(self, service: ScenarioRunService, cumulated: bool = False) -> None:
+        self.service = service
+        self.cumulated = cumulated
+        self.offsets: dict[str, int] = dict()
+        self.state: Optional[str] = None
+        self.finished = False
+
+    @property
+    def path(self) -> str:
+        return f"/organizations/{self.service.organization_id}/scenarioruns/{self.service.scenariorun_id}"
+
+    async def poll(self) -> list[tuple[str, str]]:
+        """Return the new (container, line) couples"""
+        status = await self.service.api.request("GET", f"{self.path}/status")
+        if status is not None:
+            self.state = status.json().get("state")
+        # logs read after the run reached a terminal state are complete
+        terminal = self.state in TERMINAL_STATES
+        response = await self.service.api.request("GET", f"{self.path}/{'cumulatedlogs' if self.cumulated else 'logs'}")
+        if response is None:
+            return []
+        self.finished = terminal
+        return self.new_lines(response, terminal)
+
+    def new_lines(self, response: Response, terminal: bool) -> list[tuple[str, str]]:
+        if self.cumulated:
+            content = response.json() if "json" in response.headers.get("content-type", "") else response.text
+            texts = {"": content if isinstance(content, str) else str(content)}
+        else:
+            containers = response.json().get("containers") or {}
+            texts = {name: container.get("textLog") or "" for name, container in containers.items()}
+        lines = []
+        for name, text in texts.items():
+            offset = self.offsets.get(name, 0)
+            # a line still being written is returned once complete
+            end = len(text) if terminal else text.rfind("\n") + 1
+            if end <= offset:
+                continue
+            lines += [(name, line) for line in text[offset:end].splitlines()]
+            self.offsets[name] = end
+        return lines
+
+
+def follow_runs(followers: dict[str, LogFollower],
+                emit: Callable[[str, str, str], None],
+                interval: float = 5,
+                timeout: float = 0) -> dict[str, Optional[str]]:
+    """
+    Poll scenario runs until they reach a terminal state, the runs are polled concurrently
+    :param followers: log followers by scenario run id
+    :param emit: called with the scenario run id, the container and the text of every new line
+    :param interval: seconds between two polls
+    :param timeout: maximum seconds to follow the runs, 0 to wait for their end
+    :return: last state of every scenario run
+    """
+    start = time.monotonic()
+    pending = dict(followers)
+    while pending:
+
+        async def poll_all():
+            return await asyncio.gather(*[follower.poll() for follower in pending.values()])
+
+        for (run_id, follower), lines in zip(list(pending.items()), ApiLoop.run(poll_all())):
+            for container, line in lines:
+                emit(run_id, container, line)
+            if follower.finished:
+                del pending[run_id]
+        if not pending:
+            break
+        if timeout and time.monotonic() - start > timeout:
+            logger.warning(f"Stopped following {', '.join(pending)} after {timeout}s")
+            break
+        time.sleep(interval)
+    return {run_id: follower.state for run_id, follower in followers.items()}
+
+
+def follow_logs(state: dict,
+                azure_token: str,
+                scenariorun_ids: list[str],
+                cumulated: bool = False,
+                interval: float = 5,
+                timeout: float = 0) -> CommandResponse:
+    """Stream the logs of scenario runs to stdout until they end, lines are prefixed by their container"""
+    followers = {
+        run_id:
+        LogFollower(ScenarioRunService(azure_token=azure_token,
+                                       state={
+                                           **state, "api": {
+                                               **state["api"], "scenariorun_id": run_id
+                                           }
+                                       }),
+                    cumulated=cumulated)
+        for run_id in scenariorun_ids
+    }
+
+    def emit(run_id: str, container: str, line: str):
+        prefix = "/".join([p for p in [run_id if len(followers) > 1 else "", container] if p])
+        echo(f"[{prefix}] {line}" if prefix else line)
+
+    states = follow_runs(followers, emit, interval=interval, timeout=timeout)
+    if any(s not in TERMINAL_STATES or s in FAILED_STATES for s in states.values()):
+        return CommandResponse.fail(data=states)
+    return CommandResponse.success(states)
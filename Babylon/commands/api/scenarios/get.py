@@ -9,6 +9,7 @@ from Babylon.utils.decorators import (
     injectcontext,
     retrieve_state,
     output_to_file,
+    read_only,
 )
 from Babylon.utils.response import CommandResponse
 
@@ -19,6 +20,7 @@ logger = getLogger("Babylon")
 @injectcontext()
 @pass_azure_token("csm_api")
 @output_to_file
+@read_only
 @retrieve_state
 @option("--organization-id", "organization_id", type=str)
 @option("--workspace-id", "workspace_id", type=str)
@@ -1,17 +1,19 @@
 from logging import getLogger
 
 from click import command, option
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from Babylon.commands.api.scenarios.services.scenario_api_svc import ScenarioService
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import (
     injectcontext,
     retrieve_state,
-    output_to_file,
+    output_to_stream,
+    read_only,
 )
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.listing import ItemFilter, list_response
 
 env = Environment()
 logger = getLogger("Babylon")
@@ -20,10 +22,11 @@ logger = getLogger("Babylon")
 @command()
 @injectcontext()
 @pass_azure_token("csm_api")
-@output_to_file
+@output_to_stream
 @option("--organization-id", "organization_id", type=str)
 @option("--workspace-id", "workspace_id", type=str)
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
 def get_all(
     state: Any,
@@ -31,6 +34,7 @@ def get_all(
     workspace_id: str,
     azure_token: str,
     filter: Optional[str],
+    sink: Optional[Callable[[Any], None]] = None,
 ) -> CommandResponse:
     """
     Get all scenarios in the workspace
@@ -43,7 +47,4 @@ def get_all(
     logger.info(f"Getting all scenarios from workspace {service_state['api']['workspace_id']}")
 
     scenario_service = ScenarioService(state=service_state, azure_token=azure_token)
-    response = scenario_service.get_all()
-    if response is None:
-        return CommandResponse.fail()
-    return CommandResponse.success(response.json(), verbose=True)
+    return list_response(scenario_service.iter_all(), sink, ItemFilter(filter))
@@ -10,6 +10,7 @@ from Babylon.utils.decorators import (
     injectcontext,
 )
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -25,6 +26,7 @@ env = Environment()
 @option("--organization-id", "organization_id", type=str)
 @option("--workspace-id", "workspace_id", type=str)
 @option("--scenario-id", "scenario_id", type=str)
+@read_only
 @retrieve_state
 def get(
     state: Any,
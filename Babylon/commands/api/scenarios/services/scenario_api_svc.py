@@ -7,7 +7,8 @@ from typing import Optional
 
 from Babylon.commands.api.scenarios.services.scenario_security_svc import ScenarioSecurityService
 from Babylon.utils.interactive import confirm_deletion
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.listing import DEFAULT_PAGE_SIZE, iter_pages
 
 logger = getLogger("Babylon")
 
@@ -21,6 +22,7 @@ class ScenarioService:
         self.organization_id = state["api"]["organization_id"]
         self.workspace_id = state["api"]["workspace_id"]
         self.azure_token = azure_token
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
 
         if not self.url:
             logger.error("API url not found")
@@ -33,13 +35,19 @@ class ScenarioService:
             sys.exit(1)
 
     def get_all(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios",
-            self.azure_token,
-        )
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios")
         return response
 
+    def iter_all(self, size: int = DEFAULT_PAGE_SIZE):
+        """Iterate over all items, page by page"""
+        return iter_pages(
+            lambda page, size: self.api.sync.request(
+                "GET",
+                f"/organizations/{self.organization_id}/workspaces/{self.workspace_id}/scenarios",
+                params=dict(page=page, size=size)), size)
+
     def get(self):
         scenario_id = self.state["api"]["scenario_id"]
 
@@ -47,11 +55,9 @@ class ScenarioService:
             logger.error("scenario_id is missing")
             sys.exit(1)
 
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{scenario_id}",
-            self.azure_token,
-        )
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios/{scenario_id}")
         return response
 
     def update(self):
@@ -62,24 +68,16 @@ class ScenarioService:
             sys.exit(1)
 
         details = self.spec["payload"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{scenario_id}",
-            self.azure_token,
-            type="PATCH",
-            data=details,
-        )
+        response = self.api.sync.request("PATCH", f"/organizations/{self.organization_id}/workspaces/"
+                                         f"{self.workspace_id}/scenarios/{scenario_id}",
+                                         data=details)
         return response
 
     def create(self):
         details = self.spec["payload"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/workspaces/"
+                                         f"{self.workspace_id}/scenarios",
+                                         data=details)
         return response
 
     def delete(self, force_validation: bool):
@@ -92,12 +90,9 @@ class ScenarioService:
         if not force_validation and not confirm_deletion("solution", scenario_id):
             return None
 
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{scenario_id}",
-            self.azure_token,
-            type="DELETE",
-        )
+        response = self.api.sync.request(
+            "DELETE", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios/{scenario_id}")
         return response
 
     def run(self):
@@ -107,12 +102,9 @@ class ScenarioService:
             logger.error("scenario_id is missing")
             sys.exit(1)
 
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{scenario_id}/run",
-            self.azure_token,
-            type="POST",
-        )
+        response = self.api.sync.request(
+            "POST", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios/{scenario_id}/run")
         return response
 
     def update_security(self, old_security: dict):
@@ -1,7 +1,7 @@
 import sys
 from logging import getLogger
 
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
 
 logger = getLogger("Babylon")
 
@@ -12,6 +12,7 @@ class ScenarioSecurityService:
         self.state = state
         self.azure_token = azure_token
         self.url = self.state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         if not self.url:
             logger.error("API url not found")
             sys.exit(1)
@@ -29,56 +30,37 @@ class ScenarioSecurityService:
             sys.exit(1)
 
     def get(self, id: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access/{id}",
-            self.azure_token,
-        )
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access/{id}")
         return response
 
     def get_all(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{self.scenario_id}/security",
-            self.azure_token,
-        )
+        response = self.api.sync.request(
+            "GET", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios/{self.scenario_id}/security")
         return response
 
     def add(self, details: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/workspaces/"
+                                         f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access",
+                                         data=details)
         return response
 
     def update(self, id: str, details: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access/{id}",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/workspaces/"
+                                         f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access/{id}",
+                                         data=details)
         return response
 
     def delete(self, id: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access/{id}",
-            self.azure_token,
-            type="DELETE",
-        )
+        response = self.api.sync.request(
+            "DELETE", f"/organizations/{self.organization_id}/workspaces/"
+            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/access/{id}")
         return response
 
     def set_default(self, details: str):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/"
-            f"{self.workspace_id}/scenarios/{self.scenario_id}/security/default",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/workspaces/"
+                                         f"{self.workspace_id}/scenarios/{self.scenario_id}/security/default",
+                                         data=details)
         return response
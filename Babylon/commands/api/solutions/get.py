@@ -7,6 +7,7 @@ from Babylon.commands.api.solutions.services.solutions_api_svc import SolutionSe
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import output_to_file
 from Babylon.utils.decorators import injectcontext, retrieve_state
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -20,6 +21,7 @@ env = Environment()
 @pass_azure_token("csm_api")
 @option("--organization-id", "organization_id", type=str)
 @option("--solution-id", "solution_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, organization_id: str, solution_id: str) -> CommandResponse:
     """
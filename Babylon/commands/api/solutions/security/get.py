@@ -4,6 +4,7 @@ from click import command
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import retrieve_state, injectcontext
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.commands.api.solutions.services.solutions_security_svc import SolutionSecurityService
 
@@ -13,6 +14,7 @@ from Babylon.commands.api.solutions.services.solutions_security_svc import Solut
 @output_to_file
 @pass_azure_token("csm_api")
 @argument("identity_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, identity_id: str) -> CommandResponse:
     """
@@ -3,6 +3,7 @@ from Babylon.utils.decorators import injectcontext
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import output_to_file, retrieve_state
+from Babylon.utils.decorators import read_only
 from Babylon.commands.api.solutions.services.solutions_security_svc import SolutionSecurityService
 
 
@@ -10,6 +11,7 @@ from Babylon.commands.api.solutions.services.solutions_security_svc import Solut
 @injectcontext()
 @pass_azure_token("csm_api")
 @output_to_file
+@read_only
 @retrieve_state
 def get_users(state: dict, azure_token: str) -> CommandResponse:
     """
@@ -6,7 +6,8 @@ from typing import Optional
 from Babylon.commands.api.solutions.services.solutions_security_svc import SolutionSecurityService
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.listing import DEFAULT_PAGE_SIZE, iter_pages
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -19,6 +20,7 @@ class SolutionService:
         self.spec = spec
         self.azure_token = azure_token
         self.url = self.state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         self.organization_id = self.state["api"]["organization_id"]
         self.solution_id = self.state["api"]["solution_id"]
         if not self.organization_id:
@@ -27,49 +29,38 @@ class SolutionService:
 
     def create(self):
         details = self.spec["payload"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/solutions",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/solutions", data=details)
         return response
 
     def delete(self, force_validation: bool):
         check_if_solution_exists(self.solution_id)
         if not force_validation and not confirm_deletion("solution", self.solution_id):
             return None
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/solutions/{self.solution_id}",
-            self.azure_token,
-            "DELETE",
-        )
+        response = self.api.sync.request("DELETE",
+                                         f"/organizations/{self.organization_id}/solutions/{self.solution_id}")
         return response
 
     def get(self):
         check_if_solution_exists(self.solution_id)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/solutions/{self.solution_id}",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/solutions/{self.solution_id}")
         return response
 
     def get_all(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/solutions",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/solutions")
         return response
 
+    def iter_all(self, size: int = DEFAULT_PAGE_SIZE):
+        """Iterate over all items, page by page"""
+        return iter_pages(
+            lambda page, size: self.api.sync.request(
+                "GET", f"/organizations/{self.organization_id}/solutions", params=dict(page=page, size=size)), size)
+
     def update(self):
         check_if_solution_exists(self.solution_id)
         details = self.spec["payload"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/solutions/{self.solution_id}",
-            self.azure_token,
-            "PATCH",
-            data=details,
-        )
+        response = self.api.sync.request("PATCH",
+                                         f"/organizations/{self.organization_id}/solutions/{self.solution_id}",
+                                         data=details)
         return response
 
     def update_security(self, old_security: dict):
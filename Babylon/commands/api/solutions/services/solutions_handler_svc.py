@@ -6,7 +6,8 @@ from logging import getLogger
 from pathlib import Path
 from posixpath import basename
 from Babylon.utils.environment import Environment
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.tracing import span
 
 logger = getLogger("Babylon")
 env = Environment()
@@ -19,6 +20,7 @@ class SolutionHandleService:
         self.azure_token = azure_token
         self.account_secret = env.get_platform_secret(platform=env.environ_id, resource="storage", name="account")
         self.url = state["api"].get("url")
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         if not self.url:
             logger.error("url api is missing")
             sys.exit(1)
@@ -48,11 +50,7 @@ class SolutionHandleService:
         logger.info("[api] successfully downloaded handler file")
 
     def upload(self, run_template_id: str, handler_id: str, handler_path: Path, override: bool):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/solutions/{self.solution_id}",
-            self.azure_token,
-            type="GET",
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/solutions/{self.solution_id}")
         solution = response.json()
         run_templates = list(map(lambda x: x["id"], solution["runTemplates"]))
         if run_template_id not in run_templates:
@@ -71,7 +69,9 @@ class SolutionHandleService:
         )
         if override and client.exists():
             client.delete_blob()
-        with open(handler_path, "rb") as data:
+        with open(handler_path, "rb") as data, span("blob.upload",
+                                                    artifact="handler",
+                                                    bytes=os.path.getsize(handler_path)):
             client.upload_blob(data)
         logger.info(
             f"[azure] successfully sent handler '{handler_id}' to '{run_template_id}' in solution '{self.solution_id}'")
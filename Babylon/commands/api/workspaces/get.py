@@ -9,6 +9,7 @@ from Babylon.utils.decorators import (
     retrieve_state,
 )
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.environment import Environment
 
@@ -22,6 +23,7 @@ env = Environment()
 @pass_azure_token("csm_api")
 @option("--organization-id", type=str)
 @option("--workspace-id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, organization_id: str, azure_token: str, workspace_id: str) -> CommandResponse:
     """
@@ -1,6 +1,5 @@
-import jmespath
 from logging import getLogger
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from click import command
 from click import option
 
@@ -10,7 +9,9 @@ from Babylon.utils.decorators import (
     retrieve_state,
 )
 from Babylon.utils.response import CommandResponse
-from Babylon.utils.decorators import output_to_file
+from Babylon.utils.listing import ItemFilter, list_response
+from Babylon.utils.decorators import output_to_stream
+from Babylon.utils.decorators import read_only
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
 
@@ -20,22 +21,21 @@ env = Environment()
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_azure_token("csm_api")
 @option("--organization-id", type=str)
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
-def get_all(state: Any, organization_id: str, azure_token: str, filter: Optional[str] = None) -> CommandResponse:
+def get_all(state: Any,
+            organization_id: str,
+            azure_token: str,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all workspaces details
     """
     service_state = state["services"]
     service_state["api"]["organization_id"] = (organization_id or state["services"]["api"]["organization_id"])
     workspace_service = WorkspaceService(state=service_state, azure_token=azure_token)
-    response = workspace_service.get_all()
-    if response is None:
-        return CommandResponse.fail()
-    workspaces = response.json()
-    if len(workspaces) and filter:
-        workspaces = jmespath.search(filter, workspaces)
-    return CommandResponse.success(workspaces, verbose=True)
+    return list_response(workspace_service.iter_all(), sink, ItemFilter(filter))
@@ -8,7 +8,8 @@ from Babylon.commands.api.workspaces.services.workspaces_security_svc import (
     ApiWorkspaceSecurityService, )
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
-from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.listing import DEFAULT_PAGE_SIZE, iter_pages
 
 logger = getLogger("Babylon")
 env = Environment()
@@ -21,6 +22,7 @@ class WorkspaceService:
         self.state = state
         self.azure_token = azure_token
         self.url = state["api"]["url"]
+        self.api = CosmoTechApiClient(url=self.url, azure_token=self.azure_token)
         if not self.url:
             logger.error("API url not found")
             sys.exit(1)
@@ -30,31 +32,26 @@ class WorkspaceService:
             sys.exit(1)
 
     def get_all(self):
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/workspaces")
         return response
 
+    def iter_all(self, size: int = DEFAULT_PAGE_SIZE):
+        """Iterate over all items, page by page"""
+        return iter_pages(
+            lambda page, size: self.api.sync.request(
+                "GET", f"/organizations/{self.organization_id}/workspaces", params=dict(page=page, size=size)), size)
+
     def get(self):
         workspace_id = self.state["api"]["workspace_id"]
         if not workspace_id:
             logger.error("workspace id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/{workspace_id}",
-            self.azure_token,
-        )
+        response = self.api.sync.request("GET", f"/organizations/{self.organization_id}/workspaces/{workspace_id}")
         return response
 
     def create(self):
         details = self.spec["payload"]
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces",
-            self.azure_token,
-            type="POST",
-            data=details,
-        )
+        response = self.api.sync.request("POST", f"/organizations/{self.organization_id}/workspaces", data=details)
         return response
 
     def update(self):
@@ -63,12 +60,9 @@ class WorkspaceService:
         if not workspace_id:
             logger.error("workspace id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/{workspace_id}",
-            self.azure_token,
-            type="PATCH",
-            data=details,
-        )
+        response = self.api.sync.request("PATCH",
+                                         f"/organizations/{self.organization_id}/workspaces/{workspace_id}",
+                                         data=details)
         return response
 
     def delete(self, force_validation: bool):
@@ -79,11 +73,7 @@ class WorkspaceService:
         if not force_validation and not confirm_deletion("workspace", workspace_id):
             return None
 
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/{workspace_id}",
-            self.azure_token,
-            type="DELETE",
-        )
+        response = self.api.sync.request("DELETE", f"/organizations/{self.organization_id}/workspaces/{workspace_id}")
         return response
 
     def send_key(self, workspace_id: str, workspace_key: str):
@@ -102,12 +92,9 @@ class WorkspaceService:
         if not workspace_id:
             logger.error("[api] workspace id not found")
             sys.exit(1)
-        response = oauth_request(
-            f"{self.url}/organizations/{self.organization_id}/workspaces/{workspace_id}/secret",
-            self.azure_token,
-            type="POST",
-            data=details_json,
-        )
+        response = self.api.sync.request("POST",
+                                         f"/organizations/{self.organization_id}/workspaces/{workspace_id}/secret",
+                                         data=details_json)
         return response
 
     def update_security(self, old_security: dict):
@@ -1,11 +1,12 @@
 from click import group
-from Babylon.utils.decorators import requires_external_program
+from .copy import copy
 from .delete import delete
 from .list import list
 from .pull import pull
 from .push import push
 
 list_commands = [
+    copy,
     delete,
     list,
     push,
@@ -14,7 +15,6 @@ list_commands = [
 
 
 @group()
-@requires_external_program("docker")
 def acr():
     """Azure Container Registry"""
 
@@ -0,0 +1,45 @@
+import logging
+
+from click import IntRange, argument, command, option
+from typing import Any, Optional
+from Babylon.utils.decorators import injectcontext
+from Babylon.utils.environment import Environment
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.decorators import retrieve_state
+from Babylon.utils.oci import DEFAULT_MAX_WORKERS
+from Babylon.commands.azure.acr.services.acr_api_svc import AzureContainerRegistryService
+
+logger = logging.getLogger("Babylon")
+env = Environment()
+
+
+@command()
+@injectcontext()
+@argument("source_image", type=str)
+@argument("destination_image", type=str, required=False)
+@option("--from", "source_server", type=str, help="Source registry, example dev.azurecr.io")
+@option("--to", "destination_server", type=str, help="Destination registry, example prod.azurecr.io")
+@option("--max-workers",
+        "max_workers",
+        type=IntRange(min=1),
+        default=DEFAULT_MAX_WORKERS,
+        show_default=True,
+        help="Number of layers transferred concurrently")
+@retrieve_state
+def copy(state: Any,
+         source_image: str,
+         destination_image: Optional[str] = None,
+         source_server: Optional[str] = None,
+         destination_server: Optional[str] = None,
+         max_workers: int = DEFAULT_MAX_WORKERS) -> CommandResponse:
+    """
+    Copy a docker image between registries without docker, example simulator:1.0.0 --from dev.azurecr.io
+    """
+    service_state = state['services']
+    service = AzureContainerRegistryService(state=service_state)
+    response = service.copy(source_image=source_image,
+                            destination_image=destination_image,
+                            source_server=source_server,
+                            destination_server=destination_server,
+                            max_workers=max_workers)
+    return response or CommandResponse.success()
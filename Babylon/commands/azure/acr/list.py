@@ -1,20 +1,62 @@
+import re
+
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
-from click import argument, command
+from click import BadParameter, IntRange, argument, command, option
 from Babylon.utils.decorators import injectcontext
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.decorators import retrieve_state
-from Babylon.commands.azure.acr.services.acr_api_svc import AzureContainerRegistryService
+from Babylon.commands.azure.acr.services.acr_api_svc import (DEFAULT_MAX_WORKERS, DEFAULT_PAGE_SIZE,
+                                                             AzureContainerRegistryService)
+
+DURATION = re.compile(r"^(?P<value>\d+)(?P<unit>[mhdw])$")
+UNITS = dict(m="minutes", h="hours", d="days", w="weeks")
+
+
+def parse_since(ctx: Any, param: Any, value: Optional[str]) -> Optional[datetime]:
+    """Date of `--since`, either a duration before now like `7d` or an ISO date, UTC when not given"""
+    if not value:
+        return None
+    match = DURATION.match(value)
+    if match:
+        return datetime.now(timezone.utc) - timedelta(**{UNITS[match.group("unit")]: int(match.group("value"))})
+    try:
+        date = datetime.fromisoformat(value)
+    except ValueError:
+        raise BadParameter(f"{value} is neither a duration like 7d nor an ISO date")
+    return date if date.tzinfo else date.replace(tzinfo=timezone.utc)
 
 
 @command()
 @injectcontext()
 @argument("server", type=str, required=False)
+@option("--since",
+        "since",
+        callback=parse_since,
+        help="Only tags updated since this date, an ISO date or a duration like 30m, 12h, 7d or 2w")
+@option("--top", "top", type=IntRange(min=1), help="Only the N most recently updated tags of each repository")
+@option("--max-workers",
+        "max_workers",
+        type=IntRange(min=1),
+        default=DEFAULT_MAX_WORKERS,
+        show_default=True,
+        help="Number of repositories listed concurrently")
+@option("--page-size",
+        "page_size",
+        type=IntRange(min=1),
+        default=DEFAULT_PAGE_SIZE,
+        show_default=True,
+        help="Number of items requested to the registry by page")
 @retrieve_state
-def list(state: Any, server: Optional[str] = None) -> CommandResponse:
+def list(state: Any,
+         server: Optional[str] = None,
+         since: Optional[datetime] = None,
+         top: Optional[int] = None,
+         max_workers: int = DEFAULT_MAX_WORKERS,
+         page_size: int = DEFAULT_PAGE_SIZE) -> CommandResponse:
     """
     List all docker images in the specified registry
     """
     service_state = state['services']
     service = AzureContainerRegistryService(state=service_state)
-    service.list(server=server)
-    return CommandResponse.success()
+    return service.list(server=server, since=since, top=top, max_workers=max_workers, page_size=page_size)
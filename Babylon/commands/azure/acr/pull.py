@@ -1,7 +1,9 @@
 import logging
+import pathlib
 
 from click import option
 from click import command
+from click import Path as click_path
 from typing import Any, Optional
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
@@ -16,12 +18,16 @@ env = Environment()
 @command()
 @injectcontext()
 @option("--image", type=str, help="Remote docker image to pull, example hello-world:latest")
+@option("--oci-layout",
+        "layout",
+        type=click_path(path_type=pathlib.Path, file_okay=False),
+        help="Pull to this OCI image layout directory, without docker")
 @retrieve_state
-def pull(state: Any, image: Optional[str] = None) -> CommandResponse:
+def pull(state: Any, image: Optional[str] = None, layout: Optional[pathlib.Path] = None) -> CommandResponse:
     """
     Pulls a docker image from the ACR registry
     """
     service_state = state['services']
     service = AzureContainerRegistryService(state=service_state)
-    service.pull(image_tag=image)
+    service.pull(image_tag=image, layout=layout)
     return CommandResponse.success()
@@ -1,7 +1,9 @@
 import logging
+import pathlib
 
 from click import option
 from click import command
+from click import Path as click_path
 from typing import Any, Optional
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
@@ -16,15 +18,20 @@ env = Environment()
 @command()
 @injectcontext()
 @option("--image", type=str, help="Local docker image to push")
+@option("--oci-layout",
+        "layout",
+        type=click_path(path_type=pathlib.Path, file_okay=False, exists=True),
+        help="Push from this OCI image layout directory, without docker")
 @retrieve_state
 def push(
     state: Any,
     image: Optional[str],
+    layout: Optional[pathlib.Path] = None,
 ) -> CommandResponse:
     """
     Push a docker image to the ACR registry
     """
     service_state = state['services']
     service = AzureContainerRegistryService(state=service_state)
-    service.push(image_tag=image)
+    service.push(image_tag=image, layout=layout)
     return CommandResponse.success()
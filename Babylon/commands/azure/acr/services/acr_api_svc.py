@@ -1,6 +1,13 @@
 import docker
 import logging
 
+from pathlib import Path
+from datetime import datetime
+from requests.exceptions import RequestException
+from queue import SimpleQueue
+from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from azure.containerregistry import ArtifactTagOrder, ContainerRegistryClient
 from azure.core.exceptions import HttpResponseError
 from azure.core.exceptions import ResourceNotFoundError
 from azure.core.exceptions import ServiceRequestError
@@ -8,38 +15,102 @@ from Babylon.utils.response import CommandResponse
 from Babylon.utils.environment import Environment
 from Babylon.utils.clients import get_registry_client
 from Babylon.utils.clients import get_docker_client
+from Babylon.utils.clients import get_oci_registry
+from Babylon.utils.oci import DEFAULT_MAX_WORKERS as DEFAULT_OCI_WORKERS
+from Babylon.utils.oci import OciError, copy_image, pull_layout, push_layout
+from Babylon.utils.tracing import span
 
 logger = logging.getLogger("Babylon")
 env = Environment()
 
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PAGE_SIZE = 100
+
 
 class AzureContainerRegistryService:
 
     def __init__(self, state: dict = None) -> None:
         self.state = state
 
-    def list(self, server: str = None):
+    def list(self,
+             server: str = None,
+             since: Optional[datetime] = None,
+             top: Optional[int] = None,
+             max_workers: int = DEFAULT_MAX_WORKERS,
+             page_size: int = DEFAULT_PAGE_SIZE) -> CommandResponse:
+        """List the tags of every repository, each repository is printed as soon as its tags are listed
+
+        :param since: only the tags updated since this date
+        :param top: only the `top` most recently updated tags of each repository
+        :param max_workers: number of repositories listed concurrently
+        :param page_size: number of items of each page requested to the registry
+        :return: tags by repository, most recent first
+        """
         acr_login_server = server or self.state['acr']['login_server']
         cr_client = get_registry_client(acr_login_server)
         logger.info(f"Getting repositories stored in registry {acr_login_server}")
-        try:
-            repos = [repo for repo in cr_client.list_repository_names()]
-        except ServiceRequestError:
-            logger.error(f"Could not list from registry {acr_login_server}")
-            return CommandResponse.fail()
-        _ret: list[str] = [f"Respositories from {acr_login_server}:"]
-        for repo in repos:
-            props = cr_client.list_tag_properties(repository=repo)
-            tags = [p.name for p in props]
-            tags.sort(reverse=True)
-            _ret.append(f" • {repo}: {tags}")
-        logger.info("\n".join(_ret))
+        logger.info(f"Respositories from {acr_login_server}:")
+        tags: dict[str, list[str]] = dict()
+        completed: SimpleQueue[Future] = SimpleQueue()
+
+        def collect(count: int) -> int:
+            """Print `count` listed repositories, waiting for them, returns the number printed"""
+            for _ in range(count):
+                repo, repo_tags = completed.get().result()
+                tags[repo] = repo_tags
+                logger.info(f" • {repo}: {repo_tags}")
+            return count
 
-    def pull(self, image_tag: str):
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            submitted = printed = 0
+            try:
+                # the tags of the first repositories are printed while the next pages of names are received
+                for repo in cr_client.list_repository_names(results_per_page=page_size):
+                    future = executor.submit(self.list_tags, cr_client, repo, since, top, page_size)
+                    future.add_done_callback(completed.put)
+                    submitted += 1
+                    printed += collect(completed.qsize())
+            except (ServiceRequestError, HttpResponseError):
+                logger.error(f"Could not list from registry {acr_login_server}")
+                return CommandResponse.fail()
+            collect(submitted - printed)
+        return CommandResponse.success(tags)
+
+    def list_tags(self, cr_client: ContainerRegistryClient, repository: str, since: Optional[datetime],
+                  top: Optional[int], page_size: int) -> tuple[str, List[str]]:
+        """Tags of a repository, most recently updated first"""
+        properties = []
+        with span("acr.list_tags", repository=repository) as attributes:
+            try:
+                # the registry returns the newest first, the listing stops at the first tag too old or past `top`
+                for p in cr_client.list_tag_properties(repository=repository,
+                                                       order_by=ArtifactTagOrder.LAST_UPDATED_ON_DESCENDING,
+                                                       results_per_page=min(page_size, top or page_size)):
+                    if since and p.last_updated_on < since:
+                        break
+                    properties.append(p)
+                    if top and len(properties) >= top:
+                        break
+            except (ServiceRequestError, HttpResponseError) as e:
+                logger.error(f"Could not list tags of repository {repository}: {e}")
+            attributes["tags"] = len(properties)
+        properties.sort(key=lambda p: p.last_updated_on, reverse=True)
+        return repository, [p.name for p in properties]
+
+    def pull(self, image_tag: str, layout: Optional[Path] = None):
         registry_server = self.state['acr']['login_server']
         simulator_repository = self.state['acr']['simulator_repository']
         simulator_version = self.state['acr']['simulator_version']
         image = image_tag or f"{simulator_repository}:{simulator_version}"
+        if layout:
+            logger.info(f"Pulling remote image {image} from registry {registry_server} to {layout}")
+            try:
+                stats = pull_layout(get_oci_registry(registry_server), image, layout)
+            except (OciError, RequestException) as e:
+                logger.error(f"Could not pull image {image} from registry {registry_server}: {e}")
+                return CommandResponse.fail()
+            logger.info(f"Successfully pulled image {image} from registry {registry_server}: {stats}")
+            return
         client = get_docker_client(registry=registry_server)
         if not client:
             return CommandResponse.fail()
@@ -61,11 +132,20 @@ class AzureContainerRegistryService:
             logger.error(str(e))
         logger.info(f"Successfully pulled image {image} from registry {registry_server}")
 
-    def push(self, image_tag: str):
+    def push(self, image_tag: str, layout: Optional[Path] = None):
         registry_server = self.state['acr']['login_server']
         simulator_repository = self.state['acr']['simulator_repository']
         simulator_version = self.state['acr']['simulator_version']
         image: str = image_tag or f"{simulator_repository}:{simulator_version}"
+        if layout:
+            logger.info(f"Pushing image {image} from {layout} to registry {registry_server}")
+            try:
+                stats = push_layout(layout, get_oci_registry(registry_server), image)
+            except (OciError, RequestException) as e:
+                logger.error(f"Could not push image {image} to registry {registry_server}: {e}")
+                return CommandResponse.fail()
+            logger.info(f"Successfully pushed image {image} to registry {registry_server}: {stats}")
+            return
         client = get_docker_client(registry_server)
         if not client:
             return CommandResponse.fail()
@@ -92,6 +172,26 @@ class AzureContainerRegistryService:
         client.images.remove(ref)
         logger.info(f"Successfully pushed image {image} to registry {registry_server}")
 
+    def copy(self,
+             source_image: str,
+             destination_image: Optional[str] = None,
+             source_server: Optional[str] = None,
+             destination_server: Optional[str] = None,
+             max_workers: int = DEFAULT_OCI_WORKERS):
+        """Copy an image from registry to registry, the layers go from one registry to the other without docker"""
+        source_server = source_server or self.state['acr']['login_server']
+        destination_server = destination_server or self.state['acr']['login_server']
+        destination_image = destination_image or source_image
+        source = get_oci_registry(source_server)
+        destination = source if destination_server == source_server else get_oci_registry(destination_server)
+        logger.info(f"Copying image {source_server}/{source_image} to {destination_server}/{destination_image}")
+        try:
+            stats = copy_image(source, source_image, destination, destination_image, max_workers=max_workers)
+        except (OciError, RequestException) as e:
+            logger.error(f"Could not copy image {source_image}: {e}")
+            return CommandResponse.fail()
+        logger.info(f"Successfully copied image {source_image} to {destination_server}/{destination_image}: {stats}")
+
     def delete(self, image_tag: str):
         registry_server = self.state['acr']['login_server']
         simulator_repository = self.state['acr']['simulator_repository']
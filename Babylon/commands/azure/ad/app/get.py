@@ -8,6 +8,7 @@ from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import output_to_file, retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.commands.azure.ad.services.ad_app_svc import AzureDirectoyAppService
 
 logger = logging.getLogger("Babylon")
@@ -19,6 +20,7 @@ env = Environment()
 @output_to_file
 @pass_azure_token("graph")
 @argument("object_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, object_id: str) -> CommandResponse:
     """
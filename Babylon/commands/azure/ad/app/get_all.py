@@ -7,6 +7,7 @@ from Babylon.commands.azure.ad.services.ad_app_svc import AzureDirectoyAppServic
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import output_to_file, retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 
 logger = logging.getLogger("Babylon")
 
@@ -16,6 +17,7 @@ logger = logging.getLogger("Babylon")
 @output_to_file
 @pass_azure_token("graph")
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
 def get_all(state: Any, azure_token: str, filter: Optional[str] = None) -> CommandResponse:
     """
@@ -1,10 +1,12 @@
 from click import group
 from .instance import instance
 from .model import model
+from .twins import twins
 
 list_groups = [
     model,
     instance,
+    twins,
 ]
 
 
@@ -6,6 +6,7 @@ from azure.core.exceptions import HttpResponseError
 from azure.mgmt.digitaltwins import AzureDigitalTwinsManagementClient
 from Babylon.utils.decorators import injectcontext, retrieve_state
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.environment import Environment
 from Babylon.utils.clients import pass_adt_management_client
@@ -19,6 +20,7 @@ env = Environment()
 @output_to_file
 @pass_adt_management_client
 @argument("name", type=str)
+@read_only
 @retrieve_state
 def get(state: dict, adt_management_client: AzureDigitalTwinsManagementClient, name: str) -> CommandResponse:
     """
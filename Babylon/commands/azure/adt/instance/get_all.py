@@ -1,12 +1,12 @@
 import logging
-import jmespath
 
 from click import command
 from click import option
-from typing import Optional
-from azure.core.exceptions import HttpResponseError
+from typing import Any, Callable, Optional
 from azure.mgmt.digitaltwins import AzureDigitalTwinsManagementClient
-from Babylon.utils.decorators import output_to_file, injectcontext, retrieve_state
+from Babylon.utils.decorators import output_to_stream, injectcontext, retrieve_state
+from Babylon.utils.decorators import read_only
+from Babylon.utils.listing import ItemFilter, iter_sdk, list_response
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.environment import Environment
 from Babylon.utils.clients import pass_adt_management_client
@@ -17,26 +17,18 @@ env = Environment()
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_adt_management_client
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
-def get_all(
-    state: dict,
-    adt_management_client: AzureDigitalTwinsManagementClient,
-    filter: Optional[str] = None,
-) -> CommandResponse:
+def get_all(state: dict,
+            adt_management_client: AzureDigitalTwinsManagementClient,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all azure digital twins instances
     """
     resource_group_name = state['services']['azure']['resource_group_name']
-    try:
-        instances = adt_management_client.digital_twins.list_by_resource_group(resource_group_name)
-    except HttpResponseError as _http_error:
-        error_message = _http_error.message.split("\n")
-        logger.error(f"Cannot retrieve ADT instances list : {error_message[0]}")
-        return CommandResponse.fail()
-    instances = [_ele.as_dict() for _ele in instances]
-    if len(instances) and filter:
-        instances = jmespath.search(filter, instances)
-    return CommandResponse.success(instances, verbose=True)
+    instances = adt_management_client.digital_twins.list_by_resource_group(resource_group_name)
+    return list_response(iter_sdk(instances, lambda i: i.as_dict(), "ADT instances"), sink, ItemFilter(filter))
@@ -1,12 +1,12 @@
 import logging
-import jmespath
 
-from typing import Optional
+from typing import Any, Callable, Optional
 from azure.digitaltwins.core import DigitalTwinsClient
 from click import command
 from click import option
 from Babylon.utils.decorators import injectcontext
-from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import output_to_stream
+from Babylon.utils.listing import ItemFilter, iter_sdk, list_response
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.clients import pass_adt_client
 
@@ -15,15 +15,14 @@ logger = logging.getLogger("Babylon")
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_adt_client
 @option("--filter", "filter", help="Filter response with a jmespath query")
-def get_all(adt_client: DigitalTwinsClient, filter: Optional[str] = None) -> CommandResponse:
+def get_all(adt_client: DigitalTwinsClient,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all models id from ADT
     """
     models = adt_client.list_models(include_model_definition=True)
-    output_data = [model.as_dict() for model in models]
-    if len(output_data) and filter:
-        output_data = jmespath.search(filter, output_data)
-    return CommandResponse.success(output_data, verbose=True)
+    return list_response(iter_sdk(models, lambda m: m.as_dict(), "ADT models"), sink, ItemFilter(filter))
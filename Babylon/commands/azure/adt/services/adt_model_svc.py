@@ -0,0 +1,143 @@
+import json
+import logging
+import pathlib
+
+from typing import Any, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import ResourceNotFoundError
+from azure.digitaltwins.core import DigitalTwinsClient
+
+logger = logging.getLogger("Babylon")
+
+# maximum number of models accepted by a single create_models call
+MAX_MODELS_PER_CALL = 250
+
+
+def as_list(value: Any) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def model_dependencies(model: dict) -> set[str]:
+    """Ids of the interfaces a model extends or uses as component schema"""
+    deps = set(d for d in as_list(model.get("extends")) if isinstance(d, str))
+    for content in as_list(model.get("contents")):
+        if "Component" in as_list(content.get("@type")) and isinstance(content.get("schema"), str):
+            deps.add(content["schema"])
+    return deps
+
+
+def topological_sort(graph: dict[str, set[str]]) -> list[str]:
+    """Sort model ids so that every model comes after its dependencies
+
+    :param graph: dependencies by model id, dependencies outside the graph are ignored
+    :return: sorted model ids
+    """
+    remaining = {k: set(d for d in v if d in graph and d != k) for k, v in graph.items()}
+    ordered: list[str] = []
+    while remaining:
+        ready = sorted(k for k, v in remaining.items() if not v)
+        if not ready:
+            raise ValueError(f"Circular model dependencies between {', '.join(sorted(remaining))}")
+        ordered += ready
+        for k in ready:
+            del remaining[k]
+        for v in remaining.values():
+            v.difference_update(ready)
+    return ordered
+
+
+def normalize(model: dict) -> str:
+    return json.dumps(model, sort_keys=True, separators=(",", ":"))
+
+
+class AdtModelService:
+
+    def __init__(self, adt_client: DigitalTwinsClient, max_workers: int = 8) -> None:
+        self.adt_client = adt_client
+        self.max_workers = max(1, max_workers)
+
+    def load_folder(self, model_folder: pathlib.Path) -> dict[str, dict]:
+        """Parse all json files of a folder, a file can contain one model or a list of models"""
+        models: dict[str, dict] = dict()
+        for model_file in sorted(model_folder.glob("*.json")):
+            with open(model_file, "r") as file:
+                content = json.load(file)
+            for model in as_list(content):
+                if not isinstance(model, dict) or "@id" not in model:
+                    logger.error(f"Model in {model_file} is missing `@id`")
+                    continue
+                models[model["@id"]] = model
+        return models
+
+    def list_remote(self) -> dict[str, dict]:
+        remote = self.adt_client.list_models(include_model_definition=True)
+        return {m.id: m.model for m in remote}
+
+    def delete_models(self, model_ids: Iterable[str], graph: dict[str, set[str]]):
+        """Delete models, dependents first, each level of the dependency graph concurrently"""
+        to_delete = set(model_ids)
+        levels: list[list[str]] = []
+        remaining = {k: set(d for d in graph.get(k, set()) if d in to_delete) for k in to_delete}
+        while remaining:
+            dependencies = set(d for v in remaining.values() for d in v)
+            level = sorted(k for k in remaining if k not in dependencies)
+            if not level:
+                raise ValueError("Circular model dependencies")
+            levels.append(level)
+            for k in level:
+                del remaining[k]
+
+        def delete(model_id: str):
+            logger.info(f"Deleting model {model_id}")
+            try:
+                self.adt_client.delete_model(model_id)
+            except ResourceNotFoundError:
+                pass
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for level in levels:
+                list(executor.map(delete, level))
+
+    def upload_models(self, models: list[dict]):
+        for start in range(0, len(models), MAX_MODELS_PER_CALL):
+            batch = models[start:start + MAX_MODELS_PER_CALL]
+            logger.info(f"Uploading {len(batch)} models")
+            self.adt_client.create_models(batch)
+
+    def upload(self, models: dict[str, dict], override: bool = False) -> dict[str, list[str]]:
+        """Upload models skipping the ones already present with the same definition
+
+        Existing models can not be updated in place: with override, changed models and
+        every remote model depending on them are deleted and uploaded again
+        :param models: model definitions by id
+        :param override: replace existing models having a different definition
+        :return: model ids by outcome (uploaded, unchanged, conflicting)
+        """
+        remote = self.list_remote()
+        unchanged = [k for k, m in models.items() if k in remote and normalize(remote[k]) == normalize(m)]
+        changed = [k for k in models if k in remote and k not in unchanged]
+        if changed and not override:
+            logger.warning(f"{len(changed)} models already exist with another definition, use --override")
+        graph = {k: model_dependencies(m) for k, m in {**remote, **models}.items()}
+        to_replace = set(changed) if override else set()
+        dependents = {k: set() for k in graph}
+        for k, deps in graph.items():
+            for d in deps:
+                dependents.setdefault(d, set()).add(k)
+        stack = list(to_replace)
+        while stack:
+            for k in dependents.get(stack.pop(), set()):
+                if k in remote and k not in to_replace:
+                    to_replace.add(k)
+                    stack.append(k)
+        if to_replace:
+            self.delete_models(to_replace, graph)
+        to_upload = set(k for k in models if k not in remote) | to_replace
+        definitions = {k: models.get(k, remote.get(k)) for k in to_upload}
+        ordered = topological_sort({k: graph[k] for k in to_upload})
+        self.upload_models([definitions[k] for k in ordered])
+        return dict(uploaded=ordered,
+                    unchanged=sorted(set(unchanged) - to_replace),
+                    conflicting=[] if override else sorted(changed))
@@ -0,0 +1,338 @@
+import csv
+import json
+import time
+import logging
+import pathlib
+import tempfile
+import threading
+
+from uuid import uuid4
+from typing import Any, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor, Future
+from azure.core.exceptions import HttpResponseError
+from azure.digitaltwins.core import DigitalTwinsClient
+from azure.storage.blob import BlobServiceClient
+from Babylon.utils.request import oauth_request
+from Babylon.utils.tracing import span
+
+logger = logging.getLogger("Babylon")
+
+IMPORT_CONTAINER = "babylon-adt-import"
+IMPORT_API_VERSION = "2023-10-31"
+ID_COLUMNS = ["$dtId", "$id", "id"]
+SOURCE_COLUMNS = ["$sourceId", "source"]
+TARGET_COLUMNS = ["$targetId", "target"]
+NAME_COLUMNS = ["$relationshipName", "name"]
+RELATIONSHIP_ID_COLUMNS = ["$relationshipId"]
+MODEL_COLUMNS = ["$metadata.$model", "$model"]
+IMPORT_RUNNING = ["notstarted", "running", "cancelling"]
+
+
+def parse_boolean(value: str) -> bool:
+    if value.lower() not in ["true", "false"]:
+        raise ValueError(f"invalid boolean: {value}")
+    return value.lower() == "true"
+
+
+# DTDL schemas of typed csv columns `<Property>:<schema>`
+SCHEMAS = {
+    "string": str,
+    "boolean": parse_boolean,
+    "integer": int,
+    "long": int,
+    "float": float,
+    "double": float,
+    "object": json.loads,
+    "json": json.loads,
+}
+
+
+def first_of(row: dict, columns: list[str]) -> Optional[str]:
+    for c in columns:
+        if row.get(c):
+            return row[c]
+    return None
+
+
+def parse_column(column: str) -> tuple[str, str]:
+    """Split a csv header `<Property>:<schema>` in its property name and DTDL schema, string by default"""
+    name, _, schema = column.rpartition(":")
+    if name and schema in SCHEMAS:
+        return name, schema
+    return column, "string"
+
+
+def parse_value(value: str, schema: str = "string") -> Any:
+    """Convert a csv cell to the DTDL schema of its column, untyped cells stay strings"""
+    try:
+        return SCHEMAS[schema](value)
+    except ValueError as e:
+        raise ValueError(f"cannot read {value!r} as {schema}: {e}") from e
+
+
+def parse_properties(row: dict, reserved: list[str]) -> dict:
+    properties = {}
+    for column, value in row.items():
+        if column in reserved or value in (None, ""):
+            continue
+        name, schema = parse_column(column)
+        properties[name] = parse_value(value, schema)
+    return properties
+
+
+def is_relationship(columns: list[str]) -> bool:
+    return any(c in columns for c in SOURCE_COLUMNS) and any(c in columns for c in TARGET_COLUMNS)
+
+
+def csv_to_twin(row: dict, default_model: str) -> dict:
+    twin_id = first_of(row, ID_COLUMNS)
+    model = first_of(row, MODEL_COLUMNS) or default_model
+    reserved = ID_COLUMNS + MODEL_COLUMNS
+    twin = parse_properties(row, reserved)
+    return {"$dtId": twin_id, "$metadata": {"$model": model}, **twin}
+
+
+def csv_to_relationship(row: dict, default_name: str) -> dict:
+    source = first_of(row, SOURCE_COLUMNS)
+    target = first_of(row, TARGET_COLUMNS)
+    name = first_of(row, NAME_COLUMNS) or default_name
+    relationship_id = first_of(row, RELATIONSHIP_ID_COLUMNS) or f"{source}-{name}-{target}"
+    reserved = SOURCE_COLUMNS + TARGET_COLUMNS + NAME_COLUMNS + RELATIONSHIP_ID_COLUMNS
+    properties = parse_properties(row, reserved)
+    return {
+        "$dtId": source,
+        "$relationshipId": relationship_id,
+        "$targetId": target,
+        "$relationshipName": name,
+        **properties
+    }
+
+
+def read_dataset(source: pathlib.Path, model_prefix: str = "") -> tuple[list, list]:
+    """List the twin and relationship readers of a dataset
+
+    Csv files are read lazily: one file per twin type (named after the model) with an `id` column,
+    or one file per relationship type with `source` and `target` columns. Cells are strings unless
+    their header is typed with a DTDL schema, e.g. `Capacity:integer` or `Active:boolean`. Json files hold a list
+    (or ndjson lines) of twins (`$dtId`) and relationships (`$sourceId` / `$targetId`)
+    :param source: dataset file or folder
+    :param model_prefix: prefix used to build model ids from csv file names: `<prefix>:<FileName>;1`
+    :return: tuple of (twin iterators, relationship iterators)
+    """
+    files = sorted(source.iterdir()) if source.is_dir() else [source]
+    twins, relationships = [], []
+    for f in files:
+        if f.suffix.lower() == ".csv":
+            with open(f, newline="", encoding="utf-8") as _f:
+                columns = next(csv.reader(_f), [])
+            if is_relationship(columns):
+                relationships.append(iter_csv(f, lambda r, n=f.stem: csv_to_relationship(r, n)))
+            else:
+                model = f"{model_prefix}:{f.stem};1" if model_prefix else f.stem
+                twins.append(iter_csv(f, lambda r, m=model: csv_to_twin(r, m)))
+        elif f.suffix.lower() in [".json", ".ndjson"]:
+            twins.append(item for item in iter_json(f) if "$targetId" not in item and "$sourceId" not in item)
+            relationships.append(
+                json_to_relationship(item) for item in iter_json(f) if "$targetId" in item or "$sourceId" in item)
+    return twins, relationships
+
+
+def iter_csv(path: pathlib.Path, convert) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as _f:
+        for row in csv.DictReader(_f):
+            yield convert(row)
+
+
+def iter_json(path: pathlib.Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as _f:
+        first = _f.read(1)
+        _f.seek(0)
+        if first == "[":
+            yield from json.load(_f)
+            return
+        for line in _f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def json_to_relationship(item: dict) -> dict:
+    item = dict(item)
+    if "$sourceId" in item:
+        item["$dtId"] = item.pop("$sourceId")
+    item.setdefault("$relationshipId", f"{item['$dtId']}-{item.get('$relationshipName')}-{item['$targetId']}")
+    return item
+
+
+class Throttle:
+    """Shared back-off for all workers once the service starts answering 429"""
+
+    def __init__(self, max_retries: int = 8) -> None:
+        self.max_retries = max_retries
+        self.lock = threading.Lock()
+        self.resume_at = 0.0
+
+    def wait(self):
+        delay = self.resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def call(self, func, *args, **kwargs):
+        for attempt in range(self.max_retries):
+            self.wait()
+            try:
+                return func(*args, **kwargs)
+            except HttpResponseError as e:
+                if e.status_code not in [429, 503] or attempt == self.max_retries - 1:
+                    raise
+                retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+                delay = float(retry_after) if retry_after else min(2**attempt * 0.5, 30)
+                with self.lock:
+                    self.resume_at = max(self.resume_at, time.time() + delay)
+                logger.debug(f"[adt] throttled, retrying in {delay}s")
+
+
+class Checkpoint:
+    """Append-only file of the twins and relationships already imported"""
+
+    def __init__(self, path: Optional[pathlib.Path]) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = set()
+        if path and path.exists():
+            self.done = set(line for line in path.read_text().splitlines() if line)
+        self.file = open(path, "a") if path else None
+
+    def add(self, key: str):
+        with self.lock:
+            self.done.add(key)
+            if self.file:
+                self.file.write(f"{key}\n")
+                self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class AdtTwinImportService:
+
+    def __init__(self,
+                 adt_client: DigitalTwinsClient,
+                 state: dict,
+                 azure_token: str = "",
+                 blob_client: Optional[BlobServiceClient] = None,
+                 max_workers: int = 16) -> None:
+        self.state = state
+        self.adt_client = adt_client
+        self.azure_token = azure_token
+        self.blob_client = blob_client
+        self.max_workers = max(1, max_workers)
+        self.endpoint = str(self.state["adt"]["digital_twin_url"]).rstrip("/")
+
+    def import_job(self, twins: list, relationships: list, timeout: int = 3600) -> Optional[dict]:
+        """Run an ADT import job from a ndjson file staged in blob storage
+
+        :return: the final job or None if import jobs are not available
+        """
+        if not self.blob_client or not self.azure_token:
+            return None
+        job_id = f"babylon-{uuid4()}"
+        container = self.blob_client.get_container_client(container=IMPORT_CONTAINER)
+        if not container.exists():
+            container.create_container()
+        input_blob = self.blob_client.get_blob_client(container=IMPORT_CONTAINER, blob=f"{job_id}/input.ndjson")
+        output_blob = self.blob_client.get_blob_client(container=IMPORT_CONTAINER, blob=f"{job_id}/output.ndjson")
+        with tempfile.TemporaryFile("w+b") as tmp:
+            lines = [{"Section": "Header"}, {"fileVersion": "1.0.0", "author": "babylon", "organization": ""}]
+            for line in lines:
+                tmp.write(f"{json.dumps(line)}\n".encode("utf-8"))
+            for section, readers in [("Twins", twins), ("Relationships", relationships)]:
+                tmp.write(f"{json.dumps({'Section': section})}\n".encode("utf-8"))
+                for reader in readers:
+                    for item in reader:
+                        tmp.write(f"{json.dumps(item)}\n".encode("utf-8"))
+            size = tmp.tell()
+            tmp.seek(0)
+            with span("blob.upload", artifact="adt_import", bytes=size):
+                input_blob.upload_blob(tmp, overwrite=True)
+        url = f"{self.endpoint}/jobs/imports/{job_id}?api-version={IMPORT_API_VERSION}"
+        body = json.dumps({"inputBlobUri": input_blob.url, "outputBlobUri": output_blob.url})
+        response = oauth_request(url, self.azure_token, type="PUT", data=body)
+        if response is None:
+            logger.warning("[adt] import jobs are not available on this instance")
+            return None
+        logger.info(f"[adt] import job {job_id} created")
+        deadline = time.time() + timeout
+        job = response.json()
+        while job.get("status") in IMPORT_RUNNING and time.time() < deadline:
+            time.sleep(5)
+            response = oauth_request(url, self.azure_token)
+            if response is None:
+                return None
+            job = response.json()
+            logger.info(f"[adt] import job {job_id}: {job.get('status')}")
+        if job.get("status") in IMPORT_RUNNING:
+            logger.warning(f"[adt] import job {job_id} still {job.get('status')} after {timeout}s, cancelling it")
+            oauth_request(f"{self.endpoint}/jobs/imports/{job_id}/cancel?api-version={IMPORT_API_VERSION}",
+                          self.azure_token,
+                          type="POST")
+        elif job.get("status") == "cancelled":
+            logger.warning(f"[adt] import job {job_id} was cancelled")
+        return job
+
+    def upsert_all(self, twins: list, relationships: list, checkpoint: Optional[pathlib.Path] = None) -> dict:
+        """Upsert twins then relationships concurrently, skipping entries present in the checkpoint"""
+        throttle = Throttle()
+        done = Checkpoint(checkpoint)
+        counts = dict(twins=0, relationships=0, skipped=0, failed=0)
+        lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.max_workers * 4)
+
+        def count(name: str):
+            with lock:
+                counts[name] += 1
+
+        def upsert_twin(twin: dict):
+            twin_id = twin.pop("$dtId")
+            throttle.call(self.adt_client.upsert_digital_twin, twin_id, twin)
+            return f"t:{twin_id}"
+
+        def upsert_relationship(rel: dict):
+            source = rel.pop("$dtId")
+            rel["$sourceId"] = source
+            throttle.call(self.adt_client.upsert_relationship, source, rel["$relationshipId"], rel)
+            return f"r:{source}:{rel['$relationshipId']}"
+
+        def on_done(future: Future, name: str):
+            slots.release()
+            try:
+                done.add(future.result())
+                count(name)
+            except Exception as e:
+                logger.error(f"[adt] {e}")
+                count("failed")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for name, readers, func, key in [
+                    ("twins", twins, upsert_twin, lambda i: f"t:{i['$dtId']}"),
+                    ("relationships", relationships, upsert_relationship,
+                     lambda i: f"r:{i['$dtId']}:{i['$relationshipId']}"),
+                ]:
+                    futures = []
+                    for reader in readers:
+                        for item in reader:
+                            if key(item) in done.done:
+                                count("skipped")
+                                continue
+                            slots.acquire()
+                            future = executor.submit(func, item)
+                            future.add_done_callback(lambda f, n=name: on_done(f, n))
+                            futures.append(future)
+                    # relationships need every twin to exist
+                    for future in futures:
+                        future.exception()
+                    logger.info(f"[adt] {counts[name]} {name} imported")
+        finally:
+            done.close()
+        return counts
@@ -0,0 +1,16 @@
+from click import group
+from .import_twins import import_twins
+
+list_commands = [
+    import_twins,
+]
+
+
+@group()
+def twins():
+    """Subgroup dedicate to Azure digital twins twins and relationships management"""
+    pass
+
+
+for _command in list_commands:
+    twins.add_command(_command)
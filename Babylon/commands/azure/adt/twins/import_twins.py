@@ -0,0 +1,75 @@
+import logging
+import pathlib
+
+from typing import Any, Optional
+from click import Path
+from click import argument
+from click import command
+from click import option
+from azure.digitaltwins.core import DigitalTwinsClient
+from azure.storage.blob import BlobServiceClient
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.credentials import get_azure_token
+from Babylon.utils.clients import pass_adt_client, pass_blob_client
+from Babylon.utils.decorators import describe_dry_run, injectcontext, retrieve_state
+from Babylon.commands.azure.adt.services.adt_twin_svc import AdtTwinImportService, read_dataset
+
+logger = logging.getLogger("Babylon")
+
+
+@command(name="import")
+@injectcontext()
+@pass_adt_client
+@pass_blob_client
+@option("--model-prefix", "model_prefix", default="", help="Build model ids of csv twin files as <prefix>:<FileName>;1")
+@option("--import-job",
+        "import_job",
+        is_flag=True,
+        help="Use an ADT import job, the instance identity needs blob read/write access on the storage account")
+@option("--max-workers", "max_workers", default=16, show_default=True, help="Number of concurrent upserts")
+@option("--checkpoint",
+        "checkpoint",
+        type=Path(dir_okay=False, path_type=pathlib.Path),
+        help="File listing imported twins and relationships, they are skipped on rerun")
+@option("--timeout",
+        "timeout",
+        default=3600,
+        show_default=True,
+        help="Maximum time to wait for the import job (seconds)")
+@describe_dry_run("Would read the dataset and upsert its twins and relationships in ADT")
+@argument("source", type=Path(exists=True, readable=True, path_type=pathlib.Path))
+@retrieve_state
+def import_twins(state: Any,
+                 adt_client: DigitalTwinsClient,
+                 blob_client: BlobServiceClient,
+                 source: pathlib.Path,
+                 model_prefix: str,
+                 import_job: bool,
+                 max_workers: int,
+                 timeout: int,
+                 checkpoint: Optional[pathlib.Path] = None) -> CommandResponse:
+    """
+    Import twins and relationships of SOURCE csv / json file or folder in ADT
+    """
+    service_state = state["services"]
+    service = AdtTwinImportService(adt_client=adt_client,
+                                   state=service_state,
+                                   azure_token=get_azure_token("adt") if import_job else "",
+                                   blob_client=blob_client if import_job else None,
+                                   max_workers=max_workers)
+    try:
+        if import_job:
+            job = service.import_job(*read_dataset(source, model_prefix), timeout=timeout)
+            if job and job.get("status") == "succeeded":
+                logger.info("[adt] import job succeeded")
+                return CommandResponse.success(job)
+            logger.warning("[adt] import job did not succeed, falling back to upserts")
+        counts = service.upsert_all(*read_dataset(source, model_prefix), checkpoint=checkpoint)
+    except ValueError as e:
+        logger.error(f"[adt] invalid dataset {source}: {e}")
+        return CommandResponse.fail()
+    logger.info(f"[adt] {counts['twins']} twins and {counts['relationships']} relationships imported, "
+                f"{counts['skipped']} skipped, {counts['failed']} failed")
+    if counts["failed"]:
+        return CommandResponse.fail(data=counts)
+    return CommandResponse.success(counts)
@@ -3,11 +3,12 @@ from click import group
 from .script import script
 from .permission import permission
 from .get_all import get_all
+from .ingest import ingest
 from .database import database
 from .connections import connections_group
 from .consumer import consumer
 
-list_commands = [get_all]
+list_commands = [get_all, ingest]
 
 list_groups = [permission, script, database, connections_group, consumer]
 
@@ -8,7 +8,9 @@ from Babylon.utils.environment import Environment
 from azure.mgmt.kusto import KustoManagementClient
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.clients import pass_kusto_client
+from Babylon.utils.credentials import get_azure_token
 from Babylon.utils.decorators import retrieve_state
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
 from Babylon.commands.azure.adx.services.adx_database_svc import AdxDatabaseService
 
 logger = logging.getLogger("Babylon")
@@ -20,17 +22,25 @@ env = Environment()
 @pass_kusto_client
 @argument("name", type=str, required=False)
 @option("--retention", "retention", default=365, help="Retention days", show_default=True)
+@option("--data-plane",
+        "data_plane",
+        is_flag=True,
+        help="Run init policies on the cluster query endpoint instead of ARM scripts")
 @retrieve_state
 def create(
     state: Any,
     kusto_client: KustoManagementClient,
     retention: int,
+    data_plane: bool,
     name: Optional[str] = None,
 ) -> CommandResponse:
     """
     Create database in ADX cluster
     """
     service_state = state['services']
+    command_svc = None
+    if data_plane and service_state["adx"].get("cluster_uri"):
+        command_svc = AdxCommandService(azure_token=get_azure_token("adx"), state=service_state)
     service = AdxDatabaseService(kusto_client=kusto_client, state=service_state)
-    service.create(name=name, retention=retention)
+    service.create(name=name, retention=retention, command_svc=command_svc)
     return CommandResponse.success()
@@ -8,6 +8,7 @@ from azure.mgmt.kusto import KustoManagementClient
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.clients import pass_kusto_client
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.commands.azure.adx.services.adx_database_svc import AdxDatabaseService
 
 logger = logging.getLogger("Babylon")
@@ -18,6 +19,7 @@ env = Environment()
 @injectcontext()
 @pass_kusto_client
 @argument("name", type=str, required=False)
+@read_only
 @retrieve_state
 def get(
     state: Any,
@@ -8,6 +8,7 @@ from azure.mgmt.kusto import KustoManagementClient
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.clients import pass_kusto_client
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 
 logger = logging.getLogger("Babylon")
 
@@ -16,6 +17,7 @@ logger = logging.getLogger("Babylon")
 @injectcontext()
 @pass_kusto_client
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
 def get_all(state: Any, kusto_client: KustoManagementClient, filter: Optional[str] = None) -> CommandResponse:
     """
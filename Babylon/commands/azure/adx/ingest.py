@@ -0,0 +1,74 @@
+import logging
+import pathlib
+
+from typing import Any, Optional
+from click import Choice, Path, argument, command, option
+from azure.storage.blob import BlobServiceClient
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.clients import pass_blob_client
+from Babylon.utils.credentials import get_azure_token
+from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
+from Babylon.commands.azure.adx.services.adx_ingest_svc import AdxIngestService
+
+logger = logging.getLogger("Babylon")
+
+
+@command()
+@injectcontext()
+@pass_blob_client
+@argument("table", type=str)
+@argument("folder", type=Path(exists=True, file_okay=False, dir_okay=True, readable=True, path_type=pathlib.Path))
+@option("--database", "database_name", help="Database name, defaults to the database of the state")
+@option("--format", "data_format", type=Choice(["csv", "parquet"]), help="Only ingest files of this format")
+@option("--mapping", "mapping", default="", help="Ingestion mapping reference defined on the table")
+@option("--no-header", "no_header", is_flag=True, help="Csv files have no header row")
+@option("--parallelism",
+        "parallelism",
+        default=4,
+        show_default=True,
+        help="Number of concurrent uploads and ingestions")
+@option("--chunk-size", "chunk_size", default=256, show_default=True, help="Split csv files bigger than this size (MB)")
+@option("--status-file",
+        "status_file",
+        type=Path(dir_okay=False, path_type=pathlib.Path),
+        help="Json file tracking per-file ingestion status, completed files are skipped on rerun")
+@option("--timeout", "timeout", default=3600, show_default=True, help="Maximum time to wait for ingestions (seconds)")
+@retrieve_state
+def ingest(state: Any,
+           blob_client: BlobServiceClient,
+           table: str,
+           folder: pathlib.Path,
+           mapping: str,
+           no_header: bool,
+           parallelism: int,
+           chunk_size: int,
+           timeout: int,
+           database_name: Optional[str] = None,
+           data_format: Optional[str] = None,
+           status_file: Optional[pathlib.Path] = None) -> CommandResponse:
+    """
+    Ingest csv and parquet files of FOLDER in an ADX TABLE
+    """
+    service_state = state['services']
+    if not service_state["adx"].get("cluster_uri"):
+        logger.error("[adx] cluster_uri is missing")
+        return CommandResponse.fail()
+    command_svc = AdxCommandService(azure_token=get_azure_token("adx"),
+                                    state=service_state,
+                                    database_name=database_name)
+    service = AdxIngestService(command_svc=command_svc,
+                               blob_client=blob_client,
+                               state=service_state,
+                               parallelism=parallelism)
+    status = service.ingest(table=table,
+                            folder=folder,
+                            data_format=data_format,
+                            mapping=mapping,
+                            header=not no_header,
+                            chunk_size=chunk_size * 1024 * 1024,
+                            status_file=status_file,
+                            timeout=timeout)
+    if any(s.get("state") != "Completed" for s in status.values()):
+        return CommandResponse.fail(data=status)
+    return CommandResponse.success(status)
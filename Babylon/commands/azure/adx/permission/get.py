@@ -12,6 +12,7 @@ from Babylon.commands.azure.adx.services.adx_permission_svc import AdxPermission
 from Babylon.utils.decorators import (
     retrieve_state,
     injectcontext,
+    read_only,
 )
 
 logger = logging.getLogger("Babylon")
@@ -22,6 +23,7 @@ env = Environment()
 @injectcontext()
 @pass_kusto_client
 @argument("principal_id", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, kusto_client: KustoManagementClient, principal_id: str) -> CommandResponse:
     """
@@ -7,6 +7,7 @@ from azure.mgmt.kusto import KustoManagementClient
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.clients import pass_kusto_client
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.commands.azure.adx.services.adx_permission_svc import AdxPermissionService
 
 logger = logging.getLogger("Babylon")
@@ -16,6 +17,7 @@ env = Environment()
 @command()
 @injectcontext()
 @pass_kusto_client
+@read_only
 @retrieve_state
 def get_all(state: Any, kusto_client: KustoManagementClient):
     """
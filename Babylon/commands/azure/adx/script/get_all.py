@@ -7,6 +7,7 @@ from Babylon.commands.azure.adx.services.adx_script_svc import AdxScriptService
 from Babylon.utils.decorators import (
     retrieve_state,
     injectcontext,
+    read_only,
 )
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
@@ -19,6 +20,7 @@ env = Environment()
 @command()
 @injectcontext()
 @pass_kusto_client
+@read_only
 @retrieve_state
 def get_all(state: Any, kusto_client: KustoManagementClient) -> CommandResponse:
     """
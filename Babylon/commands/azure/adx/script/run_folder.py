@@ -1,7 +1,7 @@
 import pathlib
 from typing import Any
 
-from click import Path, command, pass_context, argument
+from click import Path, command, pass_context, argument, option
 from azure.mgmt.kusto import KustoManagementClient
 from Babylon.commands.azure.adx.services.adx_script_svc import AdxScriptService
 from Babylon.utils.decorators import (
@@ -9,6 +9,8 @@ from Babylon.utils.decorators import (
     injectcontext,
 )
 from Babylon.utils.clients import pass_kusto_client
+from Babylon.utils.credentials import get_azure_token
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
 from Babylon.utils.response import CommandResponse
 
 
@@ -26,16 +28,24 @@ from Babylon.utils.response import CommandResponse
         path_type=pathlib.Path,
     ),
 )
+@option("--data-plane",
+        "data_plane",
+        is_flag=True,
+        help="Run scripts on the cluster query endpoint instead of ARM scripts")
 @retrieve_state
 def run_folder(
     state: Any,
     kusto_client: KustoManagementClient,
     script_folder: pathlib.Path,
+    data_plane: bool,
 ) -> CommandResponse:
     """
     Run all script files (.kql) from SCRIPT_FOLDER
     """
     service_state = state['services']
-    service = AdxScriptService(kusto_client=kusto_client, state=service_state)
+    command_svc = None
+    if data_plane and service_state["adx"].get("cluster_uri"):
+        command_svc = AdxCommandService(azure_token=get_azure_token("adx"), state=service_state)
+    service = AdxScriptService(kusto_client=kusto_client, state=service_state, command_svc=command_svc)
     service.run_folder(script_folder=script_folder)
     return CommandResponse.success()
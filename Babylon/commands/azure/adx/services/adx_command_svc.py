@@ -0,0 +1,110 @@
+import json
+import logging
+
+from pathlib import Path
+from typing import Optional
+from Babylon.utils.request import oauth_request
+
+logger = logging.getLogger("Babylon")
+
+# number of management commands sent in a single `.execute database script` call
+DEFAULT_BATCH_SIZE = 50
+
+
+def split_script(script_content: str) -> list[str]:
+    """Split a kusto script in single management commands
+
+    A command starts on a line beginning with a dot and runs until the next one,
+    lines holding only a `//` comment are dropped
+    :param script_content: content of a .kql / .kusto script
+    :return: list of management commands
+    """
+    commands: list[str] = []
+    current: list[str] = []
+    for line in script_content.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("//"):
+            continue
+        if stripped.startswith(".") and current:
+            commands.append("\n".join(current))
+            current = []
+        current.append(line.rstrip())
+    if current:
+        commands.append("\n".join(current))
+    return commands
+
+
+def table_to_dicts(table: dict) -> list[dict]:
+    """Convert a kusto v1 result table to a list of rows as dict"""
+    columns = [c.get("ColumnName") for c in table.get("Columns", [])]
+    return [dict(zip(columns, row)) for row in table.get("Rows", [])]
+
+
+class AdxCommandService:
+    """Sends management commands directly to the cluster data-plane endpoint
+
+    Commands are run synchronously on `<cluster_uri>/v1/rest/mgmt` instead of going
+    through the ARM `scripts` long-running operations
+    """
+
+    def __init__(self,
+                 azure_token: str,
+                 state: dict,
+                 database_name: str = "",
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.state = state
+        self.azure_token = azure_token
+        self.cluster_uri = str(self.state["adx"].get("cluster_uri", "")).rstrip("/")
+        self.database_name = database_name or self.state["adx"]["database_name"]
+        self.batch_size = max(1, batch_size)
+
+    def is_available(self) -> bool:
+        return bool(self.cluster_uri and self.azure_token)
+
+    def execute(self, command: str) -> Optional[list[dict]]:
+        """Run one management command and return its primary result table"""
+        body = json.dumps({"db": self.database_name, "csl": command})
+        response = oauth_request(f"{self.cluster_uri}/v1/rest/mgmt",
+                                 self.azure_token,
+                                 type="POST",
+                                 data=body,
+                                 headers={"Accept": "application/json"})
+        if response is None:
+            return None
+        tables = response.json().get("Tables", [])
+        if not tables:
+            return []
+        return table_to_dicts(tables[0])
+
+    def execute_many(self, commands: list[str], continue_on_errors: bool = False) -> Optional[list[dict]]:
+        """Run management commands in batches of `.execute database script`
+
+        :param commands: list of management commands
+        :param continue_on_errors: keep running the remaining commands of a batch after a failure
+        :return: per-command results or None if a batch failed
+        """
+        results: list[dict] = []
+        flag = str(continue_on_errors).lower()
+        for start in range(0, len(commands), self.batch_size):
+            batch = commands[start:start + self.batch_size]
+            script = f".execute database script with (ContinueOnErrors={flag}) <|\n"
+            script += "\n\n".join(batch)
+            logger.info(f"[adx] sending {len(batch)} commands to database {self.database_name}")
+            rows = self.execute(script)
+            if rows is None:
+                return None
+            failed = [r for r in rows if r.get("Result") == "Failed"]
+            for r in failed:
+                logger.error(f"[adx] {r.get('CommandText', '')}: {r.get('Reason', '')}")
+            results += rows
+            if failed and not continue_on_errors:
+                return None
+        return results
+
+    def run_script(self, script_file: Path, continue_on_errors: bool = False) -> Optional[list[dict]]:
+        logger.info(f"[adx] reading {script_file}")
+        commands = split_script(script_file.read_text())
+        if not commands:
+            logger.warning(f"[adx] no command found in {script_file}")
+            return []
+        return self.execute_many(commands, continue_on_errors=continue_on_errors)
@@ -1,6 +1,7 @@
 import json
 import logging
 
+from typing import Optional
 from click import progressbar
 from datetime import timedelta
 from Babylon.utils.checkers import check_ascii
@@ -8,6 +9,8 @@ from azure.mgmt.kusto.models import ReadWriteDatabase
 from azure.mgmt.kusto.models import CheckNameRequest
 from azure.mgmt.kusto import KustoManagementClient
 from Babylon.utils.response import CommandResponse
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
+from Babylon.commands.azure.adx.services.adx_command_svc import split_script
 
 logger = logging.getLogger("Babylon")
 
@@ -44,6 +47,7 @@ class AdxDatabaseService:
         self,
         name: str,
         retention: int,
+        command_svc: Optional[AdxCommandService] = None,
     ):
         if name:
             check_ascii(name)
@@ -78,9 +82,17 @@ class AdxDatabaseService:
         batching_policy = json.dumps({"MaximumBatchingTimeSpan": "00:00:10"})
         script_content = (f".alter database ['{name}'] policy streamingingestion disable\n")
         script_content += "//\n"
-        script_content += f".alter-merge database ['{name}'] policy retention softdelete = {retention}d"
+        script_content += f".alter-merge database ['{name}'] policy retention softdelete = {retention}d\n"
         script_content += "//\n"
         script_content += (f".alter database ['{name}'] policy ingestionbatching '{batching_policy}'")
+        if command_svc and command_svc.is_available():
+            command_svc.database_name = name
+            if command_svc.execute_many(split_script(script_content)) is not None:
+                logger.info("Successfully ran")
+                _ret: list[str] = [f"Provisioning state: {poller.result().provisioning_state}"]
+                logger.info("\n".join(_ret))
+                return True
+            logger.warning("[adx] data-plane execution failed, falling back to ARM scripts")
         try:
             s = self.kusto_client.scripts.begin_create_or_update(
                 resource_group_name=resource_group_name,
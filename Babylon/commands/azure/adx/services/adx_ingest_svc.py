@@ -0,0 +1,204 @@
+import csv
+import json
+import time
+import logging
+import tempfile
+
+from uuid import uuid4
+from pathlib import Path
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from azure.storage.blob import BlobServiceClient
+from azure.storage.blob import BlobSasPermissions
+from azure.storage.blob import generate_blob_sas
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
+from Babylon.commands.azure.storage.services.storage_container_svc import AzureStorageContainerService
+
+logger = logging.getLogger("Babylon")
+
+STAGING_CONTAINER = "babylon-ingestion"
+INGEST_FORMATS = {".csv": "csv", ".parquet": "parquet"}
+TERMINAL_STATES = ["Completed", "Failed", "PartiallySucceeded", "Abandoned", "BadInput", "Canceled", "Skipped"]
+
+
+def split_csv(path: Path, chunk_size: int, target_dir: Path, header: bool = True) -> list[Path]:
+    """Split a csv file in chunks of about `chunk_size` bytes, the header row is repeated in every chunk"""
+    if path.stat().st_size <= chunk_size:
+        return [path]
+    chunks: list[Path] = []
+    with open(path, newline="", encoding="utf-8") as _f:
+        reader = csv.reader(_f)
+        header_row = next(reader, None) if header else None
+        out, writer, written = None, None, 0
+        for row in reader:
+            if writer is None or written >= chunk_size:
+                if out:
+                    out.close()
+                chunk = target_dir / f"{path.stem}.{len(chunks):05d}.csv"
+                chunks.append(chunk)
+                out = open(chunk, "w", newline="", encoding="utf-8")
+                writer = csv.writer(out)
+                written = 0
+                if header_row:
+                    writer.writerow(header_row)
+            writer.writerow(row)
+            written += sum(len(c) for c in row) + len(row)
+        if out:
+            out.close()
+    return chunks or [path]
+
+
+class AdxIngestService:
+    """Loads local csv / parquet files into ADX tables through blob staging"""
+
+    def __init__(self,
+                 command_svc: AdxCommandService,
+                 blob_client: BlobServiceClient,
+                 state: dict,
+                 parallelism: int = 4) -> None:
+        self.state = state
+        self.command_svc = command_svc
+        self.blob_client = blob_client
+        self.parallelism = max(1, parallelism)
+        self.storage_svc = AzureStorageContainerService(blob_client=blob_client, state=state)
+
+    def list_files(self, folder: Path, data_format: Optional[str] = None) -> list[Path]:
+        files = [f for f in sorted(folder.iterdir()) if f.is_file() and f.suffix.lower() in INGEST_FORMATS]
+        if data_format:
+            files = [f for f in files if INGEST_FORMATS[f.suffix.lower()] == data_format]
+        return files
+
+    def blob_url(self, blob_name: str) -> str:
+        sas = generate_blob_sas(
+            account_name=self.blob_client.account_name,
+            container_name=STAGING_CONTAINER,
+            blob_name=blob_name,
+            account_key=self.blob_client.credential.account_key,
+            permission=BlobSasPermissions(read=True),
+            expiry=datetime.now(timezone.utc) + timedelta(days=1),
+        )
+        url = self.blob_client.get_blob_client(container=STAGING_CONTAINER, blob=blob_name).url
+        return f"{url}?{sas}"
+
+    def ingest_command(self, table: str, blob_name: str, data_format: str, mapping: str, header: bool) -> str:
+        properties = [f"format='{data_format}'"]
+        if mapping:
+            properties.append(f"ingestionMappingReference='{mapping}'")
+        if header and data_format == "csv":
+            properties.append("ignoreFirstRecord=true")
+        return (f".ingest async into table ['{table}'] (h'{self.blob_url(blob_name)}') "
+                f"with ({', '.join(properties)})")
+
+    def load_status(self, status_file: Optional[Path]) -> dict:
+        if status_file and status_file.exists():
+            return json.loads(status_file.read_text())
+        return dict()
+
+    def save_status(self, status: dict, status_file: Optional[Path]):
+        if status_file:
+            status_file.write_text(json.dumps(status, indent=2))
+
+    def ingest(self,
+               table: str,
+               folder: Path,
+               data_format: Optional[str] = None,
+               mapping: str = "",
+               header: bool = True,
+               chunk_size: int = 256 * 1024 * 1024,
+               status_file: Optional[Path] = None,
+               timeout: int = 3600) -> dict:
+        """Ingest all csv / parquet files of a folder in a table
+
+        :param table: target table name
+        :param folder: folder containing the files to ingest
+        :param data_format: only ingest files of this format (csv or parquet)
+        :param mapping: name of an ingestion mapping already defined on the table
+        :param header: csv files start with a header row
+        :param chunk_size: csv files bigger than this size (bytes) are split before staging
+        :param status_file: json file used to track and resume per-file ingestion status
+        :param timeout: maximum time (seconds) to wait for ingestion operations
+        :return: ingestion status by file
+        """
+        status = self.load_status(status_file)
+        files = [f for f in self.list_files(folder, data_format) if status.get(f.name, {}).get("state") != "Completed"]
+        if not files:
+            logger.info(f"[adx] no file to ingest in {folder}")
+            return status
+        container = self.blob_client.get_container_client(container=STAGING_CONTAINER)
+        if not container.exists():
+            container.create_container()
+        run_id = str(uuid4())
+        with tempfile.TemporaryDirectory() as tmp:
+            staged: list[tuple[Path, str]] = []
+            for f in files:
+                file_format = INGEST_FORMATS[f.suffix.lower()]
+                chunks = split_csv(f, chunk_size, Path(tmp), header) if file_format == "csv" else [f]
+                names = [f"{self.command_svc.database_name}/{table}/{run_id}/{c.name}" for c in chunks]
+                staged += list(zip(chunks, names))
+                status[f.name] = dict(state="Staging",
+                                      format=file_format,
+                                      chunks=[dict(blob=n, operation_id="", state="Staging") for n in names])
+            self.save_status(status, status_file)
+            logger.info(f"[adx] staging {len(staged)} blobs for {len(files)} files")
+            uploaded = self.storage_svc.upload_many(STAGING_CONTAINER, staged, max_workers=self.parallelism)
+        failed = [name for name, done in uploaded.items() if not done]
+        if failed:
+            logger.error(
+                f"[adx] {len(failed)} of {len(staged)} blobs could not be staged, their files are not ingested")
+
+        def send(chunk: dict, file_format: str) -> dict:
+            if not uploaded.get(chunk["blob"]):
+                return dict(chunk, state="Failed")
+            command = self.ingest_command(table, chunk["blob"], file_format, mapping, header)
+            rows = self.command_svc.execute(command)
+            if not rows:
+                return dict(chunk, state="Failed")
+            return dict(chunk, operation_id=rows[0].get("OperationId", ""), state="InProgress")
+
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            futures = {
+                f.name: [executor.submit(send, c, status[f.name]["format"]) for c in status[f.name]["chunks"]]
+                for f in files
+            }
+        for name, chunk_futures in futures.items():
+            status[name]["chunks"] = [future.result() for future in chunk_futures]
+        self.save_status(status, status_file)
+        self.wait(status, [f.name for f in files], timeout)
+        for f in files:
+            entry = status[f.name]
+            states = set(c["state"] for c in entry["chunks"])
+            entry["state"] = "Completed" if states == {"Completed"} else "Failed"
+            logger.info(f"[adx] {f.name}: {entry['state']}")
+        self.save_status(status, status_file)
+        self.cleanup(status, [f.name for f in files])
+        return status
+
+    def wait(self, status: dict, names: list[str], timeout: int, interval: float = 5):
+        pending = {c["operation_id"]: c for n in names for c in status[n]["chunks"] if c["state"] == "InProgress"}
+        deadline = time.time() + timeout
+        while pending and time.time() < deadline:
+            ids = ", ".join(pending)
+            rows = self.command_svc.execute(f".show operations ({ids})") or []
+            for r in rows:
+                chunk = pending.get(r.get("OperationId"))
+                if chunk and r.get("State") in TERMINAL_STATES:
+                    chunk["state"] = r.get("State")
+                    if r.get("State") != "Completed":
+                        logger.error(f"[adx] ingestion of {chunk['blob']} ended with {r.get('State')}: "
+                                     f"{r.get('Status', '')}")
+                    del pending[r.get("OperationId")]
+            if pending:
+                logger.info(f"[adx] waiting for {len(pending)} ingestion operations")
+                time.sleep(interval)
+        for chunk in pending.values():
+            chunk["state"] = "Timeout"
+
+    def cleanup(self, status: dict, names: list[str]):
+        container = self.blob_client.get_container_client(container=STAGING_CONTAINER)
+        blobs = [c["blob"] for n in names for c in status[n]["chunks"] if c["state"] == "Completed"]
+        for start in range(0, len(blobs), 256):
+            try:
+                container.delete_blobs(*blobs[start:start + 256])
+            except Exception as e:
+                logger.debug(e)
@@ -3,6 +3,7 @@ import logging
 from pprint import pformat
 from typing import Iterable
 from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
 from azure.mgmt.kusto import KustoManagementClient
 from Babylon.utils.interactive import confirm_deletion
 from Babylon.utils.response import CommandResponse
@@ -11,6 +12,13 @@ from azure.mgmt.kusto.models import DatabasePrincipalAssignment
 logger = logging.getLogger("Babylon")
 
 
+def assignment_key(principal_id: str, role: str, principal_type: str, tenant_id: str) -> tuple:
+    # roles and types come back from the SDK as str enums
+    role = getattr(role, "value", role)
+    principal_type = getattr(principal_type, "value", principal_type)
+    return (str(principal_id).lower(), str(role), str(principal_type), str(tenant_id or "").lower())
+
+
 class AdxPermissionService:
 
     def __init__(self, kusto_client: KustoManagementClient, state: dict = None) -> None:
@@ -118,3 +126,74 @@ class AdxPermissionService:
         except Exception as exp:
             logger.warning(exp)
             return result
+
+    def reconcile(self, spec_permissions: list[dict], tenant_id: str, keep_ids: list[str] = None, max_workers: int = 8):
+        """Apply spec permissions by creating and deleting only the assignments that changed
+
+        :param spec_permissions: list of dict with principal_id, role, type and optional tenant_id
+        :param tenant_id: tenant used when a spec permission has none
+        :param keep_ids: principal ids never deleted even when missing from the spec
+        :param max_workers: number of concurrent assignment operations
+        :return: tuple of (created, deleted) assignment keys
+        """
+        resource_group_name = self.state["azure"]["resource_group_name"]
+        adx_cluster_name = self.state["adx"]["cluster_name"]
+        database_name = self.state["adx"]["database_name"]
+        operations = self.kusto_client.database_principal_assignments
+        keep_ids = [str(i).lower() for i in keep_ids or []]
+        existing = dict()
+        for assign in operations.list(resource_group_name, adx_cluster_name, database_name):
+            key = assignment_key(assign.principal_id, assign.role, assign.principal_type, assign.tenant_id)
+            existing[key] = str(assign.name).split("/")[-1]
+        desired = dict()
+        for g in spec_permissions:
+            if g.get("role") not in ["User", "Viewer", "Admin"] or g.get("type") not in ["User", "Group", "App"]:
+                logger.error(f"[adx] invalid role or type for principal {g.get('principal_id')}")
+                continue
+            key = assignment_key(g.get("principal_id"), g.get("role"), g.get("type"), g.get("tenant_id", tenant_id))
+            desired[key] = DatabasePrincipalAssignment(
+                principal_id=g.get("principal_id"),
+                principal_type=g.get("type"),
+                role=g.get("role"),
+                tenant_id=g.get("tenant_id", tenant_id),
+            )
+        to_create = [k for k in desired if k not in existing]
+        to_delete = [k for k in existing if k not in desired and k[0] not in keep_ids]
+        if not to_create and not to_delete:
+            logger.info("[adx] permissions are up to date")
+            return [], []
+
+        def create(key: tuple):
+            logger.info(f"[adx] creating role {key[1]} for {key[2]}: {key[0]}")
+            return operations.begin_create_or_update(
+                principal_assignment_name=str(uuid4()),
+                cluster_name=adx_cluster_name,
+                resource_group_name=resource_group_name,
+                database_name=database_name,
+                parameters=desired[key],
+            )
+
+        def delete(key: tuple):
+            logger.info(f"[adx] deleting role {key[1]} for {key[2]}: {key[0]}")
+            return operations.begin_delete(
+                resource_group_name,
+                adx_cluster_name,
+                database_name,
+                principal_assignment_name=existing[key],
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(create, k) for k in to_create] + [executor.submit(delete, k) for k in to_delete]
+        pollers = []
+        for future in futures:
+            try:
+                pollers.append(future.result())
+            except Exception as exp:
+                logger.warning(exp)
+        for poller in pollers:
+            try:
+                poller.wait()
+            except Exception as exp:
+                logger.warning(exp)
+        logger.info(f"[adx] {len(to_create)} assignments created, {len(to_delete)} deleted")
+        return to_create, to_delete
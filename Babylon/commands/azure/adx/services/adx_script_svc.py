@@ -2,19 +2,29 @@ import glob
 import logging
 
 from pathlib import Path
+from typing import Optional
 from click import progressbar
 from azure.mgmt.kusto import KustoManagementClient
 from azure.core.exceptions import HttpResponseError
 from Babylon.utils.response import CommandResponse
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
+from Babylon.commands.azure.adx.services.adx_command_svc import split_script
 
 logger = logging.getLogger("Babylon")
 
 
 class AdxScriptService:
 
-    def __init__(self, kusto_client: KustoManagementClient, state: dict = None) -> None:
+    def __init__(self,
+                 kusto_client: KustoManagementClient,
+                 state: dict = None,
+                 command_svc: Optional[AdxCommandService] = None) -> None:
         self.state = state
         self.kusto_client = kusto_client
+        self.command_svc = command_svc
+
+    def use_data_plane(self) -> bool:
+        return bool(self.command_svc and self.command_svc.is_available())
 
     def get_all(self):
         resource_group_name = self.state["azure"]["resource_group_name"]
@@ -37,17 +47,31 @@ class AdxScriptService:
         if not files:
             logger.error(f"No script found in path {script_folder.absolute()}")
             return CommandResponse.fail()
+        if self.use_data_plane():
+            commands = []
+            for _file in files[::-1]:
+                logger.info(f"Found script {_file} sending it to the database.")
+                commands += split_script(Path(_file).read_text())
+            if self.command_svc.execute_many(commands) is not None:
+                logger.info("Successfully ran")
+                return
+            logger.warning("[adx] data-plane execution failed, falling back to ARM scripts")
         for _file in files[::-1]:
             file_path = Path(_file)
             logger.info(f"Found script {file_path} sending it to the database.")
-            self.run(script_file=file_path, kusto_client=self.kusto_client)
+            self.run(script_file=file_path, script_id=file_path.stem, data_plane=False)
 
-    def run(self, script_file: Path, script_id: str):
+    def run(self, script_file: Path, script_id: str, data_plane: bool = True):
         resource_group_name = self.state["azure"]["resource_group_name"]
         adx_cluster_name = self.state["adx"]["cluster_name"]
         database_name = self.state["adx"]["database_name"]
         if script_file.suffix != ".kql":
             logger.warning(f"File {script_file.name} is not a kql file. Errors could happen.")
+        if data_plane and self.use_data_plane():
+            if self.command_svc.run_script(script_file) is not None:
+                logger.info("Successfully ran")
+                return
+            logger.warning("[adx] data-plane execution failed, falling back to ARM scripts")
         script_name = script_id
         with open(script_file) as _script_file:
             logger.info(f"Reading {script_file}")
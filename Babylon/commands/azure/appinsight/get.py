@@ -5,6 +5,7 @@ from click import command, argument
 from Babylon.commands.azure.appinsight.services.appinsight_api_svc import AzureAppInsightService
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
 
@@ -16,6 +17,7 @@ env = Environment()
 @injectcontext()
 @pass_azure_token()
 @argument("name", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, name: str) -> CommandResponse:
     """
@@ -8,6 +8,7 @@ from Babylon.utils.decorators import retrieve_state, injectcontext
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -18,6 +19,7 @@ env = Environment()
 @output_to_file
 @pass_azure_token()
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
 def get_all(state: Any, azure_token: str, filter: Optional[str] = None) -> CommandResponse:
     """
@@ -5,6 +5,7 @@ from azure.core.exceptions import HttpResponseError
 from azure.mgmt.resource import ResourceManagementClient
 from click import command
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.clients import pass_arm_client
 from Babylon.utils.environment import Environment
@@ -16,6 +17,7 @@ env = Environment()
 @command()
 @injectcontext()
 @pass_arm_client
+@read_only
 @retrieve_state
 def get_all(
     state: Any,
@@ -8,6 +8,7 @@ from Babylon.commands.azure.staticwebapp.services.swa_app_settings_svc import (
 from Babylon.utils.decorators import (
     retrieve_state,
     injectcontext,
+    read_only,
 )
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
@@ -21,6 +22,7 @@ env = Environment()
 @injectcontext()
 @pass_azure_token()
 @argument("webapp_name", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, webapp_name: str) -> CommandResponse:
     """
@@ -6,6 +6,7 @@ from click import argument
 from Babylon.commands.azure.staticwebapp.services.swa_custom_domain_svc import (
     AzureSWACustomDomainService, )
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
@@ -19,6 +20,7 @@ env = Environment()
 @pass_azure_token()
 @argument("webapp_name", type=str)
 @argument("domain_name", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, webapp_name: str, domain_name: str) -> CommandResponse:
     """
@@ -6,6 +6,7 @@ from click import argument
 from Babylon.commands.azure.staticwebapp.services.swa_custom_domain_svc import (
     AzureSWACustomDomainService, )
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.environment import Environment
@@ -18,6 +19,7 @@ env = Environment()
 @injectcontext()
 @pass_azure_token()
 @argument("webapp_name", type=str)
+@read_only
 @retrieve_state
 def get_all(state: Any, azure_token: str, webapp_name: str) -> CommandResponse:
     """
@@ -8,6 +8,7 @@ from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_azure_token
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.commands.azure.staticwebapp.services.swa_api_svc import AzureSWAService
 
 logger = logging.getLogger("Babylon")
@@ -18,6 +19,7 @@ env = Environment()
 @injectcontext()
 @pass_azure_token()
 @argument("webapp_name", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, azure_token: str, webapp_name: str) -> CommandResponse:
     """
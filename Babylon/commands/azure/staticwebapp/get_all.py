@@ -1,9 +1,12 @@
 import logging
 
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from click import command, option
 from Babylon.commands.azure.staticwebapp.services.swa_api_svc import AzureSWAService
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
+from Babylon.utils.decorators import output_to_stream
+from Babylon.utils.listing import ItemFilter, list_response
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.environment import Environment
 from Babylon.utils.credentials import pass_azure_token
@@ -14,15 +17,19 @@ env = Environment()
 
 @command()
 @injectcontext()
+@output_to_stream
 @pass_azure_token()
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
-def get_all(state: Any, azure_token: str, filter: Optional[str] = None) -> CommandResponse:
+def get_all(state: Any,
+            azure_token: str,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all static webapps within the subscription
     https://learn.microsoft.com/en-us/rest/api/appservice/static-sites/list
     """
     service_state = state['services']
     service = AzureSWAService(azure_token=azure_token, state=service_state)
-    response = service.get_all(filter)
-    return CommandResponse.success(response, verbose=True)
+    return list_response(service.iter_all(), sink, ItemFilter(filter))
@@ -7,6 +7,7 @@ from pathlib import Path
 from Babylon.utils.checkers import check_ascii
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
+from Babylon.utils.listing import iter_next_link
 from Babylon.utils.request import oauth_request
 from Babylon.utils.response import CommandResponse
 # from Babylon.utils.interactive import confirm_deletion
@@ -86,6 +87,16 @@ class AzureSWAService:
             output_data = jmespath.search(filter, output_data)
         return output_data
 
+    def iter_all(self):
+        """Iterate over all static webapps of the resource group, following the next links"""
+        azure_subscription = self.state["azure"]["subscription_id"]
+        resource_group_name = self.state["azure"]["resource_group_name"]
+        return iter_next_link(
+            f"https://management.azure.com/subscriptions/{azure_subscription}/resourceGroups/{resource_group_name}"
+            "/providers/Microsoft.Web/staticSites?api-version=2022-03-01",
+            self.azure_token,
+        )
+
     def get(self, webapp_name: str):
         azure_subscription = self.state["azure"]["subscription_id"]
         resource_group_name = self.state["azure"]["resource_group_name"]
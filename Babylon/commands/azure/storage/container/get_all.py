@@ -1,11 +1,12 @@
 import logging
 
-from typing import Optional
+from typing import Any, Callable, Optional
 from azure.storage.blob import BlobServiceClient
 from click import command, option
 from Babylon.commands.azure.storage.services.storage_container_svc import AzureStorageContainerService
-from Babylon.utils.decorators import injectcontext
+from Babylon.utils.decorators import injectcontext, output_to_stream
 from Babylon.utils.clients import pass_blob_client
+from Babylon.utils.listing import ItemFilter, list_response
 from Babylon.utils.response import CommandResponse
 
 logger = logging.getLogger("Babylon")
@@ -13,12 +14,14 @@ logger = logging.getLogger("Babylon")
 
 @command()
 @injectcontext()
+@output_to_stream
 @pass_blob_client
 @option("--filter", "filter", help="Filter response with a jmespath query")
-def get_all(blob_client: BlobServiceClient, filter: Optional[str] = None) -> CommandResponse:
+def get_all(blob_client: BlobServiceClient,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all blob storage containers
     """
     service = AzureStorageContainerService(blob_client=blob_client)
-    response = service.get_all(filter=filter)
-    return CommandResponse.success(response, verbose=True)
+    return list_response(service.iter_all(), sink, ItemFilter(filter))
@@ -40,10 +40,9 @@ def upload(
     Upload csv files to blob storage container
     """
     service = AzureStorageContainerService(blob_client=blob_client, state=state)
-    service.upload(
+    return service.upload(
         org_id=org_id,
         work_id=work_id,
         dataset_id=dataset_id,
         folder=folder,
     )
-    return CommandResponse.success()
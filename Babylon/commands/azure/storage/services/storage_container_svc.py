@@ -1,20 +1,35 @@
 import os
 import logging
-import jmespath
 
 from glob import glob
 from pathlib import Path
+from typing import Any, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from azure.core.exceptions import HttpResponseError
 from Babylon.utils.checkers import check_ascii
 from azure.storage.blob import BlobServiceClient
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import confirm_deletion
+from Babylon.utils.listing import iter_sdk
+from Babylon.utils.tracing import span
 
 from Babylon.utils.response import CommandResponse
 
 logger = logging.getLogger("Babylon")
 env = Environment()
 
+DEFAULT_MAX_WORKERS = 8
+
+
+def container_details(container: Any) -> dict[str, Any]:
+    return {
+        "name": container.name,
+        "lease": container.lease,
+        "etag": container.etag,
+        "deleted": container.deleted,
+        "public_access": container.public_access,
+    }
+
 
 class AzureStorageContainerService:
 
@@ -50,23 +65,11 @@ class AzureStorageContainerService:
             return CommandResponse.fail()
         logger.info("Successfully deleted")
 
-    def get_all(self, filter: bool):
+    def iter_all(self) -> Iterator[dict[str, Any]]:
+        """Iterate over the containers of the storage account, page by page"""
         logger.info(f"Listing containers from storage account {self.blob_client.account_name}")
-        try:
-            containers = self.blob_client.list_containers()
-        except Exception as e:
-            logger.error(e.message)
-            return CommandResponse.fail()
-        output_data = [{
-            "name": container.name,
-            "lease": container.lease,
-            "etag": container.etag,
-            "deleted": container.deleted,
-            "public_access": container.public_access,
-        } for container in containers]
-        if filter:
-            output_data = jmespath.search(filter, output_data)
-        return output_data
+        return iter_sdk(self.blob_client.list_containers(), container_details,
+                        f"containers of storage account {self.blob_client.account_name}")
 
     def upload(self, org_id: str, work_id: str, dataset_id: str, folder: str):
         organization_id = org_id or self.state["api"]["organization_id"]
@@ -78,12 +81,40 @@ class AzureStorageContainerService:
             logger.info(f"Container '{organization_id.lower()}' not found")
             return CommandResponse.fail()
 
-        for f in files:
-            client = self.blob_client.get_blob_client(
-                container=organization_id.lower(),
-                blob=f"{workspace_id.lower()}/datasets/{dataset_id}/{os.path.basename(f)}",
-            )
-            _f: Path = env.pwd / f
-            with open(_f, "rb") as data:
-                client.upload_blob(data)
+        blobs = [(env.pwd / f, f"{workspace_id.lower()}/datasets/{dataset_id}/{os.path.basename(f)}") for f in files]
+        uploaded = self.upload_many(container=organization_id.lower(), blobs=blobs, overwrite=False)
+        failed = [name for name, done in uploaded.items() if not done]
+        if failed:
+            logger.error(f"{len(failed)} of {len(blobs)} files could not be uploaded")
+            return CommandResponse.fail(data=dict(failed=failed))
         logger.info("Successfully uploaded")
+        return CommandResponse.success(dict(uploaded=list(uploaded)))
+
+    def upload_many(self,
+                    container: str,
+                    blobs: list[tuple[Path, str]],
+                    overwrite: bool = True,
+                    max_workers: int = DEFAULT_MAX_WORKERS) -> dict[str, bool]:
+        """Upload local files to blobs of a container concurrently
+
+        :param container: target container name
+        :param blobs: list of (local file path, blob name) to upload
+        :param overwrite: replace existing blobs
+        :param max_workers: number of concurrent uploads
+        :return: upload status by blob name
+        """
+
+        def upload_one(path: Path, blob_name: str) -> bool:
+            client = self.blob_client.get_blob_client(container=container, blob=blob_name)
+            try:
+                with open(path, "rb") as data, span("blob.upload", artifact="file", bytes=os.path.getsize(path)):
+                    client.upload_blob(data, overwrite=overwrite)
+            except Exception as e:
+                logger.error(f"Failed to upload '{path}' to '{container}/{blob_name}': {e}")
+                return False
+            logger.debug("Uploaded '%s' to '%s/%s'", path, container, blob_name)
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {name: executor.submit(upload_one, path, name) for path, name in blobs}
+        return {name: future.result() for name, future in futures.items()}
@@ -4,6 +4,7 @@ from typing import Any
 from click import Choice, command, option
 from Babylon.commands.azure.token.services.token_api_svc import AzureTokenService
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -21,6 +22,7 @@ env = Environment()
     required=True,
     help="API Scope",
 )
+@read_only
 @retrieve_state
 def get(state: Any, scope: str, email: str) -> CommandResponse:
     """
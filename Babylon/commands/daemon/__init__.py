@@ -0,0 +1,20 @@
+from click import group
+from .start import start
+from .stop import stop
+from .status import status
+
+list_commands = [
+    start,
+    stop,
+    status,
+]
+
+
+@group()
+def daemon():
+    """Keep babylon warm in a local process serving commands sent by `babylonc`"""
+    pass
+
+
+for _command in list_commands:
+    daemon.add_command(_command)
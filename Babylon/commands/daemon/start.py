@@ -0,0 +1,41 @@
+import sys
+import pathlib
+import subprocess
+import click
+
+from logging import getLogger
+from typing import Optional
+from click import Path, command, option
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.daemon import BabylonDaemon, DEFAULT_IDLE_TIMEOUT
+from Babylon.utils.daemon_client import socket_path
+
+logger = getLogger("Babylon")
+
+
+@command()
+@option("--socket", "socket_file", type=Path(dir_okay=False, path_type=pathlib.Path), help="Unix socket to listen on")
+@option("--idle-timeout",
+        "idle_timeout",
+        default=DEFAULT_IDLE_TIMEOUT,
+        show_default=True,
+        help="Stop after this many seconds without command, 0 to never stop")
+@option("--detach", "detach", is_flag=True, help="Run the daemon in background")
+def start(idle_timeout: int, detach: bool, socket_file: Optional[pathlib.Path] = None) -> CommandResponse:
+    """
+    Start a babylon daemon serving commands on a unix socket
+    """
+    path = socket_file or socket_path()
+    if detach:
+        args = [sys.executable, "-m", "Babylon.main", "daemon", "start", "--socket", str(path)]
+        args += ["--idle-timeout", str(idle_timeout)]
+        process = subprocess.Popen(args,
+                                   stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL,
+                                   start_new_session=True)
+        logger.info(f"Babylon daemon started with pid {process.pid} on {path}")
+        return CommandResponse.success({"pid": process.pid, "socket": str(path)})
+    babylon = click.get_current_context().find_root().command
+    BabylonDaemon(babylon, path=path, idle_timeout=idle_timeout).serve()
+    return CommandResponse.success({"socket": str(path)})
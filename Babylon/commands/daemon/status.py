@@ -0,0 +1,27 @@
+import pathlib
+
+from logging import getLogger
+from typing import Optional
+from click import Path, command, option
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.daemon_client import connect, frames, send, socket_path
+
+logger = getLogger("Babylon")
+
+
+@command()
+@option("--socket", "socket_file", type=Path(dir_okay=False, path_type=pathlib.Path), help="Unix socket of the daemon")
+def status(socket_file: Optional[pathlib.Path] = None) -> CommandResponse:
+    """
+    Show if a babylon daemon is running
+    """
+    path = socket_file or socket_path()
+    client = connect(path, timeout=10)
+    if client is None:
+        logger.info("No babylon daemon running")
+        return CommandResponse.fail()
+    with client:
+        send(client, {"control": "status"})
+        pid = "".join(f.get("out", "") for f in frames(client)).strip()
+    logger.info(f"Babylon daemon running with pid {pid} on {path}")
+    return CommandResponse.success({"pid": pid, "socket": str(path)})
@@ -0,0 +1,26 @@
+import pathlib
+
+from logging import getLogger
+from typing import Optional
+from click import Path, command, option
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.daemon_client import connect, frames, send, socket_path
+
+logger = getLogger("Babylon")
+
+
+@command()
+@option("--socket", "socket_file", type=Path(dir_okay=False, path_type=pathlib.Path), help="Unix socket of the daemon")
+def stop(socket_file: Optional[pathlib.Path] = None) -> CommandResponse:
+    """
+    Stop the babylon daemon
+    """
+    client = connect(socket_file or socket_path(), timeout=10)
+    if client is None:
+        logger.info("No babylon daemon running")
+        return CommandResponse.success()
+    with client:
+        send(client, {"control": "stop"})
+        list(frames(client))
+    logger.info("Babylon daemon stopped")
+    return CommandResponse.success()
@@ -4,6 +4,7 @@ from typing import Any, Optional
 from click import argument, command
 from Babylon.commands.git_hub.runs.service.github_api_svc import GitHubRunsService
 from Babylon.utils.decorators import retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
 
@@ -14,6 +15,7 @@ env = Environment()
 @command()
 @injectcontext()
 @argument("workflow_name", type=str)
+@read_only
 @retrieve_state
 def get(state: Any, workflow_name: Optional[str] = None) -> CommandResponse:
     """
@@ -1,53 +1,160 @@
+import time
 import logging
 import requests
 
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Optional
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
+from Babylon.utils.tracing import span, url_template
 
 logger = logging.getLogger("Babylon")
 env = Environment()
 
+GITHUB_HEADERS = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+# polling starts fast to catch a run as soon as it shows up, then slows down while nothing changes
+MIN_INTERVAL = 1.0
+MAX_INTERVAL = 15.0
+RUN_TIMEOUT = 120.0
+DEPLOY_TIMEOUT = 1800.0
+
+
+def github_time(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+
+def github_filter(since: datetime) -> str:
+    return f">={since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
 
 class GitHubRunsService:
+    """
+    Workflow runs of the webapp repository
+
+    Runs are queried with server side filters (workflow file, branch, event, creation date,
+    commit) instead of scanning the whole run list. Polls are conditional requests on the ETag of
+    the previous answer: an unchanged answer is a 304 without body, which does not count in the
+    GitHub rate limit. The token is read from the vault on the first request
+    """
 
     def __init__(self, state: dict = None) -> None:
         self.state = state
+        self.cache: dict[str, tuple[str, Any]] = dict()
 
-    def get(self, workflow_name: str):
-        github_secret = env.get_global_secret(resource="github", name="token")
+    @cached_property
+    def session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update(GITHUB_HEADERS)
+        session.headers["Authorization"] = f"Bearer {env.get_global_secret(resource='github', name='token')}"
+        return session
+
+    @property
+    def repo_url(self) -> str:
         org = self.state["github"]["organization"]
         repo = self.state["github"]["repository"]
-        url = f"https://api.github.com/repos/{org}/{repo}/actions/runs"
-        response = requests.get(
-            url,
-            headers={
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-                "Authorization": f"Bearer {github_secret}",
-            },
-        )
-        if response is None:
-            return CommandResponse.fail()
-        response = response.json()
-        responses = [{"path": i.get("path"), "url": i.get("url")} for i in response["workflow_runs"]]
-        workflow_name = f"azure-static-web-apps-{workflow_name}.yml"
-        for workflow in responses:
-            if workflow_name in workflow.get("path"):
-                run_url = workflow.get("url")
-                return run_url
+        return f"https://api.github.com/repos/{org}/{repo}"
+
+    def request(self, url: str, params: Optional[dict[str, Any]] = None) -> Optional[Any]:
+        """Json of a GET, the cached one when the server answers it did not change"""
+        key = requests.Request("GET", url, params=params).prepare().url
+        cached = self.cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        with span(f"GET {url_template(url)}", method="GET", host="api.github.com") as attributes:
+            try:
+                response = self.session.get(url, params=params, headers=headers)
+            except requests.RequestException as e:
+                logger.warning(f"[github] request failed: {e}")
+                return None
+            attributes.update(status=response.status_code, bytes=len(response.content))
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code >= 300:
+            logger.warning(f"[github] failed ({response.status_code}): {response.text}")
+            return None
+        data = response.json()
+        if response.headers.get("ETag"):
+            self.cache[key] = (response.headers["ETag"], data)
+        return data
+
+    def runs(self,
+             workflow_name: Optional[str] = None,
+             branch: Optional[str] = None,
+             event: Optional[str] = None,
+             since: Optional[datetime] = None,
+             head_sha: Optional[str] = None,
+             per_page: int = 10) -> list[dict[str, Any]]:
+        """Last runs, of the static web app workflow `workflow_name` when given"""
+        url = f"{self.repo_url}/actions/runs"
+        if workflow_name:
+            url = f"{self.repo_url}/actions/workflows/azure-static-web-apps-{workflow_name}.yml/runs"
+        params = dict(branch=branch, event=event, head_sha=head_sha, per_page=per_page)
+        if since:
+            params["created"] = github_filter(since)
+        data = self.request(url, params={k: v for k, v in params.items() if v is not None})
+        return data.get("workflow_runs", []) if data else []
+
+    def get(self, workflow_name: str):
+        runs = self.runs(workflow_name=workflow_name, per_page=1)
+        if runs:
+            return runs[0].get("url")
+
+    def wait_for_run(self,
+                     workflow_name: str,
+                     since: Optional[datetime] = None,
+                     head_sha: Optional[str] = None,
+                     event: Optional[str] = None,
+                     timeout: float = RUN_TIMEOUT) -> Optional[dict[str, Any]]:
+        """First run of the workflow created after `since` or for the commit `head_sha`, None on timeout"""
+        branch = self.state["github"].get("branch") or None
+        with span("github.wait_run", workflow=workflow_name) as attributes:
+            deadline = time.monotonic() + timeout
+            interval = MIN_INTERVAL
+            while True:
+                runs = self.runs(workflow_name=workflow_name,
+                                 branch=branch,
+                                 event=event,
+                                 since=since,
+                                 head_sha=head_sha)
+                if runs:
+                    run = min(runs, key=lambda r: r["created_at"])
+                    attributes["run_id"] = run["id"]
+                    logger.info(f"[github] workflow run {run['id']} found")
+                    return run
+                if time.monotonic() + interval > deadline:
+                    logger.warning(f"[github] no run of workflow {workflow_name} after {timeout:.0f}s")
+                    return None
+                time.sleep(interval)
+                interval = min(interval * 1.5, MAX_INTERVAL)
+
+    def wait_for_completion(self, run: dict[str, Any], timeout: float = DEPLOY_TIMEOUT) -> Optional[dict[str, Any]]:
+        """The run once completed, polled faster after each change of status, None on timeout"""
+        with span("github.wait_completion", run_id=run["id"]) as attributes:
+            deadline = time.monotonic() + timeout
+            interval = MIN_INTERVAL
+            while run.get("status") != "completed":
+                if time.monotonic() + interval > deadline:
+                    logger.warning(f"[github] run {run['id']} still {run.get('status')} after {timeout:.0f}s")
+                    return None
+                time.sleep(interval)
+                current = self.request(run["url"]) or run
+                interval = MIN_INTERVAL if current.get("status") != run.get("status") else min(
+                    interval * 1.5, MAX_INTERVAL)
+                run = current
+            attributes["conclusion"] = run.get("conclusion")
+        if run.get("run_started_at") and run.get("updated_at"):
+            duration = github_time(run["updated_at"]) - github_time(run["run_started_at"])
+            logger.info(f"[github] run {run['id']} {run.get('conclusion')} in {duration.total_seconds():.0f}s")
+        return run
 
     def cancel(self, run_url: str):
-        github_secret = env.get_global_secret(resource="github", name="token")
         url = f"{run_url}/cancel"
-        response = requests.post(
-            url,
-            headers={
-                "Accept": "application/vnd.github+json",
-                "X-GitHub-Api-Version": "2022-11-28",
-                "Authorization": f"Bearer {github_secret}",
-            },
-        )
-        if response is None:
+        try:
+            response = self.session.post(url)
+        except requests.RequestException as e:
+            logger.warning(f"[github] could not cancel {run_url}: {e}")
+            return CommandResponse.fail()
+        if response.status_code >= 300:
+            logger.warning(f"[github] could not cancel {run_url} ({response.status_code}): {response.text}")
             return CommandResponse.fail()
-        response = response.json()
-        return response
+        return response.json()
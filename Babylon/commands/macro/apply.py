@@ -3,9 +3,9 @@ import click
 import pathlib
 
 from logging import getLogger
-from click import Path, argument, command
+from click import Path, argument, command, option
 from Babylon.utils.environment import Environment
-from Babylon.utils.decorators import injectcontext
+from Babylon.utils.decorators import injectcontext, with_metrics
 from Babylon.commands.macro.deploy_webapp import deploy_swa
 from Babylon.commands.macro.deploy_dataset import deploy_dataset
 from Babylon.commands.macro.deploy_solution import deploy_solution
@@ -17,9 +17,14 @@ env = Environment()
 
 
 @command()
+@with_metrics
 @injectcontext()
 @argument("deploy_dir", type=Path(dir_okay=True, exists=True))
-def apply(deploy_dir: pathlib.Path):
+@option("--wait-webapp",
+        "wait_webapp",
+        is_flag=True,
+        help="Wait for the github workflow deploying the webapp and report its result")
+def apply(deploy_dir: pathlib.Path, wait_webapp: bool = False):
     """Macro Apply"""
     env.check_environ(["BABYLON_SERVICE", "BABYLON_TOKEN", "BABYLON_ORG_NAME"])
     files = list(pathlib.Path(deploy_dir).iterdir())
@@ -55,7 +60,7 @@ def apply(deploy_dir: pathlib.Path):
     for swa in webapps:
         content = swa.get('content')
         namespace = swa.get('namespace')
-        deploy_swa(namespace=namespace, file_content=content)
+        deploy_swa(namespace=namespace, file_content=content, wait=wait_webapp)
 
     for w in workspaces:
         content = w.get('content')
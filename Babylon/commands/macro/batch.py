@@ -0,0 +1,57 @@
+import json
+import click
+
+from logging import getLogger
+from typing import Any, Optional
+from click import File, argument, command, option
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.command_helper import parse_batch, run_batch
+
+logger = getLogger("Babylon")
+
+
+@command()
+@argument("batch_file", type=File("r"), default="-")
+@option("--parallel",
+        "parallel",
+        default=1,
+        show_default=True,
+        help="Maximum number of read only commands of a same stage running concurrently")
+@option("--keep-going", "keep_going", is_flag=True, help="Run the next stages even if a command failed")
+@option("--results",
+        "results_file",
+        type=File("w"),
+        help="Write one json result per command in this file instead of the standard output")
+def batch(batch_file: Any, parallel: int, keep_going: bool, results_file: Optional[Any] = None) -> CommandResponse:
+    """
+    Run the babylon commands listed in BATCH_FILE (or stdin) in a single process
+
+    \b
+    One command line per line, `babylon` prefix optional, or one json object
+    per line: {"id": "orgs", "args": ["api", "organizations", "get_all"]}.
+    Blank lines separate stages: commands of a stage are independent, stages
+    run in order. With --parallel, the read only commands of a stage (gets and
+    listings) run concurrently, the others run one at a time after them.
+    Command outputs are not printed, each result is a json line.
+    A json array is also accepted, each item being a command or a list of commands (a stage).
+    Commands of a stage share the current namespace: use -c/-p/-s in separate stages.
+    """
+    stages = parse_batch(batch_file.read())
+    babylon = click.get_current_context().find_root().command
+
+    def emit(result: dict[str, Any]):
+        line = json.dumps(result, default=str, ensure_ascii=False)
+        if results_file:
+            results_file.write(f"{line}\n")
+            results_file.flush()
+        else:
+            click.echo(line)
+
+    results = run_batch(babylon, stages, parallel=parallel, keep_going=keep_going, emit=emit)
+    count = sum(len(s) for s in stages)
+    failed = [r["id"] for r in results if r["status_code"] != CommandResponse.STATUS_OK]
+    logger.info(f"{len(results)}/{count} commands run, {len(failed)} failed")
+    summary = dict(total=count, run=len(results), failed=failed)
+    if failed or len(results) < count:
+        return CommandResponse.fail(data=summary)
+    return CommandResponse.success(summary)
@@ -11,11 +11,13 @@ from Babylon.utils.environment import Environment
 from Babylon.utils.credentials import get_azure_token
 from Babylon.commands.api.datasets.services.datasets_api_svc import DatasetService
 from Babylon.commands.api.datasets.services.datasets_storage_svc import DatasetStorageService
+from Babylon.utils.tracing import traced
 
 logger = getLogger("Babylon")
 env = Environment()
 
 
+@traced()
 def deploy_dataset(namespace: str, file_content: str, deploy_dir: pathlib.Path) -> dict:
     _ret = [""]
     _ret.append("Dataset deployment")
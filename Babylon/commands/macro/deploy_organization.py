@@ -6,15 +6,18 @@ from logging import getLogger
 
 import click
 from Babylon.utils.environment import Environment
+from Babylon.utils.logs import LazyJson
 from Babylon.utils.credentials import get_azure_token
 from Babylon.commands.api.organizations.services.organization_api_svc import OrganizationService
 from Babylon.commands.azure.storage.services.storage_container_svc import (
     AzureStorageContainerService, )
+from Babylon.utils.tracing import traced
 
 logger = getLogger("Babylon")
 env = Environment()
 
 
+@traced()
 def deploy_organization(namespace: str, file_content: str):
     _ret = [""]
     _ret.append("Organization deployment")
@@ -38,7 +41,7 @@ def deploy_organization(namespace: str, file_content: str):
         response = organization_service.create()
         organization = response.json()
         logger.info(f"[api] organization {organization['id']} successfully created")
-        logger.info(json.dumps(organization, indent=2))
+        logger.debug("%s", LazyJson(organization))
         service = AzureStorageContainerService(state=state, blob_client=env.blob_client)
         service.create(name=organization.get("id"))
     else:
@@ -49,7 +52,7 @@ def deploy_organization(namespace: str, file_content: str):
         security_spec = organization_service.update_security(old_security=old_security)
         response_json["security"] = security_spec
         organization = response_json
-        logger.info(json.dumps(organization, indent=2))
+        logger.debug("%s", LazyJson(organization))
     state["services"]["api"]["organization_id"] = organization.get("id")
     env.store_state_in_local(state)
     env.store_state_in_cloud(state)
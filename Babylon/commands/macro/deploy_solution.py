@@ -9,14 +9,17 @@ from posixpath import basename
 
 import click
 from Babylon.utils.environment import Environment
+from Babylon.utils.logs import LazyJson
 from Babylon.utils.credentials import get_azure_token
 from Babylon.commands.api.solutions.services.solutions_api_svc import SolutionService
 from Babylon.commands.api.solutions.services.solutions_handler_svc import SolutionHandleService
+from Babylon.utils.tracing import traced
 
 logger = getLogger("Babylon")
 env = Environment()
 
 
+@traced()
 def deploy_solution(namespace: str, file_content: str, deploy_dir: pathlib.Path) -> bool:
     _ret = [""]
     _ret.append("Solution deployment")
@@ -40,7 +43,7 @@ def deploy_solution(namespace: str, file_content: str, deploy_dir: pathlib.Path)
         response = solution_svc.create()
         solution = response.json()
         logger.info(f"Solution {solution['id']} successfully created...")
-        logger.info(json.dumps(solution, indent=2))
+        logger.debug("%s", LazyJson(solution))
     else:
         logger.info("Updating solution...")
         response = solution_svc.update()
@@ -49,7 +52,7 @@ def deploy_solution(namespace: str, file_content: str, deploy_dir: pathlib.Path)
         security_spec = solution_svc.update_security(old_security=old_security)
         response_json["security"] = security_spec
         solution = response_json
-        logger.info(json.dumps(solution, indent=2))
+        logger.debug("%s", LazyJson(solution))
     state["services"]["api"]["solution_id"] = solution.get("id")
     env.store_state_in_local(state)
     env.store_state_in_cloud(state)
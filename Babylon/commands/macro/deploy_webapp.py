@@ -1,29 +1,30 @@
 import os
 import json
-import time
 import click
 import yaml
-import shutil
 
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
 from logging import getLogger
 from Babylon.utils.environment import Environment
 from azure.mgmt.resource import ResourceManagementClient
 from Babylon.commands.azure.arm.services.arm_api_svc import ArmService
-from Babylon.commands.webapp.service.webapp_api_svc import AzureWebAppService
-from Babylon.commands.git_hub.runs.service.github_api_svc import GitHubRunsService
+from Babylon.commands.webapp.service.webapp_api_svc import AzureWebAppService, add_import_env_step
+from Babylon.commands.webapp.service.github_commit_svc import GitHubCommitService
+from Babylon.commands.git_hub.runs.service.github_api_svc import RUN_TIMEOUT, GitHubRunsService
 from Babylon.commands.azure.ad.services.ad_app_svc import AzureDirectoyAppService
 from Babylon.utils.credentials import get_azure_credentials, get_azure_token
 from Babylon.commands.azure.staticwebapp.services.swa_api_svc import AzureSWAService
 from Babylon.commands.azure.ad.services.ad_member_svc import AzureDirectoyMemberService
 from Babylon.commands.azure.ad.services.ad_password_svc import AzureDirectoyPasswordService
 from Babylon.commands.azure.staticwebapp.services.swa_app_settings_svc import AzureSWASettingsAppService
+from Babylon.utils.tracing import traced
 
 logger = getLogger("Babylon")
 env = Environment()
 
 
-def deploy_swa(namespace: str, file_content: str):
+@traced()
+def deploy_swa(namespace: str, file_content: str, wait: bool = False):
     _ret = [""]
     _ret.append("Webapp deployment")
     _ret.append("")
@@ -82,39 +83,44 @@ def deploy_swa(namespace: str, file_content: str):
     swa_name = payload.get('name', "")
     swa = dict()
     if payload:
-        webapp_path = Path().cwd() / "webapp_src"
         azure_token = get_azure_token()
         del payload['name']
         swa_svc = AzureSWAService(azure_token=azure_token, state=state.get('services'))
+        github_svc = GitHubRunsService(state=state.get('services'))
         swas = swa_svc.get_all(filter="[].name")
         if len(swas) == 0 or swa_name not in swas:
             print("webapp not found")
             payload_str = json.dumps(obj=payload, indent=4, ensure_ascii=True)
+            # margin for the clock difference with github
+            created = datetime.now(timezone.utc) - timedelta(minutes=1)
             swa = swa_svc.create(webapp_name=swa_name, details=payload_str)
             state['services']['webapp']['webapp_name'] = swa_name
             state['services']['webapp']['static_domain'] = swa["properties"]['defaultHostname']
-            time.sleep(5)
-            github_svc = GitHubRunsService(state=state.get('services'))
+            # azure pushes the workflow of the new webapp, its run deploys the webapp before it is configured
             workflow_name = swa["properties"]['defaultHostname'].split(".")[0]
-            workflow_github = github_svc.get(workflow_name=workflow_name)
-            if workflow_github:
-                github_svc.cancel(run_url=workflow_github)
-            time.sleep(5)
+            run = github_svc.wait_for_run(workflow_name=workflow_name, since=created, event="push")
+            if run:
+                github_svc.cancel(run_url=run["url"])
+                github_svc.wait_for_completion(run, timeout=RUN_TIMEOUT)
         workflow_name = state['services']['webapp']['static_domain'].split(".")[0]
+        workflow_name_full = f"azure-static-web-apps-{workflow_name}.yml"
         webapp_svc = AzureWebAppService(state=state.get('services'))
-        webapp_svc.download(webapp_path)
+        # config.json and the workflow are committed together through the GitHub API, without a clone
+        commit_svc = GitHubCommitService(state=state.get('services'))
         config = yaml.dump(sidecars.get('config', {}))
-        c_path = Path().cwd() / "webapp_src/config.json"
-        webapp_svc.export_config(data=config, config_path=c_path)
-        time.sleep(5)
-        workflow_name_full = f"azure-static-web-apps-{workflow_name}.yml"
-        workflow_file = Path().cwd() / f"webapp_src/.github/workflows/{workflow_name_full}"
-        if workflow_file.exists():
-            webapp_svc.update_workflow(workflow_file=workflow_file)
-            config_file = Path().cwd() / "webapp_src/config.json"
-            webapp_svc.upload_many([workflow_file, config_file])
-            time.sleep(5)
-        shutil.rmtree(path=webapp_path)
+        workflow_path = f".github/workflows/{workflow_name_full}"
+        workflow = commit_svc.get_file(workflow_path)
+        if workflow:
+            files = {"config.json": webapp_svc.render_config(data=config)}
+            updated = add_import_env_step(workflow[1].decode("utf-8"))
+            if updated is not None:
+                files[workflow_path] = updated.encode("utf-8")
+            commit_sha = commit_svc.commit_files(files, message="Babylon: updated webapp configuration")
+            if commit_sha and wait:
+                run = github_svc.wait_for_run(workflow_name=workflow_name, head_sha=commit_sha)
+                run = github_svc.wait_for_completion(run) if run else None
+                if not run or run.get("conclusion") != "success":
+                    logger.error(f"[github] webapp deployment {run.get('conclusion') if run else 'not found'}")
         env.store_state_in_local(state)
         env.store_state_in_cloud(state)
     powerbi = sidecars.get('powerbi', {})
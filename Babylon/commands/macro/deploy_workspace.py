@@ -7,11 +7,13 @@ from logging import getLogger
 
 import click
 from Babylon.utils.environment import Environment
+from Babylon.utils.logs import LazyJson
 from azure.mgmt.kusto import KustoManagementClient
 from azure.mgmt.resource import ResourceManagementClient
 from Babylon.commands.azure.arm.services.arm_api_svc import ArmService
 from azure.mgmt.authorization import AuthorizationManagementClient
 from Babylon.commands.azure.adx.services.adx_script_svc import AdxScriptService
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
 from Babylon.commands.api.workspaces.services.workspaces_api_svc import WorkspaceService
 from Babylon.commands.azure.permission.services.iam_api_svc import AzureIamService
 from Babylon.commands.azure.adx.services.adx_consumer_svc import AdxConsumerService
@@ -30,11 +32,13 @@ from Babylon.utils.credentials import (
 )
 from Babylon.commands.powerbi.workspace.services.powerb__worskapce_users_svc import (
     AzurePowerBIWorkspaceUserService, )
+from Babylon.utils.tracing import traced
 
 logger = getLogger("Babylon")
 env = Environment()
 
 
+@traced()
 def deploy_workspace(namespace: str, file_content: str, deploy_dir: pathlib.Path) -> bool:
     _ret = [""]
     _ret.append("Workspace deployment")
@@ -64,7 +68,7 @@ def deploy_workspace(namespace: str, file_content: str, deploy_dir: pathlib.Path
         response = workspace_svc.create()
         workspace = response.json()
         logger.info(f"[api] workspace {workspace.get('id')} successfully created")
-        logger.info(json.dumps(workspace, indent=2))
+        logger.debug("%s", LazyJson(workspace))
         state["services"]["api"]["workspace_id"] = workspace.get("id")
     else:
         logger.info(f"[api] updating workspace {state['services']['api']['workspace_id']}")
@@ -74,7 +78,7 @@ def deploy_workspace(namespace: str, file_content: str, deploy_dir: pathlib.Path
         security_spec = workspace_svc.update_security(old_security=old_security)
         response_json["security"] = security_spec
         workspace = response_json
-        logger.info(json.dumps(workspace, indent=2))
+        logger.debug("%s", LazyJson(workspace))
     env.store_state_in_local(state)
     env.store_state_in_cloud(state)
     # update sidecars
@@ -175,43 +179,31 @@ def deploy_workspace(namespace: str, file_content: str, deploy_dir: pathlib.Path
         kusto_client = KustoManagementClient(credential=azure_credential, subscription_id=subscription_id)
         adx_svc = AdxDatabaseService(kusto_client=kusto_client, state=state["services"])
         name = f"{organization_id}-{work_key}"
+        command_svc = None
+        if adx_section.get("database").get("data_plane", False) and state["services"]["adx"].get("cluster_uri"):
+            command_svc = AdxCommandService(azure_token=get_azure_token("adx"),
+                                            state=state["services"],
+                                            database_name=name)
         available = adx_svc.check(name=name)
         to_create = adx_section.get("database").get("create", True)
         if available and to_create:
             logger.info("[adx] creating or updating adx database")
-            created = adx_svc.create(name=name, retention=adx_section.get("database").get("retention", 365))
+            created = adx_svc.create(name=name,
+                                     retention=adx_section.get("database").get("retention", 365),
+                                     command_svc=command_svc)
             if created:
                 available = False
         if not available:
             permission_svc = AdxPermissionService(kusto_client=kusto_client, state=state.get("services"))
-            existing_permissions = permission_svc.get_all()
-            existing_ids = [ent.get("principal_id") for ent in existing_permissions]
             spec_permissions: list = adx_section["database"].get("permissions", [])
             if len(spec_permissions):
-                ids = [i.get("principal_id") for i in spec_permissions]
-                for g in spec_permissions:
-                    if g.get("principal_id") in existing_ids:
-                        deleted = permission_svc.delete(g.get("principal_id"), force_validation=True)
-                        if deleted:
-                            permission_svc.set(
-                                principal_id=g.get("principal_id"),
-                                principal_type=g.get("type"),
-                                role=g.get("role"),
-                                tenant_id=g.get("tenant_id", env.tenant_id),
-                            )
-                    if g.get("principal_id") not in existing_ids:
-                        permission_svc.set(
-                            principal_id=g.get("principal_id"),
-                            principal_type=g.get("type"),
-                            role=g.get("role"),
-                            tenant_id=g.get("tenant_id", env.tenant_id),
-                        )
-                for s in existing_ids:
-                    if s not in ids:
-                        if s != state["services"]["babylon"]["client_id"]:
-                            permission_svc.delete(s, force_validation=True)
+                permission_svc.reconcile(spec_permissions=spec_permissions,
+                                         tenant_id=env.tenant_id,
+                                         keep_ids=[state["services"]["babylon"]["client_id"]])
         if ok:
-            scripts_svc = AdxScriptService(kusto_client=kusto_client, state=state.get("services"))
+            scripts_svc = AdxScriptService(kusto_client=kusto_client,
+                                           state=state.get("services"),
+                                           command_svc=command_svc)
             script_list = scripts_svc.get_all()
             scripts_spec: list[dict] = adx_section.get("database").get("scripts", [])
             if len(scripts_spec):
@@ -22,7 +22,7 @@ from Babylon.utils.credentials import (
     get_powerbi_token,
     get_azure_credentials,
 )
-from Babylon.utils.decorators import injectcontext, retrieve_state
+from Babylon.utils.decorators import injectcontext, retrieve_state, with_metrics
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.yaml_utils import yaml_to_json
 
@@ -31,6 +31,7 @@ env = Environment()
 
 
 @command()
+@with_metrics
 @injectcontext()
 @pass_azure_token("csm_api")
 @retrieve_state
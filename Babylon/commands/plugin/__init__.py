@@ -4,6 +4,7 @@ from click.core import Context
 from .activate import activate
 from .add import add
 from .deactivate import deactivate
+from .list import list
 from .remove import remove
 
 list_commands = [
@@ -11,6 +12,7 @@ list_commands = [
     deactivate,
     activate,
     add,
+    list,
 ]
 
 
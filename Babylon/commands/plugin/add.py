@@ -4,7 +4,7 @@ import click
 
 from click import argument
 from click import command
-from Babylon.utils.environment import Environment
+from Babylon.utils.plugins import PluginConfig
 from Babylon.utils.response import CommandResponse
 
 logger = logging.getLogger("Babylon")
@@ -16,8 +16,7 @@ def add(plugin_path: pathlib.Path) -> CommandResponse:
     """
     Add a plugin found at PLUGIN_PATH
     """
-    config = Environment().configuration
-    plugin_name = config.add_plugin(plugin_path)
+    plugin_name = PluginConfig().add_plugin(plugin_path)
     if plugin_name:
         logger.info(f"Plugin {plugin_name} was added to config")
         return CommandResponse.success()
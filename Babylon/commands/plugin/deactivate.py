@@ -2,7 +2,7 @@ import logging
 
 from click import argument
 from click import command
-from Babylon.utils.environment import Environment
+from Babylon.utils.plugins import PluginConfig, plugin_manifest
 from Babylon.utils.response import CommandResponse
 
 logger = logging.getLogger("Babylon")
@@ -14,10 +14,9 @@ def deactivate(plugin: str) -> CommandResponse:
     """
     Deactivate PLUGIN
     """
-    config = Environment().configuration
-    plugins = list(config.get_available_plugin())
+    plugins = [p["plugin"] for p in plugin_manifest()]
     if plugin in plugins:
-        config.deactivate_plugin(plugin)
+        PluginConfig().set_active(plugin, False)
         logger.info(f"Plugin {plugin} was deactivated")
         return CommandResponse.success()
     logger.error(f"Plugin {plugin} does not exists")
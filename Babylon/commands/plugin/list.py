@@ -0,0 +1,21 @@
+import logging
+
+from click import command
+from click import option
+from Babylon.utils.plugins import plugin_manifest
+from Babylon.utils.response import CommandResponse
+
+logger = logging.getLogger("Babylon")
+
+
+@command()
+@option("--refresh", "refresh", is_flag=True, help="Import the plugins again instead of reading the manifest")
+def list(refresh: bool = False) -> CommandResponse:
+    """
+    List plugins with their commands
+    """
+    plugins = plugin_manifest(refresh=refresh)
+    for p in plugins:
+        state = "active" if p.get("active", True) else "inactive"
+        logger.info(f"{p['plugin']} ({state}): babylon {p['name']} {', '.join(p['commands'])}")
+    return CommandResponse.success({p["plugin"]: p for p in plugins})
@@ -2,7 +2,7 @@ import logging
 
 from click import argument
 from click import command
-from Babylon.utils.environment import Environment
+from Babylon.utils.plugins import PluginConfig, entry_point_plugins
 from Babylon.utils.response import CommandResponse
 
 logger = logging.getLogger("Babylon")
@@ -14,11 +14,13 @@ def remove(plugin: str) -> CommandResponse:
     """
     Remove PLUGIN
     """
-    config = Environment().configuration
-    plugins = list(config.get_available_plugin())
-    if plugin in plugins:
+    config = PluginConfig()
+    if config.get(plugin) and config.get(plugin).get("path"):
         config.remove_plugin(plugin)
         logger.info(f"Plugin {plugin} was removed")
         return CommandResponse.success()
+    if plugin in entry_point_plugins():
+        logger.error(f"Plugin {plugin} is an installed package, uninstall it or deactivate it")
+        return CommandResponse.fail()
     logger.error(f"Plugin {plugin} does not exists")
     return CommandResponse.fail()
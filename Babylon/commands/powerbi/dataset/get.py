@@ -7,6 +7,7 @@ from click import argument
 from Babylon.commands.powerbi.dataset.services.powerbi_api_svc import AzurePowerBIDatasetService
 from Babylon.utils.decorators import retrieve_state, injectcontext
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 
 from Babylon.utils.credentials import pass_powerbi_token
@@ -20,6 +21,7 @@ logger = logging.getLogger("Babylon")
 @argument("dataset_id", type=str)
 @option("--workspace-id", "workspace_id", help="PowerBI workspace ID", type=str)
 @output_to_file
+@read_only
 @retrieve_state
 def get(
     state: Any,
@@ -6,6 +6,7 @@ from click import option
 from Babylon.commands.powerbi.dataset.services.powerbi_api_svc import AzurePowerBIDatasetService
 from Babylon.utils.decorators import retrieve_state, injectcontext
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_powerbi_token
 
@@ -18,6 +19,7 @@ logger = logging.getLogger("Babylon")
 @pass_powerbi_token()
 @option("--workspace-id", "workspace_id", help="PowerBI workspace ID", type=str)
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
 def get_all(state: Any, powerbi_token: str, workspace_id: str, filter: Optional[str] = None) -> CommandResponse:
     """Get a list of all powerbi datasets in the current workspace"""
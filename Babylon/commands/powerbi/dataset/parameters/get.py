@@ -7,6 +7,7 @@ from click import option
 from Babylon.commands.powerbi.dataset.services.powerbi_params_svc import AzurePowerBIParamsService
 from Babylon.utils.decorators import retrieve_state, injectcontext
 from Babylon.utils.decorators import output_to_file
+from Babylon.utils.decorators import read_only
 from Babylon.utils.response import CommandResponse
 
 from Babylon.utils.credentials import pass_powerbi_token
@@ -21,6 +22,7 @@ logger = logging.getLogger("Babylon")
 @option("--workspace-id", "workspace_id", type=str, help="PowerBI workspace ID")
 @argument("dataset_id", type=str)
 @option("--workspace-id", "workspace_id", type=str, help="PowerBI workspace ID")
+@read_only
 @retrieve_state
 def get(
     state: Any,
@@ -13,6 +13,7 @@ from Babylon.utils.decorators import (
     output_to_file,
     retrieve_state,
     injectcontext,
+    read_only,
 )
 
 logger = logging.getLogger("Babylon")
@@ -25,6 +26,7 @@ env = Environment()
 @pass_powerbi_token()
 @option("--workspace-id", "workspace_id", help="PowerBI workspace ID", type=str)
 @argument("report_id", type=str)
+@read_only
 @retrieve_state
 def get(
     state: Any,
@@ -8,6 +8,7 @@ from Babylon.commands.powerbi.report.service.powerbi_report_api_svc import Azure
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_powerbi_token
 from Babylon.utils.decorators import output_to_file, retrieve_state, injectcontext
+from Babylon.utils.decorators import read_only
 
 logger = logging.getLogger("Babylon")
 
@@ -18,6 +19,7 @@ logger = logging.getLogger("Babylon")
 @pass_powerbi_token()
 @option("--workspace-id", "workspace_id", help="PowerBI workspace ID", type=str)
 @option("--filter", "filter", help="Filter response with a jmespath query")
+@read_only
 @retrieve_state
 def get_all(state: Any, powerbi_token: str, workspace_id: str, filter: Optional[str] = None) -> CommandResponse:
     """
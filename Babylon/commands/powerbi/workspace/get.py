@@ -11,6 +11,7 @@ from Babylon.utils.credentials import pass_powerbi_token
 from Babylon.utils.decorators import (
     retrieve_state,
     injectcontext,
+    read_only,
 )
 
 logger = logging.getLogger("Babylon")
@@ -22,6 +23,7 @@ env = Environment()
 @pass_powerbi_token()
 @option("--workspace-id", "workspace_id", help="PowerBI workspace ID", type=str)
 @option("--name", "name", help="PowerBI workspace name", type=str)
+@read_only
 @retrieve_state
 def get(
     state: Any,
@@ -1,11 +1,12 @@
 import logging
 
-from typing import Optional
+from typing import Any, Callable, Optional
 from click import command
 from click import option
 from Babylon.commands.powerbi.workspace.services.powerbi_workspace_api_svc import AzurePowerBIWorkspaceService
 from Babylon.utils.response import CommandResponse
-from Babylon.utils.decorators import output_to_file, injectcontext
+from Babylon.utils.decorators import output_to_stream, injectcontext
+from Babylon.utils.listing import ItemFilter, list_response
 from Babylon.utils.credentials import pass_powerbi_token
 
 logger = logging.getLogger("Babylon")
@@ -13,13 +14,16 @@ logger = logging.getLogger("Babylon")
 
 @command()
 @injectcontext()
-@output_to_file
+@output_to_stream
 @pass_powerbi_token()
 @option("--filter", "filter", help="Filter response with a jmespath query")
-def get_all(powerbi_token: str, filter: Optional[str] = None) -> CommandResponse:
+def get_all(powerbi_token: str,
+            filter: Optional[str] = None,
+            sink: Optional[Callable[[Any], None]] = None) -> CommandResponse:
     """
     Get all workspace information for the given account
+    Filters like `[?name=='value']` are applied by Power BI
     """
     service = AzurePowerBIWorkspaceService(powerbi_token=powerbi_token)
-    response = service.get_all(filter=filter)
-    return CommandResponse.success(response, verbose=True)
+    item_filter = ItemFilter(filter)
+    return list_response(service.iter_all(item_filter), sink, item_filter)
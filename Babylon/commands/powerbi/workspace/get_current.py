@@ -6,6 +6,7 @@ from Babylon.commands.powerbi.workspace.services.powerbi_workspace_api_svc impor
 from Babylon.utils.decorators import (
     retrieve_state,
     injectcontext,
+    read_only,
 )
 from Babylon.utils.response import CommandResponse
 from Babylon.utils.credentials import pass_powerbi_token
@@ -16,6 +17,7 @@ logger = logging.getLogger("Babylon")
 @command()
 @injectcontext()
 @pass_powerbi_token()
+@read_only
 @retrieve_state
 def get_current(
     state: Any,
@@ -1,6 +1,8 @@
 import logging
 import jmespath
 
+from typing import Optional
+from Babylon.utils.listing import ItemFilter, iter_next_link
 from Babylon.utils.request import oauth_request
 from Babylon.utils.environment import Environment
 from Babylon.utils.response import CommandResponse
@@ -52,6 +54,13 @@ class AzurePowerBIWorkspaceService:
             output_data = jmespath.search(filter, output_data)
         return output_data
 
+    def iter_all(self, item_filter: Optional[ItemFilter] = None):
+        """Iterate over all workspaces, the filter is sent as odata $filter when possible"""
+        url_groups = "https://api.powerbi.com/v1.0/myorg/groups"
+        odata = item_filter.odata() if item_filter else None
+        params = {"$filter": odata} if odata else None
+        return iter_next_link(url_groups, self.powerbi_token, params=params)
+
     def get_current(self):
         workspace_id = self.state["powerbi"]["workspace"]["id"]
         url_groups = 'https://api.powerbi.com/v1.0/myorg/groups'
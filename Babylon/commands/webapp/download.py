@@ -4,6 +4,7 @@ import pathlib
 from typing import Any
 from click import command
 from click import argument
+from click import option
 from click import Path
 from Babylon.commands.webapp.service.webapp_api_svc import AzureWebAppService
 from Babylon.utils.environment import Environment
@@ -17,12 +18,13 @@ env = Environment()
 @command()
 @injectcontext()
 @argument("destination_folder", type=Path(path_type=pathlib.Path))
+@option("--path", "paths", multiple=True, help="Only check out this file or folder of the repository")
 @retrieve_state
-def download(state: Any, destination_folder: pathlib.Path) -> CommandResponse:
+def download(state: Any, destination_folder: pathlib.Path, paths: tuple[str, ...]) -> CommandResponse:
     """
     Download the github repository locally
     """
     service_state = state['services']
     service = AzureWebAppService(state=service_state)
-    service.download(destination_folder=destination_folder)
+    service.download(destination_folder=destination_folder, paths=list(paths))
     return CommandResponse.success()
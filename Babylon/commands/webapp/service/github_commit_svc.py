@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import logging
+
+from typing import Optional
+from Babylon.utils.request import oauth_request
+from Babylon.utils.environment import Environment
+
+logger = logging.getLogger("Babylon")
+env = Environment()
+
+GITHUB_API = "https://api.github.com"
+GITHUB_HEADERS = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+# attempts when the branch moves between the read of its head and the ref update
+MAX_ATTEMPTS = 3
+
+
+def blob_sha(content: bytes) -> str:
+    """Sha of a file content as computed by git"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class GitHubCommitService:
+    """
+    Commits files to the webapp repository through the GitHub Git Data API, without a clone
+
+    All files go in a single commit built on the head of the branch. Files whose blob sha is
+    already the one of the branch are left out, and nothing is committed when no file changed, so
+    no pointless workflow run is triggered
+    """
+
+    def __init__(self, state: dict = None) -> None:
+        self.state = state
+        self.branch = self.state["github"]["branch"]
+        self.repo_url = (f"{GITHUB_API}/repos/{self.state['github']['organization']}/"
+                         f"{self.state['github']['repository']}")
+        self.token = env.get_global_secret(resource="github", name="token")
+
+    def request(self, path: str, type: str = "GET", **kwargs):
+        return oauth_request(f"{self.repo_url}{path}", self.token, type=type, headers=GITHUB_HEADERS, **kwargs)
+
+    def head(self) -> Optional[tuple[str, str]]:
+        """Sha of the last commit of the branch and of its tree"""
+        ref = self.request(f"/git/ref/heads/{self.branch}")
+        if ref is None:
+            logger.error(f"[github] branch {self.branch} not found")
+            return None
+        commit_sha = ref.json()["object"]["sha"]
+        commit = self.request(f"/git/commits/{commit_sha}")
+        if commit is None:
+            return None
+        return commit_sha, commit.json()["tree"]["sha"]
+
+    def get_file(self, path: str, ref: Optional[str] = None) -> Optional[tuple[str, bytes]]:
+        """Blob sha and content of a file of the branch, None when the file does not exist"""
+        response = self.request(f"/contents/{path}", params=dict(ref=ref or self.branch))
+        if response is None:
+            return None
+        data = response.json()
+        return data["sha"], base64.b64decode(data.get("content", ""))
+
+    def commit_files(self, files: dict[str, bytes], message: str) -> Optional[str]:
+        """
+        Commit files given by path in the repository in a single commit
+        :return: the sha of the new commit, an empty string when nothing changed, None when the commit failed
+        """
+        for _ in range(MAX_ATTEMPTS):
+            head = self.head()
+            if head is None:
+                return None
+            commit_sha, tree_sha = head
+            changed = dict()
+            for path, content in files.items():
+                existing = self.get_file(path, ref=commit_sha)
+                if existing and existing[0] == blob_sha(content):
+                    logger.info(f"[github] {path} is unchanged")
+                    continue
+                changed[path] = content
+            if not changed:
+                logger.info("[github] no changes to commit")
+                return ""
+            entries = [self.tree_entry(path, content) for path, content in changed.items()]
+            if None in entries:
+                return None
+            tree = self.request("/git/trees", type="POST", json=dict(base_tree=tree_sha, tree=entries))
+            if tree is None:
+                return None
+            commit = self.request("/git/commits",
+                                  type="POST",
+                                  json=dict(message=message, tree=tree.json()["sha"], parents=[commit_sha]))
+            if commit is None:
+                return None
+            new_sha = commit.json()["sha"]
+            # fails when the branch moved since its head was read, the commit is then rebuilt on the new head
+            if self.request(f"/git/refs/heads/{self.branch}", type="PATCH", json=dict(sha=new_sha,
+                                                                                      force=False)) is not None:
+                logger.info(f"[github] {', '.join(changed)} committed in {new_sha[:7]} on {self.branch}")
+                return new_sha
+            logger.warning(f"[github] branch {self.branch} was updated meanwhile, retrying")
+        logger.error(f"[github] could not update branch {self.branch}")
+        return None
+
+    def tree_entry(self, path: str, content: bytes) -> Optional[dict]:
+        entry = dict(path=path, mode="100644", type="blob")
+        try:
+            # text files are sent inline with the tree, binary files need a blob first
+            return dict(entry, content=content.decode("utf-8"))
+        except UnicodeDecodeError:
+            pass
+        response = self.request("/git/blobs",
+                                type="POST",
+                                json=dict(content=base64.b64encode(content).decode("ascii"), encoding="base64"))
+        return dict(entry, sha=response.json()["sha"]) if response is not None else None
@@ -4,6 +4,7 @@ import pathlib
 from typing import Any
 from click import command
 from click import argument
+from click import option
 from click import Path
 from Babylon.commands.webapp.service.webapp_api_svc import AzureWebAppService
 from Babylon.utils.response import CommandResponse
@@ -15,13 +16,16 @@ logger = logging.getLogger("Babylon")
 @command()
 @injectcontext()
 @argument("file", type=Path(path_type=pathlib.Path, exists=True))
+@option("--remote",
+        "remote",
+        is_flag=True,
+        help="Commit through the GitHub API in a single commit, without a local clone")
 @retrieve_state
-def upload_file(state: Any, file: pathlib.Path) -> CommandResponse:
+def upload_file(state: Any, file: pathlib.Path, remote: bool = False) -> CommandResponse:
     """
     Upload a file to the webapp github repository
     """
     # Get parent git repository of the workflow file
     service_state = state['services']
     service = AzureWebAppService(state=service_state)
-    service.upload_file(file=file)
-    return CommandResponse.success()
+    return service.upload_file(file=file, remote=remote)
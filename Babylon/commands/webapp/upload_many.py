@@ -18,10 +18,15 @@ logger = logging.getLogger("Babylon")
         type=(pathlib.Path),
         multiple=True,
         help="Add a combination <Key Value> that will be sent as parameter to all your datasets")
+@option("--remote",
+        "remote",
+        is_flag=True,
+        help="Commit through the GitHub API in a single commit, without a local clone")
 @retrieve_state
 def upload_many(
     state: Any,
     files: Optional[Iterable[pathlib.Path]] = None,
+    remote: bool = False,
 ) -> CommandResponse:
     """
     Upload files to the webapp github repository
@@ -29,5 +34,4 @@ def upload_many(
     # Get parent git repository of the workflow file
     service_state = state['services']
     service = AzureWebAppService(state=service_state)
-    service.upload_many(files=files)
-    return CommandResponse.success()
+    return service.upload_many(files=files, remote=remote)
@@ -9,13 +9,16 @@ from click import echo
 from click import group
 from click import option
 from Babylon.version import VERSION
-from rich.logging import RichHandler
 from Babylon.commands import list_groups
 from Babylon.utils.dry_run import display_dry_run
 from Babylon.utils.environment import Environment
 from Babylon.utils.interactive import interactive_run
 from Babylon.utils.interactive import INTERACTIVE_ARG_VALUE
 from Babylon.utils.decorators import prepend_doc_with_ascii
+from Babylon.utils.tracing import tracer
+from Babylon.utils.cassette import cassette
+from Babylon.utils.logs import LOG_FORMATS, log_pipeline
+from Babylon.utils.plugins import PluginGroup
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -28,7 +31,7 @@ def print_version(ctx, param, value):
     ctx.exit()
 
 
-@group(name='babylon', invoke_without_command=False)
+@group(name='babylon', cls=PluginGroup, invoke_without_command=False)
 @click_log.simple_verbosity_option(logger)
 @option("--bare",
         "--raw",
@@ -55,8 +58,37 @@ def print_version(ctx, param, value):
         is_flag=True,
         hidden=True,
         help="Start an interactive session after command run.")
+@option("--trace",
+        "trace",
+        envvar="BABYLON_TRACE",
+        metavar="FILE|URL",
+        help="Write a Chrome trace (Perfetto) of the command in FILE, or send it to an OTLP/HTTP collector URL.")
+@option("--record-http",
+        "record_http",
+        envvar="BABYLON_RECORD_HTTP",
+        type=click.Path(dir_okay=False),
+        help="Record the http exchanges of the command, without credentials, in a cassette FILE.")
+@option("--replay-http",
+        "replay_http",
+        envvar="BABYLON_REPLAY_HTTP",
+        type=click.Path(dir_okay=False, exists=True),
+        help="Answer the http requests of the command from a cassette FILE instead of the network.")
+@option("--replay-speed",
+        "replay_speed",
+        envvar="BABYLON_REPLAY_SPEED",
+        type=float,
+        default=0,
+        show_default=True,
+        help="Factor applied to the recorded latencies on replay, 0 answers at once, 1 at recorded speed.")
+@option("--log-format",
+        "log_format",
+        envvar="BABYLON_LOG_FORMAT",
+        type=click.Choice(LOG_FORMATS),
+        default="rich",
+        show_default=True,
+        help="Console logs format, compact prints plain lines for machine consumption.")
 @prepend_doc_with_ascii
-def main(tests_mode, interactive):
+def main(tests_mode, interactive, trace, record_http, replay_http, replay_speed, log_format):
     """CLI used for cloud interactions between CosmoTech and multiple cloud environment
 
 The following environment variables are required:
@@ -66,19 +98,22 @@ The following environment variables are required:
 - BABYLON_TOKEN: Access Token Vault Service
 - BABYLON_ORG_NAME: Organization Name
     """
+    # handlers are set once per process, batch and daemon runs invoke this group for every command
+    # and only switch the console handler when a command asks for another format
     if not tests_mode:
         sys.tracebacklimit = 0
-        logfileHandler = logging.FileHandler("./info.log")
-        errorFileHandler = logging.FileHandler("./error.log")
-        errorFileHandler.setLevel(logging.WARNING)
-        logging.basicConfig(format="%(asctime)s | %(message)10s",
-                            handlers=[
-                                logfileHandler, errorFileHandler,
-                                RichHandler(show_time=False,
-                                            rich_tracebacks=True,
-                                            tracebacks_suppress=click,
-                                            omit_repeated_times=False)
-                            ])
+        log_pipeline.start(log_format)
+    # records still queued are written before the output of the command
+    click.get_current_context().call_on_close(log_pipeline.flush)
+    if trace:
+        tracer.enable()
+        click.get_current_context().call_on_close(lambda: tracer.export(trace))
+    if record_http:
+        cassette.record(record_http)
+        click.get_current_context().call_on_close(cassette.stop)
+    elif replay_http:
+        cassette.replay(replay_http, speed=replay_speed)
+        click.get_current_context().call_on_close(cassette.stop)
 
 
 main.result_callback()(interactive_run)
@@ -39,11 +39,15 @@ class ConnectorServiceTestCase(unittest.TestCase):
         result = CliRunner().invoke(get, ["--connector-id", "1"], standalone_mode=False)
         assert result.return_value.data == {"id": "1", "name": "ADT Connector"}
 
-    @mock.patch.object(ConnectorService, 'get_all')
+    @mock.patch.object(ConnectorService, 'iter_all')
     def test_get_all(self, connectorservice_get_all):
-        the_response = Response()
-        the_response._content = b'[{"id": "1", "name": "ADT Connector"}, {"id" : "1", "name": "ADT Connector"}]'
-        connectorservice_get_all.return_value = the_response
+        connectorservice_get_all.return_value = iter([{
+            "id": "1",
+            "name": "ADT Connector"
+        }, {
+            "id": "1",
+            "name": "ADT Connector"
+        }])
 
         result = CliRunner().invoke(get_all, standalone_mode=False)
         assert len(result.return_value.data) == 2
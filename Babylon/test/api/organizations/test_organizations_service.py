@@ -42,12 +42,9 @@ class OrganizationServiceTestCase(unittest.TestCase):
         states = env.get_state_from_local()
         assert states["services"]["api"]["organization_id"] == ""
 
-    @mock.patch.object(OrganizationService, 'get_all')
+    @mock.patch.object(OrganizationService, 'iter_all')
     def test_get_all(self, organizationservice_get_all):
-        the_response = Response()
-        the_response.status_code = 200
-        the_response._content = b'[{"id": "1", "name": "Org 1"}, {"id" : "2", "name": "Org 2"}]'
-        organizationservice_get_all.return_value = the_response
+        organizationservice_get_all.return_value = iter([{"id": "1", "name": "Org 1"}, {"id": "2", "name": "Org 2"}])
 
         result = CliRunner().invoke(get_all, standalone_mode=False)
 
@@ -0,0 +1,56 @@
+import unittest
+from Babylon.test.fake_server import FakeServer
+from Babylon.commands.api.scenarioruns.services.scenariorun_api_svc import LogFollower, ScenarioRunService, follow_runs
+
+RUN_LOGS = ["starting\n", "loading data\n", "simulation step 1\n", "simulation step 2\nwriting res", "ults\n"]
+
+fake = FakeServer()
+polls: dict[str, int] = dict()
+
+
+@fake.route("GET", r".*/(?P<run_id>[\w-]+)/status")
+def get_status(request, run_id):
+    polls[run_id] = polls.get(run_id, 0) + 1
+    state = "Running" if polls[run_id] < len(RUN_LOGS) else ("Failed" if run_id == "sr-2" else "Successful")
+    return 200, {"id": run_id, "state": state}
+
+
+@fake.route("GET", r".*/(?P<run_id>[\w-]+)/cumulatedlogs")
+def get_cumulated_logs(request, run_id):
+    return 200, "".join(RUN_LOGS[:polls[run_id]])
+
+
+@fake.route("GET", r".*/(?P<run_id>[\w-]+)/logs")
+def get_logs(request, run_id):
+    text = "".join(RUN_LOGS[:polls[run_id]])
+    return 200, {"containers": {"main": {"textLog": text}, "other": {"textLog": f"{run_id}\n"}}}
+
+
+class ScenarioRunFollowTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.url = fake.url
+
+    def follower(self, run_id: str, cumulated: bool = False) -> LogFollower:
+        state = {"api": {"url": self.url, "organization_id": "o-1", "scenariorun_id": run_id}}
+        return LogFollower(ScenarioRunService(azure_token="token", state=state), cumulated=cumulated)
+
+    def test_follow(self):
+        lines = []
+        followers = {"sr-1": self.follower("sr-1"), "sr-2": self.follower("sr-2")}
+        states = follow_runs(followers, lambda *line: lines.append(line), interval=0)
+        assert states == {"sr-1": "Successful", "sr-2": "Failed"}
+        for run_id in followers:
+            assert [line for r, c, line in lines if r == run_id and c == "main"] == "".join(RUN_LOGS).splitlines()
+            assert [line for r, c, line in lines if r == run_id and c == "other"] == [run_id]
+
+    def test_follow_cumulated(self):
+        lines = []
+        states = follow_runs({"sr-3": self.follower("sr-3", cumulated=True)},
+                             lambda *line: lines.append(line),
+                             interval=0)
+        assert states == {"sr-3": "Successful"}
+        assert [line for _, _, line in lines] == "".join(RUN_LOGS).splitlines()
@@ -20,11 +20,9 @@ class ScenarioServiceTestCase(unittest.TestCase):
         env.check_environ(["BABYLON_SERVICE", "BABYLON_TOKEN", "BABYLON_ORG_NAME"])
         env.get_namespace_from_local()
 
-    @mock.patch.object(ScenarioService, 'get_all')
+    @mock.patch.object(ScenarioService, 'iter_all')
     def test_get_all(self, mock_get_all):
-        the_response = Response()
-        the_response._content = b'[{"id": "1", "name": "Scenario 1"}, {"id" : "2", "name": "Scenario 2"}]'
-        mock_get_all.return_value = the_response
+        mock_get_all.return_value = iter([{"id": "1", "name": "Scenario 1"}, {"id": "2", "name": "Scenario 2"}])
 
         result = CliRunner().invoke(get_all, ["--organization-id", "1", "--workspace-id", "1"], standalone_mode=False)
 
@@ -41,12 +41,9 @@ class SolutionServiceTestCase(unittest.TestCase):
         states = env.get_state_from_local()
         assert states["services"]["api"]["solution_id"] == ""
 
-    @mock.patch.object(SolutionService, 'get_all')
+    @mock.patch.object(SolutionService, 'iter_all')
     def test_get_all(self, mock_get_all):
-        the_response = Response()
-        the_response.status_code = 200
-        the_response._content = b'[{"id": "1", "name": "Solution 1"}, {"id" : "2", "name": "Solution 2"}]'
-        mock_get_all.return_value = the_response
+        mock_get_all.return_value = iter([{"id": "1", "name": "Solution 1"}, {"id": "2", "name": "Solution 2"}])
 
         result = CliRunner().invoke(get_all, ["--organization-id", "1"], standalone_mode=False)
 
@@ -41,11 +41,9 @@ class SolutionServiceTestCase(unittest.TestCase):
 
         assert result.return_value.data == {"id": "1", "name": "Workspace"}
 
-    @mock.patch.object(WorkspaceService, 'get_all')
+    @mock.patch.object(WorkspaceService, 'iter_all')
     def test_get_all(self, mock_get_all):
-        the_response = Response()
-        the_response._content = b'[{"id": "1", "name": "Workspace 1"}, {"id": "2", "name": "Workspace 2"}]'
-        mock_get_all.return_value = the_response
+        mock_get_all.return_value = iter([{"id": "1", "name": "Workspace 1"}, {"id": "2", "name": "Workspace 2"}])
 
         result = CliRunner().invoke(get_all, ["--organization-id", "1"], standalone_mode=False)
 
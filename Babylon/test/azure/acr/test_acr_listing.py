@@ -0,0 +1,106 @@
+import time
+import threading
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+
+from click import Command, Context
+from azure.containerregistry import ArtifactTagOrder
+from azure.core.exceptions import HttpResponseError
+from Babylon.commands.azure.acr.list import parse_since
+from Babylon.commands.azure.acr.services import acr_api_svc
+from Babylon.commands.azure.acr.services.acr_api_svc import AzureContainerRegistryService
+from Babylon.utils.response import CommandResponse
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class Tag:
+
+    def __init__(self, name: str, days: int) -> None:
+        self.name = name
+        self.last_updated_on = NOW - timedelta(days=days)
+
+
+class FakeRegistry:
+    """Repositories of tags named so that the name order is not the date order"""
+
+    def __init__(self) -> None:
+        self.repositories = {
+            f"simulator-{i}": [Tag("1.10.0", 1), Tag("1.9.0", 5),
+                               Tag("1.2.0", 30), Tag("0.1.0", 90)]
+            for i in range(20)
+        }
+        self.read = 0
+        self.paging = 0.0
+        self.paged = 0.0
+        self.running = 0
+        self.concurrent = 0
+        self.lock = threading.Lock()
+
+    def list_repository_names(self, results_per_page: int = None):
+        for name in self.repositories:
+            time.sleep(self.paging)
+            yield name
+        self.paged = time.time()
+
+    def list_tag_properties(self, repository: str, order_by: str = None, results_per_page: int = None):
+        assert order_by == ArtifactTagOrder.LAST_UPDATED_ON_DESCENDING
+        with self.lock:
+            self.running += 1
+            self.concurrent = max(self.concurrent, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        for tag in sorted(self.repositories[repository], key=lambda t: t.last_updated_on, reverse=True):
+            self.read += 1
+            yield tag
+
+
+class AcrListingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = FakeRegistry()
+        patch = mock.patch.object(acr_api_svc, "get_registry_client", return_value=self.registry)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.service = AzureContainerRegistryService(state=dict(acr=dict(login_server="registry.azurecr.io")))
+        context = Context(Command("list"))
+        context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+
+    def test_list(self):
+        tags = self.service.list(max_workers=4).data
+        assert len(tags) == 20
+        assert tags["simulator-0"] == ["1.10.0", "1.9.0", "1.2.0", "0.1.0"]
+        assert 1 < self.registry.concurrent <= 4
+
+    def test_since_and_top(self):
+        tags = self.service.list(since=NOW - timedelta(days=10)).data
+        assert tags["simulator-3"] == ["1.10.0", "1.9.0"]
+        self.registry.read = 0
+        tags = self.service.list(top=1).data
+        assert tags["simulator-3"] == ["1.10.0"]
+        # the listing of each repository stops at its first tag
+        assert self.registry.read == 20
+
+    def test_streaming(self):
+        self.registry.paging = 0.02
+        with self.assertLogs("Babylon", level="INFO") as logs:
+            self.service.list(max_workers=4)
+        printed = [r.created for r in logs.records if r.getMessage().startswith(" • ")]
+        assert len(printed) == 20
+        # repositories are printed while the next names are paged
+        assert min(printed) < self.registry.paged
+
+    def test_list_failure(self):
+        error = HttpResponseError(message="forbidden")
+        with mock.patch.object(self.registry, "list_repository_names", side_effect=error):
+            response = self.service.list()
+        assert response.status_code == CommandResponse.STATUS_ERROR
+
+    def test_parse_since(self):
+        assert parse_since(None, None, "2024-01-01") == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        since = parse_since(None, None, "7d")
+        assert datetime.now(timezone.utc) - since >= timedelta(days=7)
+        assert parse_since(None, None, None) is None
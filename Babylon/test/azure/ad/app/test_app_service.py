@@ -32,7 +32,7 @@ class AzureDirectoyAppServiceTestCase(unittest.TestCase):
 
         assert result.return_value.status_code == 0
 
-    @mock.patch('requests.get')
+    @mock.patch('Babylon.utils.request.session.get')
     def test_get_all(self, mock_get):
         the_response = Response()
         the_response.status_code = 0
@@ -48,7 +48,7 @@ class AzureDirectoyAppServiceTestCase(unittest.TestCase):
 
         assert result.return_value.status_code == 0
 
-    @mock.patch('requests.patch')
+    @mock.patch('Babylon.utils.request.session.patch')
     def test_update(self, mock_patch):
         the_response = Response()
         the_response.status_code = 0
@@ -0,0 +1,68 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from Babylon.commands.azure.adt.services.adt_model_svc import AdtModelService, topological_sort, model_dependencies
+
+
+def interface(model_id: str, extends: list = None, component: str = None, version: int = 1) -> dict:
+    model = {"@id": model_id, "@type": "Interface", "@context": "dtmi:dtdl:context;2", "version": version}
+    if extends:
+        model["extends"] = extends
+    if component:
+        model["contents"] = [{"@type": "Component", "name": "c", "schema": component}]
+    return model
+
+
+class AdtModelServiceTestCase(unittest.TestCase):
+
+    def test_dependencies_and_sort(self):
+        models = {
+            "dtmi:c;1": interface("dtmi:c;1", extends=["dtmi:b;1"], component="dtmi:d;1"),
+            "dtmi:b;1": interface("dtmi:b;1", extends="dtmi:a;1"),
+            "dtmi:a;1": interface("dtmi:a;1"),
+            "dtmi:d;1": interface("dtmi:d;1"),
+        }
+        assert model_dependencies(models["dtmi:c;1"]) == {"dtmi:b;1", "dtmi:d;1"}
+        order = topological_sort({k: model_dependencies(m) for k, m in models.items()})
+        assert order.index("dtmi:a;1") < order.index("dtmi:b;1") < order.index("dtmi:c;1")
+        assert order.index("dtmi:d;1") < order.index("dtmi:c;1")
+        with self.assertRaises(ValueError):
+            topological_sort({"x": {"y"}, "y": {"x"}})
+
+    def test_upload_skips_unchanged(self):
+        client = mock.MagicMock()
+        remote = [interface("dtmi:a;1"), interface("dtmi:b;1", extends=["dtmi:a;1"])]
+        client.list_models.return_value = [SimpleNamespace(id=m["@id"], model=m) for m in remote]
+        local = {m["@id"]: m for m in remote + [interface("dtmi:c;1", extends=["dtmi:b;1"])]}
+        result = AdtModelService(adt_client=client).upload(local)
+
+        assert result["uploaded"] == ["dtmi:c;1"]
+        assert result["unchanged"] == ["dtmi:a;1", "dtmi:b;1"]
+        client.delete_model.assert_not_called()
+        client.create_models.assert_called_once_with([local["dtmi:c;1"]])
+
+    def test_upload_override_replaces_dependents(self):
+        client = mock.MagicMock()
+        remote = [interface("dtmi:a;1"), interface("dtmi:b;1", extends=["dtmi:a;1"]), interface("dtmi:x;1")]
+        client.list_models.return_value = [SimpleNamespace(id=m["@id"], model=m) for m in remote]
+        local = {"dtmi:a;1": interface("dtmi:a;1", version=2)}
+        deleted = []
+        client.delete_model.side_effect = deleted.append
+        result = AdtModelService(adt_client=client).upload(local, override=True)
+
+        assert deleted == ["dtmi:b;1", "dtmi:a;1"]
+        assert result["uploaded"] == ["dtmi:a;1", "dtmi:b;1"]
+        uploaded = client.create_models.call_args.args[0]
+        assert uploaded == [local["dtmi:a;1"], remote[1]]
+
+    def test_upload_batches(self):
+        client = mock.MagicMock()
+        client.list_models.return_value = []
+        local = {f"dtmi:m{i};1": interface(f"dtmi:m{i};1") for i in range(600)}
+        AdtModelService(adt_client=client).upload(local)
+
+        assert [len(c.args[0]) for c in client.create_models.call_args_list] == [250, 250, 100]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from azure.core.exceptions import HttpResponseError
+from Babylon.commands.azure.adt.services.adt_twin_svc import AdtTwinImportService, read_dataset
+
+
+class AzureDigitalTwinsTwinImportTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp.name)
+        (self.folder / "Bar.csv").write_text("id,Capacity:integer,Name,Code\nbar1,10,first,007\nbar2,,second,true\n")
+        (self.folder / "arc_to_Customer.csv").write_text("source,target,name\nbar1,bar2,contains\n")
+        self.state = {"adt": {"digital_twin_url": "https://adt.example.com"}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_read_dataset(self):
+        twins, relationships = read_dataset(self.folder, model_prefix="dtmi:com:cosmotech")
+        twins = [t for r in twins for t in r]
+        relationships = [r for reader in relationships for r in reader]
+        assert twins[0] == {
+            "$dtId": "bar1",
+            "$metadata": {
+                "$model": "dtmi:com:cosmotech:Bar;1"
+            },
+            "Capacity": 10,
+            "Name": "first",
+            "Code": "007"
+        }
+        assert "Capacity" not in twins[1]
+        assert twins[1]["Code"] == "true"
+        assert relationships == [{
+            "$dtId": "bar1",
+            "$relationshipId": "bar1-contains-bar2",
+            "$targetId": "bar2",
+            "$relationshipName": "contains"
+        }]
+
+    def test_read_dataset_invalid_cell(self):
+        (self.folder / "Bar.csv").write_text("id,Capacity:integer\nbar1,ten\n")
+        twins, _ = read_dataset(self.folder)
+        with self.assertRaisesRegex(ValueError, "'ten' as integer"):
+            list(twins[0])
+
+    @mock.patch("Babylon.commands.azure.adt.services.adt_twin_svc.time.sleep")
+    @mock.patch("Babylon.commands.azure.adt.services.adt_twin_svc.oauth_request")
+    def test_import_job_cancelled(self, oauth_request, _sleep):
+        statuses = ["notstarted", "running", "cancelling", "cancelled"]
+        oauth_request.side_effect = [mock.MagicMock(json=lambda s=s: {"status": s}) for s in statuses]
+        blob_client = mock.MagicMock()
+        blob_client.get_blob_client.return_value.url = "https://storage.example.com/input.ndjson"
+        service = AdtTwinImportService(adt_client=mock.MagicMock(),
+                                       state=self.state,
+                                       azure_token="token",
+                                       blob_client=blob_client)
+        job = service.import_job(*read_dataset(self.folder))
+        assert job == {"status": "cancelled"}
+        assert oauth_request.call_count == 4
+
+    def test_upsert_resume(self):
+        adt_client = mock.MagicMock()
+        throttled = HttpResponseError(message="throttled", response=mock.MagicMock(status_code=429))
+        throttled.status_code = 429
+        throttled.response.headers = {"Retry-After": "0"}
+        adt_client.upsert_digital_twin.side_effect = [throttled, None, None]
+        checkpoint = self.folder / "checkpoint.txt"
+        service = AdtTwinImportService(adt_client=adt_client, state=self.state, max_workers=1)
+        counts = service.upsert_all(*read_dataset(self.folder), checkpoint=checkpoint)
+        assert counts == dict(twins=2, relationships=1, skipped=0, failed=0)
+        assert adt_client.upsert_digital_twin.call_count == 3
+        adt_client.upsert_relationship.assert_called_once_with("bar1", "bar1-contains-bar2", mock.ANY)
+
+        counts = service.upsert_all(*read_dataset(self.folder), checkpoint=checkpoint)
+        assert counts == dict(twins=0, relationships=0, skipped=3, failed=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
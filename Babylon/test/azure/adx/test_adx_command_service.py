@@ -0,0 +1,60 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from Babylon.test.fake_server import FakeServer
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
+from Babylon.commands.azure.adx.services.adx_command_svc import split_script
+
+fake = FakeServer()
+
+
+@fake.route("POST", r"/v1/rest/mgmt")
+def management(request):
+    commands = [c for c in request.json()["csl"].split("\n\n")]
+    commands[0] = commands[0].split("<|\n")[-1]
+    rows = [[str(i), "TableCreate", c, "Failed" if "fail" in c else "Completed", ""] for i, c in enumerate(commands)]
+    columns = ["OperationId", "CommandType", "CommandText", "Result", "Reason"]
+    return 200, {"Tables": [{"TableName": "Table_0", "Columns": [{"ColumnName": c} for c in columns], "Rows": rows}]}
+
+
+class AdxCommandServiceTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.state = {"adx": {"cluster_uri": fake.url, "database_name": "db"}}
+
+    def setUp(self):
+        fake.requests.clear()
+
+    def test_split_script(self):
+        script = ".create table A (x: int)\n//\n.alter table A policy\n  retention\n\n// comment\n.drop table B"
+        assert split_script(script) == [
+            ".create table A (x: int)", ".alter table A policy\n  retention", ".drop table B"
+        ]
+
+    def test_execute_many_batches(self):
+        service = AdxCommandService(azure_token="token", state=self.state, batch_size=20)
+        commands = [f".create table T{i} (x: int)" for i in range(50)]
+        results = service.execute_many(commands)
+        assert len(results) == 50
+        assert len(fake.requests) == 3
+        assert json.loads(fake.requests[0].body)["db"] == "db"
+
+    def test_execute_many_failure(self):
+        service = AdxCommandService(azure_token="token", state=self.state)
+        assert service.execute_many([".create table A (x: int)", ".fail"]) is None
+
+    def test_run_script(self):
+        service = AdxCommandService(azure_token="token", state=self.state)
+        with tempfile.TemporaryDirectory() as tmp:
+            script = Path(tmp) / "tables.kql"
+            script.write_text(".create table A (x: int)\n\n.create table B (y: string)\n")
+            results = service.run_script(script)
+        assert [r["CommandText"] for r in results] == [".create table A (x: int)", ".create table B (y: string)"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import json
+import base64
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+from Babylon.test.fake_server import FakeServer
+from Babylon.commands.azure.adx.services.adx_command_svc import AdxCommandService
+from Babylon.commands.azure.adx.services.adx_ingest_svc import AdxIngestService, split_csv
+
+fake = FakeServer()
+
+
+def commands() -> list[str]:
+    return [json.loads(r.body)["csl"] for r in fake.requests]
+
+
+@fake.route("POST", r"/v1/rest/mgmt")
+def management(request):
+    csl: str = request.json()["csl"]
+    if csl.startswith(".ingest"):
+        columns, rows = ["OperationId"], [[f"op-{len(fake.requests)}"]]
+    else:
+        ids = csl.split("(")[1].rstrip(")").split(", ")
+        columns, rows = ["OperationId", "State", "Status"], [[i, "Completed", ""] for i in ids]
+    return 200, {"Tables": [{"Columns": [{"ColumnName": c} for c in columns], "Rows": rows}]}
+
+
+class AdxIngestServiceTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.state = {"adx": {"cluster_uri": fake.url, "database_name": "db"}}
+
+    def test_split_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "data.csv"
+            source.write_text("id,name\n" + "".join(f"{i},name{i}\n" for i in range(1000)))
+            target = Path(tmp) / "chunks"
+            target.mkdir()
+            chunks = split_csv(source, 2000, target)
+            assert len(chunks) > 1
+            lines = [line for c in chunks for line in c.read_text().splitlines()]
+            assert lines.count("id,name") == len(chunks)
+            assert len(lines) == 1000 + len(chunks)
+
+    def test_ingest(self):
+        blob_client = mock.MagicMock()
+        blob_client.account_name = "account"
+        blob_client.credential.account_key = base64.b64encode(b"key").decode("utf-8")
+        command_svc = AdxCommandService(azure_token="token", state=self.state)
+        service = AdxIngestService(command_svc=command_svc, blob_client=blob_client, state=self.state)
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            (folder / "a.csv").write_text("id\n1\n")
+            (folder / "b.parquet").write_bytes(b"PAR1")
+            (folder / "c.txt").write_text("ignored")
+            status_file = folder / "status.json"
+            status = service.ingest(table="T", folder=folder, mapping="m", status_file=status_file)
+            assert set(status) == {"a.csv", "b.parquet"}
+            assert all(s["state"] == "Completed" for s in status.values())
+            assert json.loads(status_file.read_text()) == status
+            ingests = [c for c in commands() if c.startswith(".ingest")]
+            assert len(ingests) == 2
+            assert all("ingestionMappingReference='m'" in c for c in ingests)
+            fake.requests.clear()
+            service.ingest(table="T", folder=folder, status_file=status_file)
+            assert not commands()
+
+    def test_ingest_upload_failure(self):
+        blob_client = mock.MagicMock()
+
+        def get_blob_client(container: str, blob: str):
+            client = mock.MagicMock()
+            if blob.endswith("b.parquet"):
+                client.upload_blob.side_effect = OSError("connection reset")
+            return client
+
+        blob_client.account_name = "account"
+        blob_client.credential.account_key = base64.b64encode(b"key").decode("utf-8")
+        blob_client.get_blob_client.side_effect = get_blob_client
+        command_svc = AdxCommandService(azure_token="token", state=self.state)
+        service = AdxIngestService(command_svc=command_svc, blob_client=blob_client, state=self.state)
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            (folder / "a.csv").write_text("id\n1\n")
+            (folder / "b.parquet").write_bytes(b"PAR1")
+            status = service.ingest(table="T", folder=folder, status_file=folder / "status.json")
+        assert status["a.csv"]["state"] == "Completed"
+        assert status["b.parquet"]["state"] == "Failed"
+
+
+if __name__ == "__main__":
+    unittest.main()
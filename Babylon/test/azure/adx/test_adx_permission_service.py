@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+from azure.mgmt.kusto.models import DatabasePrincipalAssignment
+from Babylon.commands.azure.adx.services.adx_permission_svc import AdxPermissionService
+
+STATE = {"azure": {"resource_group_name": "rg"}, "adx": {"cluster_name": "cluster", "database_name": "db"}}
+
+
+def assignment(name: str, principal_id: str, role: str, principal_type: str = "User", tenant_id: str = "tenant"):
+    assign = DatabasePrincipalAssignment(principal_id=principal_id,
+                                         role=role,
+                                         principal_type=principal_type,
+                                         tenant_id=tenant_id)
+    assign.name = f"cluster/db/{name}"
+    return assign
+
+
+class AdxPermissionServiceTestCase(unittest.TestCase):
+
+    def test_reconcile(self):
+        kusto_client = mock.MagicMock()
+        operations = kusto_client.database_principal_assignments
+        operations.list.return_value = [
+            assignment("a1", "unchanged", "Admin"),
+            assignment("a2", "role-changed", "Viewer"),
+            assignment("a3", "removed", "User"),
+            assignment("a4", "babylon", "Admin", "App"),
+        ]
+        service = AdxPermissionService(kusto_client=kusto_client, state=STATE)
+        spec = [
+            dict(principal_id="unchanged", role="Admin", type="User"),
+            dict(principal_id="role-changed", role="User", type="User"),
+            dict(principal_id="added", role="Viewer", type="Group"),
+        ]
+        created, deleted = service.reconcile(spec_permissions=spec, tenant_id="tenant", keep_ids=["babylon"])
+
+        assert operations.list.call_count == 1
+        assert sorted(k[0] for k in created) == ["added", "role-changed"]
+        assert sorted(k[0] for k in deleted) == ["removed", "role-changed"]
+        assert operations.begin_create_or_update.call_count == 2
+        deleted_names = sorted(c.kwargs["principal_assignment_name"] for c in operations.begin_delete.call_args_list)
+        assert deleted_names == ["a2", "a3"]
+        assert operations.begin_delete.return_value.wait.call_count == 2
+
+    def test_reconcile_up_to_date(self):
+        kusto_client = mock.MagicMock()
+        operations = kusto_client.database_principal_assignments
+        operations.list.return_value = [assignment("a1", "user", "Admin")]
+        service = AdxPermissionService(kusto_client=kusto_client, state=STATE)
+        created, deleted = service.reconcile(spec_permissions=[dict(principal_id="user", role="Admin", type="User")],
+                                             tenant_id="tenant")
+
+        assert not created and not deleted
+        operations.begin_create_or_update.assert_not_called()
+        operations.begin_delete.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,7 +18,7 @@ class AzureAppInsightServiceTestCase(unittest.TestCase):
         env.check_environ(["BABYLON_SERVICE", "BABYLON_TOKEN", "BABYLON_ORG_NAME"])
         env.get_namespace_from_local()
 
-    @mock.patch('requests.put')
+    @mock.patch('Babylon.utils.request.session.put')
     def test_create(self, mock_put):
         the_response = Response()
         the_response.status_code = 0
@@ -29,7 +29,7 @@ class AzureAppInsightServiceTestCase(unittest.TestCase):
 
         assert result.return_value.status_code == 0
 
-    @mock.patch('requests.delete')
+    @mock.patch('Babylon.utils.request.session.delete')
     def test_delete(self, mock_delete):
         the_response = Response()
         the_response.status_code = 0
@@ -38,7 +38,7 @@ class AzureAppInsightServiceTestCase(unittest.TestCase):
 
         assert result.return_value.status_code == 0
 
-    @mock.patch('requests.get')
+    @mock.patch('Babylon.utils.request.session.get')
     def test_get_all(self, mock_get):
         the_response = Response()
         the_response.status_code = 0
@@ -48,7 +48,7 @@ class AzureAppInsightServiceTestCase(unittest.TestCase):
 
         assert result.return_value.status_code == 0
 
-    @mock.patch('requests.get')
+    @mock.patch('Babylon.utils.request.session.get')
     def test_get(self, mock_get):
         the_response = Response()
         the_response.status_code = 0
@@ -19,7 +19,7 @@ class AzureStaticWebappServiceTestCase(unittest.TestCase):
         env.check_environ(["BABYLON_SERVICE", "BABYLON_TOKEN", "BABYLON_ORG_NAME"])
         env.get_namespace_from_local()
 
-    @mock.patch('requests.put')
+    @mock.patch('Babylon.utils.request.session.put')
     def test_create(self, mock_create):
         the_response = Response()
         the_response.status_code = 200
@@ -30,7 +30,7 @@ class AzureStaticWebappServiceTestCase(unittest.TestCase):
 
         assert result.return_value.data == {'id': 'my-webapp-name'}
 
-    @mock.patch('requests.delete')
+    @mock.patch('Babylon.utils.request.session.delete')
     def test_delete(self, mock_delete):
         the_response = Response()
         the_response.status_code = 204
@@ -40,17 +40,17 @@ class AzureStaticWebappServiceTestCase(unittest.TestCase):
 
         assert result.return_value is None
 
-    @mock.patch('requests.get')
+    @mock.patch('Babylon.utils.request.session.get')
     def test_get_all(self, mock_get_all):
         the_response = Response()
         the_response.status_code = 200
-        the_response._content = b'{"value": "my-webapp-name"}'
+        the_response._content = b'{"value": [{"name": "my-webapp-name"}]}'
         mock_get_all.return_value = the_response
         result = CliRunner().invoke(get_all, ["--filter", ""], standalone_mode=False)
 
-        assert result.output == "'my-webapp-name'\n"
+        assert result.output == "[{'name': 'my-webapp-name'}]\n"
 
-    @mock.patch('requests.get')
+    @mock.patch('Babylon.utils.request.session.get')
     def test_get(self, mock_get):
         the_response = Response()
         the_response.status_code = 200
@@ -60,7 +60,7 @@ class AzureStaticWebappServiceTestCase(unittest.TestCase):
 
         assert result.output == "{'id': 'my-webapp-name'}\n"
 
-    @mock.patch('requests.put')
+    @mock.patch('Babylon.utils.request.session.put')
     def test_update(self, mock_update):
         the_response = Response()
         the_response.status_code = 200
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+from click import Command, Context
+from Babylon.commands.azure.storage.services.storage_container_svc import AzureStorageContainerService
+from Babylon.utils.response import CommandResponse
+
+
+class StorageContainerServiceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.folder = Path(self.tmp.name)
+        (self.folder / "Bar.csv").write_text("id\nbar1\n")
+        (self.folder / "Customer.csv").write_text("id\ncustomer1\n")
+        self.blob_client = mock.MagicMock()
+        self.service = AzureStorageContainerService(blob_client=self.blob_client, state=dict())
+        context = Context(Command("upload"))
+        context.__enter__()
+        self.addCleanup(context.__exit__, None, None, None)
+
+    def upload(self) -> CommandResponse:
+        return self.service.upload(org_id="O-1", work_id="W-1", dataset_id="D-1", folder=str(self.folder))
+
+    def test_upload(self):
+        response = self.upload()
+        assert response.status_code == CommandResponse.STATUS_OK
+        assert sorted(response.data["uploaded"]) == ["w-1/datasets/D-1/Bar.csv", "w-1/datasets/D-1/Customer.csv"]
+
+    def test_iter_all(self):
+        container = mock.MagicMock(lease=None, etag="0x1", deleted=False, public_access=None)
+        container.name = "o-1"
+        self.blob_client.list_containers.return_value = iter([container])
+        assert list(
+            self.service.iter_all()) == [dict(name="o-1", lease=None, etag="0x1", deleted=False, public_access=None)]
+
+    def test_upload_failure(self):
+
+        def get_blob_client(container: str, blob: str):
+            client = mock.MagicMock()
+            if blob.endswith("Customer.csv"):
+                client.upload_blob.side_effect = OSError("connection reset")
+            return client
+
+        self.blob_client.get_blob_client.side_effect = get_blob_client
+        response = self.upload()
+        assert response.status_code == CommandResponse.STATUS_ERROR
+        assert response.data["failed"] == ["w-1/datasets/D-1/Customer.csv"]
+
+
+if __name__ == "__main__":
+    unittest.main()
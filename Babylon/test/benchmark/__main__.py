@@ -0,0 +1,54 @@
+import sys
+import json
+import click
+
+from rich.console import Console
+from rich.table import Table
+from Babylon.test.benchmark.harness import BASELINE_FILE, SCENARIOS, Harness, compare
+
+
+def parse_latency(ctx: click.Context, param: click.Parameter, value: str) -> dict[str, float]:
+    latency = dict()
+    for item in filter(None, (value or "").split(",")):
+        service, _, seconds = item.partition("=")
+        latency[service.strip() if seconds else "default"] = float(seconds or service)
+    return latency
+
+
+@click.command()
+@click.option("--latency",
+              callback=parse_latency,
+              help="Delay of the fake services in seconds, e.g. `0.02` or `default=0.01,arm=0.1,vault=0.005`")
+@click.option("--lro", "lro_duration", type=float, default=0, help="Duration of the ARM long running operations")
+@click.option("--scenario", "names", multiple=True, help="Run only these scenarios")
+@click.option("--baseline", type=click.Path(dir_okay=False), default=str(BASELINE_FILE), help="Baseline file")
+@click.option("--write-baseline", is_flag=True, help="Store the results as the new baseline")
+@click.option("--tolerance", type=float, default=0.5, help="Allowed relative increase of time and memory")
+def benchmark(latency: dict[str, float], lro_duration: float, names: tuple[str, ...], baseline: str,
+              write_baseline: bool, tolerance: float):
+    """Run the deploy scenarios against local fake cloud services and compare them with a baseline"""
+    harness = Harness(latency=latency, lro_duration=lro_duration)
+    scenarios = [s for s in SCENARIOS if not names or s.name in names]
+    results = [harness.run(s) for s in scenarios]
+    services = sorted({service for r in results for service in r.calls})
+    table = Table(title="Babylon deploy benchmark")
+    for column in ["Scenario", "Time (s)", "Peak memory (MiB)", *services]:
+        table.add_column(column, justify="left" if column == "Scenario" else "right")
+    for r in results:
+        table.add_row(r.name, f"{r.seconds:.3f}", f"{r.peak_memory / 1024 / 1024:.1f}",
+                      *[str(r.calls.get(s, 0)) for s in services])
+    Console(stderr=True).print(table)
+    if write_baseline:
+        with open(baseline, "w") as _f:
+            json.dump({r.name: r.to_baseline() for r in results}, _f, indent=2)
+            _f.write("\n")
+        return
+    with open(baseline) as _f:
+        regressions = compare(results, json.load(_f), tolerance)
+    for regression in regressions:
+        click.echo(click.style(regression, fg="red"), err=True)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,2 @@
+def apply_parameters(parameters: dict) -> dict:
+    return parameters
@@ -0,0 +1,364 @@
+import json
+import time
+import uuid
+import base64
+import requests
+
+from collections import Counter
+from contextlib import contextmanager
+from email.utils import formatdate
+from typing import Any, Iterator, Optional
+from urllib.parse import parse_qs, urlsplit, urlunsplit
+
+from Babylon.test.fake_server import FakeRequest, FakeServer
+
+ORGANIZATION_NAME = "bench"
+TENANT_ID = "7b4e1c2a-0f3d-4e5b-9a6c-1d2e3f4a5b6c"
+PLATFORM_ID = "bench"
+STORAGE_ACCOUNT = "benchstorage"
+ACCOUNT_KEY = base64.b64encode(b"babylon-benchmark-account-key").decode("ascii")
+
+# hosts served by the fake cloud, requests to any of them are redirected by `redirect_to`
+AZURE_HOSTS = ["login.microsoftonline.com", "management.azure.com", "api.powerbi.com", "graph.microsoft.com"]
+AZURE_SUFFIXES = [".blob.core.windows.net", ".kusto.windows.net"]
+
+# ARM resource types created synchronously, answered with a 200 instead of a long running operation
+SYNCHRONOUS_TYPES = ["consumergroups", "roleAssignments"]
+
+ID_PREFIXES = {
+    "organizations": "o",
+    "solutions": "sol",
+    "workspaces": "w",
+    "datasets": "d",
+    "scenarios": "s",
+    "connectors": "c",
+    "run": "sr",
+}
+
+
+def is_arm_collection(path: str) -> bool:
+    """Whether an ARM path names a list of resources, like `.../providers/Microsoft.Kusto/clusters/c/databases`"""
+    parts = path.strip("/").split("/")
+    if "providers" in parts:
+        parts = parts[parts.index("providers") + 2:]
+    return len(parts) % 2 == 1
+
+
+def arm_name(path: str) -> str:
+    """Name of an ARM resource, kusto child resources are named after their parents like `cluster/database`"""
+    parts = path.strip("/").split("/")
+    if "/providers/Microsoft.Kusto/" not in path:
+        return parts[-1]
+    return "/".join(parts[parts.index("providers") + 3::2])
+
+
+def is_azure_host(host: str) -> bool:
+    host = host.split(":")[0]
+    return host in AZURE_HOSTS or any(host.endswith(suffix) for suffix in AZURE_SUFFIXES)
+
+
+class FakeCloud(FakeServer):
+    """
+    Local stand-in for every service reached by the deploy macros
+
+    A single http server answers for the Vault KV v1 endpoint (`/v1/`), the Cosmo Tech API
+    (`/api/`) and, through the Host header set by `redirect_to`, azure active directory, blob
+    storage (the subset of Azurite used by babylon), ARM (with the Kusto, Event Hubs and role
+    assignment resources), the Kusto data plane, Power BI and Graph.
+    `latency` delays every answer of a service, ARM deployments stay `InProgress` and deleted
+    resources stay `Deleting` for `lro_duration` seconds
+    """
+
+    def __init__(self, latency: Optional[dict[str, float]] = None, lro_duration: float = 0) -> None:
+        super().__init__(handler=FakeCloudHandler)
+        self.route("*", r".*")(FakeCloudHandler.handle_any)
+        self.latency = latency or dict()
+        self.lro_duration = lro_duration
+        self.calls: Counter[tuple[str, str]] = Counter()
+        self.vault: dict[str, dict[str, Any]] = dict()
+        self.api: dict[str, Any] = dict()
+        self.blobs: dict[str, dict[str, tuple[bytes, str]]] = dict()
+        self.arm: dict[str, Any] = dict()
+        self.operations: dict[str, float] = dict()
+        self.deleting: dict[str, Optional[float]] = dict()
+
+    def seed_arm(self, resource_id: str, properties: dict[str, Any]):
+        """Store an azure resource deployed outside of the scenarios"""
+        self.arm[resource_id] = dict(id=resource_id, name=resource_id.rsplit("/", 1)[-1], properties=properties)
+
+    def seed_vault(self, config: dict[str, dict[str, Any]], secrets: dict[str, str]):
+        """Store the platform configuration files and the secrets read by babylon"""
+        prefix = f"{ORGANIZATION_NAME}/{TENANT_ID}"
+        self.vault[f"organization/{ORGANIZATION_NAME}"] = dict(tenant=TENANT_ID)
+        for resource, data in config.items():
+            self.vault[f"{prefix}/babylon/config/{PLATFORM_ID}/{resource}"] = data
+        for path, secret in secrets.items():
+            self.vault[f"{prefix}/{path}"] = dict(secret=secret)
+
+    def service(self, host: str, path: str) -> str:
+        """Name of the service answering a request, used for latencies and call counts"""
+        host = host.split(":")[0]
+        if host.endswith(".blob.core.windows.net"):
+            return "blob"
+        if host.endswith(".kusto.windows.net"):
+            return "kusto"
+        if host in AZURE_HOSTS:
+            return {
+                "login.microsoftonline.com": "aad",
+                "management.azure.com": "arm",
+                "api.powerbi.com": "powerbi",
+                "graph.microsoft.com": "graph"
+            }[host]
+        return "vault" if path.startswith("/v1/") else "api"
+
+    def count(self) -> dict[str, int]:
+        """Number of calls by service"""
+        totals: Counter[str] = Counter()
+        for (service, _), calls in self.calls.items():
+            totals[service] += calls
+        return dict(sorted(totals.items()))
+
+
+class FakeCloudHandler(FakeRequest):
+
+    @property
+    def fake(self) -> FakeCloud:
+        return self.server.fake_server
+
+    def reply(self, status: int, body: Any = None, headers: Optional[dict[str, str]] = None):
+        headers = {"Content-Type": "application/json", "x-ms-request-id": str(uuid.uuid4()), **(headers or {})}
+        super().reply(status, body, headers)
+
+    def handle_any(self):
+        url = urlsplit(self.path)
+        host = self.headers.get("Host", "")
+        service = self.fake.service(host, url.path)
+        with self.fake.lock:
+            self.fake.calls[(service, self.command)] += 1
+        delay = self.fake.latency.get(service, self.fake.latency.get("default", 0))
+        if delay:
+            time.sleep(delay)
+        getattr(self, f"handle_{service}")(host, url.path, parse_qs(url.query))
+
+    def handle_vault(self, host: str, path: str, query: dict[str, list[str]]):
+        key = path[len("/v1/"):]
+        if self.command in ["PUT", "POST"]:
+            self.fake.vault[key] = json.loads(self.body() or b"{}")
+            return self.reply(204)
+        data = self.fake.vault.get(key)
+        if data is None:
+            return self.reply(404, {"errors": []})
+        return self.reply(200, {"data": data, "lease_duration": 0, "renewable": False})
+
+    def handle_aad(self, host: str, path: str, query: dict[str, list[str]]):
+        tenant = path.strip("/").split("/")[0]
+        authority = f"https://login.microsoftonline.com/{tenant}"
+        if "discovery/instance" in path:
+            return self.reply(
+                200, {
+                    "tenant_discovery_endpoint":
+                    f"{authority}/v2.0/.well-known/openid-configuration",
+                    "api-version":
+                    "1.1",
+                    "metadata": [{
+                        "preferred_network": "login.microsoftonline.com",
+                        "preferred_cache": "login.windows.net",
+                        "aliases": ["login.microsoftonline.com", "login.windows.net"]
+                    }]
+                })
+        if path.endswith("openid-configuration"):
+            return self.reply(
+                200, {
+                    "token_endpoint": f"{authority}/oauth2/v2.0/token",
+                    "authorization_endpoint": f"{authority}/oauth2/v2.0/authorize",
+                    "device_authorization_endpoint": f"{authority}/oauth2/v2.0/devicecode",
+                    "issuer": f"{authority}/v2.0",
+                })
+        self.body()
+        return self.reply(200, {
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "ext_expires_in": 3600,
+            "access_token": "fake-token"
+        })
+
+    def handle_api(self, host: str, path: str, query: dict[str, list[str]]):
+        parts = path.strip("/").split("/")[1:]
+        store = self.fake.api
+        payload = json.loads(self.body() or b"{}") if self.command in ["POST", "PATCH", "PUT"] else None
+        if "security" in parts:
+            index = parts.index("security")
+            item = store.get("/".join(parts[:index]))
+            if item is None:
+                return self.reply(404, {"detail": "not found"})
+            security = item.setdefault("security", {"default": "none", "accessControlList": []})
+            rest = parts[index + 1:]
+            if rest == ["default"]:
+                security["default"] = payload["role"]
+                return self.reply(201, {"role": payload["role"]})
+            acl = security["accessControlList"]
+            if rest == ["access"]:
+                acl.append(payload)
+                return self.reply(201, payload)
+            if len(rest) == 2:
+                entry = next((a for a in acl if a["id"] == rest[1]), None)
+                if entry is None:
+                    return self.reply(404, {"detail": "not found"})
+                if self.command == "DELETE":
+                    acl.remove(entry)
+                    return self.reply(204)
+                entry.update(payload or {})
+                return self.reply(200, entry)
+            return self.reply(200, security)
+        key = "/".join(parts)
+        if len(parts) % 2 == 1:
+            if self.command == "POST":
+                item_id = f"{ID_PREFIXES.get(parts[-1], 'x')}-{uuid.uuid4().hex[:10]}"
+                store[f"{key}/{item_id}"] = {**payload, "id": item_id}
+                return self.reply(201, store[f"{key}/{item_id}"])
+            items = [v for k, v in store.items() if k.startswith(f"{key}/") and k.count("/") == key.count("/") + 1]
+            page, size = int(query.get("page", ["0"])[0]), int(query.get("size", [str(len(items) or 1)])[0])
+            return self.reply(200, items[page * size:(page + 1) * size])
+        if key not in store:
+            return self.reply(404, {"detail": "not found"})
+        if self.command == "DELETE":
+            del store[key]
+            return self.reply(204)
+        if self.command == "PATCH":
+            store[key].update({k: v for k, v in payload.items() if k != "security"})
+        return self.reply(200, store[key])
+
+    def handle_blob(self, host: str, path: str, query: dict[str, list[str]]):
+        container, _, blob = path.strip("/").partition("/")
+        blobs = self.fake.blobs
+        headers = {"Last-Modified": formatdate(usegmt=True), "x-ms-version": "2021-08-06"}
+        if query.get("restype") == ["container"]:
+            if self.command == "PUT":
+                if container in blobs:
+                    return self.reply(409, b"", {**headers, "x-ms-error-code": "ContainerAlreadyExists"})
+                blobs[container] = dict()
+                return self.reply(201, b"", {**headers, "ETag": '"0x1"'})
+            if container not in blobs:
+                return self.reply(404, b"", {**headers, "x-ms-error-code": "ContainerNotFound"})
+            if self.command == "DELETE":
+                del blobs[container]
+                return self.reply(202, b"", headers)
+            return self.reply(200, b"", {**headers, "ETag": '"0x1"'})
+        if container not in blobs:
+            self.body()
+            return self.reply(404, b"", {**headers, "x-ms-error-code": "ContainerNotFound"})
+        if self.command == "PUT":
+            etag = f'"0x{uuid.uuid4().hex[:16].upper()}"'
+            blobs[container][blob] = (self.body(), etag)
+            return self.reply(201, b"", {**headers, "ETag": etag, "x-ms-request-server-encrypted": "true"})
+        if blob not in blobs[container]:
+            return self.reply(404, b"", {**headers, "x-ms-error-code": "BlobNotFound"})
+        data, etag = blobs[container][blob]
+        headers.update({"ETag": etag, "x-ms-blob-type": "BlockBlob", "Content-Type": "application/octet-stream"})
+        if self.command == "DELETE":
+            del blobs[container][blob]
+            return self.reply(202, b"", headers)
+        if self.headers.get("If-None-Match") == etag:
+            return self.reply(304, b"", {**headers, "x-ms-error-code": "ConditionNotMet"})
+        if self.command == "HEAD":
+            return self.reply(200, data, headers)
+        return self.reply(206, data, {**headers, "Content-Range": f"bytes 0-{max(0, len(data) - 1)}/{len(data)}"})
+
+    def handle_arm(self, host: str, path: str, query: dict[str, list[str]]):
+        if path.startswith("/operations/"):
+            started = self.fake.operations.get(path, 0)
+            if time.monotonic() - started >= self.fake.lro_duration:
+                return self.reply(200, {"status": "Succeeded"})
+            return self.reply(200, {"status": "InProgress"}, {"Retry-After": "1"})
+        if self.command == "POST":
+            self.body()
+            if path.endswith("/checkNameAvailability"):
+                return self.reply(200, {"nameAvailable": True})
+            return self.reply(200, {"value": []})
+        if self.command in ["PUT", "PATCH"]:
+            resource = {**json.loads(self.body() or b"{}"), "id": path, "name": arm_name(path)}
+            properties = resource.setdefault("properties", {})
+            properties.update(provisioningState="Succeeded", hostName=f"{resource['name']}.bench.azure.net")
+            if "/Microsoft.Kusto/" in path and "/databases/" in path and path.count("/") == 10:
+                # database models are polymorphic, the sdk does not send the kind of a read write database
+                resource.setdefault("kind", "ReadWrite")
+            self.fake.arm[path] = resource
+            if path.split("/")[-2] in SYNCHRONOUS_TYPES:
+                return self.reply(200, resource)
+            operation = f"/operations/{uuid.uuid4().hex}"
+            self.fake.operations[operation] = time.monotonic()
+            return self.reply(
+                201, resource, {
+                    "Azure-AsyncOperation": f"https://management.azure.com{operation}?api-version=2021-01-01",
+                    "Retry-After": "1" if self.fake.lro_duration else "0"
+                })
+        if self.command == "DELETE":
+            if path not in self.fake.arm:
+                return self.reply(204)
+            self.fake.arm[path].setdefault("properties", {})["provisioningState"] = "Deleting"
+            self.fake.deleting[path] = time.monotonic()
+            return self.reply(200)
+        if path in self.fake.deleting:
+            # a deleted resource is still read once while deleting, then once the deletion lasted lro_duration
+            if self.fake.deleting[path] is None:
+                del self.fake.deleting[path]
+                del self.fake.arm[path]
+                return self.reply(404, {"error": {"code": "ResourceNotFound", "message": path}})
+            if time.monotonic() - self.fake.deleting[path] >= self.fake.lro_duration:
+                self.fake.deleting[path] = None
+        if path in self.fake.arm:
+            return self.reply(200, self.fake.arm[path])
+        if is_arm_collection(path):
+            items = [
+                v for k, v in self.fake.arm.items() if k.startswith(f"{path}/") and k.count("/") == path.count("/") + 1
+            ]
+            return self.reply(200, {"value": items})
+        return self.reply(404, {"error": {"code": "ResourceNotFound", "message": path}})
+
+    def handle_powerbi(self, host: str, path: str, query: dict[str, list[str]]):
+        return self.handle_collection("powerbi", path)
+
+    def handle_graph(self, host: str, path: str, query: dict[str, list[str]]):
+        return self.handle_collection("graph", path)
+
+    def handle_kusto(self, host: str, path: str, query: dict[str, list[str]]):
+        self.body()
+        return self.reply(200, {"Tables": [{"TableName": "Table_0", "Columns": [], "Rows": []}]})
+
+    def handle_collection(self, name: str, path: str):
+        """Generic json store for Power BI and Graph: POST creates, GET lists or reads"""
+        store = self.fake.arm
+        key = f"{name}:{path.rstrip('/')}"
+        if self.command == "POST":
+            item = {**json.loads(self.body() or b"{}"), "id": str(uuid.uuid4())}
+            store[f"{key}/{item['id']}"] = item
+            return self.reply(201, item)
+        if self.command in ["PUT", "PATCH"]:
+            store[key] = {**store.get(key, {}), **json.loads(self.body() or b"{}")}
+            return self.reply(200, store[key])
+        if self.command == "DELETE":
+            store.pop(key, None)
+            return self.reply(200)
+        if key in store:
+            return self.reply(200, store[key])
+        return self.reply(200, {"value": [v for k, v in store.items() if k.startswith(f"{key}/")]})
+
+
+@contextmanager
+def redirect_to(cloud: FakeCloud) -> Iterator[None]:
+    """Send the requests of babylon and of the azure sdks for azure hosts to the fake cloud"""
+    original = requests.Session.send
+    target = urlsplit(cloud.url)
+
+    def send(session: requests.Session, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        url = urlsplit(request.url)
+        if is_azure_host(url.netloc):
+            request.headers["Host"] = url.netloc
+            request.url = urlunsplit(("http", target.netloc, url.path, url.query, ""))
+        return original(session, request, **kwargs)
+
+    requests.Session.send = send
+    try:
+        yield
+    finally:
+        requests.Session.send = original
@@ -0,0 +1,207 @@
+import os
+import sys
+import time
+import yaml
+import shutil
+import logging
+import pathlib
+import tempfile
+import tracemalloc
+
+from unittest import mock
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from Babylon import main
+from Babylon.config import config_files
+from Babylon.utils import ORIGINAL_TEMPLATE_FOLDER_PATH
+from Babylon.utils.metrics import metrics
+from Babylon.utils.environment import Environment
+from Babylon.utils.credentials import credentials_cache
+from Babylon.utils.working_dir import WorkingDir
+from Babylon.test.benchmark.fakes import (ACCOUNT_KEY, ORGANIZATION_NAME, PLATFORM_ID, STORAGE_ACCOUNT, FakeCloud,
+                                          redirect_to)
+
+logger = logging.getLogger("Babylon")
+env = Environment()
+
+DEPLOY_DIR = pathlib.Path(__file__).parent / "deploy"
+BASELINE_FILE = pathlib.Path(__file__).parent / "baseline.json"
+# wall time and memory differences under these floors are noise on a local run
+TIME_FLOOR = 0.25
+MEMORY_FLOOR = 2 * 1024 * 1024
+
+
+@dataclass
+class Scenario:
+    """Babylon commands run against the fake cloud, `setup` commands are not measured"""
+
+    name: str
+    commands: list[list[str]]
+    setup: list[list[str]] = field(default_factory=list)
+
+
+SIMULATIONS = ["abba", "run", "simulations/simulations.tsv", "simulations/var_types.tsv"]
+
+SCENARIOS = [
+    Scenario("organization-create", [["apply", "organization"]]),
+    Scenario("organization-update", [["apply", "organization"]], setup=[["apply", "organization"]]),
+    Scenario("solution-create", [["apply", "solution"]]),
+    Scenario("workspace-create", [["apply", "workspace"]], setup=[["apply", "solution"]]),
+    Scenario("workspace-update", [["apply", "workspace"]], setup=[["apply", "solution"], ["apply", "workspace"]]),
+    Scenario("destroy", [["destroy"]], setup=[["apply", "solution"], ["apply", "workspace"]]),
+    Scenario("abba-run", [SIMULATIONS], setup=[["apply", "solution"], ["apply", "workspace"]]),
+    Scenario("adt-instance-create", [["azure", "adt", "instance", "create"]], setup=[["apply", "organization"]]),
+]
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    peak_memory: int
+    calls: dict[str, int]
+    metrics: dict[str, list[dict[str, Any]]]
+    failures: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def to_baseline(self) -> dict[str, Any]:
+        return dict(seconds=round(self.seconds, 3), peak_memory=self.peak_memory, calls=self.calls)
+
+
+def platform_config() -> dict[str, dict[str, Any]]:
+    """Platform configuration stored in vault, the templates with the values read by the deploy macros"""
+    config = dict()
+    for resource in config_files:
+        config[resource] = yaml.safe_load((ORIGINAL_TEMPLATE_FOLDER_PATH / f"config/{resource}.yaml").read_text())
+    config["api"]["scope"] = "http://bench-api/.default"
+    config["api"]["workspace_key"] = "benchworkspace"
+    config["babylon"].update(client_id="00000000-0000-0000-0000-00000000b4b1",
+                             principal_id="00000000-0000-0000-0000-00000000b4b2")
+    config["platform"]["principal_id"] = "00000000-0000-0000-0000-00000000b4b3"
+    config["adx"].update(cluster_name="benchcluster",
+                         cluster_uri="https://benchcluster.westeurope.kusto.windows.net",
+                         cluster_principal_id="00000000-0000-0000-0000-00000000b4b4")
+    # set by the webapp deployment, read by destroy
+    config["webapp"]["webapp_name"] = "bench-webapp"
+    config["azure"].update(storage_account_name=STORAGE_ACCOUNT,
+                           subscription_id="00000000-0000-0000-0000-000000000001",
+                           resource_group_name="bench-rg",
+                           resource_location="westeurope")
+    return config
+
+
+class ErrorRecords(logging.Handler):
+    """Errors logged by the commands, which report most failures of the cloud services without failing"""
+
+    def __init__(self) -> None:
+        super().__init__(logging.ERROR)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(record.getMessage())
+
+
+class Harness:
+    """
+    Run babylon commands on the deploy directories of `deploy/` against a `FakeCloud`
+
+    Every scenario starts from an empty cloud and a fresh babylon home, so its measures do not
+    depend on the previous ones
+    """
+
+    def __init__(self, latency: Optional[dict[str, float]] = None, lro_duration: float = 0) -> None:
+        self.latency = latency or dict()
+        self.lro_duration = lro_duration
+
+    def invoke(self, args: list[str], workdir: pathlib.Path) -> bool:
+        """Run a command in the same process, like `babylon batch` does"""
+        env.reset_caches()
+        credentials_cache.clear()
+        env.pwd = workdir
+        env.working_dir = WorkingDir(working_dir_path=workdir)
+        args = [str(workdir / a) if (workdir / a).is_dir() else a for a in args]
+        argv = ["--tests", *args]
+        cwd = os.getcwd()
+        # commands like abba run write their outputs in the current folder
+        os.chdir(workdir)
+        try:
+            # the dry run option parses the command line itself
+            with mock.patch.object(sys, "argv", ["babylon", *argv]):
+                main.main(args=argv, standalone_mode=False)
+        except SystemExit as e:
+            return not e.code
+        except Exception as e:
+            logger.error(f"{' '.join(args)} failed: {e}")
+            return False
+        finally:
+            os.chdir(cwd)
+        return True
+
+    def run(self, scenario: Scenario) -> Result:
+        with FakeCloud(latency=self.latency, lro_duration=self.lro_duration) as cloud, \
+                tempfile.TemporaryDirectory() as tmp, redirect_to(cloud):
+            home = pathlib.Path(tmp) / "home"
+            workdir = pathlib.Path(tmp) / "work"
+            shutil.copytree(DEPLOY_DIR, workdir)
+            (workdir / "variables.yaml").write_text(yaml.safe_dump(dict(api_url=f"{cloud.url}/api")))
+            ns_dir = home / ".config/cosmotech/babylon"
+            ns_dir.mkdir(parents=True)
+            (ns_dir / "namespace.yaml").write_text(
+                yaml.safe_dump(dict(context="bench", platform=PLATFORM_ID, state_id="bench")))
+            config = platform_config()
+            group = f"/subscriptions/{config['azure']['subscription_id']}/resourceGroups/bench-rg"
+            cloud.seed_arm(f"{group}/providers/Microsoft.Web/staticSites/{config['webapp']['webapp_name']}",
+                           dict(defaultHostname="bench-webapp.azurestaticapps.net"))
+            cloud.seed_vault(config,
+                             secrets={
+                                 f"babylon/{PLATFORM_ID}/client": "bench-client-secret",
+                                 f"platform/{PLATFORM_ID}/storage/account": ACCOUNT_KEY,
+                             })
+            variables = dict(HOME=str(home),
+                             BABYLON_SERVICE=cloud.url,
+                             BABYLON_TOKEN="bench-token",
+                             BABYLON_ORG_NAME=ORGANIZATION_NAME,
+                             NO_PROXY="*")
+            with mock.patch.dict(os.environ, variables):
+                for command in scenario.setup:
+                    self.invoke(command, workdir)
+                cloud.calls.clear()
+                failures = 0
+                errors = ErrorRecords()
+                logger.addHandler(errors)
+                tracemalloc.start()
+                start = time.perf_counter()
+                try:
+                    with metrics.collect():
+                        for command in scenario.commands:
+                            failures += not self.invoke(command, workdir)
+                finally:
+                    seconds = time.perf_counter() - start
+                    _, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    logger.removeHandler(errors)
+            return Result(scenario.name, seconds, peak, cloud.count(), metrics.summary(), failures, errors.messages)
+
+
+def compare(results: list[Result], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions of the results against the baseline: any extra call, slower or bigger runs"""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if result.failures:
+            regressions.append(f"{result.name}: {result.failures} command(s) failed")
+        for error in result.errors:
+            regressions.append(f"{result.name}: error logged: {error}")
+        if not reference:
+            continue
+        for service, calls in result.calls.items():
+            expected = reference["calls"].get(service, 0)
+            if calls > expected:
+                regressions.append(f"{result.name}: {calls} {service} calls, baseline is {expected}")
+        if result.seconds > max(reference["seconds"] * (1 + tolerance), reference["seconds"] + TIME_FLOOR):
+            regressions.append(f"{result.name}: {result.seconds:.3f}s, baseline is {reference['seconds']:.3f}s")
+        limit = max(reference["peak_memory"] * (1 + tolerance), reference["peak_memory"] + MEMORY_FLOOR)
+        if result.peak_memory > limit:
+            regressions.append(f"{result.name}: peak memory {result.peak_memory} B, "
+                               f"baseline is {reference['peak_memory']} B")
+    return regressions
@@ -0,0 +1,15 @@
+import json
+import unittest
+from Babylon.test.benchmark.harness import BASELINE_FILE, SCENARIOS, Harness, compare
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_call_counts(self):
+        """Deploy scenarios run without errors and make no more calls than the baseline"""
+        baseline = json.loads(BASELINE_FILE.read_text())
+        results = [Harness().run(s) for s in SCENARIOS]
+        # wall time and memory depend on the machine, only the call counts are checked here
+        regressions = compare(results, baseline, tolerance=float("inf"))
+        assert regressions == []
+        assert all(r.calls for r in results)
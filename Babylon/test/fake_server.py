@@ -0,0 +1,150 @@
+import re
+import json
+import threading
+
+from typing import Any, Callable, NamedTuple, Optional
+from email.message import Message
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METHODS = ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
+
+
+class Received(NamedTuple):
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: Message
+    body: bytes
+    client: tuple[str, int]
+
+
+class FakeRequest(BaseHTTPRequestHandler):
+    """
+    Request received by a `FakeServer`, answered by the first route matching its method and path
+
+    A route is called with the request and the named groups of its pattern. It answers with
+    `request.reply(...)`, or returns the arguments of `reply`: `(status, body, headers)`
+    """
+    protocol_version = "HTTP/1.1"
+    content: Optional[bytes] = None
+
+    def log_message(self, *args: Any):
+        pass
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except ConnectionError:
+            pass
+
+    @property
+    def url_path(self) -> str:
+        return urlsplit(self.path).path
+
+    @property
+    def query(self) -> dict[str, str]:
+        """First value of each query parameter"""
+        return {k: v[0] for k, v in parse_qs(urlsplit(self.path).query, keep_blank_values=True).items()}
+
+    def body(self) -> bytes:
+        if self.content is None:
+            self.content = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        return self.content
+
+    def json(self) -> Any:
+        return json.loads(self.body())
+
+    def reply(self, status: int = 200, body: Any = None, headers: Optional[dict[str, str]] = None):
+        """Answer the request, bodies which are not bytes are sent as json"""
+        headers = dict(headers or {})
+        if body is None:
+            data = b""
+        elif isinstance(body, bytes):
+            data = body
+        else:
+            data = json.dumps(body).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def handle_route(self):
+        fake: FakeServer = self.server.fake_server
+        # the handler of a connection answers its successive requests
+        self.content = None
+        received = Received(self.command, self.url_path, self.query, self.headers, self.body(), self.client_address)
+        with fake.lock:
+            fake.requests.append(received)
+        for methods, pattern, route in fake.routes:
+            match = pattern.fullmatch(self.url_path)
+            if self.command in methods and match:
+                answer = route(self, **match.groupdict())
+                if answer is not None:
+                    self.reply(*answer)
+                break
+        else:
+            self.reply(404)
+
+    do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = handle_route
+
+
+class FakeServer:
+    """
+    Local http server of the tests, answering the routes they register
+
+        fake = FakeServer()
+
+        @fake.route("GET", r"/organizations/(?P<organization_id>[\\w-]+)")
+        def get_organization(request, organization_id):
+            return 200, {"id": organization_id}
+
+    `start` serves on a free port of the loopback, `requests` keeps the received requests in order
+    """
+
+    def __init__(self, handler: type[FakeRequest] = FakeRequest) -> None:
+        self.handler = handler
+        self.routes: list[tuple[list[str], re.Pattern, Callable[..., Any]]] = []
+        self.requests: list[Received] = []
+        self.lock = threading.Lock()
+        self.httpd: Optional[ThreadingHTTPServer] = None
+
+    def route(self, methods: str, pattern: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Register a route for the methods (`GET`, `GET,HEAD` or `*`) and a regular expression of the path"""
+
+        def register(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.routes.append((METHODS if methods == "*" else methods.split(","), re.compile(pattern), func))
+            return func
+
+        return register
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}"
+
+    def start(self) -> "FakeServer":
+        self.requests.clear()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.httpd.fake_server = self
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self) -> "FakeServer":
+        return self.start()
+
+    def __exit__(self, *args: Any):
+        self.stop()
@@ -0,0 +1,79 @@
+import json
+import asyncio
+import unittest
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.commands.api.organizations.services.organization_api_svc import OrganizationService
+
+fake = FakeServer()
+organizations = {"o-1": {"id": "o-1", "name": "first"}}
+
+
+@fake.route("GET", r"/organizations(/(?P<organization_id>[\w-]+))?")
+def get_organizations(request, organization_id):
+    if request.headers.get("Authorization") != "Bearer token":
+        return (401, )
+    if organization_id is None:
+        return 200, list(organizations.values())
+    organization = organizations.get(organization_id)
+    return (200, organization) if organization else (404, {"error": "not found"})
+
+
+@fake.route("POST", r"/organizations")
+def create_organization(request):
+    body = request.json()
+    body["id"] = f"o-{len(organizations) + 1}"
+    organizations[body["id"]] = body
+    return 201, body
+
+
+class ApiClientTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.url = fake.url
+
+    def test_sync(self):
+        client = CosmoTechApiClient(self.url, "token")
+        assert client.sync.request("GET", "/organizations/o-1").json()["name"] == "first"
+        assert client.sync.request("GET", "/organizations/missing") is None
+        assert CosmoTechApiClient(self.url, "wrong").sync.request("GET", "/organizations") is None
+        response = client.sync.request("POST", "/organizations", data=json.dumps({"name": "second"}))
+        assert response.status_code == 201
+
+    def test_pools_by_loop(self):
+        client = CosmoTechApiClient(self.url, "token")
+
+        async def pool():
+            return asyncio.get_running_loop(), client.pool()
+
+        first_loop, first = asyncio.run(pool())
+        _, second = asyncio.run(pool())
+        # a new loop never gets the pool of a closed one, closed loops are dropped
+        assert first is not second
+        assert (self.url, first_loop) not in CosmoTechApiClient.pools
+
+    def test_service(self):
+        state = {"api": {"url": self.url, "organization_id": "o-1"}}
+        service = OrganizationService(state=state, azure_token="token")
+        assert service.get().json()["id"] == "o-1"
+        assert len(service.get_all().json()) >= 1
+
+    def test_concurrent_keep_alive(self):
+        fake.requests.clear()
+        client = CosmoTechApiClient(self.url, "token", max_connections=4)
+
+        async def many():
+            calls = [client.request("GET", "/organizations/o-1") for _ in range(40)]
+            return await client.gather(calls, concurrency=4)
+
+        responses = asyncio.run(many())
+        assert all(r.json()["id"] == "o-1" for r in responses)
+        # connections are reused by the pool
+        assert len({r.client for r in fake.requests}) <= 4
+
+
+if __name__ == "__main__":
+    unittest.main()
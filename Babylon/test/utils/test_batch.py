@@ -0,0 +1,92 @@
+import io
+import threading
+import unittest
+from contextlib import redirect_stdout
+from click import argument, command, group
+from Babylon.utils.command_helper import is_read_only, parse_batch, run_batch
+from Babylon.utils.decorators import read_only
+from Babylon.utils.response import CommandResponse
+
+threads = set()
+
+
+@group()
+def babylon():
+    pass
+
+
+@babylon.command()
+@argument("value")
+@read_only
+def echo(value: str):
+    threads.add(threading.get_ident())
+    return CommandResponse.success({"value": value}, verbose=True)
+
+
+@babylon.group()
+def state():
+    pass
+
+
+@state.command()
+@argument("value")
+def write(value: str):
+    threads.add(threading.get_ident())
+    return CommandResponse.success({"value": value}, verbose=True)
+
+
+@command()
+def fail():
+    return CommandResponse.fail()
+
+
+babylon.add_command(fail)
+
+
+class BatchTestCase(unittest.TestCase):
+
+    def test_parse_lines(self):
+        content = 'babylon echo a\necho "b c"  # comment\n\n{"id": "d", "args": "echo d"}\n# skipped\n'
+        stages = parse_batch(content)
+        assert stages == [[dict(id="0", args=["echo", "a"]),
+                           dict(id="1", args=["echo", "b c"])], [dict(id="d", args=["echo", "d"])]]
+
+    def test_parse_json(self):
+        stages = parse_batch('[["echo", "a"], [{"args": ["echo", "b"]}, "echo c"]]')
+        assert [[c["args"] for c in s] for s in stages] == [[["echo", "a"]], [["echo", "b"], ["echo", "c"]]]
+
+    def test_run_parallel(self):
+        threads.clear()
+        emitted = []
+        stages = parse_batch("\n".join(f"echo {i}" for i in range(8)))
+        results = run_batch(babylon, stages, parallel=4, emit=emitted.append)
+        assert [r["data"]["value"] for r in results] == [str(i) for i in range(8)]
+        assert len(emitted) == 8
+        assert len(threads) > 1
+
+    def test_read_only(self):
+        assert is_read_only(babylon, ["echo", "a"])
+        assert not is_read_only(babylon, ["state", "write", "a"])
+        assert not is_read_only(babylon, ["state"])
+        assert not is_read_only(babylon, ["unknown"])
+
+    def test_writers_run_alone(self):
+        threads.clear()
+        stages = parse_batch("\n".join(f"state write {i}" for i in range(4)))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            results = run_batch(babylon, stages, parallel=4)
+        assert [r["data"]["value"] for r in results] == [str(i) for i in range(4)]
+        assert threads == {threading.get_ident()}
+        # responses are only given to emit
+        assert output.getvalue() == ""
+
+    def test_stop_on_failure(self):
+        results = run_batch(babylon, parse_batch("fail\n\necho a"))
+        assert [r["status_code"] for r in results] == [1]
+        results = run_batch(babylon, parse_batch("fail\n\necho a\nunknown"), keep_going=True)
+        assert [r["status_code"] for r in results] == [1, 0, 1]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import time
+import pathlib
+import tempfile
+import unittest
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.request import oauth_request
+from Babylon.utils.api_client import CosmoTechApiClient
+from Babylon.utils.cassette import Cassette, CassetteError, redact_json, redact_url
+
+fake = FakeServer()
+
+
+@fake.route("GET", r"/organizations/(?P<organization_id>[\w-]+)")
+def get_organization(request, organization_id):
+    time.sleep(0.05)
+    return 200, {"id": organization_id, "name": "Organization"}
+
+
+@fake.route("POST", r"/oauth2/token")
+def get_token(request):
+    time.sleep(0.05)
+    return 200, {"token_type": "Bearer", "access_token": "eyJ-secret", "expires_in": 3600}
+
+
+class CassetteTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.url = fake.start().url
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tmp.name) / "apply.cassette.json"
+
+    def tearDown(self):
+        fake.stop()
+        self.tmp.cleanup()
+
+    def record(self):
+        cassette = Cassette()
+        cassette.record(self.path)
+        oauth_request(f"{self.url}/organizations/o-recorded1", "user-token")
+        oauth_request(f"{self.url}/oauth2/token?client_secret=abc", "", type="POST", data="grant_type=x")
+        api = CosmoTechApiClient(url=self.url, azure_token="user-token")
+        api.sync.request("GET", "/organizations/o-recorded2")
+        cassette.stop()
+        fake.stop()
+
+    def test_redaction(self):
+        assert redact_url("https://a.test/b?sig=xyz&page=1") == "https://a.test/b?sig=REDACTED&page=1"
+        assert redact_json({
+            "data": {
+                "secret": "s"
+            },
+            "token_type": "Bearer",
+            "keys": [{
+                "accountKey": "k"
+            }]
+        }) == {
+            "data": {
+                "secret": "REDACTED"
+            },
+            "token_type": "Bearer",
+            "keys": [{
+                "accountKey": "REDACTED"
+            }]
+        }
+        # whole key names only, `sig` does not match `signedIdentifiers` nor `designer`
+        kept = {
+            "roleAssignments": ["r"],
+            "designer": "d",
+            "signedIdentifiers": [{
+                "id": "policy"
+            }],
+            "tokenEndpoint": "https://login.test/token",
+            "keyName": "key1",
+            "value": "v"
+        }
+        assert redact_json(kept) == kept
+        assert redact_json({
+            "keys": [{
+                "keyName": "key1",
+                "value": "k1",
+                "permissions": "FULL"
+            }],
+            "primaryKey": "p",
+            "key": "k",
+            "sig": "s"
+        }) == {
+            "keys": [{
+                "keyName": "key1",
+                "value": "REDACTED",
+                "permissions": "FULL"
+            }],
+            "primaryKey": "REDACTED",
+            "key": "REDACTED",
+            "sig": "REDACTED"
+        }
+        self.record()
+        content = self.path.read_text()
+        assert "user-token" not in content and "eyJ-secret" not in content and "abc" not in content
+        interactions = json.loads(content)["interactions"]
+        assert [i["request"]["method"] for i in interactions] == ["GET", "POST", "GET"]
+        assert all(i["elapsed"] >= 0.05 for i in interactions)
+
+    def test_replay(self):
+        self.record()
+        cassette = Cassette()
+        cassette.replay(self.path)
+        try:
+            start = time.perf_counter()
+            # ids differ from the recorded ones, the url template still matches
+            response = oauth_request(f"{self.url}/organizations/o-replayed1", "other-token")
+            token = oauth_request(f"{self.url}/oauth2/token?client_secret=def", "", type="POST", data="")
+            api = CosmoTechApiClient(url=self.url, azure_token="other-token")
+            api_response = api.sync.request("GET", "/organizations/o-recorded2")
+            assert time.perf_counter() - start < 0.05
+            assert response.json()["id"] == "o-recorded1"
+            assert token.json()["access_token"] == "REDACTED"
+            assert api_response.json()["id"] == "o-recorded2"
+            assert oauth_request(f"{self.url}/organizations/o-replayed3", "token") is None
+        finally:
+            cassette.stop()
+        cassette.replay(self.path, speed=1)
+        start = time.perf_counter()
+        oauth_request(f"{self.url}/organizations/o-recorded1", "token")
+        cassette.stop()
+        assert time.perf_counter() - start >= 0.05
+
+    def test_invalid_cassette(self):
+        self.path.write_text(json.dumps({"version": 0, "interactions": []}))
+        with self.assertRaises(CassetteError):
+            Cassette().replay(self.path)
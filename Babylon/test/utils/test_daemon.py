@@ -0,0 +1,89 @@
+import io
+import os
+import sys
+import stat
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+import click
+from click import argument, group
+from Babylon.utils.daemon import BabylonDaemon, env
+from Babylon.utils.daemon_client import connect, forward, frames, send
+from Babylon.utils.response import CommandResponse
+
+
+@group()
+def babylon():
+    pass
+
+
+@babylon.command()
+@argument("value")
+def echo(value: str):
+    click.echo(value)
+    return CommandResponse.success({"value": value})
+
+
+@babylon.command()
+def cat():
+    click.echo(sys.stdin.read().upper())
+
+
+@babylon.command()
+def crash():
+    sys.exit(3)
+
+
+class DaemonTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "babylon.sock"
+        self.daemon = BabylonDaemon(babylon, path=self.path, idle_timeout=30)
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+        while not self.path.exists():
+            time.sleep(0.01)
+
+    def tearDown(self):
+        client = connect(self.path)
+        if client:
+            with client:
+                send(client, {"control": "stop"})
+                list(frames(client))
+        self.thread.join(5)
+        self.tmp.cleanup()
+
+    def run_forward(self, argv: list[str], stdin: str = "") -> tuple[int, str]:
+        out = io.StringIO()
+        code = forward(argv, path=self.path, stdin=io.StringIO(stdin), stdout=out, stderr=io.StringIO())
+        return code, out.getvalue()
+
+    def test_forward(self):
+        assert self.run_forward(["echo", "hello"]) == (0, "hello\n")
+        assert self.run_forward(["cat"], stdin="abc") == (0, "ABC\n")
+        assert self.run_forward(["crash"])[0] == 3
+        assert self.run_forward(["unknown"])[0] == 2
+
+    def test_socket_mode(self):
+        assert stat.S_IMODE(os.stat(self.path).st_mode) == 0o600
+
+    def test_states_revalidated(self):
+        env.validated_states["state.yaml"] = {"id": "state"}
+        assert self.run_forward(["echo", "hello"])[0] == 0
+        assert env.validated_states == {}
+
+    def test_stop(self):
+        client = connect(self.path)
+        with client:
+            send(client, {"control": "stop"})
+            assert list(frames(client)) == [{"exit": 0}]
+        self.thread.join(5)
+        assert not self.path.exists()
+        assert forward(["echo", "hello"], path=self.path, stdin=io.StringIO()) is None
+
+
+if __name__ == "__main__":
+    unittest.main()
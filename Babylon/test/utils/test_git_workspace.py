@@ -0,0 +1,74 @@
+import os
+import shutil
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import git
+
+from Babylon.utils.git_workspace import GitWorkspace, git_auth_env
+
+IDENTITY = dict(GIT_AUTHOR_NAME="babylon",
+                GIT_AUTHOR_EMAIL="babylon@test",
+                GIT_COMMITTER_NAME="babylon",
+                GIT_COMMITTER_EMAIL="babylon@test")
+
+
+class GitWorkspaceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = pathlib.Path(self.tmp.name)
+        self.env = mock.patch.dict(os.environ, IDENTITY)
+        self.env.start()
+        self.origin = git.Repo.init(self.dir / "webapp", initial_branch="main")
+        self.origin.git.config("uploadpack.allowFilter", "true")
+        self.origin.git.config("receive.denyCurrentBranch", "ignore")
+        (self.dir / "webapp/.github/workflows").mkdir(parents=True)
+        (self.dir / "webapp/assets").mkdir()
+        (self.dir / "webapp/config.json").write_text("{}")
+        (self.dir / "webapp/.github/workflows/deploy.yml").write_text("name: deploy\n")
+        (self.dir / "webapp/assets/bundle.js").write_bytes(os.urandom(100000))
+        self.origin.git.add("-A")
+        self.origin.git.commit("-m", "first")
+        self.workspace = GitWorkspace(url=f"file://{self.dir}/webapp", branch="main", cache_dir=self.dir / "cache")
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def test_sparse_checkout(self):
+        work = self.workspace.checkout(self.dir / "work", paths=["config.json", ".github/workflows/deploy.yml"])
+        assert (self.dir / "work/config.json").exists()
+        assert (self.dir / "work/.github/workflows/deploy.yml").exists()
+        assert not (self.dir / "work/assets").exists()
+        # the cache holds the last commit only, without the contents of the files left out
+        cache = git.Git(self.workspace.cache)
+        assert int(cache.rev_list("--count", "origin/main")) == 1
+        assert not cache.cat_file("--batch-all-objects", "--batch-check").count("blob 100000")
+        (self.dir / "work/config.json").write_text('{"api": "url"}')
+        work.git.add("config.json")
+        work.git.commit("-m", "update config")
+        work.git.push("origin", "HEAD:main")
+        assert self.origin.git.show("main:config.json") == '{"api": "url"}'
+        assert self.origin.git.show("main:assets/bundle.js", stdout_as_string=False)
+        self.workspace.remove(self.dir / "work")
+        assert not (self.dir / "work").exists()
+
+    def test_incremental_fetch(self):
+        self.workspace.checkout(self.dir / "first")
+        assert (self.dir / "first/assets/bundle.js").exists()
+        (self.dir / "webapp/config.json").write_text('{"v": 2}')
+        self.origin.git.commit("-am", "second")
+        # a working copy deleted without git does not block the next checkout
+        shutil.rmtree(self.dir / "first")
+        self.workspace.checkout(self.dir / "second", paths=["config.json"])
+        assert (self.dir / "second/config.json").read_text() == '{"v": 2}'
+        assert git.Git(self.workspace.cache).rev_parse("origin/main") == self.origin.head.commit.hexsha
+
+    def test_auth_env(self):
+        assert git_auth_env(None) == {"GIT_TERMINAL_PROMPT": "0"}
+        variables = git_auth_env("ghp_token")
+        assert variables["GIT_CONFIG_KEY_0"] == "http.extraHeader"
+        assert "ghp_token" not in variables["GIT_CONFIG_VALUE_0"]
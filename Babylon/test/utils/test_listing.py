@@ -0,0 +1,97 @@
+import io
+import json
+import unittest
+from click import Command, Context
+from azure.core.exceptions import HttpResponseError
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.listing import ItemFilter, iter_next_link, iter_sdk, list_response
+from Babylon.utils.response import CommandResponse
+from Babylon.commands.api.organizations.services.organization_api_svc import OrganizationService
+
+ORGANIZATIONS = [{"id": f"o-{i}", "name": f"org-{i % 3}"} for i in range(250)]
+
+fake = FakeServer()
+
+
+@fake.route("GET", r"(?P<prefix>/capped)?/organizations")
+def get_organizations(request, prefix):
+    page, size = int(request.query["page"]), int(request.query["size"])
+    size = min(size, 30) if prefix else size
+    return 200, ORGANIZATIONS[page * size:(page + 1) * size]
+
+
+@fake.route("GET", r"/unpaginated/organizations")
+def get_unpaginated_organizations(request):
+    return 200, ORGANIZATIONS[:10]
+
+
+@fake.route("GET", r"/groups")
+def get_groups(request):
+    skip = int(request.query.get("$skip", "0"))
+    body = {"value": ORGANIZATIONS[skip:skip + 100]}
+    if skip + 100 < len(ORGANIZATIONS):
+        body["@odata.nextLink"] = f"{fake.url}/groups?$skip={skip + 100}"
+    return 200, body
+
+
+class ListingTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.url = fake.url
+
+    def test_item_filter(self):
+        items = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        item_filter = ItemFilter("[?name=='b'].id")
+        assert item_filter.per_item
+        assert list(item_filter.apply(iter(items))) == [2]
+        assert ItemFilter("[].name").apply(iter(items)) == ["a", "b"]
+        assert list(ItemFilter().apply(iter(items))) == items
+        assert ItemFilter("[?name=='b' && properties.kind=='x']").odata() == "name eq 'b' and properties/kind eq 'x'"
+        assert ItemFilter("[?id > `1`]").odata() is None
+        # pipes apply to the whole filtered list
+        assert not ItemFilter("[?name=='b'] | [0]").per_item
+        assert ItemFilter("[?name=='b'] | [0]").apply(iter(items)) == {"id": 2, "name": "b"}
+        assert ItemFilter("[?name!='c'] | length(@)").apply(iter(items)) == 2
+        assert ItemFilter("[?name=='b'].id | [0]").apply(iter(items)) == 2
+        assert ItemFilter("[?name=='b'] | [0]").odata() is None
+
+    def test_iter_pages(self):
+        service = OrganizationService(state={"api": {"url": self.url}}, azure_token="token")
+        organizations = list(service.iter_all(size=100))
+        assert organizations == ORGANIZATIONS
+        service = OrganizationService(state={"api": {"url": f"{self.url}/unpaginated"}}, azure_token="token")
+        assert list(service.iter_all(size=5)) == ORGANIZATIONS[:10]
+        service = OrganizationService(state={"api": {"url": f"{self.url}/capped"}}, azure_token="token")
+        assert list(service.iter_all(size=100)) == ORGANIZATIONS
+
+    def test_iter_next_link(self):
+        assert list(iter_next_link(f"{self.url}/groups", "token")) == ORGANIZATIONS
+
+    def test_list_response(self):
+        service = OrganizationService(state={"api": {"url": self.url}}, azure_token="token")
+        with Context(Command("get_all")):
+            response = list_response(service.iter_all(), None, ItemFilter("[?name=='org-1'].id"))
+            assert response.data == [o["id"] for o in ORGANIZATIONS if o["name"] == "org-1"]
+            stream = io.StringIO()
+            response = list_response(service.iter_all(), lambda item: stream.write(f"{json.dumps(item)}\n"))
+            assert response.data == {"count": len(ORGANIZATIONS)}
+            assert [json.loads(line) for line in stream.getvalue().splitlines()] == ORGANIZATIONS
+            response = list_response(iter_next_link(f"{self.url}/missing", "token"), None)
+            assert response.status_code == CommandResponse.STATUS_ERROR
+
+    def test_iter_sdk(self):
+
+        def paged():
+            yield from ORGANIZATIONS
+            raise HttpResponseError(message="Forbidden\ndetails")
+
+        with Context(Command("get_all")):
+            stream = io.StringIO()
+            response = list_response(iter_sdk(paged(), dict, "organizations"),
+                                     lambda item: stream.write(f"{json.dumps(item)}\n"))
+        # the items received before the failure are streamed, the listing fails
+        assert response.status_code == CommandResponse.STATUS_ERROR
+        assert len(stream.getvalue().splitlines()) == len(ORGANIZATIONS)
@@ -0,0 +1,114 @@
+import io
+import os
+import queue
+import logging
+import tempfile
+import unittest
+import threading
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+from rich.logging import RichHandler
+from Babylon.utils.logs import LazyJson, LazyQueueHandler, LogPipeline
+
+logger = logging.getLogger("Babylon")
+
+
+class Payload:
+
+    def __init__(self) -> None:
+        self.serialized = 0
+
+    def __str__(self) -> str:
+        self.serialized += 1
+        return "payload"
+
+
+class LogsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.pipeline = LogPipeline()
+        self.level = logger.level
+        logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        self.pipeline.stop()
+        logger.setLevel(self.level)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_lazy_json(self):
+        payload = Payload()
+        logger.debug("%s", LazyJson(dict(data=payload)))
+        assert payload.serialized == 0
+        assert str(LazyJson(dict(data=payload), indent=None)) == '{"data": "payload"}'
+
+    def test_pipeline(self):
+        with mock.patch("sys.stderr") as stderr:
+            self.pipeline.start("compact")
+            console = self.pipeline.listener.handlers[2]
+            threads = set()
+            emit = console.emit
+
+            def record_thread(record: logging.LogRecord):
+                threads.add(threading.current_thread().name)
+                emit(record)
+
+            console.emit = record_thread
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda i: logger.info("uploaded %d", i), range(100)))
+            logger.warning("done")
+            self.pipeline.flush()
+        info = open("info.log").read().splitlines()
+        errors = open("error.log").read().splitlines()
+        assert len(info) == 101
+        assert errors == [info[-1]] and errors[0].endswith(" done")
+        # records are formatted and written by the listener, not by the workers
+        assert len(threads) == 1 and threading.current_thread().name not in threads
+        assert "WARNING done" in "".join(c.args[0] for c in stderr.write.call_args_list)
+        # the listener thread is not restarted by a flush
+        thread = self.pipeline.listener._thread
+        self.pipeline.flush()
+        assert self.pipeline.listener._thread is thread
+        self.pipeline.stop()
+        assert not any(h is self.pipeline.handler for h in logging.getLogger().handlers)
+
+    def test_switch_format(self):
+        # like the daemon, every command gets its own stderr
+        first, second = io.StringIO(), io.StringIO()
+        with mock.patch("sys.stderr", first):
+            self.pipeline.start("compact")
+            logger.info("first command")
+            self.pipeline.start("compact")
+            self.pipeline.flush()
+        with mock.patch("sys.stderr", second):
+            logger.info("second command")
+            self.pipeline.start("rich")
+            self.pipeline.flush()
+        assert "INFO first command" in first.getvalue()
+        # records queued before the switch keep their format
+        assert "INFO second command" in second.getvalue() and "second" not in first.getvalue()
+        assert isinstance(self.pipeline.listener.handlers[2], RichHandler)
+        assert len(self.pipeline.listener.handlers) == 3
+
+    def test_mutable_args(self):
+        handler = LazyQueueHandler(queue.SimpleQueue())
+
+        def prepare(level: int, msg: str, *args):
+            return handler.prepare(logging.LogRecord("Babylon", level, __file__, 1, msg, args, None))
+
+        organization = dict(state="creating")
+        records = [
+            prepare(logging.INFO, "organization %s", organization),
+            prepare(logging.INFO, "%(state)s", organization),
+            prepare(logging.INFO, "uploaded %d", 3),
+            prepare(logging.DEBUG, "%s", LazyJson(organization)),
+        ]
+        organization["state"] = "created"
+        assert [r.getMessage() for r in records[:2]] == ["organization {'state': 'creating'}", "creating"]
+        # immutable arguments and debug payloads are formatted by the listener
+        assert records[2].args == (3, )
+        assert isinstance(records[3].args[0], LazyJson)
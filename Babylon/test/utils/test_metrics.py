@@ -0,0 +1,77 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.metrics import MetricsRegistry, metrics, quantile
+from Babylon.utils.request import oauth_request, poll_request
+from Babylon.utils.tracing import span, tracer
+
+fake = FakeServer()
+
+
+@fake.route("GET", r"/organizations")
+def get_organizations(request):
+    return 200, {}
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.host = fake.host
+
+    def test_quantile(self):
+        assert quantile([], 0.5) == 0.0
+        assert quantile(list(range(100)), 0.5) == 50
+        assert quantile(list(range(100)), 0.95) == 95
+
+    def test_collect(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = pathlib.Path(tmp) / "metrics.prom"
+            with metrics.collect(output):
+                for _ in range(3):
+                    oauth_request(f"http://{self.host}/organizations", "token")
+                oauth_request(f"http://{self.host}/missing", "token")
+                poll_request(url=f"http://{self.host}/organizations", access_token="token")
+                with span("vault.read", path="org/secret"):
+                    pass
+                with span("blob.upload", artifact="dataset", bytes=120):
+                    pass
+            assert not tracer.active
+            summary = metrics.summary()
+            requests = {s["labels"]["status"]: s["value"] for s in summary["babylon_http_requests_total"]}
+            assert requests == {"200": 4, "404": 1}
+            latency = summary["babylon_http_request_seconds"][0]
+            assert latency["labels"] == {"host": self.host} and latency["count"] == 5
+            assert summary["babylon_vault_operations_total"] == [{"labels": {"operation": "read"}, "value": 1}]
+            assert summary["babylon_uploaded_bytes_total"] == [{"labels": {"artifact": "dataset"}, "value": 120}]
+            assert summary["babylon_poll_iterations_total"][0]["value"] == 1
+            text = output.read_text()
+            assert "# TYPE babylon_http_request_seconds summary" in text
+            assert f'babylon_http_requests_total{{host="{self.host}",method="GET",status="200"}} 4' in text
+
+    def test_json(self):
+        registry = MetricsRegistry()
+        registry.inc("babylon_token_acquisitions_total", scope='csm "api"')
+        with tempfile.TemporaryDirectory() as tmp:
+            output = pathlib.Path(tmp) / "metrics.json"
+            registry.write(output)
+            assert json.loads(output.read_text())["babylon_token_acquisitions_total"][0]["value"] == 1
+        assert 'scope="csm \\"api\\""' in registry.prometheus()
+
+    def test_azure_poller(self):
+        registry = MetricsRegistry()
+        registry.on_span("azure.poller", {"iterations": None}, 0.5)
+        summary = registry.summary()
+        assert summary["babylon_poll_iterations_total"][0]["value"] == 1
+        assert summary["babylon_poll_seconds"][0]["sum"] == 0.5
+
+    def test_collect_keeps_exceptions(self):
+        with self.assertRaises(RuntimeError):
+            with metrics.collect():
+                with span("command apply"):
+                    raise RuntimeError("deploy failed")
+        assert metrics.summary()["babylon_command_seconds"][0]["count"] == 1
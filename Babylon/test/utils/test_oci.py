@@ -0,0 +1,182 @@
+import json
+import uuid
+import base64
+import hashlib
+import pathlib
+import tempfile
+import unittest
+
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.oci import (DOCKER_MANIFEST, OCI_INDEX, OciError, OciRegistry, copy_image, parse_image, pull_layout,
+                               push_layout)
+
+
+def digest(content: bytes) -> str:
+    return f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+
+class FakeRegistry(FakeServer):
+    """Subset of a `registry:2` with token authentication"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.blobs, self.links, self.manifests, self.uploads = dict(), dict(), dict(), dict()
+        self.tokens = self.mounts = self.chunks = 0
+        self.route("GET", r"/token")(self.get_token)
+        self.route("POST", r"/v2/(?P<repo>.+)/blobs/uploads/")(self.start_upload)
+        self.route("PATCH,PUT", r"/v2/(?P<repo>.+)/blobs/uploads/(?P<upload>[\w-]+)")(self.upload)
+        self.route("GET,HEAD", r"/v2/(?P<repo>.+)/blobs/(?P<blob>sha256:\w+)")(self.get_blob)
+        self.route("GET,HEAD,PUT", r"/v2/(?P<repo>.+)/manifests/(?P<ref>[\w.:-]+)")(self.manifest)
+        self.start()
+
+    close = FakeServer.stop
+
+    def get_token(self, request):
+        basic = base64.b64encode(b"user:secret").decode()
+        if request.headers.get("Authorization") != f"Basic {basic}":
+            return (401, )
+        self.tokens += 1
+        return 200, json.dumps(dict(token="token")).encode()
+
+    def challenge(self, request):
+        if request.headers.get("Authorization") != "Bearer token":
+            challenge = f'Bearer realm="{self.url}/token",service="registry"'
+            return 401, b"{}", {"WWW-Authenticate": challenge}
+
+    def start_upload(self, request, repo):
+        if rejected := self.challenge(request):
+            return rejected
+        mount, source = request.query.get("mount"), request.query.get("from")
+        if mount and mount in self.links.get(source, set()):
+            self.links.setdefault(repo, set()).add(mount)
+            self.mounts += 1
+            return (201, )
+        upload = str(uuid.uuid4())
+        self.uploads[upload] = bytearray()
+        return 202, None, {"Location": f"/v2/{repo}/blobs/uploads/{upload}"}
+
+    def upload(self, request, repo, upload):
+        if rejected := self.challenge(request):
+            return rejected
+        data = self.uploads[upload]
+        if request.command == "PATCH":
+            start = int(request.headers["Content-Range"].split("-")[0])
+            assert start == len(data), "chunks must follow each other"
+            data.extend(request.body())
+            self.chunks += 1
+            return 202, None, {"Location": request.url_path}
+        data.extend(request.body())
+        if digest(bytes(data)) != request.query["digest"]:
+            return 400, b"digest mismatch"
+        self.blobs[request.query["digest"]] = bytes(data)
+        self.links.setdefault(repo, set()).add(request.query["digest"])
+        return (201, )
+
+    def get_blob(self, request, repo, blob):
+        if rejected := self.challenge(request):
+            return rejected
+        if blob not in self.links.get(repo, set()):
+            return (404, )
+        return 200, self.blobs[blob]
+
+    def manifest(self, request, repo, ref):
+        if rejected := self.challenge(request):
+            return rejected
+        key = (repo, ref)
+        if request.command == "PUT":
+            content = request.body()
+            manifest = json.loads(content)
+            for blob in [manifest.get("config"), *manifest.get("layers", []), *manifest.get("manifests", [])]:
+                if blob and blob["digest"] not in self.links.get(repo, set()) | set(d for r, d in self.manifests):
+                    return 400, b"blob unknown"
+            self.manifests[key] = self.manifests[(repo, digest(content))] = (content, request.headers["Content-Type"])
+            return 201, None, {"Docker-Content-Digest": digest(content)}
+        if key not in self.manifests:
+            return (404, )
+        content, media_type = self.manifests[key]
+        return 200, content, {"Content-Type": media_type, "Docker-Content-Digest": digest(content)}
+
+    def add_image(self, repo: str, tag: str, layers: list[bytes]):
+        config = json.dumps(dict(architecture="amd64")).encode()
+        for blob in [config, *layers]:
+            self.blobs[digest(blob)] = blob
+            self.links.setdefault(repo, set()).add(digest(blob))
+        manifest = dict(schemaVersion=2,
+                        mediaType=DOCKER_MANIFEST,
+                        config=dict(digest=digest(config), size=len(config)),
+                        layers=[dict(digest=digest(layer), size=len(layer)) for layer in layers])
+        content = json.dumps(manifest).encode()
+        self.manifests[(repo, tag)] = self.manifests[(repo, digest(content))] = (content, DOCKER_MANIFEST)
+        return content
+
+    def count(self, method: str) -> int:
+        return sum(1 for r in self.requests if r.method == method)
+
+
+class OciTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dev = FakeRegistry()
+        self.prod = FakeRegistry()
+        self.addCleanup(self.dev.close)
+        self.addCleanup(self.prod.close)
+        self.layers = [bytes([i]) * 3000 for i in range(5)]
+        self.dev.add_image("simulator", "1.0.0", self.layers)
+
+    def registry(self, fake: FakeRegistry) -> OciRegistry:
+        return OciRegistry(fake.url, credentials=lambda: ("user", "secret"), chunk_size=1024)
+
+    def test_parse_image(self):
+        assert parse_image("simulator") == ("simulator", "latest")
+        assert parse_image("team/simulator:1.0.0") == ("team/simulator", "1.0.0")
+        assert parse_image("simulator@sha256:abc") == ("simulator", "sha256:abc")
+        assert parse_image("localhost:5000/simulator") == ("localhost:5000/simulator", "latest")
+
+    def test_copy_between_registries(self):
+        stats = copy_image(self.registry(self.dev), "simulator:1.0.0", self.registry(self.prod), "simulator:1.0.0")
+        assert stats.transferred == 6
+        assert self.prod.manifests[("simulator", "1.0.0")] == self.dev.manifests[("simulator", "1.0.0")]
+        assert all(self.prod.blobs[digest(layer)] == layer for layer in self.layers)
+        # layers bigger than a chunk are uploaded in several requests
+        assert self.prod.chunks > 6
+        self.prod.requests.clear()
+        stats = copy_image(self.registry(self.dev), "simulator:1.0.0", self.registry(self.prod), "simulator:1.0.1")
+        assert stats.existing == 6 and stats.transferred == 0
+        assert self.prod.count("PATCH") == 0
+
+    def test_mount_in_registry(self):
+        dev = self.registry(self.dev)
+        stats = copy_image(dev, "simulator:1.0.0", dev, "release/simulator:1.0.0")
+        assert stats.mounted == 6 and stats.transferred == 0
+        assert self.dev.count("PATCH") == 0
+        assert ("release/simulator", "1.0.0") in self.dev.manifests
+        # the token of a scope is asked once
+        assert self.dev.tokens <= 4
+
+    def test_index(self):
+        child = self.dev.add_image("simulator", "amd64", self.layers[:2])
+        index = json.dumps(
+            dict(schemaVersion=2,
+                 mediaType=OCI_INDEX,
+                 manifests=[dict(digest=digest(child), size=len(child), mediaType=DOCKER_MANIFEST)])).encode()
+        self.dev.manifests[("simulator", "multi")] = (index, OCI_INDEX)
+        copy_image(self.registry(self.dev), "simulator:multi", self.registry(self.prod), "simulator:multi")
+        assert self.prod.manifests[("simulator", "multi")][0] == index
+        assert ("simulator", digest(child)) in self.prod.manifests
+
+    def test_layout(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            layout = pathlib.Path(tmp) / "simulator"
+            stats = pull_layout(self.registry(self.dev), "simulator:1.0.0", layout)
+            assert stats.transferred == 6
+            assert json.loads((layout / "index.json").read_text())["manifests"][0]["annotations"]
+            assert pull_layout(self.registry(self.dev), "simulator:1.0.0", layout).existing == 6
+            stats = push_layout(layout, self.registry(self.prod), "simulator:1.0.0")
+            assert stats.transferred == 6
+            assert self.prod.manifests[("simulator", "1.0.0")] == self.dev.manifests[("simulator", "1.0.0")]
+
+    def test_errors(self):
+        with self.assertRaises(OciError):
+            copy_image(self.registry(self.dev), "simulator:missing", self.registry(self.prod), "simulator:1.0.0")
+        with self.assertRaises(OciError):
+            copy_image(OciRegistry(self.dev.url), "simulator:1.0.0", self.registry(self.prod), "simulator:1.0.0")
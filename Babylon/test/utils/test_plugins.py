@@ -0,0 +1,127 @@
+import os
+import sys
+import importlib
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import click
+from click.testing import CliRunner
+
+from Babylon.utils import plugins
+from Babylon.utils.plugins import PluginConfig, PluginGroup, plugin_manifest
+
+# the package exports the command under the name of its module
+initialize_module = importlib.import_module("plugins.dev_tools.initialize_plugin")
+
+PLUGIN = '''import click
+
+
+@click.group()
+def sample():
+    """Sample plugin"""
+
+
+@sample.command()
+def hello():
+    click.echo("hello from sample")
+'''
+
+
+@click.group()
+def packaged():
+    """Plugin installed as a package"""
+
+
+@packaged.command()
+def run():
+    click.echo("packaged run")
+
+
+def babylon() -> click.Group:
+
+    @click.group(cls=PluginGroup)
+    def root():
+        pass
+
+    @root.command()
+    def version():
+        click.echo("1.0")
+
+    return root
+
+
+class PluginsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = pathlib.Path(self.tmp.name)
+        home = mock.patch.dict(os.environ, HOME=str(self.dir / "home"))
+        home.start()
+        self.addCleanup(home.stop)
+        self.plugin = self.dir / "sample"
+        self.plugin.mkdir()
+        (self.plugin / "__init__.py").write_text(PLUGIN)
+        (self.plugin / "plugin_config.yaml").write_text("plugin_name: sample")
+        entry_points = mock.patch.object(plugins,
+                                         "entry_point_plugins",
+                                         return_value=dict(packaged="Babylon.test.utils.test_plugins:packaged"))
+        entry_points.start()
+        self.addCleanup(entry_points.stop)
+        self.addCleanup(sys.modules.pop, "babylon_plugin_sample", None)
+        assert PluginConfig().add_plugin(self.plugin) == "sample"
+
+    def test_lazy_commands(self):
+        plugin_manifest()
+        sys.modules.pop("babylon_plugin_sample")
+        runner = CliRunner()
+        result = runner.invoke(babylon(), ["--help"])
+        assert "sample" in result.output and "Sample plugin" in result.output
+        assert "packaged" in result.output
+        # the help comes from the manifest
+        assert "babylon_plugin_sample" not in sys.modules
+        result = runner.invoke(babylon(), ["sample", "hello"])
+        assert result.output == "hello from sample\n"
+        assert runner.invoke(babylon(), ["packaged", "run"]).output == "packaged run\n"
+
+    def test_babylon_commands(self):
+        with mock.patch.object(plugins, "plugin_manifest", side_effect=AssertionError("manifest read")):
+            assert CliRunner().invoke(babylon(), ["version"]).output == "1.0\n"
+
+    def test_manifest_invalidation(self):
+        manifest = plugin_manifest()
+        assert {p["name"]: p["commands"] for p in manifest} == dict(sample=["hello"], packaged=["run"])
+        with mock.patch.object(plugins, "build_manifest", wraps=plugins.build_manifest) as build:
+            plugin_manifest()
+            assert build.call_count == 0
+            mtime = (self.plugin / "__init__.py").stat().st_mtime + 10
+            os.utime(self.plugin / "__init__.py", (mtime, mtime))
+            plugin_manifest()
+            assert build.call_count == 1
+            PluginConfig().set_active("packaged", False)
+            assert [p["active"] for p in plugin_manifest() if p["plugin"] == "packaged"] == [False]
+            assert build.call_count == 2
+        assert "packaged" not in babylon().list_commands(click.Context(babylon()))
+
+    def test_add_errors(self):
+        config = PluginConfig()
+        assert config.add_plugin(self.plugin) is None
+        assert config.add_plugin(self.dir) is None
+        config.remove_plugin("sample")
+        assert PluginConfig().get("sample") is None
+
+    def test_initialize_plugin(self):
+        template = self.dir / "templates" / "plugin_template"
+        (template / "__pycache__").mkdir(parents=True)
+        (template / "__init__.py").write_text("# plugin_template\n")
+        (template / "__pycache__" / "__init__.cpython-311.pyc").write_bytes(b"\xa7\r\r\n\x00\xff")
+        (template / "logo.png").write_bytes(b"\x89PNG\xff\x00")
+        target = self.dir / "my_plug"
+        with mock.patch.object(initialize_module, "ORIGINAL_TEMPLATE_FOLDER_PATH", template.parent):
+            result = CliRunner().invoke(initialize_module.initialize_plugin, [str(target), "my_plug"])
+        assert result.exit_code == 0, result.output
+        assert (target / "__init__.py").read_text() == "# my_plug\n"
+        assert (target / "logo.png").read_bytes() == b"\x89PNG\xff\x00"
+        assert not (target / "__pycache__").exists()
@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import base64
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+import docker
+from cryptography.fernet import Fernet
+from Babylon.utils import clients
+from Babylon.utils.oci import OciRegistry, copy_image
+from Babylon.utils.registry_tokens import REFRESH_SCOPE, RegistryTokenCache, token_expiry
+from Babylon.test.utils.test_oci import FakeRegistry
+
+
+def jwt(expiry: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(dict(exp=expiry)).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+class RegistryTokensTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = pathlib.Path(self.tmp.name) / "registry_tokens"
+        key = mock.patch.dict(os.environ, BABYLON_ENCODING_KEY=Fernet.generate_key().decode())
+        key.start()
+        self.addCleanup(key.stop)
+
+    def test_expiry(self):
+        expiry = time.time() + 3600
+        assert token_expiry(jwt(expiry)) == expiry
+        assert token_expiry(f"Bearer {jwt(expiry)}") == expiry
+        assert token_expiry("opaque") > time.time()
+        cache = RegistryTokenCache(self.path)
+        cache.put("registry.azurecr.io", REFRESH_SCOPE, jwt(time.time() + 60))
+        # too close to its expiry to be used
+        assert cache.get("registry.azurecr.io", REFRESH_SCOPE) is None
+
+    def test_across_processes(self):
+        token = jwt(time.time() + 3600)
+        RegistryTokenCache(self.path).put("registry.azurecr.io", REFRESH_SCOPE, token)
+        assert token.encode() not in self.path.read_bytes()
+        assert RegistryTokenCache(self.path).get("registry.azurecr.io", REFRESH_SCOPE) == token
+        with mock.patch.dict(os.environ, BABYLON_ENCODING_KEY=Fernet.generate_key().decode()):
+            assert RegistryTokenCache(self.path).get("registry.azurecr.io", REFRESH_SCOPE) is None
+        with mock.patch.dict(os.environ, BABYLON_ENCODING_KEY=""):
+            other = pathlib.Path(self.tmp.name) / "other"
+            RegistryTokenCache(other).put("registry.azurecr.io", REFRESH_SCOPE, token)
+            assert not other.exists()
+
+    def test_refresh_token_exchanged_once(self):
+        response = mock.Mock()
+        response.json.return_value = dict(refresh_token=jwt(time.time() + 3600))
+        with mock.patch.object(clients, "registry_tokens", RegistryTokenCache(self.path)), \
+                mock.patch.object(clients, "registry_identity", return_value="tenant/client"), \
+                mock.patch.object(clients, "get_azure_token", return_value="azure") as azure_token, \
+                mock.patch.object(clients, "oauth_request", return_value=response) as exchange:
+            for _ in range(20):
+                assert clients.get_registry_refresh_token("registry.azurecr.io")
+        assert exchange.call_count == 1
+        assert azure_token.call_count == 1
+
+    def test_access_tokens_shared(self):
+        fake = FakeRegistry()
+        self.addCleanup(fake.close)
+        fake.add_image("simulator", "1.0.0", [b"layer"])
+        cache = RegistryTokenCache(self.path)
+        for tag in ["1.0.1", "1.0.2", "1.0.3"]:
+            registry = OciRegistry(fake.url, credentials=lambda: ("user", "secret"), token_cache=cache)
+            copy_image(registry, "simulator:1.0.0", registry, f"simulator:{tag}")
+        # the tokens of the first copy are used by the next clients
+        assert fake.tokens == 2
+
+    def test_identities(self):
+        token = jwt(time.time() + 3600)
+        cache = RegistryTokenCache(self.path)
+        cache.put("registry.azurecr.io", REFRESH_SCOPE, token, identity="tenant/client")
+        assert cache.get("registry.azurecr.io", REFRESH_SCOPE, identity="tenant/client") == token
+        assert cache.get("registry.azurecr.io", REFRESH_SCOPE, identity="tenant/other") is None
+        assert RegistryTokenCache(self.path).get("registry.azurecr.io", REFRESH_SCOPE, identity="other/client") is None
+
+    def test_clear(self):
+        cache = RegistryTokenCache(self.path)
+        cache.put("registry.azurecr.io", REFRESH_SCOPE, jwt(time.time() + 3600))
+        cache.clear()
+        # cleared tokens are not read again from disk
+        assert cache.get("registry.azurecr.io", REFRESH_SCOPE) is None
+        assert RegistryTokenCache(self.path).get("registry.azurecr.io", REFRESH_SCOPE) is None
+
+    def test_rejected_credentials(self):
+        fake = FakeRegistry()
+        self.addCleanup(fake.close)
+        fake.add_image("simulator", "1.0.0", [b"layer"])
+        cache = RegistryTokenCache(self.path)
+        cache.put(fake.url.split("://")[-1], REFRESH_SCOPE, "revoked")
+        # an access token the registry no longer accepts
+        cache.put(fake.url.split("://")[-1], "repository:simulator:pull", "Bearer expired")
+
+        def credentials():
+            return ("user", cache.get(fake.url.split("://")[-1], REFRESH_SCOPE) or "secret")
+
+        rejected = mock.Mock(side_effect=lambda: cache.drop(fake.url.split("://")[-1], REFRESH_SCOPE))
+        registry = OciRegistry(fake.url, credentials=credentials, token_cache=cache, reject_credentials=rejected)
+        copy_image(registry, "simulator:1.0.0", registry, "simulator:1.0.1")
+        assert rejected.call_count == 1
+        assert cache.get(fake.url.split("://")[-1], "repository:simulator:pull") == "Bearer token"
+
+    def test_docker_login_rejected(self):
+        client = mock.Mock()
+        client.login.side_effect = [docker.errors.APIError("unauthorized"), None]
+        with mock.patch.object(clients.docker, "from_env", return_value=client), \
+                mock.patch.object(clients, "get_registry_refresh_token", side_effect=["revoked", "fresh"]), \
+                mock.patch.object(clients, "drop_registry_refresh_token") as drop:
+            assert clients.get_docker_client("registry.azurecr.io") is client
+        drop.assert_called_once_with("registry.azurecr.io")
+        assert client.login.call_args.kwargs["password"] == "fresh"
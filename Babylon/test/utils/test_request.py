@@ -0,0 +1,30 @@
+import unittest
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.request import oauth_request
+
+fake = FakeServer()
+
+
+@fake.route("GET,PATCH", r"/organizations/(?P<organization_id>[\w-]+)")
+def organization(request, organization_id):
+    return 200, {"id": organization_id}
+
+
+class RequestTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+
+    def test_keep_alive(self):
+        for method in ["GET", "PATCH", "GET"]:
+            response = oauth_request(f"{fake.url}/organizations/o-1", "token", type=method, json={})
+            assert response.json() == {"id": "o-1"}
+        assert oauth_request(f"{fake.url}/missing", "token") is None
+        # the requests share one connection
+        assert len({r.client for r in fake.requests}) == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import io
+import json
+import stat
+import yaml
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+from click import Command, Context
+from Babylon.utils.response import (DEFAULT_PRETTY_PRINT_LIMIT, CommandResponse, atomic_writer, pretty_print_limit,
+                                    serialized_size)
+
+
+class ResponseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = pathlib.Path(self.tmp.name)
+        self.ctx = Context(Command("get_all"))
+        self.ctx.__enter__()
+        self.data = [{"id": i, "name": f"item-{i}"} for i in range(1000)]
+
+    def tearDown(self):
+        self.ctx.__exit__(None, None, None)
+        self.tmp.cleanup()
+
+    def test_dump(self):
+        response = CommandResponse.success(self.data)
+        response.dump(self.dir / "out.json")
+        response.dump(self.dir / "out.yaml")
+        response.dump(self.dir / "out.ndjson")
+        assert json.loads((self.dir / "out.json").read_text()) == self.data
+        assert yaml.safe_load((self.dir / "out.yaml").read_text()) == self.data
+        lines = (self.dir / "out.ndjson").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == self.data
+        assert sorted(p.name for p in self.dir.iterdir()) == ["out.json", "out.ndjson", "out.yaml"]
+
+    def test_atomic_writer(self):
+        target = self.dir / "out.json"
+        target.write_text("previous")
+        with self.assertRaises(ValueError):
+            with atomic_writer(target) as _f:
+                _f.write("partial")
+                raise ValueError()
+        assert target.read_text() == "previous"
+        assert list(self.dir.iterdir()) == [target]
+
+    def test_atomic_writer_mode(self):
+        umask = os.umask(0o022)
+        self.addCleanup(os.umask, umask)
+        created = self.dir / "created.prom"
+        with atomic_writer(created) as _f:
+            _f.write("metric 1\n")
+        assert stat.S_IMODE(created.stat().st_mode) == 0o644
+        replaced = self.dir / "replaced.prom"
+        replaced.write_text("")
+        replaced.chmod(0o640)
+        with atomic_writer(replaced) as _f:
+            _f.write("metric 1\n")
+        assert stat.S_IMODE(replaced.stat().st_mode) == 0o640
+        # an explicit mode is set on the temporary file, the target never has another one
+        modes = []
+        replace = os.replace
+
+        def record_mode(source, target):
+            modes.append(stat.S_IMODE(os.stat(source).st_mode))
+            replace(source, target)
+
+        with mock.patch("os.replace", record_mode), atomic_writer(replaced, mode=0o600) as _f:
+            _f.write("secret\n")
+        assert modes == [0o600] and stat.S_IMODE(replaced.stat().st_mode) == 0o600
+
+    def test_pretty_print_limit(self):
+        with mock.patch.dict(os.environ, {"BABYLON_PRETTY_PRINT_LIMIT": "1024"}):
+            assert pretty_print_limit() == 1024
+        with mock.patch.dict(os.environ, {"BABYLON_PRETTY_PRINT_LIMIT": "256k"}), \
+                self.assertLogs("Babylon", level="WARNING"):
+            assert pretty_print_limit() == DEFAULT_PRETTY_PRINT_LIMIT
+
+    def test_render(self):
+        assert serialized_size(self.data, 100) > 100
+        assert serialized_size({"a": 1}, 100) == len(json.dumps({"a": 1}))
+        response = CommandResponse.success(self.data)
+        stdout = io.StringIO()
+        with mock.patch("sys.stdout", stdout), mock.patch("Babylon.utils.response.pprint") as pprint:
+            response.render(limit=100)
+            pprint.assert_not_called()
+            assert json.loads(stdout.getvalue()) == self.data
+            response.render()
+            pprint.assert_called_once_with(self.data)
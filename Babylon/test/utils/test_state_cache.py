@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import yaml
+from unittest import mock
+from azure.storage.blob import BlobServiceClient
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.environment import Environment
+
+env = Environment()
+
+BLOB = yaml.dump(dict(id="1234", services=dict(api=dict(url="https://api")))).encode("utf-8")
+ETAG = '"0x1"'
+
+fake = FakeServer()
+
+
+@fake.route("PUT", r"/devstoreaccount1/.+")
+def put_blob(request):
+    return 201, None, {"ETag": '"0x2"'}
+
+
+@fake.route("GET", r"/devstoreaccount1/.+")
+def get_blob(request):
+    if request.headers.get("If-None-Match") == ETAG:
+        return 304, None, {"ETag": ETAG, "x-ms-error-code": "ConditionNotMet"}
+    return 206, BLOB, {
+        "ETag": ETAG,
+        "Content-Range": f"bytes 0-{len(BLOB) - 1}/{len(BLOB)}",
+        "Content-Type": "application/octet-stream",
+        "x-ms-blob-type": "BlockBlob"
+    }
+
+
+class StateCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.home = tempfile.TemporaryDirectory()
+        self.patch_home = mock.patch.dict(os.environ, {"HOME": self.home.name})
+        self.patch_home.start()
+        fake.start()
+        env.blob_client = BlobServiceClient.from_connection_string(
+            "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;AccountKey=a2V5;"
+            f"BlobEndpoint={fake.url}/devstoreaccount1;")
+        env.context_id, env.environ_id, env.state_ttl = "ctx", "plt", 0
+        env.validated_states = dict()
+
+    def tearDown(self):
+        fake.stop()
+        self.patch_home.stop()
+        self.home.cleanup()
+
+    def test_revalidate_with_etag(self):
+        state = env.get_state_from_cloud(dict(id="1234"))
+        assert state["services"]["api"]["url"] == "https://api"
+        assert fake.requests[-1].headers.get("If-None-Match") is None
+        env.store_state_in_local(state)
+
+        env.validated_states = dict()
+        state = env.get_state_from_cloud(dict(id="1234"))
+        assert state["services"]["api"]["url"] == "https://api"
+        assert fake.requests[-1].headers.get("If-None-Match") == ETAG
+
+        # validated once per process
+        env.get_state_from_cloud(dict(id="1234"))
+        assert len(fake.requests) == 2
+
+    def test_state_ttl(self):
+        env.get_state_from_cloud(dict(id="1234"))
+        env.validated_states = dict()
+        env.state_ttl = 60
+        state = env.get_state_from_cloud(dict(id="1234"))
+        assert state["id"] == "1234"
+        assert len(fake.requests) == 1
+
+    def test_store_only_changed_state(self):
+        state = env.get_state_from_cloud(dict(id="1234"))
+        env.read_only = True
+        env.store_state_in_cloud(state)
+        env.read_only = False
+        assert len(fake.requests) == 1
+
+        env.cloud_state_hash = env.state_hash(env.store_mtime_in_state(dict(state)))
+        env.store_state_in_cloud(state)
+        assert len(fake.requests) == 1
+
+        state["services"]["api"]["url"] = "https://other"
+        env.store_state_in_cloud(state)
+        assert fake.requests[-1].method == "PUT"
+        assert env.get_state_meta()["etag"] == '"0x2"'
+
+
+if __name__ == "__main__":
+    unittest.main()
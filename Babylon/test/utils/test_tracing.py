@@ -0,0 +1,83 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.request import oauth_request
+from Babylon.utils.tracing import Tracer, tracer, url_template
+
+fake = FakeServer()
+
+
+@fake.route("GET", r"/organizations/(?P<organization_id>[\w-]+)")
+def get_organization(request, organization_id):
+    return 200, b'{"id": "o-abcdef12"}'
+
+
+@fake.route("POST", r"/v1/traces")
+def post_traces(request):
+    return (200, )
+
+
+class TracingTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        fake.start()
+        cls.addClassCleanup(fake.stop)
+        cls.url = fake.url
+
+    def tearDown(self):
+        tracer.disable()
+
+    def test_url_template(self):
+        assert url_template("https://api.test/v2/organizations/o-abcdef12/workspaces/w-12345678?page=1") == \
+            "api.test/v2/organizations/{id}/workspaces/{id}"
+        assert url_template("https://vault/v1/3fa85f64-5717-4562-b3fc-2c963f66afa6/babylon") == "vault/v1/{id}/babylon"
+
+    def test_disabled(self):
+        local = Tracer()
+        with local.span("nothing") as attributes:
+            attributes["status"] = 200
+        assert local.spans == []
+
+    def test_spans(self):
+        tracer.enable()
+        with tracer.span("command babylon api organizations get"):
+            oauth_request(f"{self.url}/organizations/o-abcdef12", "token")
+        child, parent = tracer.spans
+        assert child["parent"] == parent["id"]
+        assert child["name"] == f"GET {fake.host}/organizations/{{id}}"
+        assert child["attributes"] == {"method": "GET", "host": fake.host, "status": 200, "bytes": 20}
+        events = tracer.chrome_trace()["traceEvents"]
+        assert [e["ph"] for e in events] == ["X", "X"]
+        assert events[1]["dur"] >= events[0]["dur"]
+        assert [g["name"] for g in tracer.summary()] == [parent["name"], child["name"]]
+
+    def test_export(self):
+        tracer.enable()
+        with tracer.span("command", retries=2):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_file = pathlib.Path(tmp) / "trace.json"
+            tracer.export(str(trace_file))
+            assert json.loads(trace_file.read_text())["traceEvents"][0]["args"] == {"retries": 2}
+        tracer.export(self.url)
+        received = fake.requests[-1]
+        assert received.path == "/v1/traces"
+        span = json.loads(received.body)["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+        assert span["name"] == "command"
+        assert span["attributes"] == [{"key": "retries", "value": {"intValue": "2"}}]
+        assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+
+    def test_listener_keeps_exceptions(self):
+        received = []
+        tracer.add_listener(lambda name, attributes, seconds: received.append((name, attributes)))
+        try:
+            with self.assertRaises(KeyError):
+                with tracer.span("failing"):
+                    raise KeyError("missing")
+        finally:
+            tracer.listeners.clear()
+            tracer.unpatch()
+        assert received == [("failing", {"error": "KeyError"})]
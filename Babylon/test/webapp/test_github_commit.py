@@ -0,0 +1,140 @@
+import os
+import re
+import json
+import base64
+import hashlib
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+from click import Command, Context
+
+from Babylon.commands.webapp.service import github_commit_svc
+from Babylon.commands.webapp.service.github_commit_svc import GitHubCommitService, blob_sha
+from Babylon.commands.webapp.service.webapp_api_svc import AzureWebAppService, add_import_env_step
+from Babylon.utils.response import CommandResponse
+
+STATE = dict(github=dict(organization="cosmo", repository="webapp", branch="main"))
+WORKFLOW = """jobs:
+  build_and_deploy_job:
+    steps:
+    - uses: actions/checkout@v3
+    - name: Build And Deploy
+      uses: Azure/static-web-apps-deploy@v1
+"""
+
+
+class Response:
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class FakeGitHub:
+    """Refs, commits and trees of a branch, answering like `oauth_request`"""
+
+    def __init__(self, files: dict[str, bytes]) -> None:
+        self.commits = dict()
+        self.calls = []
+        self.conflicts = 0
+        self.head = self.add_commit(files, [])
+
+    def add_commit(self, files: dict[str, bytes], parents: list[str]) -> str:
+        sha = hashlib.sha1(json.dumps([sorted(files), parents, len(self.commits)]).encode()).hexdigest()
+        self.commits[sha] = dict(files=files, parents=parents)
+        return sha
+
+    def __call__(self, url: str, token: str, type: str = "GET", json: dict = None, **kwargs):
+        path = url.removeprefix("https://api.github.com/repos/cosmo/webapp")
+        self.calls.append((type, path))
+        if type == "GET" and path == "/git/ref/heads/main":
+            return Response(dict(object=dict(sha=self.head)))
+        if match := re.fullmatch(r"/git/commits/(\w+)", path):
+            return Response(dict(tree=dict(sha=f"tree-{match.group(1)}")))
+        if match := re.fullmatch(r"/contents/(.+)", path):
+            content = self.commits[kwargs["params"]["ref"]]["files"].get(match.group(1))
+            if content is None:
+                return None
+            return Response(dict(sha=blob_sha(content), content=base64.b64encode(content).decode()))
+        if path == "/git/trees":
+            base = self.commits[json["base_tree"].removeprefix("tree-")]["files"]
+            files = {**base, **{e["path"]: e["content"].encode() for e in json["tree"]}}
+            return Response(dict(sha=f"tree-{self.add_commit(files, [])}"))
+        if path == "/git/commits":
+            files = self.commits[json["tree"].removeprefix("tree-")]["files"]
+            return Response(dict(sha=self.add_commit(files, json["parents"])))
+        if type == "PATCH" and path == "/git/refs/heads/main":
+            if self.conflicts:
+                # someone pushed between the read of the head and the update
+                self.conflicts -= 1
+                self.head = self.add_commit(self.commits[self.head]["files"], [self.head])
+                return None
+            if self.commits[json["sha"]]["parents"] != [self.head]:
+                return None
+            self.head = json["sha"]
+            return Response(dict(object=dict(sha=self.head)))
+        raise AssertionError(f"unexpected call {type} {path}")
+
+    def commit_count(self) -> int:
+        return sum(1 for t, p in self.calls if (t, p) == ("POST", "/git/commits"))
+
+
+class GitHubCommitTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.github = FakeGitHub({"config.json": b"{}", ".github/workflows/deploy.yml": WORKFLOW.encode()})
+        patches = [
+            mock.patch.object(github_commit_svc, "oauth_request", self.github),
+            mock.patch.object(github_commit_svc.env, "get_global_secret", return_value="token")
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.service = GitHubCommitService(state=STATE)
+
+    def test_single_commit(self):
+        workflow = add_import_env_step(WORKFLOW)
+        sha = self.service.commit_files(
+            {
+                "config.json": b'{"api": "url"}',
+                ".github/workflows/deploy.yml": workflow.encode()
+            }, "update")
+        assert sha == self.github.head
+        assert self.github.commit_count() == 1
+        files = self.github.commits[sha]["files"]
+        assert files["config.json"] == b'{"api": "url"}'
+        assert "import-env" in files[".github/workflows/deploy.yml"].decode()
+        assert add_import_env_step(files[".github/workflows/deploy.yml"].decode()) is None
+
+    def test_unchanged_files(self):
+        head = self.github.head
+        assert self.service.commit_files({"config.json": b"{}"}, "update") == ""
+        assert self.github.head == head
+        assert self.github.commit_count() == 0
+
+    def test_branch_moved(self):
+        self.github.conflicts = 1
+        sha = self.service.commit_files({"config.json": b'{"api": "url"}'}, "update")
+        assert sha == self.github.head
+        assert self.github.commit_count() == 2
+        assert self.github.commits[sha]["files"]["config.json"] == b'{"api": "url"}'
+
+    def test_upload_remote(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp.name)
+        config = pathlib.Path("config.json")
+        config.write_bytes(b"{}")
+        service = AzureWebAppService(state=STATE)
+        with Context(Command("upload_file")):
+            # nothing changed is not a failure
+            assert service.upload_file(config, remote=True).status_code == CommandResponse.STATUS_OK
+            config.write_bytes(b'{"api": "url"}')
+            self.github.conflicts = github_commit_svc.MAX_ATTEMPTS
+            assert service.upload_many([config], remote=True).status_code == CommandResponse.STATUS_ERROR
+            assert service.upload_file(config, remote=True).status_code == CommandResponse.STATUS_OK
+        assert self.github.commits[self.github.head]["files"]["config.json"] == b'{"api": "url"}'
@@ -0,0 +1,96 @@
+import json
+import unittest
+import requests
+from unittest import mock
+from click import Command, Context
+from datetime import datetime, timezone
+
+from Babylon.commands.git_hub.runs.service import github_api_svc
+from Babylon.commands.git_hub.runs.service.github_api_svc import GitHubRunsService
+from Babylon.test.fake_server import FakeServer
+from Babylon.utils.response import CommandResponse
+
+STATE = dict(github=dict(organization="cosmo", repository="webapp", branch="main"))
+WORKFLOW = "/actions/workflows/azure-static-web-apps-webapp.yml/runs"
+
+# runs of one workflow, a run shows up and completes after a few polls
+fake = FakeServer()
+github = dict(polls=0, not_modified=0)
+
+
+def poll_run() -> dict:
+    github["polls"] += 1
+    return dict(id=7,
+                url=f"{fake.url}/runs/7",
+                created_at="2024-01-01T00:00:10Z",
+                run_started_at="2024-01-01T00:00:10Z",
+                updated_at="2024-01-01T00:01:40Z",
+                status="in_progress" if github["polls"] < 6 else "completed",
+                conclusion=None if github["polls"] < 6 else "success")
+
+
+def reply_etag(request, data: dict):
+    body = json.dumps(data).encode()
+    etag = f'"{hash(body)}"'
+    if request.headers.get("If-None-Match") == etag:
+        github["not_modified"] += 1
+        return (304, )
+    return 200, body, {"ETag": etag, "Content-Type": "application/json"}
+
+
+@fake.route("GET", WORKFLOW)
+def get_workflow_runs(request):
+    run = poll_run()
+    return reply_etag(request, dict(workflow_runs=[run] if github["polls"] > 2 else []))
+
+
+@fake.route("GET", r"/runs/7")
+def get_run(request):
+    return reply_etag(request, poll_run())
+
+
+class GitHubRunsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        github.update(polls=0, not_modified=0)
+        fake.start()
+        self.addCleanup(fake.stop)
+        patches = [
+            mock.patch.object(GitHubRunsService, "repo_url", fake.url),
+            mock.patch.object(github_api_svc.env, "get_global_secret", return_value="token"),
+            mock.patch.object(github_api_svc.time, "sleep")
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.service = GitHubRunsService(state=STATE)
+
+    def test_wait_for_run(self):
+        since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        run = self.service.wait_for_run("webapp", since=since, event="push")
+        assert run["id"] == 7
+        first = fake.requests[0]
+        assert first.path == WORKFLOW
+        assert first.query["created"] == ">=2024-01-01T00:00:00Z"
+        assert first.query["branch"] == "main" and first.query["event"] == "push"
+        # the empty list did not change between the first polls
+        assert github["not_modified"] == 1
+        run = self.service.wait_for_completion(run)
+        assert run["conclusion"] == "success"
+        assert github["not_modified"] == 2
+
+    def test_lazy_token(self):
+        github_api_svc.env.get_global_secret.reset_mock()
+        service = GitHubRunsService(state=STATE)
+        github_api_svc.env.get_global_secret.assert_not_called()
+        service.runs("webapp")
+        github_api_svc.env.get_global_secret.assert_called_once()
+
+    def test_cancel_network_error(self):
+        with Context(Command("cancel")), \
+                mock.patch.object(self.service.session, "post", side_effect=requests.ConnectionError("reset")):
+            response = self.service.cancel(f"{self.service.repo_url}/actions/runs/7")
+        assert response.status_code == CommandResponse.STATUS_ERROR
+
+    def test_wait_timeout(self):
+        assert self.service.wait_for_run("other", timeout=0) is None
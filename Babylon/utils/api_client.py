@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import threading
+import httpx
+
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from Babylon.utils.tracing import span, url_template
+
+logger = logging.getLogger("Babylon")
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_TIMEOUT = 60
+
+
+class ApiLoop:
+    """Event loop running in a daemon thread, used to run the api coroutines from synchronous code"""
+
+    lock = threading.Lock()
+    loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def get(cls) -> asyncio.AbstractEventLoop:
+        with cls.lock:
+            if cls.loop is None:
+                cls.loop = asyncio.new_event_loop()
+                threading.Thread(target=cls.loop.run_forever, name="babylon-api", daemon=True).start()
+        return cls.loop
+
+    @classmethod
+    def run(cls, coroutine: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, cls.get()).result()
+
+
+class CosmoTechApiClient:
+    """
+    Asynchronous client of the Cosmo Tech API
+
+    All clients of a same api url share one keep-alive connection pool (HTTP/2 when the `h2`
+    package is installed). Coroutines are run on the event loop of the caller, or with `sync`
+    from synchronous code. Like `oauth_request`, requests return None on failure
+    """
+
+    # keyed by the loop itself and not its id, ids of collected loops are reused by new loops
+    pools: dict[tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = dict()
+    pools_lock = threading.Lock()
+
+    def __init__(self,
+                 url: str,
+                 azure_token: str,
+                 max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 timeout: float = DEFAULT_TIMEOUT) -> None:
+        self.url = str(url or "").rstrip("/")
+        self.azure_token = azure_token
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.sync = SyncApiClient(self)
+
+    def pool(self) -> httpx.AsyncClient:
+        # a pool is bound to the event loop it was created on
+        key = (self.url, asyncio.get_running_loop())
+        with self.pools_lock:
+            for closed in [k for k in self.pools if k[1].is_closed()]:
+                # the connections of a closed loop cannot be closed anymore, they are only released
+                del self.pools[closed]
+            if key not in self.pools:
+                limits = httpx.Limits(max_connections=self.max_connections,
+                                      max_keepalive_connections=self.max_connections)
+                self.pools[key] = httpx.AsyncClient(base_url=self.url,
+                                                    http2=HTTP2_AVAILABLE,
+                                                    limits=limits,
+                                                    timeout=self.timeout)
+            return self.pools[key]
+
+    async def request(self,
+                      type: str,
+                      path: str,
+                      content_type: str = "application/json",
+                      data: Optional[Any] = None,
+                      json: Optional[Any] = None,
+                      params: Optional[dict[str, Any]] = None,
+                      headers: Optional[dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        Send a request to the api
+        :param type: request type [POST, PATCH, PUT, GET, DELETE]
+        :param path: path relative to the api url
+        :param content_type: content type of `data`
+        :param data: raw body, a string, bytes or a binary file, or a dict sent as a form
+        :param json: body serialized as json
+        :param params: query parameters
+        :return: the response or None if the request failed
+        """
+        headers = {"Authorization": f"Bearer {self.azure_token}", "Content-Type": content_type, **(headers or {})}
+        if hasattr(data, "read"):
+            data = data.read()
+        form = data if isinstance(data, dict) else None
+        with span(f"{type.upper()} {url_template(self.url + path)}", method=type.upper(),
+                  host=httpx.URL(self.url).host) as attributes:
+            try:
+                response = await self.pool().request(type.upper(),
+                                                     path,
+                                                     content=None if form else data,
+                                                     data=form,
+                                                     json=json,
+                                                     params=params,
+                                                     headers=headers)
+            except httpx.HTTPError as e:
+                logger.warning(f"Request failed: {e}")
+                return None
+            attributes.update(status=response.status_code, bytes=len(response.content))
+        if response.status_code >= 300:
+            logger.warning(f"Failed: ({response.status_code}): {response.text}")
+            return None
+        logger.debug(f"Request success ({response.status_code}): {response.text}")
+        return response
+
+    async def gather(self, calls: Iterable[Awaitable[Any]], concurrency: int = DEFAULT_MAX_CONNECTIONS) -> list[Any]:
+        """Await many api calls, at most `concurrency` at a time, results are in the calls order"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def bounded(call: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await call
+
+        return await asyncio.gather(*[bounded(c) for c in calls])
+
+
+class SyncApiClient:
+    """Blocking version of every coroutine of a CosmoTechApiClient, for the existing call sites"""
+
+    def __init__(self, client: CosmoTechApiClient) -> None:
+        self.client = client
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self.client, name)
+        if not asyncio.iscoroutinefunction(method):
+            return method
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return ApiLoop.run(method(*args, **kwargs))
+
+        return wrapper
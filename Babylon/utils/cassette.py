@@ -0,0 +1,246 @@
+import io
+import re
+import json
+import time
+import base64
+import asyncio
+import logging
+import pathlib
+import threading
+
+from collections import deque
+from typing import Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from Babylon.utils.tracing import url_template
+from Babylon.utils.response import atomic_writer
+
+logger = logging.getLogger("Babylon")
+
+CASSETTE_VERSION = 1
+REDACTED = "REDACTED"
+REDACTED_HEADERS = [
+    "authorization", "x-vault-token", "cookie", "set-cookie", "x-ms-copy-source-authorization",
+    "ocp-apim-subscription-key", "x-functions-key"
+]
+REDACTED_PARAMS = ["sig", "code", "client_secret", "access_token", "refresh_token", "token"]
+# whole json keys holding credentials, compared without case, `_` and `-`
+SECRET_KEY = re.compile(r"(access|refresh|id|sas|api|auth)?token|(client|shared)?secret|(admin)?password|credentials?|"
+                        r"(primary|secondary)?connectionstrings?|"
+                        r"(account|primary|secondary|primarymaster|secondarymaster|shared|access|api|storage)?key|"
+                        r"sig|signature")
+# lists of named keys, as returned by listKeys: `{"keys": [{"keyName": "key1", "value": "..."}]}`
+KEY_LISTS = ["keys"]
+# headers describing the wire encoding of bodies which are stored decoded
+TRANSPORT_HEADERS = ["content-encoding", "transfer-encoding", "content-length", "connection"]
+
+
+class CassetteError(Exception):
+    pass
+
+
+def redact_url(url: str) -> str:
+    parts = urlsplit(str(url))
+    query = [(k, REDACTED if k.lower() in REDACTED_PARAMS else v) for k, v in parse_qsl(parts.query, True)]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def redact_headers(headers: Any) -> dict[str, str]:
+    return {k: REDACTED if k.lower() in REDACTED_HEADERS else v for k, v in headers.items()}
+
+
+def redact_json(data: Any, secret: bool = False, parent: str = "") -> Any:
+    """Replace the strings found under credential keys"""
+    if isinstance(data, dict):
+        redacted = dict()
+        for k, v in data.items():
+            key = str(k).lower().replace("_", "").replace("-", "")
+            is_secret = bool(SECRET_KEY.fullmatch(key)) or (key == "value" and parent in KEY_LISTS)
+            redacted[k] = redact_json(v, secret or is_secret, key)
+        return redacted
+    if isinstance(data, list):
+        return [redact_json(v, secret, parent) for v in data]
+    if secret and isinstance(data, str):
+        return REDACTED
+    return data
+
+
+def encode_body(content: bytes) -> dict[str, str]:
+    if not content:
+        return dict(text="")
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return dict(base64=base64.b64encode(content).decode("ascii"))
+    try:
+        return dict(text=json.dumps(redact_json(json.loads(text))))
+    except ValueError:
+        return dict(text=text)
+
+
+def decode_body(body: dict[str, str]) -> bytes:
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body.get("text", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    Records the http exchanges of a command in a cassette file, or replays them
+
+    Both the requests sessions (`oauth_request`, hvac, msal and the azure sdk pipelines) and the
+    httpx clients of the Cosmo Tech API are patched at the transport level. Credentials are
+    redacted before anything is written. On replay a request gets the next recorded response of the
+    same method and url, then of the same url template, so the ids generated by a run do not
+    break the matching. `speed` scales the recorded latencies, 0 answers at once
+    """
+
+    def __init__(self) -> None:
+        self.mode = ""
+        self.path: Optional[pathlib.Path] = None
+        self.speed = 0.0
+        self.lock = threading.Lock()
+        self.interactions: list[dict[str, Any]] = []
+        self.queues: dict[tuple[str, str], deque[dict[str, Any]]] = dict()
+        self.patches: list[tuple[Any, str, Any]] = []
+
+    @property
+    def active(self) -> bool:
+        return bool(self.mode)
+
+    def record(self, path: pathlib.Path):
+        self.stop()
+        self.mode, self.path, self.interactions = "record", pathlib.Path(path), []
+        self.patch()
+
+    def replay(self, path: pathlib.Path, speed: float = 0.0):
+        self.stop()
+        path = pathlib.Path(path)
+        try:
+            content = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            raise CassetteError(f"Could not read cassette {path}: {e}")
+        if content.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version in {path}")
+        self.mode, self.path, self.speed = "replay", path, speed
+        self.interactions = content["interactions"]
+        self.queues = dict()
+        for interaction in self.interactions:
+            method, url = interaction["request"]["method"], interaction["request"]["url"]
+            self.queues.setdefault((method, url), deque()).append(interaction)
+            self.queues.setdefault((method, url_template(url)), deque()).append(interaction)
+        self.patch()
+
+    def stop(self):
+        """Remove the patches and write the cassette of a recording"""
+        for owner, name, original in reversed(self.patches):
+            setattr(owner, name, original)
+        self.patches = []
+        if self.mode == "record":
+            with atomic_writer(self.path) as _f:
+                json.dump(dict(version=CASSETTE_VERSION, interactions=self.interactions), _f, indent=1)
+            logger.info(f"{len(self.interactions)} http exchanges recorded in {self.path}")
+        self.mode = ""
+
+    def add(self, method: str, url: str, headers: Any, body_size: int, status: int, reason: str, response_headers: Any,
+            content: bytes, elapsed: float):
+        interaction = dict(request=dict(method=method,
+                                        url=redact_url(url),
+                                        headers=redact_headers(headers),
+                                        body_size=body_size),
+                           response=dict(status=status,
+                                         reason=reason,
+                                         headers={
+                                             k: v
+                                             for k, v in redact_headers(response_headers).items()
+                                             if k.lower() not in TRANSPORT_HEADERS
+                                         },
+                                         body=encode_body(content)),
+                           elapsed=round(elapsed, 6))
+        with self.lock:
+            self.interactions.append(interaction)
+
+    def take(self, method: str, url: str) -> dict[str, Any]:
+        """Next unused recorded exchange matching the request"""
+        url = redact_url(url)
+        with self.lock:
+            for key in [(method, url), (method, url_template(url))]:
+                queue = self.queues.get(key, deque())
+                while queue:
+                    interaction = queue.popleft()
+                    if not interaction.get("used"):
+                        interaction["used"] = True
+                        return interaction
+        raise CassetteError(f"No recorded response for {method} {url}")
+
+    def patch(self):
+        import httpx
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.response import HTTPResponse
+        cassette = self
+        send = requests.Session.send
+        async_send = httpx.AsyncClient.send
+
+        def body_size(body: Any) -> int:
+            return len(body) if isinstance(body, (bytes, str)) else 0
+
+        def session_send(session: requests.Session, request: requests.PreparedRequest,
+                         **kwargs: Any) -> requests.Response:
+            if cassette.mode == "replay":
+                try:
+                    interaction = cassette.take(request.method, request.url)
+                except CassetteError as e:
+                    raise requests.ConnectionError(str(e), request=request)
+                time.sleep(interaction["elapsed"] * cassette.speed)
+                recorded = interaction["response"]
+                content = decode_body(recorded["body"])
+                raw = HTTPResponse(body=io.BytesIO(content),
+                                   headers={
+                                       **recorded["headers"], "Content-Length": str(len(content))
+                                   },
+                                   status=recorded["status"],
+                                   reason=recorded["reason"],
+                                   preload_content=False,
+                                   decode_content=False)
+                return HTTPAdapter().build_response(request, raw)
+            # lower layers may rewrite the request, keep it as babylon sent it
+            method, url, headers = request.method, request.url, dict(request.headers)
+            start = time.perf_counter()
+            response = send(session, request, **kwargs)
+            content = response.content
+            cassette.add(method, url, headers, body_size(request.body), response.status_code, response.reason or "",
+                         response.headers, content,
+                         time.perf_counter() - start)
+            return response
+
+        async def client_send(client: httpx.AsyncClient, request: httpx.Request, **kwargs: Any) -> httpx.Response:
+            if cassette.mode == "replay":
+                try:
+                    interaction = cassette.take(request.method, str(request.url))
+                except CassetteError as e:
+                    raise httpx.ConnectError(str(e), request=request)
+                await asyncio.sleep(interaction["elapsed"] * cassette.speed)
+                recorded = interaction["response"]
+                return httpx.Response(recorded["status"],
+                                      headers=recorded["headers"],
+                                      content=decode_body(recorded["body"]),
+                                      request=request)
+            start = time.perf_counter()
+            response = await async_send(client, request, **kwargs)
+            content = await response.aread()
+            try:
+                size = len(request.content)
+            except httpx.RequestNotRead:
+                size = 0
+            cassette.add(request.method, str(request.url), request.headers, size, response.status_code,
+                         response.reason_phrase, response.headers, content,
+                         time.perf_counter() - start)
+            return response
+
+        for owner, name, replacement in [(requests.Session, "send", session_send),
+                                         (httpx.AsyncClient, "send", client_send)]:
+            self.patches.append((owner, name, getattr(owner, name)))
+            setattr(owner, name, replacement)
+
+
+cassette = Cassette()
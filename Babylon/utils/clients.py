@@ -6,6 +6,7 @@ import hvac
 
 from typing import Any
 from typing import Callable
+from typing import Optional
 from functools import wraps
 from azure.storage.blob import BlobServiceClient
 from azure.digitaltwins.core import DigitalTwinsClient
@@ -20,9 +21,14 @@ from .environment import Environment
 from .credentials import get_azure_credentials
 from .credentials import get_azure_token
 from .request import oauth_request
+from .oci import OciRegistry
+from .registry_tokens import REFRESH_SCOPE, registry_tokens
 
 logger = logging.getLogger("Babylon")
 env = Environment()
+# user name of the refresh tokens of azure container registries
+ACR_USER = "00000000-0000-0000-0000-000000000000"
+registry_clients: dict[str, ContainerRegistryClient] = dict()
 
 
 def get_registry_client(registry: str):
@@ -30,41 +36,104 @@ def get_registry_client(registry: str):
 
     :param registry: registry name: myregistry.azurecr.io
     :type registry: str
-    :return: ContainerRegistryClient logger to the registry
+    :return: ContainerRegistryClient logger to the registry, the same for the commands of a process
     """
-    return ContainerRegistryClient(f"https://{registry}",
-                                   get_azure_credentials(),
-                                   audience="https://management.azure.com")
+    # a client keeps the registry tokens of its requests, reusing it saves their exchanges
+    if registry not in registry_clients:
+        registry_clients[registry] = ContainerRegistryClient(f"https://{registry}",
+                                                             get_azure_credentials(),
+                                                             audience="https://management.azure.com")
+    return registry_clients[registry]
 
 
-def get_docker_client(registry: str):
-    """Gets a docker client logged to the registry
+def registry_identity() -> str:
+    """Tenant and client id the registry tokens are exchanged for"""
+    config = env.get_state_from_vault_by_platform(env.environ_id)
+    return f"{env.tenant_id}/{config['babylon']['client_id']}"
+
+
+def drop_registry_refresh_token(registry: str):
+    """Forgets the refresh token of the container registry, once the registry rejected it"""
+    logger.debug(f"Dropping the refresh token of container registry {registry}")
+    registry_tokens.drop(registry, REFRESH_SCOPE, identity=registry_identity())
+
+
+def get_registry_refresh_token(registry: str) -> Optional[str]:
+    """Exchanges an azure token for a refresh token of the container registry, kept until it expires
+    or until the registry rejects it
 
     :param registry: registry name: myregistry.azurecr.io
     :type registry: str
-    :return: Docker client
+    :return: refresh token, the password of the null guid user
     """
-    # Getting Refresh token
-    body = f"grant_type=access_token&service={registry}&tenant={env.tenant_id}&access_token={get_azure_token()}"
+    identity = registry_identity()
+    refresh_token = registry_tokens.get(registry, REFRESH_SCOPE, identity=identity)
+    if refresh_token:
+        return refresh_token
+    azure_token = get_azure_token()
+    body = f"grant_type=access_token&service={registry}&tenant={env.tenant_id}&access_token={azure_token}"
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
     response = oauth_request(f"https://{registry}/oauth2/exchange",
-                             get_azure_token(),
+                             azure_token,
                              data=body,
                              type="POST",
                              headers=headers)
     if response is None:
         logger.error(f"Could not get a refresh token for container registry {registry}")
         return None
-    # Login to registry with docker
-    client = docker.from_env()
+    refresh_token = response.json().get("refresh_token")
+    if refresh_token:
+        registry_tokens.put(registry, REFRESH_SCOPE, refresh_token, identity=identity)
+    return refresh_token
+
+
+def get_oci_registry(registry: str) -> OciRegistry:
+    """Gets a client of the distribution API of the registry, no docker daemon is needed
+
+    :param registry: registry name: myregistry.azurecr.io
+    :type registry: str
+    :return: OciRegistry authenticated with a refresh token when the registry asks for it
+    """
+
+    def credentials() -> Optional[tuple[str, str]]:
+        refresh_token = get_registry_refresh_token(registry)
+        return (ACR_USER, refresh_token) if refresh_token else None
+
+    return OciRegistry(registry,
+                       credentials=credentials,
+                       token_cache=registry_tokens,
+                       identity=registry_identity(),
+                       reject_credentials=lambda: drop_registry_refresh_token(registry))
+
+
+def get_docker_client(registry: str):
+    """Gets a docker client logged to the registry
+
+    :param registry: registry name: myregistry.azurecr.io
+    :type registry: str
+    :return: Docker client
+    """
     try:
-        client.login(username="00000000-0000-0000-0000-000000000000",
-                     password=response.json().get("refresh_token"),
-                     registry=registry)
-    except docker.errors.APIError:
-        logger.error(f"Could not connect to container registry {registry}")
+        client = docker.from_env()
+    except docker.errors.DockerException:
+        logger.error(f"Could not connect to container registry {registry} with docker")
         return None
-    return client
+    # Login to registry with docker, a rejected refresh token is exchanged again once
+    for attempt in range(2):
+        refresh_token = get_registry_refresh_token(registry)
+        if refresh_token is None:
+            return None
+        try:
+            client.login(username=ACR_USER, password=refresh_token, registry=registry, reauth=True)
+            return client
+        except docker.errors.APIError as e:
+            if attempt:
+                logger.error(f"Could not log to container registry {registry} with docker: {e}")
+                return None
+            drop_registry_refresh_token(registry)
+        except docker.errors.DockerException:
+            logger.error(f"Could not connect to container registry {registry} with docker")
+            return None
 
 
 def pass_hvac_client(func: Callable[..., Any]) -> Callable[..., Any]:
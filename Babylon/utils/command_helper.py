@@ -1,24 +1,166 @@
+import json
+import shlex
+import time
 import logging
 import click
 
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
 from .response import CommandResponse
+from .environment import Environment
 
 logger = logging.getLogger("Babylon")
 
 
-def run_command(command_line: list[str]) -> CommandResponse:
+def run_command(command_line: list[str], babylon: Optional[click.Command] = None) -> CommandResponse:
     """
     Helper used to run a command
     :param command_line: command line of the command to run
+    :param babylon: root command, defaults to the root of the current click context
     :return: result of the command
     """
-    context = click.get_current_context()
-    if context.command_path == "babylon":
-        root = context
-    else:
-        root = context.find_root()
-    babylon = root.command
+    if babylon is None:
+        context = click.get_current_context()
+        if context.command_path == "babylon":
+            root = context
+        else:
+            root = context.find_root()
+        babylon = root.command
     ctx = babylon.make_context("babylon", [*command_line], ignore_unknown_options=True)
     ret: CommandResponse = babylon.invoke(ctx)
     logger.setLevel(logging.INFO)
     return ret
+
+
+def is_read_only(babylon: click.Command, command_line: list[str]) -> bool:
+    """Whether the command of a command line is declared `read_only`, the command is not run"""
+    command, name, args = babylon, "babylon", [*command_line]
+    parent = None
+    try:
+        while isinstance(command, click.Group):
+            ctx = command.make_context(name, args, parent=parent, resilient_parsing=True)
+            # click keeps the subcommand name and its arguments apart from the remaining args
+            remaining = [*(ctx._protected_args if hasattr(ctx, "_protected_args") else ctx.protected_args), *ctx.args]
+            if not remaining:
+                return False
+            name, command, args = command.resolve_command(ctx, remaining)
+            parent = ctx
+    except click.ClickException:
+        return False
+    return bool(getattr(getattr(command, "callback", None), "read_only", False))
+
+
+def parse_command(entry: Any, index: int) -> dict[str, Any]:
+    """Build a batch entry from a command line string, an argument list or a json object"""
+    if isinstance(entry, dict):
+        args = entry.get("args", [])
+        entry_id = str(entry.get("id", index))
+    else:
+        args, entry_id = entry, str(index)
+    if isinstance(args, str):
+        args = shlex.split(args, comments=True)
+    if args and args[0] == "babylon":
+        args = args[1:]
+    return dict(id=entry_id, args=[str(a) for a in args])
+
+
+def parse_batch(content: str) -> list[list[dict[str, Any]]]:
+    """
+    Split a batch file in stages of independent commands
+
+    A json array holds one entry per stage, a stage being a command or a list of commands.
+    Otherwise every line is a command line or a json object `{"id": ..., "args": ...}`,
+    and blank lines separate stages
+    :param content: content of the batch file
+    :return: list of stages
+    """
+    stages: list[list[dict[str, Any]]] = []
+    index = 0
+    if content.lstrip().startswith("["):
+        for stage in json.loads(content):
+            stage = stage if isinstance(stage, list) and stage and not isinstance(stage[0], str) else [stage]
+            stages.append([])
+            for entry in stage:
+                stages[-1].append(parse_command(entry, index))
+                index += 1
+        return [s for s in stages if s]
+    current: list[dict[str, Any]] = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            if current:
+                stages.append(current)
+                current = []
+            continue
+        if line.startswith("#"):
+            continue
+        entry = json.loads(line) if line.startswith("{") else line
+        command = parse_command(entry, index)
+        index += 1
+        if command["args"]:
+            current.append(command)
+    if current:
+        stages.append(current)
+    return stages
+
+
+def run_batch(babylon: click.Command,
+              stages: list[list[dict[str, Any]]],
+              parallel: int = 1,
+              keep_going: bool = False,
+              emit: Optional[Callable[[dict[str, Any]], None]] = None) -> list[dict[str, Any]]:
+    """
+    Run batch stages one after the other
+
+    Commands of a stage share the environment (namespace, state, working directory). Only the
+    commands declared `read_only` run concurrently, the others run one at a time once the read
+    only commands of their stage are done, so state updates are never lost.
+    Command responses are not printed while the batch runs, results are only given to `emit`
+    :param babylon: root command
+    :param stages: stages returned by `parse_batch`
+    :param parallel: maximum number of concurrent commands in a stage
+    :param keep_going: run the next stages even if a command failed
+    :param emit: called with each command result as soon as it is available
+    :return: list of command results
+    """
+
+    def run(entry: dict[str, Any]) -> dict[str, Any]:
+        start = time.perf_counter()
+        result = dict(id=entry["id"], args=entry["args"], status_code=CommandResponse.STATUS_ERROR, data=None)
+        try:
+            response = run_command(entry["args"], babylon=babylon)
+            if isinstance(response, CommandResponse):
+                result.update(status_code=response.status_code, data=response.data)
+            else:
+                result.update(status_code=CommandResponse.STATUS_OK, data=response)
+        except click.exceptions.Exit as e:
+            result.update(status_code=e.exit_code)
+        except click.ClickException as e:
+            result.update(error=e.format_message())
+        except SystemExit as e:
+            result.update(status_code=e.code if isinstance(e.code, int) else CommandResponse.STATUS_ERROR)
+        except Exception as e:
+            logger.error(e)
+            result.update(error=str(e))
+        result["duration"] = round(time.perf_counter() - start, 3)
+        if emit:
+            emit(result)
+        return result
+
+    env = Environment()
+    results: list[dict[str, Any]] = []
+    is_verbose = env.is_verbose
+    env.is_verbose = False
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallel)) as executor:
+            for stage in stages:
+                concurrent = [i for i, e in enumerate(stage) if parallel > 1 and is_read_only(babylon, e["args"])]
+                done = dict(zip(concurrent, executor.map(run, [stage[i] for i in concurrent])))
+                stage_results = [done[i] if i in done else run(entry) for i, entry in enumerate(stage)]
+                results += stage_results
+                if not keep_going and any(r["status_code"] != CommandResponse.STATUS_OK for r in stage_results):
+                    logger.error("Batch stopped after a failed command")
+                    break
+    finally:
+        env.is_verbose = is_verbose
+    return results
@@ -12,9 +12,11 @@ from click import option
 from Babylon.utils.checkers import check_email
 from Babylon.utils.response import CommandResponse
 from .environment import Environment
+from .tracing import span
 
 logger = logging.getLogger("Babylon")
 env = Environment()
+credentials_cache: dict[tuple[str, str, str], ClientSecretCredential] = dict()
 
 
 def get_powerbi_token(email: str = None) -> str:
@@ -26,7 +28,8 @@ def get_powerbi_token(email: str = None) -> str:
     env.AZURE_SCOPES.update({"powerbi": "https://analysis.windows.net/powerbi/api/.default"})
     logger.debug(f"Getting azure token with scope {env.AZURE_SCOPES['powerbi']}")
     try:
-        token = credentials.get_token(env.AZURE_SCOPES["powerbi"])
+        with span("token", scope="powerbi"):
+            token = credentials.get_token(env.AZURE_SCOPES["powerbi"])
     except ClientAuthenticationError:
         logger.error(f"Could not get token with scope {env.AZURE_SCOPES['powerbi']}")
         sys.exit(1)
@@ -39,10 +42,14 @@ def get_azure_token(scope: str = "default") -> str:
     config = env.get_state_from_vault_by_platform(env.environ_id)
     api = config["api"]
     env.AZURE_SCOPES.update({"csm_api": api["scope"]})
+    cluster_uri = config["adx"].get("cluster_uri", "")
+    if cluster_uri:
+        env.AZURE_SCOPES.update({"adx": f"{cluster_uri.rstrip('/')}/.default"})
     scope_url = env.AZURE_SCOPES[scope.lower()]
     logger.debug(f"Getting azure token with scope {scope_url}")
     try:
-        token = credentials.get_token(scope_url)
+        with span("token", scope=scope.lower()):
+            token = credentials.get_token(scope_url)
     except ClientAuthenticationError:
         logger.error(f"Could not get token with scope {scope_url}")
         sys.exit(1)
@@ -54,6 +61,10 @@ def get_azure_credentials() -> ClientSecretCredential:
     credential = None
     config = env.get_state_from_vault_by_platform(env.environ_id)
     babylon_client_id = config["babylon"]["client_id"]
+    # credentials keep their token cache, reuse them across commands of a same process
+    key = (env.tenant_id, env.environ_id, babylon_client_id)
+    if key in credentials_cache:
+        return credentials_cache[key]
     try:
         baby_client_secret = env.get_env_babylon(name="client", environ_id=env.environ_id)
         credential = ClientSecretCredential(
@@ -63,6 +74,7 @@ def get_azure_credentials() -> ClientSecretCredential:
         )
         if credential is None:
             raise AttributeError
+        credentials_cache[key] = credential
     except (CredentialUnavailableError, AttributeError) as exp:
         logger.error(exp)
     return credential
@@ -0,0 +1,185 @@
+import io
+import os
+import sys
+import json
+import socket
+import logging
+import click
+
+from pathlib import Path
+from typing import Any, Optional
+from Babylon.utils.environment import Environment
+from Babylon.utils.working_dir import WorkingDir
+from Babylon.utils.credentials import credentials_cache
+from Babylon.utils.clients import registry_clients
+from Babylon.utils.registry_tokens import registry_tokens
+from Babylon.utils.response import CommandResponse
+from Babylon.utils.daemon_client import send, socket_path, FORWARDED_ENV_PREFIX
+
+logger = logging.getLogger("Babylon")
+env = Environment()
+
+DEFAULT_IDLE_TIMEOUT = 900
+
+
+class FrameWriter(io.TextIOBase):
+    """Text stream sending everything written to it as json frames on the client socket"""
+
+    def __init__(self, conn: socket.socket, stream: str) -> None:
+        self.conn = conn
+        self.stream = stream
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, data: str) -> int:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        if data:
+            try:
+                send(self.conn, {self.stream: data})
+            except OSError:
+                pass
+        return len(data)
+
+
+class BabylonDaemon:
+    """
+    Serves babylon command lines sent by `daemon_client` on a unix socket
+
+    Commands run one at a time in this process so the Environment singleton, vault client,
+    credentials and clients stay warm between commands. Caches are keyed by platform and
+    state, they are dropped when the namespace file, the variables file or the BABYLON_*
+    variables of the client change. The cloud state is revalidated by every command
+    """
+
+    def __init__(self,
+                 babylon: click.Command,
+                 path: Optional[Path] = None,
+                 idle_timeout: int = DEFAULT_IDLE_TIMEOUT) -> None:
+        self.babylon = babylon
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout
+        self.running = False
+        self.watched: dict[str, float] = dict()
+        self.default_state_ttl = env.state_ttl
+
+    def serve(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            self.path.unlink()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # the socket is created readable by the user only, there is no window with default permissions
+        umask = os.umask(0o177)
+        try:
+            server.bind(str(self.path))
+        finally:
+            os.umask(umask)
+        server.listen()
+        server.settimeout(self.idle_timeout or None)
+        self.running = True
+        logger.info(f"Babylon daemon listening on {self.path}")
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    logger.info(f"No command received for {self.idle_timeout}s, stopping")
+                    break
+                with conn:
+                    self.handle(conn)
+        finally:
+            server.close()
+            if self.path.exists():
+                self.path.unlink()
+
+    def handle(self, conn: socket.socket):
+        conn.settimeout(None)
+        with conn.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        control = request.get("control")
+        if control == "stop":
+            self.running = False
+            send(conn, {"exit": 0})
+            return
+        if control == "status":
+            send(conn, {"out": f"{os.getpid()}\n"})
+            send(conn, {"exit": 0})
+            return
+        code = self.run(conn, request)
+        try:
+            send(conn, {"exit": code})
+        except OSError:
+            pass
+
+    def refresh(self, request: dict[str, Any]):
+        """Reset per-command settings and drop caches that may be stale"""
+        cwd = Path(request.get("cwd") or os.getcwd())
+        os.chdir(cwd)
+        if env.pwd != cwd:
+            env.pwd = cwd
+            env.working_dir = WorkingDir(working_dir_path=cwd)
+        env.working_dir.files_to_deploy = []
+        env.dry_run = False
+        env.is_verbose = True
+        env.read_only = False
+        env.state_ttl = self.default_state_ttl
+        # states are validated once per command like in separate processes, so updates made by other
+        # machines are seen, `state_ttl` still lets recently validated local copies be used without request
+        env.validated_states.clear()
+        stale = False
+        client_env = request.get("env", {})
+        for key in [k for k in os.environ if k.startswith(FORWARDED_ENV_PREFIX) and k not in client_env]:
+            del os.environ[key]
+            stale = True
+        for key, value in client_env.items():
+            if os.environ.get(key) != value:
+                os.environ[key] = value
+                stale = True
+        for watched in [Path.home() / ".config/cosmotech/babylon/namespace.yaml", cwd / "variables.yaml"]:
+            mtime = watched.stat().st_mtime if watched.exists() else 0.0
+            if self.watched.setdefault(str(watched), mtime) != mtime:
+                self.watched[str(watched)] = mtime
+                stale = True
+        if stale:
+            logger.debug("Dropping daemon caches")
+            env.reset_caches()
+            credentials_cache.clear()
+            registry_clients.clear()
+            registry_tokens.clear()
+
+    def run(self, conn: socket.socket, request: dict[str, Any]) -> int:
+        self.refresh(request)
+        streams = sys.stdin, sys.stdout, sys.stderr
+        sys.stdin = io.StringIO(request.get("stdin") or "")
+        sys.stdout = FrameWriter(conn, "out")
+        sys.stderr = FrameWriter(conn, "err")
+        try:
+            # exit codes follow the babylon command line: a failed CommandResponse still exits with 0
+            self.babylon.main(args=request.get("argv", []), prog_name="babylon", standalone_mode=False)
+            return 0
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            return CommandResponse.STATUS_ERROR
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else CommandResponse.STATUS_ERROR
+        except Exception as e:
+            logger.error(e)
+            return CommandResponse.STATUS_ERROR
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = streams
@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import socket
+import hashlib
+
+from pathlib import Path
+from typing import Any, Optional, TextIO
+
+# thin client of `babylon daemon`: only standard library modules are imported here so it starts fast,
+# the full CLI is loaded only when no daemon is listening
+FORWARDED_ENV_PREFIX = "BABYLON_"
+
+
+def socket_path() -> Path:
+    """Socket of the daemon serving the current vault service and organization"""
+    custom = os.environ.get("BABYLON_DAEMON_SOCKET")
+    if custom:
+        return Path(custom)
+    key = "|".join([os.environ.get("BABYLON_SERVICE", ""), os.environ.get("BABYLON_ORG_NAME", "")])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return Path.home() / ".config/cosmotech/babylon" / f"daemon-{digest}.sock"
+
+
+def connect(path: Optional[Path] = None, timeout: Optional[float] = None) -> Optional[socket.socket]:
+    path = path or socket_path()
+    if not path.exists():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(str(path))
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def send(client: socket.socket, message: dict[str, Any]):
+    client.sendall(f"{json.dumps(message)}\n".encode("utf-8"))
+
+
+def frames(client: socket.socket):
+    """Yield the json frames sent back by the daemon"""
+    with client.makefile("r", encoding="utf-8") as reader:
+        for line in reader:
+            if line.strip():
+                yield json.loads(line)
+
+
+def forward(argv: list[str],
+            path: Optional[Path] = None,
+            stdin: Optional[TextIO] = None,
+            stdout: Optional[TextIO] = None,
+            stderr: Optional[TextIO] = None) -> Optional[int]:
+    """
+    Run a command line on the daemon, streaming its output to the local stdout / stderr
+    :param argv: babylon arguments
+    :param path: daemon socket, defaults to `socket_path()`
+    :param stdin: stream forwarded as the command stdin unless it is a terminal, defaults to sys.stdin
+    :param stdout: stream receiving the command stdout, defaults to sys.stdout
+    :param stderr: stream receiving the command stderr, defaults to sys.stderr
+    :return: exit code of the command or None if no daemon is available
+    """
+    client = connect(path)
+    if client is None:
+        return None
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    content = None if stdin is None or stdin.isatty() else stdin.read()
+    request = dict(argv=argv,
+                   cwd=os.getcwd(),
+                   env={
+                       k: v
+                       for k, v in os.environ.items() if k.startswith(FORWARDED_ENV_PREFIX)
+                   },
+                   stdin=content)
+    with client:
+        send(client, request)
+        for frame in frames(client):
+            if "out" in frame:
+                stdout.write(frame["out"])
+                stdout.flush()
+            elif "err" in frame:
+                stderr.write(frame["err"])
+                stderr.flush()
+            elif "exit" in frame:
+                return frame["exit"]
+    return 1
+
+
+def main():
+    code = forward(sys.argv[1:])
+    if code is None:
+        from Babylon.main import main as babylon
+        babylon(prog_name="babylon")
+        return
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import sys
+import json
 import datetime
 import logging
 import pathlib
@@ -6,12 +8,15 @@ import time
 
 from typing import Any
 from functools import wraps
+from contextlib import nullcontext
 from typing import Callable
 from Babylon.utils.checkers import check_special_char
 from Babylon.version import get_version
 from click import get_current_context, option
 from Babylon.utils.environment import Environment
-from Babylon.utils.response import CommandResponse
+from Babylon.utils.response import CommandResponse, atomic_writer
+from Babylon.utils.tracing import span
+from Babylon.utils.metrics import metrics
 
 logger = logging.getLogger("Babylon")
 env = Environment()
@@ -53,26 +58,74 @@ def output_to_file(func: Callable[..., Any]) -> Callable[..., Any]:
         "-o",
         "--output",
         "output_file",
-        help="File to which content should be outputted",
+        help="File to which content should be outputted, .ndjson and .jsonl files get one json line per item",
     )
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         output_file = kwargs.pop("output_file", None)
-        if output_file:
-            path_file = pathlib.Path(output_file)
-            ext_file = path_file.suffix
         response: CommandResponse = func(*args, **kwargs)
         if output_file:
-            output_file = pathlib.Path(output_file)
-            if "json" in ext_file:
-                response.dump_json(output_file)
-            else:
-                response.dump_yaml(output_file)
+            response.dump(pathlib.Path(output_file))
+        return response
+
+    return wrapper
+
+
+def output_to_stream(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Add output options to a listing command, the command receives a `sink` writing ndjson lines
+
+    The sink is None when items are not streamed: the command returns them and they are
+    dumped as with `output_to_file`
+    """
+
+    @option(
+        "-o",
+        "--output",
+        "output_file",
+        help="File to which content should be outputted, .ndjson and .jsonl files are streamed",
+    )
+    @option("--ndjson", "ndjson", is_flag=True, help="Stream items as json lines while they are received")
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        output_file = kwargs.pop("output_file", None)
+        ndjson = kwargs.pop("ndjson", False)
+        path_file = pathlib.Path(output_file) if output_file else None
+        if ndjson or (path_file and path_file.suffix in [".ndjson", ".jsonl"]):
+            with atomic_writer(path_file) if path_file else nullcontext(sys.stdout) as stream:
+                kwargs["sink"] = lambda item: stream.write(f"{json.dumps(item, default=str, ensure_ascii=False)}\n")
+                response = func(*args, **kwargs)
+                stream.flush()
+            return response
+        kwargs["sink"] = None
+        response: CommandResponse = func(*args, **kwargs)
+        if path_file:
+            response.dump(path_file)
         return response
 
     return wrapper
 
 
+def with_metrics(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Add a --metrics option writing call counts, latencies and bytes of the command at exit"""
+
+    @option(
+        "--metrics",
+        "metrics_file",
+        type=pathlib.Path,
+        envvar="BABYLON_METRICS",
+        help="Write the metrics of the command in this file, Prometheus textfile for .prom files, json otherwise",
+    )
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        metrics_file = kwargs.pop("metrics_file", None)
+        if not metrics_file:
+            return func(*args, **kwargs)
+        with metrics.collect(metrics_file):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
 def timing_decorator(func: Callable[..., Any]) -> Callable[..., Any]:
     """
     Decorator adding timings before and after the run of a function
@@ -157,8 +210,18 @@ def injectcontext() -> Callable[..., Any]:
             "state_id",
             help="State Id",
         )
+        @option(
+            "--state-ttl",
+            "state_ttl",
+            type=int,
+            envvar="BABYLON_STATE_TTL",
+            help="Use the local state copy without checking the cloud state for this many seconds",
+        )
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any):
+            state_ttl = kwargs.pop("state_ttl", None)
+            if state_ttl is not None:
+                env.state_ttl = state_ttl
             context = kwargs.pop("context", None)
             if context and check_special_char(string=context):
                 env.set_context(context)
@@ -169,7 +232,8 @@ def injectcontext() -> Callable[..., Any]:
             if state_id and check_special_char(string=state_id):
                 env.set_state_id(state_id)
             env.get_namespace_from_local(context=context, platform=platform, state_id=state_id)
-            return func(*args, **kwargs)
+            with span(f"command {get_current_context().command_path}"):
+                return func(*args, **kwargs)
 
         return wrapper
 
@@ -187,6 +251,26 @@ def retrieve_state(func) -> Callable[..., Any]:
     return wrapper
 
 
+def read_only(func) -> Callable[..., Any]:
+    """
+    Declare a command as not modifying the state, nothing is persisted while it runs
+
+    The command callback gets a `read_only` attribute, `babylon batch` runs only these commands concurrently
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any):
+        env.read_only = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            env.read_only = False
+
+    # copied to the outer decorators by `wraps`
+    wrapper.read_only = True
+    return wrapper
+
+
 def wrapcontext() -> Callable[..., Any]:
 
     def wrap_function(func: Callable[..., Any]) -> Callable[..., Any]:
@@ -1,8 +1,12 @@
+import copy
 import json
+import hashlib
 import os
 import re
 import sys
+import time
 import uuid
+import threading
 import yaml
 import logging
 import requests
@@ -13,10 +17,13 @@ from mako.template import Template
 from cryptography.fernet import Fernet
 from flatten_json import flatten
 from Babylon.config import config_files
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient
 
 from Babylon.utils import ORIGINAL_TEMPLATE_FOLDER_PATH
 from Babylon.utils.working_dir import WorkingDir
+from Babylon.utils.tracing import span, tracer
 from Babylon.utils.yaml_utils import yaml_to_json
 
 logger = logging.getLogger("Babylon")
@@ -61,14 +68,41 @@ class Environment(metaclass=SingletonMeta):
         self.original_template_path = (ORIGINAL_TEMPLATE_FOLDER_PATH / "working_dir/.templates")
         self.dry_run = False
         self.is_verbose = True
+        # seconds during which the local state copy is trusted without revalidation
+        self.state_ttl = int(os.environ.get("BABYLON_STATE_TTL", 0) or 0)
+        self.vault_states: dict[str, dict] = dict()
+        self.validated_states: dict[str, dict] = dict()
+        # commands declared read-only never persist the state, flag is per thread for batch runs
+        self.thread_state = threading.local()
+        self.blob_client_environ = ""
+        self.local_state_hash = ""
+        self.cloud_state_hash = ""
         self.AZURE_SCOPES = {
             "graph": "https://graph.microsoft.com/.default",
             "default": "https://management.azure.com/.default",
             "powerbi": "https://analysis.windows.net/powerbi/api/.default",
             "csm_api": "",
+            "adx": "",
+            "adt": "https://digitaltwins.azure.net/.default",
         }
         self.working_dir = WorkingDir(working_dir_path=self.pwd)
 
+    @property
+    def read_only(self) -> bool:
+        return getattr(self.thread_state, "read_only", False)
+
+    @read_only.setter
+    def read_only(self, value: bool):
+        self.thread_state.read_only = value
+
+    def reset_caches(self):
+        """Forget vault, state and client caches kept between commands of a same process"""
+        self.vault_states.clear()
+        self.validated_states.clear()
+        self.hvac_client = None
+        self.blob_client = None
+        self.blob_client_environ = ""
+
     def get_variables(self):
         variables_file = self.pwd / "variables.yaml"
         vars = dict()
@@ -81,7 +115,8 @@ class Environment(metaclass=SingletonMeta):
         result = content.replace("services", "")
         t = Template(text=result, strict_undefined=True)
         vars = self.get_variables()
-        payload = t.render(**vars)
+        with span("template.render"):
+            payload = t.render(**vars)
         payload_dict = yaml.safe_load(payload)
         context_id = payload_dict.get("context", "")
         state_id = payload_dict.get("state_id", "")
@@ -114,7 +149,8 @@ class Environment(metaclass=SingletonMeta):
             vars.update(ext_args)
         if state:
             flattenstate = flatten(state.get("services", {}), separator=".")
-        payload = t.render(**vars, services=flattenstate)
+        with span("template.render"):
+            payload = t.render(**vars, services=flattenstate)
         payload_json = yaml_to_json(payload)
         payload_dict = json.loads(payload_json)
         return payload_dict
@@ -161,14 +197,20 @@ class Environment(metaclass=SingletonMeta):
         self.tenant_id = self.get_organization_secret(self.organization_name, "tenant")
 
     def set_server_id(self):
-        self.server_id = os.environ.get("BABYLON_SERVICE")
+        server_id = os.environ.get("BABYLON_SERVICE")
+        if self.hvac_client and server_id == self.server_id:
+            # keep the warm client when several commands run in the same process
+            return
+        self.server_id = server_id
         try:
             client = Client(url=f"{self.server_id}", token=os.environ.get("BABYLON_TOKEN"))
-            self.hvac_client = client
+            self.hvac_client = tracer.instrument(client, "vault", ["read", "write"])
         except Exception as e:
             logger.error(e)
 
     def set_blob_client(self):
+        if self.blob_client and self.blob_client_environ == self.environ_id:
+            return
         try:
             state = self.get_state_from_vault_by_platform(self.environ_id)
             storage_name = state["azure"]["storage_account_name"]
@@ -176,6 +218,7 @@ class Environment(metaclass=SingletonMeta):
             prefix = f"DefaultEndpointsProtocol=https;AccountName={storage_name}"
             connection_str = (f"{prefix};AccountKey={account_secret};EndpointSuffix=core.windows.net")
             self.blob_client = BlobServiceClient.from_connection_string(connection_str)
+            self.blob_client_environ = self.environ_id
         except Exception as e:
             logger.error(e)
 
@@ -270,6 +313,8 @@ class Environment(metaclass=SingletonMeta):
         return response_json["access_token"]
 
     def get_state_from_vault_by_platform(self, platform: str):
+        if platform in self.vault_states:
+            return copy.deepcopy(self.vault_states[platform])
         resources = config_files
         organization_name = os.environ.get("BABYLON_ORG_NAME", "")
         tenant_id = self.tenant_id
@@ -280,49 +325,127 @@ class Environment(metaclass=SingletonMeta):
                 logger.error(f"platform id '{platform}' not found in vault service")
                 sys.exit(1)
             response_parsed.setdefault(r, dict(response["data"].items()))
+        self.vault_states[platform] = copy.deepcopy(response_parsed)
         return response_parsed
 
     def store_mtime_in_state(self, state: dict):
         state["files"] = self.working_dir.files_to_deploy
         return state
 
-    def store_state_in_local(self, state: dict):
+    def state_file_name(self) -> str:
+        return f"state.{self.context_id}.{self.environ_id}.{self.state_id}.yaml"
+
+    def state_meta_path(self) -> Path:
+        return Path().home() / ".config/cosmotech/babylon" / self.state_file_name().replace(".yaml", ".meta.json")
+
+    def get_state_meta(self) -> dict:
+        meta_file = self.state_meta_path()
+        if not meta_file.exists():
+            return dict()
+        try:
+            return json.loads(meta_file.read_text())
+        except ValueError:
+            return dict()
+
+    def store_state_meta(self, etag: str):
+        """Keep the etag of the cloud blob the local state copy was taken from"""
+        meta_file = self.state_meta_path()
+        meta_file.parent.mkdir(parents=True, exist_ok=True)
+        meta_file.write_text(json.dumps(dict(etag=etag, validated_at=time.time())))
+
+    @staticmethod
+    def state_hash(state: dict) -> str:
+        return hashlib.sha256(yaml.dump(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def write_local_state(self, state: dict):
         state_dir = Path().home() / ".config/cosmotech/babylon"
         if not state_dir.exists():
             state_dir.mkdir(parents=True, exist_ok=True)
-        s = state_dir / f"state.{self.context_id}.{self.environ_id}.{self.state_id}.yaml"
-        state = self.store_mtime_in_state(state)
+        s = state_dir / self.state_file_name()
         s.write_bytes(data=yaml.dump(state).encode("utf-8"))
 
+    def store_state_in_local(self, state: dict):
+        if self.read_only:
+            return
+        state = self.store_mtime_in_state(state)
+        state_hash = self.state_hash(state)
+        if state_hash == self.local_state_hash:
+            logger.debug("Local state unchanged")
+            return
+        self.write_local_state(state)
+        self.local_state_hash = state_hash
+
     def store_state_in_cloud(self, state: dict):
-        s = f"state.{self.context_id}.{self.environ_id}.{self.state_id}.yaml"
-        # check babylon-states container if exists
-        state_container = self.blob_client.get_container_client(container="babylon-states")
-        if not state_container.exists():
-            state_container.create_container()
+        if self.read_only:
+            return
+        state = self.store_mtime_in_state(state)
+        state_hash = self.state_hash(state)
+        if state_hash == self.cloud_state_hash:
+            logger.debug("Cloud state unchanged")
+            return
+        s = self.state_file_name()
         state_blob = self.blob_client.get_blob_client(container="babylon-states", blob=s)
-        if state_blob.exists():
-            state_blob.delete_blob()
-        state_blob.upload_blob(data=yaml.dump(state).encode("utf-8"))
+        data = yaml.dump(state).encode("utf-8")
+        with span("blob.upload", artifact="state", bytes=len(data)):
+            try:
+                result = state_blob.upload_blob(data=data, overwrite=True)
+            except ResourceNotFoundError:
+                # babylon-states container does not exist yet
+                self.blob_client.get_container_client(container="babylon-states").create_container()
+                result = state_blob.upload_blob(data=data, overwrite=True)
+        self.cloud_state_hash = state_hash
+        # the local copy now matches the uploaded blob, next commands can revalidate it cheaply
+        self.store_state_meta(etag=result.get("etag", ""))
+        self.validated_states[s] = copy.deepcopy(state)
 
     def get_state_from_local(self):
         state_dir = Path().home() / ".config/cosmotech/babylon"
-        state_file = state_dir / f"state.{self.context_id}.{self.environ_id}.{self.state_id}.yaml"
+        state_file = state_dir / self.state_file_name()
         if not state_file.exists():
             return dict()
         state_data = yaml.load(state_file.open("r"), Loader=yaml.SafeLoader)
         return state_data
 
     def get_state_from_cloud(self, state: dict) -> dict:
+        """Return the cloud state, downloading it only when its etag differs from the local copy
+
+        The local copy is trusted without any request for `state_ttl` seconds after its last
+        validation, and is validated at most once per process
+        """
         if not state.get("id"):
             return state
         self.state_id = state.get("id")
-        s = f"state.{self.context_id}.{self.environ_id}.{self.state_id}.yaml"
+        s = self.state_file_name()
+        if s in self.validated_states:
+            return copy.deepcopy(self.validated_states[s])
+        meta = self.get_state_meta()
+        local = self.get_state_from_local() if meta.get("etag") else dict()
+        if local and self.state_ttl and time.time() - meta.get("validated_at", 0) < self.state_ttl:
+            logger.debug(f"Using local state {s}, validated less than {self.state_ttl}s ago")
+            self.validated_states[s] = copy.deepcopy(local)
+            return local
         state_blob = self.blob_client.get_blob_client(container="babylon-states", blob=s)
-        if not state_blob.exists():
+        try:
+            with span("blob.download", artifact="state", conditional=bool(local)) as attributes:
+                if local:
+                    downloader = state_blob.download_blob(etag=meta["etag"], match_condition=MatchConditions.IfModified)
+                else:
+                    downloader = state_blob.download_blob()
+                content = downloader.readall()
+                attributes["bytes"] = len(content)
+            data = yaml.load(content, Loader=yaml.SafeLoader)
+        except ResourceNotFoundError:
             return state
-        if state_blob.exists():
-            data = yaml.load(state_blob.download_blob().readall(), Loader=yaml.SafeLoader)
+        except HttpResponseError as e:
+            if e.status_code != 304:
+                raise
+            logger.debug(f"Local state {s} is up to date")
+            self.store_state_meta(etag=meta["etag"])
+            self.validated_states[s] = copy.deepcopy(local)
+            return local
+        self.write_local_state(data)
+        self.store_state_meta(etag=downloader.properties.etag)
+        self.validated_states[s] = copy.deepcopy(data)
         return data
 
     def get_state_id(self):
@@ -375,7 +498,9 @@ class Environment(metaclass=SingletonMeta):
         init_state["services"] = data_vault
         init_state["id"] = state_id or self.get_state_id()
         state_cloud = self.get_state_from_cloud(init_state)
-        self.store_state_in_local(state_cloud)
+        if state_cloud is init_state:
+            # no cloud state yet, keep the generated id for the next commands
+            self.write_local_state(state_cloud)
         for section, keys in state_cloud.get("services").items():
             final_state["services"][section] = dict()
             for key, _ in keys.items():
@@ -385,6 +510,10 @@ class Environment(metaclass=SingletonMeta):
         final_state["id"] = init_state.get("id") or state_cloud.get("id")
         final_state["context"] = self.context_id
         final_state["platform"] = self.environ_id
+        # commands persisting an unchanged state skip the writes
+        state_hash = self.state_hash(self.store_mtime_in_state(copy.deepcopy(final_state)))
+        self.local_state_hash = state_hash
+        self.cloud_state_hash = "" if state_cloud is init_state else state_hash
         return final_state
 
     def set_ns_from_yaml(self, content: str, state: dict = None, ext_args: dict = None):
@@ -0,0 +1,85 @@
+import base64
+import shutil
+import logging
+
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+import git
+
+from Babylon.utils.tracing import span
+
+logger = logging.getLogger("Babylon")
+
+
+def git_cache_dir() -> Path:
+    return Path().home() / ".config/cosmotech/babylon/git"
+
+
+def git_auth_env(token: Optional[str]) -> dict[str, str]:
+    """Environment giving the token to git as a header, so it is never written in a git config or command line"""
+    variables = dict(GIT_TERMINAL_PROMPT="0")
+    if token:
+        basic = base64.b64encode(f"x-access-token:{token}".encode("utf-8")).decode("ascii")
+        variables.update(GIT_CONFIG_COUNT="1",
+                         GIT_CONFIG_KEY_0="http.extraHeader",
+                         GIT_CONFIG_VALUE_0=f"Authorization: Basic {basic}")
+    return variables
+
+
+class GitWorkspace:
+    """
+    Working copies of a branch backed by a persistent cache of the repository
+
+    The cache is a bare repository holding only the last commit of the branch, without file
+    contents (`--depth 1 --filter=blob:none`), kept under `~/.config/cosmotech/babylon/git`. Later
+    runs fetch the new commit only. Working copies are git worktrees of the cache, checked out
+    sparsely when `paths` are given, so only the blobs of these files are downloaded
+    """
+
+    def __init__(self, url: str, branch: str, token: Optional[str] = None, cache_dir: Optional[Path] = None) -> None:
+        self.url = url
+        self.branch = branch
+        self.env = git_auth_env(token)
+        parts = urlsplit(url)
+        name = parts.path.strip("/").removesuffix(".git")
+        self.cache = (cache_dir or git_cache_dir()) / (parts.netloc or "local") / f"{name}.git"
+
+    def mirror(self) -> git.Git:
+        """Git commands of the cache, updated with the last commit of the branch"""
+        if not (self.cache / "HEAD").exists():
+            logger.info(f"[git] creating cache of {self.url} in {self.cache}")
+            git.Repo.init(self.cache, bare=True, mkdir=True).create_remote("origin", self.url)
+        # sparse worktrees move `core.bare` to a config file GitPython does not read, use plain commands
+        cache = git.Git(self.cache)
+        with span("git.fetch", branch=self.branch), cache.custom_environment(**self.env):
+            cache.fetch("--depth", "1", "--filter=blob:none", "origin",
+                        f"+refs/heads/{self.branch}:refs/remotes/origin/{self.branch}")
+        return cache
+
+    def checkout(self, destination: Path, paths: Optional[list[str]] = None) -> git.Repo:
+        """Working copy of the branch in `destination`, limited to `paths` when given"""
+        cache = self.mirror()
+        destination = Path(destination).absolute()
+        with span("git.checkout", sparse=bool(paths)), cache.custom_environment(**self.env):
+            # worktrees removed without git are still registered
+            cache.worktree("prune")
+            cache.worktree("add", "--no-checkout", "--force", "-B", self.branch, str(destination),
+                           f"origin/{self.branch}")
+            repo = git.Repo(destination)
+            with repo.git.custom_environment(**self.env):
+                if paths:
+                    repo.git.sparse_checkout("set", "--no-cone", *[f"/{p.strip('/')}" for p in paths])
+                # file contents are fetched here, for the checked out paths only
+                repo.git.checkout(self.branch)
+        logger.info(f"[git] {self.url} checked out in {destination}")
+        return repo
+
+    def remove(self, destination: Path):
+        """Delete a working copy, the cache is kept for the next runs"""
+        destination = Path(destination).absolute()
+        try:
+            git.Git(self.cache).worktree("remove", "--force", str(destination))
+        except (git.GitCommandError, OSError):
+            shutil.rmtree(destination, ignore_errors=True)
@@ -6,6 +6,7 @@ from math import log10
 from typing import Any
 from typing import Optional
 from ..version import VERSION
+from .logs import log_pipeline
 
 MAX_RETRIES = 3
 INTERACTIVE_ARG_VALUE = "--interactive-after"
@@ -81,6 +82,7 @@ def confirm_deletion(entity_type: str, entity_id: str) -> bool:
     :param entity_id: Entity ID
     :return: Should execution continue ?
     """
+    log_pipeline.flush()
     if not click.confirm(f"You are trying to delete {entity_type} {entity_id} \nDo you want to continue ?"):
         logger.info(f"{entity_type} deletion aborted.")
         return False
@@ -0,0 +1,157 @@
+import json
+import logging
+import jmespath
+
+from typing import Any, Callable, Iterable, Iterator, Optional
+from azure.core.exceptions import HttpResponseError, ServiceRequestError
+from Babylon.utils.request import oauth_request
+from Babylon.utils.response import CommandResponse
+
+logger = logging.getLogger("Babylon")
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class ListingError(Exception):
+    """Raised by the listing iterators when a page cannot be retrieved"""
+
+
+def odata_clauses(node: dict[str, Any]) -> Optional[list[str]]:
+    """Odata clauses of a jmespath condition made of `field=='value'` comparisons joined by `&&`"""
+    if node["type"] == "and_expression":
+        left, right = (odata_clauses(child) for child in node["children"])
+        return left + right if left is not None and right is not None else None
+    if node["type"] != "comparator" or node["value"] != "eq":
+        return None
+    field, literal = node["children"]
+    if literal["type"] != "literal" or not isinstance(literal["value"], str):
+        return None
+    fields = field["children"] if field["type"] == "subexpression" else [field]
+    if any(f["type"] != "field" for f in fields):
+        return None
+    value = literal["value"].replace("'", "''")
+    return [f"{'/'.join(f['value'] for f in fields)} eq '{value}'"]
+
+
+class ItemFilter:
+    """
+    Pre-compiled jmespath `--filter` applied to a stream of items
+
+    Filters of the form `[?condition]` or `[?condition].projection` are evaluated item by item
+    while the items are received. Other expressions, pipes included (`[?condition] | [0]`), need
+    the whole list and are evaluated once all items are received
+    """
+
+    def __init__(self, expression: Optional[str] = None) -> None:
+        self.expression = expression or ""
+        self.item = None
+        self.whole = None
+        if not self.expression:
+            return
+        compiled = jmespath.compile(self.expression)
+        root = compiled.parsed
+        if root["type"] == "filter_projection" and root["children"][0]["type"] == "identity":
+            self.item = compiled
+        else:
+            self.whole = compiled
+
+    @property
+    def per_item(self) -> bool:
+        return self.whole is None
+
+    def apply(self, items: Iterable[Any]) -> Any:
+        """Return an iterator of filtered items, or the result of the expression on the whole list"""
+        if self.whole is not None:
+            return self.whole.search(list(items))
+        return self.iter(items)
+
+    def iter(self, items: Iterable[Any]) -> Iterator[Any]:
+        for item in items:
+            if self.item is None:
+                yield item
+                continue
+            # a filter projection keeps its semantics when run on a list of one item
+            yield from self.item.search([item])
+
+    def odata(self) -> Optional[str]:
+        """Odata $filter equivalent of the condition when it only compares fields to strings"""
+        if self.item is None:
+            return None
+        clauses = odata_clauses(self.item.parsed["children"][2])
+        return " and ".join(clauses) if clauses else None
+
+
+def iter_next_link(url: str, access_token: str, key: str = "value", **kwargs: Any) -> Iterator[dict]:
+    """Iterate over the items of an azure (ARM, graph, powerbi) listing following its next links"""
+    while url:
+        response = oauth_request(url, access_token, **kwargs)
+        if response is None:
+            raise ListingError(f"Could not list {url}")
+        content = response.json()
+        yield from content.get(key, [])
+        url = content.get("@odata.nextLink") or content.get("nextLink")
+        # query parameters are already part of the next links
+        kwargs.pop("params", None)
+
+
+def iter_sdk(paged: Iterable[Any], convert: Callable[[Any], Any], name: str) -> Iterator[Any]:
+    """Iterate over an azure SDK listing (`ItemPaged`), its pages are requested as the items are consumed"""
+    try:
+        for item in paged:
+            yield convert(item)
+    except (HttpResponseError, ServiceRequestError) as e:
+        raise ListingError(f"Could not list {name}: {str(e.message).splitlines()[0]}")
+
+
+def iter_pages(get_page: Callable[[int, int], Optional[Any]], size: int = DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+    """
+    Iterate over a `page` / `size` paginated listing of the Cosmo Tech API
+    :param get_page: returns the response of a page from its number and size
+    :param size: number of items per page
+    """
+    page = 0
+    first_items: set[str] = set()
+    while True:
+        response = get_page(page, size)
+        if response is None:
+            raise ListingError(f"Could not retrieve page {page}")
+        items = response.json()
+        if not isinstance(items, list):
+            return
+        # servers may cap the page size below `size`, only an empty page ends the listing
+        if not items:
+            return
+        # servers without pagination return the whole collection for every page
+        first = json.dumps(items[0], sort_keys=True)
+        if first in first_items:
+            return
+        first_items.add(first)
+        yield from items
+        page += 1
+
+
+def list_response(items: Iterable[Any],
+                  sink: Optional[Callable[[Any], None]] = None,
+                  item_filter: Optional[ItemFilter] = None) -> CommandResponse:
+    """
+    Stream listed items to the sink given by `output_to_stream`, or return them as the command data
+    :param items: iterator of the listed items
+    :param sink: called with every item once filtered, None to return the items
+    :param item_filter: `--filter` of the command
+    :return: the items, or their count when they are streamed
+    """
+    count = 0
+    try:
+        if item_filter is not None:
+            items = item_filter.apply(items)
+        if sink is None:
+            data = items if isinstance(items, (dict, str, int, float)) or items is None else list(items)
+            return CommandResponse.success(data, verbose=True)
+        for item in items if isinstance(items, (list, Iterator)) else [items]:
+            sink(item)
+            count += 1
+    except ListingError as e:
+        logger.error(e)
+        return CommandResponse.fail()
+    logger.debug(f"{count} items listed")
+    return CommandResponse.success({"count": count})
@@ -0,0 +1,165 @@
+import sys
+import copy
+import json
+import click
+import queue
+import atexit
+import threading
+import logging
+import logging.handlers
+
+from typing import Any, Optional
+from rich.logging import RichHandler
+
+LOG_FORMATS = ["rich", "compact"]
+FILE_FORMAT = "%(asctime)s | %(message)10s"
+COMPACT_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+
+
+class LazyJson:
+    """
+    Json of a payload, serialized only when a handler emits the record
+
+    `logger.debug("%s", LazyJson(payload))` costs nothing when debug is off
+    """
+
+    def __init__(self, data: Any, indent: Optional[int] = 2) -> None:
+        self.data = data
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return json.dumps(self.data, indent=self.indent, default=str)
+
+
+# arguments which cannot change once logged, their records are formatted by the listener thread
+IMMUTABLE_ARGS = (str, bytes, int, float, type(None))
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records, messages are formatted by the handlers of the listener thread
+
+    A record holding mutable arguments, which the caller may change once the log call returned,
+    is formatted before being queued. Only `LazyJson` payloads of debug records stay lazy
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        args = record.args if isinstance(record.args, tuple) else (record.args, ) if record.args else ()
+        lazy = isinstance(record.msg, str) and all(
+            isinstance(a, IMMUTABLE_ARGS) or (isinstance(a, LazyJson) and record.levelno <= logging.DEBUG)
+            for a in args)
+        if not lazy:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """Listener setting the event of the flush records instead of handling them"""
+
+    def handle(self, record: logging.LogRecord):
+        flushed = getattr(record, "flushed", None)
+        if flushed is not None:
+            flushed.set()
+            return
+        super().handle(record)
+
+
+class StderrHandler(logging.StreamHandler):
+    """Stream handler writing to the current `sys.stderr`, which the daemon swaps for each client"""
+
+    def __init__(self) -> None:
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def console_handler(log_format: str) -> logging.Handler:
+    if log_format == "compact":
+        console = StderrHandler()
+        console.setFormatter(logging.Formatter(COMPACT_FORMAT))
+        return console
+    # the rich console resolves sys.stderr on each write
+    return RichHandler(show_time=False, rich_tracebacks=True, tracebacks_suppress=[click], omit_repeated_times=False)
+
+
+class LogPipeline:
+    """
+    Handlers of the command line, behind a queue
+
+    Callers only put records in a queue, a listener thread formats them and writes the log files
+    and the console, so logging from concurrent workers neither waits for the disk nor for each
+    other. `flush` waits for the queued records, before anything printed outside of the loggers.
+    A pipeline started again with another format only switches its console handler
+    """
+
+    def __init__(self) -> None:
+        self.listener: Optional[FlushingQueueListener] = None
+        self.handler: Optional[logging.Handler] = None
+        self.log_format: Optional[str] = None
+        self.lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self.listener is not None
+
+    def start(self, log_format: str = "rich"):
+        if self.started:
+            if log_format != self.log_format:
+                self.switch_console(log_format)
+            return
+        info_handler = logging.FileHandler("./info.log")
+        error_handler = logging.FileHandler("./error.log")
+        error_handler.setLevel(logging.WARNING)
+        for handler in [info_handler, error_handler]:
+            handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        records = queue.SimpleQueue()
+        self.listener = FlushingQueueListener(records,
+                                              info_handler,
+                                              error_handler,
+                                              console_handler(log_format),
+                                              respect_handler_level=True)
+        self.log_format = log_format
+        self.handler = LazyQueueHandler(records)
+        logging.getLogger().addHandler(self.handler)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def switch_console(self, log_format: str):
+        """Write the next records to a console handler of another format"""
+        # the records queued so far keep the format of the command which logged them
+        self.flush()
+        with self.lock:
+            *files, console = self.listener.handlers
+            self.listener.handlers = (*files, console_handler(log_format))
+            self.log_format = log_format
+        console.close()
+
+    def flush(self):
+        """Wait until the listener has handled the records queued so far"""
+        flushed = threading.Event()
+        with self.lock:
+            if not self.started:
+                return
+            # the listener handles the records in order, the flush record comes after the ones queued so far
+            self.listener.queue.put_nowait(logging.makeLogRecord(dict(flushed=flushed)))
+        flushed.wait()
+
+    def stop(self):
+        with self.lock:
+            if self.started:
+                logging.getLogger().removeHandler(self.handler)
+                self.listener.stop()
+                for handler in self.listener.handlers:
+                    handler.close()
+                self.listener = None
+
+
+log_pipeline = LogPipeline()
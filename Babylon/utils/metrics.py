@@ -0,0 +1,157 @@
+import json
+import logging
+import pathlib
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from Babylon.utils.tracing import tracer
+from Babylon.utils.response import atomic_writer
+
+logger = logging.getLogger("Babylon")
+
+Labels = tuple[tuple[str, str], ...]
+
+HELP = {
+    "babylon_http_requests_total": "HTTP calls by host, method and status",
+    "babylon_http_request_seconds": "HTTP call latency by host",
+    "babylon_http_response_bytes_total": "HTTP response bytes by host",
+    "babylon_vault_operations_total": "Vault reads and writes",
+    "babylon_token_acquisitions_total": "Azure token requests by scope",
+    "babylon_uploaded_bytes_total": "Bytes uploaded to blob storage by artifact type",
+    "babylon_uploads_total": "Blob uploads by artifact type",
+    "babylon_downloaded_bytes_total": "Bytes downloaded from blob storage by artifact type",
+    "babylon_poll_iterations_total": "Poll iterations of long running operations",
+    "babylon_poll_seconds": "Time waiting for long running operations",
+    "babylon_command_seconds": "Command duration",
+}
+
+
+def quantile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class MetricsRegistry:
+    """
+    Counters and latency samples aggregated from the spans of `tracer`
+
+    The registry listens to the spans of the instrumented choke points (http calls, vault
+    client, token requests, blob transfers, pollers) while `collect` is active, so metrics need
+    no instrumentation of their own
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counters: dict[tuple[str, Labels], float] = dict()
+        self.samples: dict[tuple[str, Labels], list[float]] = dict()
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.samples.clear()
+
+    def inc(self, name: str, value: float = 1, **labels: Any):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any):
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self.lock:
+            self.samples.setdefault(key, []).append(value)
+
+    def on_span(self, name: str, attributes: dict[str, Any], seconds: float):
+        if "method" in attributes:
+            host = attributes.get("host", "")
+            self.inc("babylon_http_requests_total",
+                     host=host,
+                     method=attributes["method"],
+                     status=attributes.get("status", "error"))
+            self.observe("babylon_http_request_seconds", seconds, host=host)
+            self.inc("babylon_http_response_bytes_total", attributes.get("bytes", 0), host=host)
+        elif name.startswith("vault."):
+            self.inc("babylon_vault_operations_total", operation=name.split(".", 1)[1])
+        elif name == "token":
+            self.inc("babylon_token_acquisitions_total", scope=attributes.get("scope", ""))
+        elif name == "blob.upload":
+            self.inc("babylon_uploads_total", artifact=attributes.get("artifact", ""))
+            self.inc("babylon_uploaded_bytes_total",
+                     attributes.get("bytes", 0),
+                     artifact=attributes.get("artifact", ""))
+        elif name == "blob.download":
+            self.inc("babylon_downloaded_bytes_total",
+                     attributes.get("bytes", 0),
+                     artifact=attributes.get("artifact", ""))
+        elif name == "poll_request":
+            self.inc("babylon_poll_iterations_total", attributes.get("retries", 0) + 1, operation=attributes.get("url"))
+            self.observe("babylon_poll_seconds", seconds, operation=attributes.get("url"))
+        elif name in ["azure.poller", "polling2.poll"]:
+            self.inc("babylon_poll_iterations_total", attributes.get("iterations") or 1, operation=name)
+            self.observe("babylon_poll_seconds", seconds, operation=name)
+        elif name.startswith("command "):
+            self.observe("babylon_command_seconds", seconds, command=name.split(" ", 1)[1])
+
+    def summary(self) -> dict[str, list[dict[str, Any]]]:
+        """Counters, and count / sum / p50 / p95 / max of the latencies, by metric name"""
+        result: dict[str, list[dict[str, Any]]] = dict()
+        with self.lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                result.setdefault(name, []).append(dict(labels=dict(labels), value=value))
+            for (name, labels), samples in sorted(self.samples.items()):
+                result.setdefault(name, []).append(
+                    dict(labels=dict(labels),
+                         count=len(samples),
+                         sum=sum(samples),
+                         p50=quantile(samples, 0.5),
+                         p95=quantile(samples, 0.95),
+                         max=max(samples)))
+        return result
+
+    def prometheus(self) -> str:
+        """Metrics in the Prometheus text format, latencies are exported as summaries"""
+
+        def labels_text(labels: dict[str, str], **extra: str) -> str:
+            labels = {**labels, **extra}
+            if not labels:
+                return ""
+            escaped = {k: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for k, v in labels.items()}
+            return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+        lines = []
+        for name, series in self.summary().items():
+            kind = "summary" if "count" in series[0] else "counter"
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} {kind}"]
+            for s in series:
+                if kind == "counter":
+                    lines.append(f"{name}{labels_text(s['labels'])} {s['value']}")
+                    continue
+                lines.append(f"{name}{labels_text(s['labels'], quantile='0.5')} {s['p50']}")
+                lines.append(f"{name}{labels_text(s['labels'], quantile='0.95')} {s['p95']}")
+                lines.append(f"{name}_sum{labels_text(s['labels'])} {s['sum']}")
+                lines.append(f"{name}_count{labels_text(s['labels'])} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_file: pathlib.Path):
+        """Write a Prometheus textfile for .prom files, a json summary otherwise"""
+        output_file = pathlib.Path(output_file)
+        content = self.prometheus() if output_file.suffix == ".prom" else json.dumps(self.summary(), indent=2)
+        # textfile collectors may read the file at any time
+        with atomic_writer(output_file) as _f:
+            _f.write(content)
+        logger.info(f"Metrics written in {output_file}")
+
+    @contextmanager
+    def collect(self, output_file: Optional[pathlib.Path] = None) -> Iterator["MetricsRegistry"]:
+        """Aggregate the spans of the block, then write the metrics in `output_file` if given"""
+        self.reset()
+        tracer.add_listener(self.on_span)
+        try:
+            yield self
+        finally:
+            tracer.remove_listener(self.on_span)
+            if output_file:
+                self.write(output_file)
+
+
+metrics = MetricsRegistry()
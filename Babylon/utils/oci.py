@@ -0,0 +1,379 @@
+import re
+import json
+import base64
+import hashlib
+import logging
+import pathlib
+import threading
+import requests
+
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+from Babylon.utils.tracing import span
+from Babylon.utils.registry_tokens import RegistryTokenCache
+
+logger = logging.getLogger("Babylon")
+
+OCI_INDEX = "application/vnd.oci.image.index.v1+json"
+OCI_MANIFEST = "application/vnd.oci.image.manifest.v1+json"
+DOCKER_LIST = "application/vnd.docker.distribution.manifest.list.v2+json"
+DOCKER_MANIFEST = "application/vnd.docker.distribution.manifest.v2+json"
+INDEX_TYPES = [OCI_INDEX, DOCKER_LIST]
+MANIFEST_TYPES = [*INDEX_TYPES, OCI_MANIFEST, DOCKER_MANIFEST]
+CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+CHALLENGE_PARAM = re.compile(r'(\w+)="([^"]*)"')
+# name given to the image of an OCI image layout
+REF_NAME = "org.opencontainers.image.ref.name"
+
+
+class OciError(Exception):
+    """Raised when a registry answers a distribution request with an error"""
+
+
+def parse_image(image: str) -> tuple[str, str]:
+    """Repository and reference (tag or digest) of `repository[:tag|@digest]`, the tag defaults to latest"""
+    if "@" in image:
+        repository, reference = image.split("@", 1)
+        return repository, reference
+    name, _, tag = image.rpartition(":")
+    # a port of a registry host is not a tag
+    if not name or "/" in tag:
+        return image, "latest"
+    return name, tag
+
+
+def sha256_digest(content: bytes) -> str:
+    return f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+
+@dataclass
+class TransferStats:
+    """What became of the blobs of a copy: already there, mounted from another repository or transferred"""
+
+    existing: int = 0
+    mounted: int = 0
+    transferred: int = 0
+    bytes: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, action: str, size: int = 0):
+        with self.lock:
+            setattr(self, action, getattr(self, action) + 1)
+            self.bytes += size
+
+    def __str__(self) -> str:
+        return (f"{self.transferred} blob(s) transferred ({self.bytes} bytes), {self.mounted} mounted, "
+                f"{self.existing} already present")
+
+
+class OciRegistry:
+    """
+    Client of the OCI distribution API of a registry, without a docker daemon
+
+    Authentication follows the challenges of the registry: a Basic challenge gets the credentials,
+    a Bearer challenge gets a token from its realm for the scope of the request. Tokens are kept
+    by scope for the next requests, and in `token_cache` under `identity` for the next clients.
+    `credentials` returns the user name and password, for an azure container registry the null
+    guid and a refresh token. When the token realm rejects them, `reject_credentials` is called
+    and they are asked once more
+    """
+
+    def __init__(self,
+                 server: str,
+                 credentials: Optional[Callable[[], Optional[tuple[str, str]]]] = None,
+                 chunk_size: int = CHUNK_SIZE,
+                 token_cache: Optional[RegistryTokenCache] = None,
+                 identity: str = "",
+                 reject_credentials: Optional[Callable[[], None]] = None) -> None:
+        self.server = server.split("://")[-1].rstrip("/")
+        self.url = server.rstrip("/") if "://" in server else f"https://{server}"
+        self.credentials = credentials
+        self.reject_credentials = reject_credentials
+        self.chunk_size = chunk_size
+        self.session = requests.Session()
+        self.tokens: dict[str, str] = dict()
+        self.token_cache = token_cache
+        self.identity = identity
+        self.lock = threading.Lock()
+
+    def authenticate(self, challenge: str, scope: str, rejected: Optional[str] = None):
+        """Get an authorization for the scope, unless another thread replaced the rejected one meanwhile"""
+        with self.lock:
+            if self.tokens.get(scope, rejected) != rejected:
+                return
+            if rejected and self.token_cache:
+                self.token_cache.drop(self.server, scope, identity=self.identity)
+            authorization = self.authorization(challenge, scope)
+            self.tokens[scope] = authorization
+            # basic authorizations hold the credentials themselves, they are not kept
+            if self.token_cache and authorization.startswith("Bearer "):
+                self.token_cache.put(self.server, scope, authorization, identity=self.identity)
+
+    def authorization(self, challenge: str, scope: str) -> str:
+        scheme, _, params = challenge.partition(" ")
+        params = dict(CHALLENGE_PARAM.findall(params))
+        credentials = self.credentials() if self.credentials else None
+        if scheme.lower() == "basic":
+            if not credentials:
+                raise OciError(f"Registry {self.server} requires credentials")
+            basic = base64.b64encode(":".join(credentials).encode("utf-8")).decode("ascii")
+            authorization = f"Basic {basic}"
+        else:
+            scopes = sorted({s for s in [params.get("scope"), *scope.split(" ")] if s})
+            for attempt in range(2):
+                with span("oci.token", registry=self.server):
+                    response = self.session.get(params["realm"],
+                                                params=dict(service=params.get("service", self.server), scope=scopes),
+                                                auth=credentials)
+                if response.status_code != 401 or not credentials or not self.reject_credentials or attempt:
+                    break
+                logger.debug(f"Registry {self.server} rejected its credentials, asking new ones")
+                self.reject_credentials()
+                credentials = self.credentials()
+            if response.status_code != 200:
+                raise OciError(f"Could not get a token from {self.server} ({response.status_code}): {response.text}")
+            data = response.json()
+            authorization = f"Bearer {data.get('token') or data.get('access_token')}"
+        return authorization
+
+    def request(self, method: str, path: str, scope: str, expected: Iterable[int], **kwargs: Any) -> requests.Response:
+        # locations of uploads are relative to the registry or absolute
+        url = path if "://" in path else f"{self.url}{path}"
+        headers = dict(kwargs.pop("headers", dict()))
+        if scope not in self.tokens and self.token_cache:
+            cached = self.token_cache.get(self.server, scope, identity=self.identity)
+            if cached:
+                self.tokens.setdefault(scope, cached)
+        for attempt in range(2):
+            if scope in self.tokens:
+                headers["Authorization"] = self.tokens[scope]
+            response = self.session.request(method, url, headers=headers, **kwargs)
+            if response.status_code != 401 or attempt:
+                break
+            self.authenticate(response.headers.get("WWW-Authenticate", "Bearer"), scope, headers.get("Authorization"))
+        if response.status_code not in expected:
+            raise OciError(f"{method} {url} failed ({response.status_code}): {response.text[:500]}")
+        return response
+
+    def manifest(self, repository: str, reference: str) -> tuple[bytes, str, str]:
+        """Content, media type and digest of a manifest"""
+        response = self.request("GET",
+                                f"/v2/{repository}/manifests/{reference}",
+                                f"repository:{repository}:pull", [200],
+                                headers={"Accept": ", ".join(MANIFEST_TYPES)})
+        content = response.content
+        media_type = response.headers.get("Content-Type", "").split(";")[0] or json.loads(content).get("mediaType")
+        return content, media_type, response.headers.get("Docker-Content-Digest") or sha256_digest(content)
+
+    def put_manifest(self, repository: str, reference: str, content: bytes, media_type: str) -> str:
+        response = self.request("PUT",
+                                f"/v2/{repository}/manifests/{reference}",
+                                f"repository:{repository}:pull,push", [201],
+                                data=content,
+                                headers={"Content-Type": media_type})
+        return response.headers.get("Docker-Content-Digest") or sha256_digest(content)
+
+    def has_blob(self, repository: str, digest: str) -> bool:
+        response = self.request("HEAD", f"/v2/{repository}/blobs/{digest}", f"repository:{repository}:pull", [200, 404])
+        return response.status_code == 200
+
+    def blob_chunks(self, repository: str, digest: str) -> Iterator[bytes]:
+        """Content of a blob, streamed by chunks"""
+        response = self.request("GET",
+                                f"/v2/{repository}/blobs/{digest}",
+                                f"repository:{repository}:pull", [200],
+                                stream=True)
+        with response:
+            yield from response.iter_content(chunk_size=self.chunk_size)
+
+    def mount_blob(self, repository: str, digest: str, source_repository: str) -> Optional[str]:
+        """
+        Mount a blob of another repository of the registry
+        :return: None when mounted, else the location of the upload the registry started instead
+        """
+        response = self.request("POST",
+                                f"/v2/{repository}/blobs/uploads/",
+                                f"repository:{repository}:pull,push repository:{source_repository}:pull", [201, 202],
+                                params=dict(mount=digest, **{"from": source_repository}))
+        return None if response.status_code == 201 else response.headers["Location"]
+
+    def upload_blob(self, repository: str, digest: str, chunks: Iterable[bytes], location: Optional[str] = None) -> int:
+        """Upload a blob by chunks, in the upload started at `location` when given, returns its size"""
+        scope = f"repository:{repository}:pull,push"
+        if location is None:
+            location = self.request("POST", f"/v2/{repository}/blobs/uploads/", scope, [202]).headers["Location"]
+        offset = 0
+        for chunk in chunks:
+            if not chunk:
+                continue
+            response = self.request("PATCH",
+                                    location,
+                                    scope, [202],
+                                    data=chunk,
+                                    headers={
+                                        "Content-Type": "application/octet-stream",
+                                        "Content-Range": f"{offset}-{offset + len(chunk) - 1}"
+                                    })
+            location = response.headers["Location"]
+            offset += len(chunk)
+        self.request("PUT", location, scope, [201], params=dict(digest=digest))
+        return offset
+
+
+def manifest_blobs(manifest: dict[str, Any]) -> list[dict[str, Any]]:
+    return [manifest["config"], *manifest.get("layers", [])]
+
+
+def copy_image(source: OciRegistry,
+               source_image: str,
+               destination: OciRegistry,
+               destination_image: str,
+               max_workers: int = DEFAULT_MAX_WORKERS) -> TransferStats:
+    """
+    Copy an image between repositories of one or two registries
+
+    Blobs already in the destination are skipped, blobs of another repository of the same registry
+    are mounted, the others are streamed from the source to the destination by chunks, several
+    blobs at a time. Manifests are copied last so the image is never seen incomplete
+    """
+    src_repo, src_ref = parse_image(source_image)
+    dst_repo, dst_ref = parse_image(destination_image)
+    same_registry = source.url == destination.url
+    stats = TransferStats()
+
+    def copy_blob(descriptor: dict[str, Any]):
+        digest = descriptor["digest"]
+        with span("oci.blob", digest=digest[:19]) as attributes:
+            if destination.has_blob(dst_repo, digest):
+                attributes["action"] = "existing"
+                stats.add("existing")
+                return
+            location = None
+            if same_registry and src_repo != dst_repo:
+                location = destination.mount_blob(dst_repo, digest, src_repo)
+                if location is None:
+                    attributes["action"] = "mounted"
+                    stats.add("mounted")
+                    return
+            size = destination.upload_blob(dst_repo, digest, source.blob_chunks(src_repo, digest), location)
+            attributes.update(action="transferred", bytes=size)
+            stats.add("transferred", size)
+
+    def copy_manifest(reference: str, target: str):
+        content, media_type, digest = source.manifest(src_repo, reference)
+        manifest = json.loads(content)
+        if media_type in INDEX_TYPES:
+            for child in manifest["manifests"]:
+                copy_manifest(child["digest"], child["digest"])
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                # results raise the first error of the transfers
+                list(executor.map(copy_blob, manifest_blobs(manifest)))
+        destination.put_manifest(dst_repo, target, content, media_type)
+
+    with span("oci.copy", source=source_image, destination=destination_image):
+        copy_manifest(src_ref, dst_ref)
+    return stats
+
+
+def pull_layout(registry: OciRegistry,
+                image: str,
+                layout: pathlib.Path,
+                max_workers: int = DEFAULT_MAX_WORKERS) -> TransferStats:
+    """Save an image in an OCI image layout directory, blobs already in the layout are not downloaded"""
+    repository, reference = parse_image(image)
+    blobs = pathlib.Path(layout) / "blobs"
+    stats = TransferStats()
+
+    def write_blob(digest: str, chunks: Iterable[bytes]) -> int:
+        path = blobs.joinpath(*digest.split(":"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        size = 0
+        with open(partial, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        partial.replace(path)
+        return size
+
+    def pull_blob(descriptor: dict[str, Any]):
+        digest = descriptor["digest"]
+        if blobs.joinpath(*digest.split(":")).exists():
+            stats.add("existing")
+            return
+        with span("oci.blob", digest=digest[:19]):
+            stats.add("transferred", write_blob(digest, registry.blob_chunks(repository, digest)))
+
+    def pull_manifest(reference: str) -> dict[str, Any]:
+        content, media_type, digest = registry.manifest(repository, reference)
+        manifest = json.loads(content)
+        if media_type in INDEX_TYPES:
+            for child in manifest["manifests"]:
+                pull_manifest(child["digest"])
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                list(executor.map(pull_blob, manifest_blobs(manifest)))
+        write_blob(digest, [content])
+        return dict(mediaType=media_type, digest=digest, size=len(content))
+
+    with span("oci.pull", image=image):
+        descriptor = pull_manifest(reference)
+    layout = pathlib.Path(layout)
+    (layout / "oci-layout").write_text(json.dumps({"imageLayoutVersion": "1.0.0"}))
+    index_file = layout / "index.json"
+    index = json.loads(index_file.read_text()) if index_file.exists() else dict(schemaVersion=2, manifests=[])
+    index["manifests"] = [m for m in index["manifests"] if m.get("annotations", {}).get(REF_NAME) != reference]
+    index["manifests"].append(dict(descriptor, annotations={REF_NAME: reference}))
+    index_file.write_text(json.dumps(index, indent=2))
+    return stats
+
+
+def push_layout(layout: pathlib.Path,
+                registry: OciRegistry,
+                image: str,
+                max_workers: int = DEFAULT_MAX_WORKERS) -> TransferStats:
+    """Push the image of an OCI image layout directory named like the tag of `image`, or its only image"""
+    repository, reference = parse_image(image)
+    layout = pathlib.Path(layout)
+    stats = TransferStats()
+    try:
+        index = json.loads((layout / "index.json").read_text())
+    except (OSError, ValueError) as e:
+        raise OciError(f"{layout} is not an OCI image layout: {e}")
+    manifests = index.get("manifests", [])
+    named = [m for m in manifests if m.get("annotations", {}).get(REF_NAME) == reference]
+    if not named and len(manifests) != 1:
+        raise OciError(f"No image {reference} in {layout}")
+    descriptor = (named or manifests)[0]
+
+    def read_blob(digest: str) -> Iterator[bytes]:
+        with open(layout.joinpath("blobs", *digest.split(":")), "rb") as f:
+            while chunk := f.read(registry.chunk_size):
+                yield chunk
+
+    def push_blob(blob: dict[str, Any]):
+        digest = blob["digest"]
+        with span("oci.blob", digest=digest[:19]):
+            if registry.has_blob(repository, digest):
+                stats.add("existing")
+                return
+            stats.add("transferred", registry.upload_blob(repository, digest, read_blob(digest)))
+
+    def push_manifest(blob: dict[str, Any], target: str):
+        content = layout.joinpath("blobs", *blob["digest"].split(":")).read_bytes()
+        manifest = json.loads(content)
+        media_type = blob.get("mediaType") or manifest.get("mediaType")
+        if media_type in INDEX_TYPES:
+            for child in manifest["manifests"]:
+                push_manifest(child, child["digest"])
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                list(executor.map(push_blob, manifest_blobs(manifest)))
+        registry.put_manifest(repository, target, content, media_type)
+
+    with span("oci.push", image=image):
+        push_manifest(descriptor, reference)
+    return stats
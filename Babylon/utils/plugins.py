@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import yaml
+import click
+import logging
+import pathlib
+import importlib
+import importlib.util
+
+from typing import Any, Optional
+from importlib.metadata import entry_points
+from Babylon.utils.response import atomic_writer
+
+logger = logging.getLogger("Babylon")
+
+ENTRY_POINT_GROUP = "babylon.plugins"
+MANIFEST_VERSION = 1
+PLUGIN_CONFIG_FILE = "plugin_config.yaml"
+
+
+def plugins_file() -> pathlib.Path:
+    return pathlib.Path().home() / ".config/cosmotech/babylon/plugins.yaml"
+
+
+def manifest_file() -> pathlib.Path:
+    return pathlib.Path().home() / ".config/cosmotech/babylon/plugins_manifest.json"
+
+
+class PluginConfig:
+    """
+    Plugins added from a folder and plugins deactivated, kept in `~/.config/cosmotech/babylon/plugins.yaml`
+
+    A plugin folder holds a `plugin_config.yaml` giving its `plugin_name`, and an `__init__.py`
+    defining a click group of the same name. Plugins installed as python packages are found through
+    their `babylon.plugins` entry point and are only listed here once deactivated
+    """
+
+    def __init__(self, path: Optional[pathlib.Path] = None) -> None:
+        self.path = path or plugins_file()
+        content = yaml.safe_load(self.path.read_text()) if self.path.exists() else None
+        self.plugins: list[dict[str, Any]] = (content or dict()).get("plugins", [])
+
+    def save(self):
+        with atomic_writer(self.path) as _f:
+            yaml.safe_dump(dict(plugins=self.plugins), _f)
+
+    def get(self, name: str) -> Optional[dict[str, Any]]:
+        return next((p for p in self.plugins if p["name"] == name), None)
+
+    def is_active(self, name: str) -> bool:
+        plugin = self.get(name)
+        return plugin is None or plugin.get("active", True)
+
+    def add_plugin(self, plugin_path: pathlib.Path) -> Optional[str]:
+        """Add the plugin of a folder, return its name or None when the folder is not a new plugin"""
+        plugin_path = pathlib.Path(plugin_path).absolute()
+        config_file = plugin_path / PLUGIN_CONFIG_FILE
+        if not config_file.exists() or not (plugin_path / "__init__.py").exists():
+            logger.error(f"{plugin_path} needs a {PLUGIN_CONFIG_FILE} and an __init__.py")
+            return None
+        name = (yaml.safe_load(config_file.read_text()) or dict()).get("plugin_name")
+        if not name or self.get(name) or name in entry_point_plugins():
+            return None
+        self.plugins.append(dict(name=name, path=str(plugin_path), active=True))
+        self.save()
+        return name
+
+    def remove_plugin(self, name: str):
+        self.plugins = [p for p in self.plugins if p["name"] != name]
+        self.save()
+
+    def set_active(self, name: str, active: bool):
+        plugin = self.get(name)
+        if plugin is None:
+            plugin = dict(name=name)
+            self.plugins.append(plugin)
+        plugin["active"] = active
+        self.save()
+
+
+def entry_point_plugins() -> dict[str, str]:
+    """`module:attribute` of the click group of each installed plugin, by name"""
+    return {e.name: e.value for e in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def fingerprint(config: PluginConfig) -> dict[str, Any]:
+    """
+    What the manifest depends on, cheap to compute: the plugin configuration, the modification
+    times of the import folders, changed when a package is installed or removed, and of the files
+    of the plugin folders
+    """
+    folders = dict()
+    # the current folder changes with every command output, plugins are not imported from it
+    for entry in filter(None, sys.path):
+        try:
+            folders[entry] = os.stat(entry).st_mtime_ns
+        except OSError:
+            continue
+    files = dict()
+    for plugin in config.plugins:
+        if not plugin.get("path"):
+            continue
+        for root, dirs, names in os.walk(plugin["path"]):
+            dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".")]
+            for name in names:
+                path = os.path.join(root, name)
+                files[path] = os.stat(path).st_mtime_ns
+    return dict(config=config.plugins, folders=folders, files=files)
+
+
+def load_folder(name: str, path: str) -> click.Command:
+    """Import the package of a plugin folder and return its group"""
+    module_name = f"babylon_plugin_{name}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name,
+                                                      pathlib.Path(path) / "__init__.py",
+                                                      submodule_search_locations=[path])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return getattr(module, name)
+
+
+def load_entry_point(value: str) -> click.Command:
+    module_name, _, attribute = value.partition(":")
+    command = importlib.import_module(module_name)
+    for part in attribute.split("."):
+        command = getattr(command, part)
+    return command
+
+
+def load_plugin(plugin: dict[str, Any]) -> click.Command:
+    if plugin.get("path"):
+        return load_folder(plugin["plugin"], plugin["path"])
+    return load_entry_point(plugin["target"])
+
+
+def build_manifest(config: PluginConfig) -> list[dict[str, Any]]:
+    """Import every plugin once to record its command name and help"""
+    found = [dict(plugin=name, target=value) for name, value in entry_point_plugins().items()]
+    found += [dict(plugin=p["name"], path=p["path"]) for p in config.plugins if p.get("path")]
+    manifest = []
+    for plugin in found:
+        try:
+            command = load_plugin(plugin)
+        except Exception as e:
+            logger.warning(f"Could not load plugin {plugin['plugin']}: {e}")
+            continue
+        commands = sorted(getattr(command, "commands", dict()))
+        manifest.append(
+            dict(plugin,
+                 name=command.name,
+                 help=command.get_short_help_str(limit=120),
+                 commands=commands,
+                 active=config.is_active(plugin["plugin"])))
+    return manifest
+
+
+def plugin_manifest(refresh: bool = False) -> list[dict[str, Any]]:
+    """Plugins with their command names and help, rebuilt only when a plugin changed"""
+    config = PluginConfig()
+    current = fingerprint(config)
+    path = manifest_file()
+    if not refresh and path.exists():
+        try:
+            cached = json.loads(path.read_text())
+            if cached.get("version") == MANIFEST_VERSION and cached.get("fingerprint") == current:
+                return cached["plugins"]
+        except ValueError:
+            pass
+    logger.debug("Building the plugin manifest")
+    plugins = build_manifest(config)
+    try:
+        with atomic_writer(path) as _f:
+            json.dump(dict(version=MANIFEST_VERSION, fingerprint=current, plugins=plugins), _f)
+    except OSError as e:
+        logger.debug(f"Could not write the plugin manifest: {e}")
+    return plugins
+
+
+class LazyPluginCommand(click.Command):
+    """Placeholder of a plugin command in the help, the plugin is imported when the command runs"""
+
+    def __init__(self, plugin: dict[str, Any]) -> None:
+        super().__init__(plugin["name"], short_help=plugin.get("help"), help=plugin.get("help"))
+        self.plugin = plugin
+        self.loaded: Optional[click.Command] = None
+
+    def load(self) -> click.Command:
+        if self.loaded is None:
+            self.loaded = load_plugin(self.plugin)
+        return self.loaded
+
+    def make_context(self,
+                     info_name: Optional[str],
+                     args: list[str],
+                     parent: Optional[click.Context] = None,
+                     **extra: Any) -> click.Context:
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+
+class PluginGroup(click.Group):
+    """
+    Root group adding the active plugins to the babylon commands
+
+    Plugins come from the manifest, which is only read for names that are not babylon commands and
+    for the help. A plugin is imported only when one of its commands runs
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.plugins: Optional[dict[str, LazyPluginCommand]] = None
+
+    def plugin_commands(self) -> dict[str, LazyPluginCommand]:
+        if self.plugins is None:
+            try:
+                manifest = plugin_manifest()
+            except Exception as e:
+                logger.warning(f"Plugins are not available: {e}")
+                manifest = []
+            self.plugins = {
+                p["name"]: LazyPluginCommand(p)
+                for p in manifest if p.get("active", True) and p["name"] not in self.commands
+            }
+        return self.plugins
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.plugin_commands()])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+        return self.plugin_commands().get(cmd_name)
+
+    def resolve_command(self, ctx: click.Context,
+                        args: list[str]) -> tuple[Optional[str], Optional[click.Command], list[str]]:
+        name, command, args = super().resolve_command(ctx, args)
+        if isinstance(command, LazyPluginCommand):
+            try:
+                command = command.load()
+            except Exception as e:
+                ctx.fail(f"Could not load plugin {command.plugin['plugin']}: {e}")
+        return name, command, args
@@ -0,0 +1,124 @@
+import os
+import json
+import time
+import base64
+import logging
+import pathlib
+import threading
+
+from typing import Optional
+from cryptography.fernet import Fernet, InvalidToken
+from Babylon.utils.response import atomic_writer
+
+logger = logging.getLogger("Babylon")
+
+# tokens are renewed this long before they expire, so a token never expires during a transfer
+EXPIRY_MARGIN = 300
+# lifetime assumed for tokens which do not tell their expiry
+DEFAULT_TTL = 600
+REFRESH_SCOPE = "refresh"
+
+
+def registry_tokens_file() -> pathlib.Path:
+    return pathlib.Path().home() / ".config/cosmotech/babylon/registry_tokens"
+
+
+def token_expiry(token: str) -> float:
+    """Expiry time of a jwt, read without verification, or of the default lifetime"""
+    try:
+        payload = token.split(" ")[-1].split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return time.time() + DEFAULT_TTL
+
+
+def token_key(registry: str, scope: str, identity: str = "") -> str:
+    return " ".join(k for k in [identity, registry, scope] if k)
+
+
+class RegistryTokenCache:
+    """
+    Refresh and access tokens of container registries, by identity, registry and scope
+
+    Tokens are kept until shortly before their expiry or until the registry rejects them, so the
+    commands of a process exchange one refresh token per registry and get one access token per
+    scope. The identity (tenant and client id) is part of the keys, tokens of an identity are
+    never given to another one. When `BABYLON_ENCODING_KEY` is
+    set, tokens are also kept encrypted in `~/.config/cosmotech/babylon/registry_tokens` for the
+    next processes
+    """
+
+    def __init__(self, path: Optional[pathlib.Path] = None) -> None:
+        self.path = path
+        self.tokens: dict[str, tuple[str, float]] = dict()
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    @property
+    def fernet(self) -> Optional[Fernet]:
+        key = os.environ.get("BABYLON_ENCODING_KEY")
+        if not key:
+            return None
+        try:
+            return Fernet(key)
+        except ValueError:
+            logger.warning("BABYLON_ENCODING_KEY is not a valid key, registry tokens are not kept")
+            return None
+
+    def load(self):
+        self.loaded = True
+        fernet = self.fernet
+        path = self.path or registry_tokens_file()
+        if fernet is None or not path.exists():
+            return
+        try:
+            stored = json.loads(fernet.decrypt(path.read_bytes()))
+        except (OSError, InvalidToken, ValueError):
+            logger.debug(f"Ignoring unreadable registry tokens in {path}")
+            return
+        now = time.time()
+        self.tokens.update({k: (t, e) for k, (t, e) in stored.items() if e - EXPIRY_MARGIN > now})
+
+    def save(self):
+        fernet = self.fernet
+        if fernet is None:
+            return
+        path = self.path or registry_tokens_file()
+        # only readable by the user from the moment it replaces the previous cache
+        with atomic_writer(path, mode=0o600) as _f:
+            _f.write(fernet.encrypt(json.dumps(self.tokens).encode("utf-8")).decode("ascii"))
+
+    def get(self, registry: str, scope: str, identity: str = "") -> Optional[str]:
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            token, expiry = self.tokens.get(token_key(registry, scope, identity), (None, 0.0))
+        return token if expiry - EXPIRY_MARGIN > time.time() else None
+
+    def put(self, registry: str, scope: str, token: str, expiry: Optional[float] = None, identity: str = ""):
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            now = time.time()
+            self.tokens = {k: v for k, v in self.tokens.items() if v[1] > now}
+            self.tokens[token_key(registry, scope, identity)] = (token, expiry or token_expiry(token))
+            self.save()
+
+    def drop(self, registry: str, scope: str, identity: str = ""):
+        """Forget a token rejected by the registry, in memory and on disk"""
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            if self.tokens.pop(token_key(registry, scope, identity), None) is not None:
+                self.save()
+
+    def clear(self):
+        """Forget all tokens, the tokens kept on disk included"""
+        with self.lock:
+            self.tokens.clear()
+            self.loaded = True
+            (self.path or registry_tokens_file()).unlink(missing_ok=True)
+
+
+registry_tokens = RegistryTokenCache()
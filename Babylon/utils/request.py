@@ -4,21 +4,28 @@ import requests
 from typing import Any
 from typing import Optional
 from time import sleep
+from urllib.parse import urlsplit
+from Babylon.utils.tracing import span, url_template
 
 logger = logging.getLogger("Babylon")
 
+# connections are kept alive between the requests of a process, batch and daemon runs reuse them across commands
+session = requests.Session()
+
 
 def poll_request(retries: int = 5, check_for_failure: bool = False, **kwargs: dict[str, Any]):
     """Do a request until success or failure with a long polling"""
-    for _ in range(0, retries):
-        response = oauth_request(**kwargs)
-        if check_for_failure and response is None:
-            return
-        if response and response.status_code <= 300:
-            logger.info("Request polling succeeded")
-            return response
-        sleep(1)
-    raise ValueError("Request polling failed")
+    with span("poll_request", url=url_template(kwargs.get("url", ""))) as attributes:
+        for retry in range(0, retries):
+            attributes["retries"] = retry
+            response = oauth_request(**kwargs)
+            if check_for_failure and response is None:
+                return
+            if response and response.status_code <= 300:
+                logger.info("Request polling succeeded")
+                return response
+            sleep(1)
+        raise ValueError("Request polling failed")
 
 
 def oauth_request(url: str,
@@ -36,21 +43,23 @@ def oauth_request(url: str,
     """
     headers = {'Authorization': f'Bearer {access_token}', "Content-Type": content_type, **kwargs.pop("headers", {})}
     request_funcs = {
-        "POST": requests.post,
-        "PATCH": requests.patch,
-        "PUT": requests.put,
-        "GET": requests.get,
-        "DELETE": requests.delete,
+        "POST": session.post,
+        "PATCH": session.patch,
+        "PUT": session.put,
+        "GET": session.get,
+        "DELETE": session.delete,
     }
     request_func = request_funcs.get(type.upper())
     if not request_func:
         logger.warning(f"Could not find request of type {type}")
         return None
-    try:
-        response = request_func(url=url, headers=headers, **kwargs)
-    except Exception as e:
-        logger.warning(f"Request failed: {e}")
-        return None
+    with span(f"{type.upper()} {url_template(url)}", method=type.upper(), host=urlsplit(url).netloc) as attributes:
+        try:
+            response = request_func(url=url, headers=headers, **kwargs)
+        except Exception as e:
+            logger.warning(f"Request failed: {e}")
+            return None
+        attributes.update(status=response.status_code, bytes=len(response.content))
     if response.status_code >= 300:
         logger.warning(f"Failed: ({response.status_code}): {response.text}")
         return None
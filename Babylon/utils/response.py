@@ -1,18 +1,78 @@
+import os
+import sys
+import stat
 import logging
 import json
 import pathlib
-import shutil
 import tempfile
 import yaml
 
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterator, TextIO
 from typing import Optional
 from rich.pretty import pprint
 from click import get_current_context
 from .environment import Environment
+from .logs import log_pipeline
 
 logger = logging.getLogger("Babylon")
 
+DEFAULT_PRETTY_PRINT_LIMIT = 256 * 1024
+
+
+def pretty_print_limit() -> int:
+    """Limit set by BABYLON_PRETTY_PRINT_LIMIT, an invalid value falls back to the default"""
+    value = os.environ.get("BABYLON_PRETTY_PRINT_LIMIT")
+    if value is None:
+        return DEFAULT_PRETTY_PRINT_LIMIT
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Invalid BABYLON_PRETTY_PRINT_LIMIT {value!r}, using {DEFAULT_PRETTY_PRINT_LIMIT}")
+        return DEFAULT_PRETTY_PRINT_LIMIT
+
+
+# payloads bigger than this, once serialized, are not pretty printed on the console
+PRETTY_PRINT_LIMIT = pretty_print_limit()
+
+
+@contextmanager
+def atomic_writer(output_file: pathlib.Path, mode: Optional[int] = None) -> Iterator[TextIO]:
+    """
+    Text stream to a temporary file renamed to `output_file` once completely written
+
+    :param mode: permissions of the written file, set before the rename, defaults to those of the replaced file
+    """
+    output_file = pathlib.Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output_file.parent, prefix=f".{output_file.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as _f:
+            yield _f
+        # mkstemp creates the file 0600, keep the mode of the replaced file or the one open() would give
+        if mode is None:
+            try:
+                mode = stat.S_IMODE(output_file.stat().st_mode)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, output_file)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def serialized_size(data: Any, limit: int) -> int:
+    """Size of the compact json of `data`, counting stops once `limit` is exceeded"""
+    size = 0
+    for chunk in json.JSONEncoder(default=str, ensure_ascii=False).iterencode(data):
+        size += len(chunk)
+        if size > limit:
+            break
+    return size
+
 
 class CommandResponse():
     """
@@ -29,7 +89,23 @@ class CommandResponse():
         self.command = ctx.command_path.split(" ")
         self.params = {k: str(v) for k, v in ctx.params.items()}
         if verbose and Environment().is_verbose:
+            self.render()
+
+    def render(self, limit: int = PRETTY_PRINT_LIMIT):
+        """
+        Print the data on the console, payloads bigger than `limit` are not pretty printed:
+        they are truncated on a terminal and written as compact json otherwise
+        """
+        log_pipeline.flush()
+        if serialized_size(self.data, limit) <= limit:
             pprint(self.data)
+            return
+        if sys.stdout.isatty():
+            pprint(self.data, max_length=20, max_string=200, max_depth=4)
+            logger.info("Response truncated, use --output to get the complete content")
+            return
+        json.dump(self.data, sys.stdout, default=str, ensure_ascii=False)
+        sys.stdout.write("\n")
 
     def to_dict(self) -> dict[str, Any]:
         return {"command": self.command, "params": self.params, "status_code": self.status_code, "data": self.data}
@@ -48,22 +124,36 @@ class CommandResponse():
     def toYAML(self) -> str:
         return yaml.dump(self.data)
 
+    def dump(self, output_file: pathlib.Path):
+        """Dump command response data in a file, the format is given by its extension"""
+        suffix = pathlib.Path(output_file).suffix
+        if suffix in [".ndjson", ".jsonl"]:
+            self.dump_ndjson(output_file)
+        elif "json" in suffix:
+            self.dump_json(output_file)
+        else:
+            self.dump_yaml(output_file)
+
     def dump_yaml(self, output_file: pathlib.Path):
         """Dump command response data in a yaml file"""
-        yaml_file = yaml.dump(self.data)
-        tmpf = tempfile.NamedTemporaryFile(mode="w+")
-        tmpf.write(yaml_file)
-        tmpf.seek(0)
-        shutil.copy(tmpf.name, output_file)
-        tmpf.flush()
-        tmpf.close()
+        with atomic_writer(output_file) as _f:
+            yaml.dump(self.data, _f)
 
     def dump_json(self, output_file: pathlib.Path):
         """Dump command response data in a json file"""
-        with open(output_file, "w") as _f:
-            _f.write(self.toJSON())
+        with atomic_writer(output_file) as _f:
+            json.dump(self.data, _f, indent=4, ensure_ascii=False)
         logger.info(f"The JSON response was dumped in file: {output_file}")
 
+    def dump_ndjson(self, output_file: pathlib.Path):
+        """Dump command response data in a json lines file, one line per item of a list"""
+        items = self.data if isinstance(self.data, list) else [self.data]
+        with atomic_writer(output_file) as _f:
+            for item in items:
+                json.dump(item, _f, default=str, ensure_ascii=False)
+                _f.write("\n")
+        logger.info(f"The NDJSON response was dumped in file: {output_file}")
+
     def has_failed(self) -> bool:
         """Checks if command has failed"""
         return self.status_code == self.STATUS_ERROR
@@ -0,0 +1,268 @@
+import os
+import re
+import json
+import time
+import logging
+import secrets
+import threading
+import contextvars
+
+from functools import wraps
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("Babylon")
+
+# path segments replaced by {id} in url templates: uuids, numbers and Cosmo Tech ids like `w-1a2b3c4d5e`
+ID_SEGMENT = re.compile(r"^([0-9a-fA-F-]{32,36}|\d+|[a-z]{1,2}-[a-z0-9]{6,})$")
+
+
+def url_template(url: str) -> str:
+    """Url without its query string and with ids replaced by `{id}`, used to group http spans"""
+    parts = urlsplit(str(url))
+    path = "/".join("{id}" if ID_SEGMENT.match(s) else s for s in parts.path.split("/"))
+    return f"{parts.netloc}{path}"
+
+
+class Tracer:
+    """
+    Records spans of the current command when tracing is enabled with `--trace`
+
+    Spans are nested through a context variable so threads and asyncio tasks each get their own
+    parent. When tracing is disabled `span` only yields a throw-away dict
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.spans: list[dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self.stack: contextvars.ContextVar[tuple[str, ...]] = contextvars.ContextVar("babylon_spans", default=())
+        self.trace_id = ""
+        self.origin = (time.time_ns(), time.perf_counter_ns())
+        self.patches: list[tuple[Any, str, Any]] = []
+        # called with the name, attributes and duration in seconds of every span, e.g. by the metrics registry
+        self.listeners: list[Callable[[str, dict[str, Any], float], None]] = []
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or bool(self.listeners)
+
+    def enable(self):
+        self.enabled = True
+        self.spans = []
+        self.trace_id = secrets.token_hex(16)
+        self.origin = (time.time_ns(), time.perf_counter_ns())
+        self.patch_pollers()
+
+    def disable(self):
+        self.enabled = False
+        if not self.listeners:
+            self.unpatch()
+
+    def add_listener(self, listener: Callable[[str, dict[str, Any], float], None]):
+        self.listeners.append(listener)
+        self.patch_pollers()
+
+    def remove_listener(self, listener: Callable[[str, dict[str, Any], float], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+        if not self.active:
+            self.unpatch()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """Time a block, the yielded dict receives attributes known once the block ran"""
+        if not self.active:
+            yield attributes
+            return
+        span_id = secrets.token_hex(8)
+        parents = self.stack.get()
+        token = self.stack.set((*parents, span_id))
+        start = time.perf_counter_ns()
+        try:
+            yield attributes
+        except BaseException as e:
+            attributes["error"] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            self.stack.reset(token)
+            for listener in self.listeners:
+                listener(name, attributes, (end - start) / 1e9)
+            # no return in this block, it would swallow the exception of the span
+            if self.enabled:
+                self.record(span_id, parents[-1] if parents else None, name, start, end, attributes)
+
+    def record(self, span_id: str, parent: Optional[str], name: str, start: int, end: int, attributes: dict[str, Any]):
+        with self.lock:
+            self.spans.append(
+                dict(id=span_id,
+                     parent=parent,
+                     name=name,
+                     start=start,
+                     end=end,
+                     tid=threading.get_ident(),
+                     attributes={
+                         k: v
+                         for k, v in attributes.items() if v is not None
+                     }))
+
+    def traced(self, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator recording a span for every call of a function"""
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name or func.__name__):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def instrument(self, obj: Any, prefix: str, methods: list[str]) -> Any:
+        """Record a span for the given methods of an object, e.g. the reads and writes of the vault client"""
+
+        def wrap(name: str, original: Callable[..., Any]) -> Callable[..., Any]:
+
+            @wraps(original)
+            def traced_method(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name, path=kwargs.get("path")):
+                    return original(*args, **kwargs)
+
+            return traced_method
+
+        for method in methods:
+            original = getattr(obj, method, None)
+            if original is not None:
+                setattr(obj, method, wrap(f"{prefix}.{method}", original))
+        return obj
+
+    def patch_pollers(self):
+        """Record the waits on azure long running operations and polling2 loops"""
+        if self.patches:
+            return
+        try:
+            from azure.core.polling import LROPoller
+            self.patch(LROPoller, "result", "azure.poller")
+        except ImportError:
+            pass
+        try:
+            import polling2
+            self.patch(polling2, "poll", "polling2.poll")
+        except ImportError:
+            pass
+
+    def patch(self, owner: Any, name: str, span_name: str):
+        original = getattr(owner, name)
+
+        @wraps(original)
+        def traced_call(*args: Any, **kwargs: Any) -> Any:
+            with self.span(span_name, iterations=0 if span_name == "polling2.poll" else None) as attributes:
+                if "iterations" in attributes and args and callable(args[0]):
+                    target = args[0]
+
+                    def counted_target(*target_args: Any, **target_kwargs: Any) -> Any:
+                        attributes["iterations"] += 1
+                        return target(*target_args, **target_kwargs)
+
+                    args = (counted_target, *args[1:])
+                return original(*args, **kwargs)
+
+        self.patches.append((owner, name, original))
+        setattr(owner, name, traced_call)
+
+    def unpatch(self):
+        for owner, name, original in reversed(self.patches):
+            setattr(owner, name, original)
+        self.patches = []
+
+    def wall_ns(self, perf_ns: int) -> int:
+        return self.origin[0] + perf_ns - self.origin[1]
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Spans in the Chrome trace event format, readable by Perfetto and chrome://tracing"""
+        pid = os.getpid()
+        events = [
+            dict(name=s["name"],
+                 cat="babylon",
+                 ph="X",
+                 ts=(s["start"] - self.origin[1]) / 1000,
+                 dur=(s["end"] - s["start"]) / 1000,
+                 pid=pid,
+                 tid=s["tid"],
+                 args=s["attributes"]) for s in self.spans
+        ]
+        return dict(traceEvents=events, displayTimeUnit="ms")
+
+    def otlp_trace(self) -> dict[str, Any]:
+        """Spans in the OTLP/HTTP json format"""
+
+        def value(v: Any) -> dict[str, Any]:
+            if isinstance(v, bool):
+                return {"boolValue": v}
+            if isinstance(v, int):
+                return {"intValue": str(v)}
+            if isinstance(v, float):
+                return {"doubleValue": v}
+            return {"stringValue": str(v)}
+
+        spans = [
+            dict(traceId=self.trace_id,
+                 spanId=s["id"],
+                 parentSpanId=s["parent"] or "",
+                 name=s["name"],
+                 kind=1,
+                 startTimeUnixNano=str(self.wall_ns(s["start"])),
+                 endTimeUnixNano=str(self.wall_ns(s["end"])),
+                 attributes=[dict(key=k, value=value(v)) for k, v in s["attributes"].items()]) for s in self.spans
+        ]
+        resource = dict(attributes=[dict(key="service.name", value=value("babylon"))])
+        return dict(resourceSpans=[dict(resource=resource, scopeSpans=[dict(scope=dict(name="babylon"), spans=spans)])])
+
+    def summary(self, top: int = 15) -> list[dict[str, Any]]:
+        """Total time, call count and max duration of the spans grouped by name, biggest first"""
+        groups: dict[str, dict[str, Any]] = dict()
+        for s in self.spans:
+            duration = (s["end"] - s["start"]) / 1e9
+            group = groups.setdefault(s["name"], dict(name=s["name"], calls=0, total=0.0, max=0.0))
+            group["calls"] += 1
+            group["total"] += duration
+            group["max"] = max(group["max"], duration)
+        return sorted(groups.values(), key=lambda g: g["total"], reverse=True)[:top]
+
+    def print_summary(self, top: int = 15):
+        from rich.console import Console
+        from rich.table import Table
+        table = Table(title="Top time consumers")
+        for column in ["Span", "Calls", "Total (s)", "Mean (ms)", "Max (ms)"]:
+            table.add_column(column, justify="left" if column == "Span" else "right")
+        for g in self.summary(top):
+            table.add_row(g["name"], str(g["calls"]), f"{g['total']:.3f}", f"{g['total'] / g['calls'] * 1000:.1f}",
+                          f"{g['max'] * 1000:.1f}")
+        Console(stderr=True).print(table)
+
+    def export(self, target: str):
+        """Write the trace to a file, or send it to an OTLP/HTTP collector when `target` is an url"""
+        self.disable()
+        if not self.spans:
+            return
+        if target.startswith(("http://", "https://")):
+            import requests
+            url = target if target.rstrip("/").endswith("/v1/traces") else f"{target.rstrip('/')}/v1/traces"
+            try:
+                requests.post(url, json=self.otlp_trace(), timeout=10).raise_for_status()
+            except Exception as e:
+                logger.warning(f"Could not send the trace to {url}: {e}")
+        else:
+            with open(target, "w", encoding="utf-8") as _f:
+                json.dump(self.chrome_trace(), _f, default=str)
+            logger.info(f"Trace written in {target}")
+        self.print_summary()
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
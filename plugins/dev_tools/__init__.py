@@ -9,7 +9,7 @@ from click import pass_context
 from click import Context
 
 from Babylon.utils import BABYLON_PATH
-from Babylon.utils.environment import Environment
+from Babylon.utils.plugins import PluginConfig
 from .initialize_plugin import initialize_plugin
 from .tests import tests
 
@@ -27,18 +27,13 @@ logger = logging.getLogger("Babylon")
 @option("-p", "--plugin", "plugin", type=str, required=False)
 def dev_tools(ctx: Context, plugin: Optional[str] = None):
     """Plugin used to simplify some development operations"""
-    environment = Environment()
     base_path = BABYLON_PATH
     if plugin:
-        config = environment.configuration
-        if plugin not in list(config.get_available_plugin()):
+        config = PluginConfig().get(plugin)
+        if not config or not config.get("path"):
             logger.error(f"Plugin `{plugin}` does not exists.")
             raise click.Abort()
-        else:
-            for _p in config.plugins:
-                if _p['name'] == plugin:
-                    base_path = pathlib.Path(_p['path'])
-                    break
+        base_path = pathlib.Path(config["path"])
     ctx.obj = base_path
 
 
@@ -6,7 +6,7 @@ import shutil
 import click
 
 from Babylon.utils import ORIGINAL_TEMPLATE_FOLDER_PATH
-from Babylon.utils.environment import Environment
+from Babylon.utils.plugins import PluginConfig, entry_point_plugins
 from Babylon.utils.string import is_valid_command_name
 
 logger = logging.getLogger("Babylon")
@@ -19,7 +19,7 @@ logger = logging.getLogger("Babylon")
 @click.option("-a", "--add", "add", is_flag=True, help="Add the created plugin to the config.")
 def initialize_plugin(plugin_name: str, plugin_folder: pathlib.Path, add: bool = False):
     """Will initialize PLUGIN_NAME in PLUGIN_FOLDER"""
-    environment = Environment()
+    config = PluginConfig()
     plugin_name = plugin_name.replace("-", "_")
     if not is_valid_command_name(plugin_name):
         logger.error(f"`{plugin_name}` contains illegal characters")
@@ -32,29 +32,33 @@ def initialize_plugin(plugin_name: str, plugin_folder: pathlib.Path, add: bool =
         return
 
     if add:
-        if plugin_name in environment.configuration.get_available_plugin():
+        if config.get(plugin_name) or plugin_name in entry_point_plugins():
             logger.error(f"Plugin `{plugin_name}` already exists in the config.")
             return
 
     os.makedirs(str(plugin_folder), exist_ok=True)
 
     logger.info(f"Creating plugin folder tree at {plugin_folder.absolute()}")
-    shutil.copytree(plugin_template, plugin_folder, dirs_exist_ok=True)
+    # byte-compiled files of an installed template are not part of it
+    shutil.copytree(plugin_template,
+                    plugin_folder,
+                    dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
 
     for root, _, _files in os.walk(str(plugin_folder)):
 
         for _f_name in _files:
             _f_path = pathlib.Path(root) / _f_name
-            _f_content = []
-            with open(_f_path) as _f:
-                for _line in _f:
-                    _f_content.append(_line.replace('plugin_template', plugin_name))
-            with open(_f_path, "w") as _f:
-                _f.write("".join(_f_content))
+            try:
+                _f_content = _f_path.read_text(encoding="utf-8")
+            except UnicodeDecodeError:
+                logger.debug(f"Keeping binary file {_f_path} as is")
+                continue
+            _f_path.write_text(_f_content.replace('plugin_template', plugin_name), encoding="utf-8")
 
     logger.info(f"Plugin {plugin_name} is ready")
     if add:
-        environment.configuration.add_plugin(plugin_folder)
+        config.add_plugin(plugin_folder)
         logger.info(f"Plugin {plugin_name} was added to the configuration.")
-    logger.info("Use `babylon config plugin` to see how to interact with it")
+    logger.info("Use `babylon plugin` to see how to interact with it")
     logger.info(f"Use `babylon dev-tools --plugin {plugin_name}` to use dev commands on your plugin")